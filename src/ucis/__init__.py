@@ -18,8 +18,6 @@
 
 import logging
 from enum import IntEnum, auto
-from .report import *
-from .rgy import *
 from .ucis import UCIS
 from .scope import Scope
 
@@ -45,6 +43,66 @@ from ucis.toggle_dir_t import ToggleDirT
 from _datetime import datetime
 
 
+#********************************************************************
+#* Lazily-imported names
+#********************************************************************
+# The report and format-registry packages pull in every backend, so they
+# are only imported when one of their names is first used
+_LAZY_ATTRS = {
+    "CoverageReport":        "ucis.report.coverage_report",
+    "CoverageReportBuilder": "ucis.report.coverage_report_builder",
+    "FormatRgy":             "ucis.rgy.format_rgy",
+    "FormatDbFlags":         "ucis.rgy.format_if_db",
+    "FormatCapabilities":    "ucis.rgy.format_if_db",
+    "FormatDescDb":          "ucis.rgy.format_if_db",
+    "FormatIfDb":            "ucis.rgy.format_if_db",
+    "FormatDescRpt":         "ucis.rgy.format_if_rpt",
+    "FormatIfRpt":           "ucis.rgy.format_if_rpt",
+    "FormatRptOutFlags":     "ucis.rgy.format_if_rpt",
+    "FormatRptJson":         "ucis.report.format_rpt_json",
+    "FormatRptText":         "ucis.report.format_rpt_text",
+    "DbFormatIfLib":         "ucis.lib.db_format_if_lib",
+    "DbFormatIfXml":         "ucis.xml.db_format_if_xml",
+    "DbFormatIfYaml":        "ucis.yaml.db_format_if_yaml",
+    # Re-exported by the former star imports of ucis.report and ucis.rgy
+    "Dict":                  "typing",
+    "IntFlag":               "enum",
+    "dataclass":             "dataclasses",
+    "field":                 "dataclasses",
+}
+
+# Submodules that the former star imports left bound as attributes
+_LAZY_MODULES = {
+    "coverage_report":         "ucis.report.coverage_report",
+    "coverage_report_builder": "ucis.report.coverage_report_builder",
+    "format_if_db":            "ucis.rgy.format_if_db",
+    "format_if_rpt":           "ucis.rgy.format_if_rpt",
+    "format_rgy":              "ucis.rgy.format_rgy",
+    "cover_instance":          "ucis.cover_instance",
+    "du_scope":                "ucis.du_scope",
+    "instance_scope":          "ucis.instance_scope",
+    "lib":                     "ucis.lib",
+    "mem":                     "ucis.mem",
+    "xml":                     "ucis.xml",
+    "yaml":                    "ucis.yaml",
+}
+
+def __getattr__(name):
+    import importlib
+    module = _LAZY_ATTRS.get(name)
+    if module is not None:
+        value = getattr(importlib.import_module(module), name)
+    elif name in _LAZY_MODULES:
+        value = importlib.import_module(_LAZY_MODULES[name])
+    else:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS) | set(_LAZY_MODULES))
+
+
 #********************************************************************
 #* Property Functions
 #********************************************************************
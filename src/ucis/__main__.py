@@ -4,14 +4,21 @@ Created on Jun 11, 2022
 @author: mballance
 '''
 import argparse
-from ucis.cmd import cmd_list_db_formats
-from ucis.cmd import cmd_list_report_formats
-from ucis.cmd import cmd_report, cmd_merge, cmd_convert, cmd_show
-from ucis.cmd import cmd_history, cmd_testplan
+import importlib
 import sys
 import traceback
 import os
 
+def _cmd(module, func):
+    """
+    Command entry point that imports ``ucis.cmd.<module>`` only when the
+    command runs, so building the parser does not load every backend.
+    """
+    def run(args):
+        return getattr(importlib.import_module("ucis.cmd." + module), func)(args)
+    run.__name__ = func
+    return run
+
 def get_parser():
     parser = argparse.ArgumentParser(description="Manipulate UCIS coverage data")
     parser.prog = "ucis"
@@ -38,8 +45,12 @@ def get_parser():
     convert.add_argument("--warn-summary",
         action="store_true", default=False,
         help="Print a summary of conversion warnings at the end")
+    convert.add_argument("--compress-level",
+        type=int, choices=range(10), default=None, metavar="{0-9}",
+        help="zlib level for NCDB output (default: 6). Lower levels write "
+             "faster; 0 stores the members uncompressed")
     convert.add_argument("input", help="Source database to convert")
-    convert.set_defaults(func=cmd_convert.convert)
+    convert.set_defaults(func=_cmd("cmd_convert", "convert"))
    
     merge = subparser.add_parser("merge",
         help="""
@@ -65,17 +76,23 @@ def get_parser():
     merge.add_argument("--workers", "-j",
         type=int,
         default=4,
-        help="Number of parallel reader threads for merge_fast (default: 4)")
+        help="Number of parallel threads: readers for merge_fast, member "
+             "compression for NCDB output (default: 4)")
+    merge.add_argument("--compress-level",
+        type=int, choices=range(10), default=None, metavar="{0-9}",
+        help="zlib level for NCDB output (default: 6). Lower levels write "
+             "faster, e.g. for intermediate merges; 0 stores the members "
+             "uncompressed")
     merge.add_argument("db", nargs="+")
-    merge.set_defaults(func=cmd_merge.merge)
+    merge.set_defaults(func=_cmd("cmd_merge", "merge"))
     
     list_db_formats = subparser.add_parser("list-db-formats",
         help="Shows available database formats")
-    list_db_formats.set_defaults(func=cmd_list_db_formats.list_db_formats)
+    list_db_formats.set_defaults(func=_cmd("cmd_list_db_formats", "list_db_formats"))
     
     list_rpt_formats = subparser.add_parser("list-rpt-formats",
         help="Shows available report filters")
-    list_rpt_formats.set_defaults(func=cmd_list_report_formats.list_report_formats)
+    list_rpt_formats.set_defaults(func=_cmd("cmd_list_report_formats", "list_report_formats"))
     
     report = subparser.add_parser("report",
         help="Generate a report (typically textual) from coverage data")
@@ -85,8 +102,10 @@ def get_parser():
         help="Specifies the format of the input database. Defaults to 'xml'")
     report.add_argument("--output-format", "-of",
         help="Specifies the output format of the report. Defaults to 'txt'")
+    report.add_argument("--cache-dir",
+        help="Fragment cache directory (html-dir output); unchanged parts of the report are reused from the previous run")
     report.add_argument("db", help="Path to the coverage database")
-    report.set_defaults(func=cmd_report.report)
+    report.set_defaults(func=_cmd("cmd_report", "report"))
 
     show = subparser.add_parser("show",
         help="Query and display coverage information from UCIS database")
@@ -226,6 +245,25 @@ def get_parser():
     show_compare.add_argument("db", help="Path to the baseline coverage database")
     show_compare.add_argument("compare_db", help="Path to the comparison database")
     
+    # show diff subcommand
+    show_diff = show_subparser.add_parser("diff",
+        help="Diff coverage of a baseline database against one or more others")
+    show_diff.add_argument("--out", "-o",
+        help="Specifies the output location for the report")
+    show_diff.add_argument("--input-format", "-if",
+        help="Specifies the format of the input databases. Detected per file by default")
+    show_diff.add_argument("--output-format", "-of",
+        help="Specifies the output format. Defaults to 'json'",
+        default='json',
+        choices=['json', 'text', 'txt'])
+    show_diff.add_argument("--limit", "-l",
+        help="Maximum number of coveritem paths listed per category (default: 100)",
+        type=int,
+        default=100)
+    show_diff.add_argument("db", help="Path to the baseline coverage database")
+    show_diff.add_argument("compare_dbs", nargs="+",
+        help="Paths of the databases to compare against the baseline")
+    
     # show hotspots subcommand
     show_hotspots = show_subparser.add_parser("hotspots",
         help="Identify coverage hotspots and high-value targets")
@@ -258,6 +296,8 @@ def get_parser():
         help="Specifies the output format",
         default='json',
         choices=['json', 'text', 'txt', 'lcov', 'cobertura', 'jacoco', 'clover'])
+    show_code_cov.add_argument("--cache-dir",
+        help="Fragment cache directory for lcov/cobertura output; unchanged covergroups are reused from the previous run")
     show_code_cov.add_argument("db", help="Path to the coverage database")
     
     # show assertions
@@ -286,13 +326,41 @@ def get_parser():
         choices=['json', 'text', 'txt'])
     show_toggle.add_argument("db", help="Path to the coverage database")
     
-    show.set_defaults(func=cmd_show.show)
+    # show batch
+    show_batch = show_subparser.add_parser("batch",
+        help="Run many show queries against one database, reading it once")
+    show_batch_src = show_batch.add_mutually_exclusive_group(required=True)
+    show_batch_src.add_argument("--queries", "-q",
+        help="JSON file of queries: an array, or one object per line ('-' for stdin). "
+             "Each query is {\"cmd\": <show subcommand>, <option>: <value>, ...}")
+    show_batch_src.add_argument("--stdin",
+        help="Read JSON-lines queries from stdin and answer each with one line of JSON",
+        action="store_true")
+    show_batch.add_argument("--out", "-o",
+        help="Specifies the output location for the results")
+    show_batch.add_argument("--input-format", "-if",
+        help="Specifies the format of the input database. Defaults to 'xml'")
+    show_batch.add_argument("--output-format", "-of",
+        help="Specifies the output format for --queries results. Defaults to 'json'",
+        default='json',
+        choices=['json', 'text', 'txt'])
+    show_batch.add_argument("db", help="Path to the coverage database")
+    
+    for show_cmd in show_subparser.choices.values():
+        show_cmd.add_argument("--no-cache",
+            help="Neither read nor update the database's metrics cache sidecar (<db>.metrics-cache.json)",
+            action="store_true")
+    
+    show.set_defaults(func=_cmd("cmd_show", "show"))
 
     # View subcommand (interactive TUI)
     view = subparser.add_parser("view",
         help="Launch interactive Terminal UI for exploring coverage data")
     view.add_argument("--input-format", "-if",
         help="Specifies the format of the input database. Defaults to 'xml'")
+    view.add_argument("--no-cache",
+        help="Neither read nor update the database's metrics cache sidecar",
+        action="store_true")
     view.add_argument("db", help="Path to the coverage database")
     view.set_defaults(func=lambda args: _launch_tui(args))
 
@@ -325,7 +393,7 @@ def get_parser():
         choices=["text", "json"],
         help="Output format (default: text)",
     )
-    history_query.set_defaults(func=cmd_history.cmd_history_query)
+    history_query.set_defaults(func=_cmd("cmd_history", "cmd_history_query"))
 
     history_stats = history_sub.add_parser(
         "stats",
@@ -345,7 +413,68 @@ def get_parser():
         choices=["text", "json"],
         help="Output format (default: text)",
     )
-    history_stats.set_defaults(func=cmd_history.cmd_history_stats)
+    history_stats.set_defaults(func=_cmd("cmd_history", "cmd_history_stats"))
+
+    history_trend = history_sub.add_parser(
+        "trend",
+        help="Show daily or weekly pass-rate, flake-rate and coverage-run "
+             "trends (one test or all tests)",
+    )
+    history_trend.add_argument("db", help="Path to the NCDB .cdb file")
+    history_trend.add_argument("test_name", nargs="?", default=None,
+        help="Test name (default: all tests)")
+    history_trend.add_argument("--granularity", "-g", default="day",
+        choices=["day", "week"],
+        help="Period length (default: day)")
+    history_trend.add_argument("--from", dest="from_",
+        metavar="DATE", default=None,
+        help="Start date (ISO 8601 or Unix timestamp)")
+    history_trend.add_argument("--to", default=None,
+        metavar="DATE",
+        help="End date (ISO 8601 or Unix timestamp)")
+    history_trend.add_argument("--out", "-o", default=None,
+        help="Output file (default: stdout)")
+    history_trend.add_argument(
+        "--output-format", "-of", default="text",
+        choices=["text", "json"],
+        help="Output format (default: text)",
+    )
+    history_trend.set_defaults(func=_cmd("cmd_history", "cmd_history_trend"))
+
+    history_record = history_sub.add_parser(
+        "record",
+        help="Append a test run to a journal next to the .cdb; safe to run "
+             "from many workers at once (see 'history compact')",
+    )
+    history_record.add_argument("db", help="Path to the NCDB .cdb file")
+    history_record.add_argument("test_name", help="Test name")
+    history_record.add_argument("--status", default="pass",
+        choices=["pass", "fail", "error", "fatal", "compile"],
+        help="Run status (default: pass)")
+    history_record.add_argument("--seed", default="0",
+        help="Test seed (default: 0)")
+    history_record.add_argument("--ts", default=None, metavar="DATE",
+        help="Run time (ISO 8601 or Unix timestamp; default: now)")
+    history_record.add_argument("--cpu-time", type=float, default=None,
+        metavar="SECONDS", help="CPU/wall time of the run")
+    history_record.add_argument("--coverage", action="store_true",
+        help="The run produced coverage data")
+    history_record.add_argument("--rerun", action="store_true",
+        help="The run is a retry of a failed run")
+    history_record.add_argument("--writer-id", default=None,
+        help="Append to this worker's open journal instead of writing a "
+             "one-run journal")
+    history_record.set_defaults(func=_cmd("cmd_history", "cmd_history_record"))
+
+    history_compact = history_sub.add_parser(
+        "compact",
+        help="Fold journaled test runs into the .cdb history store",
+    )
+    history_compact.add_argument("db", help="Path to the NCDB .cdb file")
+    history_compact.add_argument("--compress-level",
+        type=int, choices=range(10), default=None, metavar="{0-9}",
+        help="zlib level for the rewritten .cdb (default: 6)")
+    history_compact.set_defaults(func=_cmd("cmd_history", "cmd_history_compact"))
 
     # -----------------------------------------------------------------------
     # testplan subcommand
@@ -368,7 +497,7 @@ def get_parser():
         "--subs", metavar="KEY=VAL", action="append", default=[],
         help="Template substitution (repeatable): e.g. --subs uart=uart0",
     )
-    testplan_import.set_defaults(func=cmd_testplan.cmd_testplan_import)
+    testplan_import.set_defaults(func=_cmd("cmd_testplan", "cmd_testplan_import"))
 
     testplan_closure = testplan_sub.add_parser(
         "closure",
@@ -391,7 +520,7 @@ def get_parser():
         choices=["text", "json"],
         help="Output format (default: text)",
     )
-    testplan_closure.set_defaults(func=cmd_testplan.cmd_testplan_closure)
+    testplan_closure.set_defaults(func=_cmd("cmd_testplan", "cmd_testplan_closure"))
 
     testplan_export_junit = testplan_sub.add_parser(
         "export-junit",
@@ -407,7 +536,7 @@ def get_parser():
         metavar="NAME",
         help="JUnit testsuite name attribute")
     testplan_export_junit.set_defaults(
-        func=cmd_testplan.cmd_testplan_export_junit
+        func=_cmd("cmd_testplan", "cmd_testplan_export_junit")
     )
 
     return parser
@@ -416,7 +545,8 @@ def _launch_tui(args):
     """Launch the TUI application."""
     from ucis.tui.app import TUIApp
     input_format = getattr(args, 'input_format', None)
-    app = TUIApp(args.db, input_format=input_format)
+    app = TUIApp(args.db, input_format=input_format,
+                 use_cache=not getattr(args, 'no_cache', False))
     app.run()
 
 def main():
@@ -46,7 +46,7 @@ from typing import Dict, Optional, Any
 import logging
 
 from ucis.ucis import UCIS
-from ucis.sqlite.sqlite_ucis import SqliteUCIS
+from ucis.mem.mem_ucis import MemUCIS
 from ucis.source_t import SourceT
 from ucis.scope_type_t import ScopeTypeT
 from ucis.flags_t import FlagsT
@@ -67,13 +67,13 @@ class AvlJsonReader:
         
         Args:
             filename: Path to AVL JSON file
-            db: Target UCIS database (creates new SQLite in-memory if None)
+            db: Target UCIS database (creates a new MemUCIS if None)
             
         Returns:
             UCIS database with imported coverage
         """
         if db is None:
-            db = SqliteUCIS(":memory:")
+            db = MemUCIS()
         
         self.db = db
         self.scope_map.clear()
@@ -189,9 +189,9 @@ class AvlJsonReader:
         
         # Process bins
         bins = data.get('bins', {})
-        for bin_name, bin_data in bins.items():
-            hits = bin_data.get('hits', 0) if isinstance(bin_data, dict) else bin_data
-            self._create_bin(coverpoint, bin_name, hits)
+        self._create_bins(coverpoint, [
+            (bin_name, bin_data.get('hits', 0) if isinstance(bin_data, dict) else bin_data)
+            for bin_name, bin_data in bins.items()])
     
     def _process_cross(self, parent, name: str, data: dict):
         """Process a cross coverage item."""
@@ -207,9 +207,17 @@ class AvlJsonReader:
         
         # Process cross bins
         bins = data.get('bins', {})
-        for bin_name, bin_data in bins.items():
-            hits = bin_data.get('hits', 0) if isinstance(bin_data, dict) else bin_data
-            self._create_bin(cross, bin_name, hits)
+        self._create_bins(cross, [
+            (bin_name, bin_data.get('hits', 0) if isinstance(bin_data, dict) else bin_data)
+            for bin_name, bin_data in bins.items()])
+    
+    def _create_bins(self, parent_scope, bins: list, at_least: int = 1):
+        """Create (bin name, hits) bins in the coverpoint/cross in one batch."""
+        try:
+            parent_scope.createBins(bins, None, at_least)
+            logger.debug(f"Created {len(bins)} bins")
+        except (AttributeError, TypeError) as e:
+            logger.warning(f"Failed to create bins: {e}")
     
     def _create_bin(self, parent_scope, bin_name: str, hits: int, at_least: int = 1):
         """Create a bin in the coverpoint/cross."""
@@ -272,10 +280,9 @@ class AvlJsonReader:
                 coverpoint = self.scope_map[base_name]
             
             # Create bins
-            for bin_record in bins:
-                bin_name = bin_record.get('bin_name', 'unknown')
-                hits = bin_record.get('hits', 0)
-                self._create_bin(coverpoint, bin_name, hits)
+            self._create_bins(coverpoint, [
+                (bin_record.get('bin_name', 'unknown'), bin_record.get('hits', 0))
+                for bin_record in bins])
     
     def _process_dataframe_table(self, parent, table: dict):
         """Process DataFrame table/index format."""
@@ -306,7 +313,7 @@ def read_avl_json(filename: str, db: Optional[UCIS] = None) -> UCIS:
     
     Args:
         filename: Path to JSON file
-        db: Target database (creates new if None)
+        db: Target database (creates a new MemUCIS if None)
         
     Returns:
         UCIS database with imported coverage
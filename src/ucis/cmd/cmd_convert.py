@@ -23,6 +23,9 @@ def convert(args):
 
     input_if = input_desc.fmt_if()
     output_if = output_desc.fmt_if()
+    compress_level = getattr(args, 'compress_level', None)
+    if args.output_format == "ncdb" and compress_level is not None:
+        output_if.init({"compress_level": compress_level})
 
     strict = getattr(args, 'strict', False)
     ctx = ConversionContext(
@@ -4,6 +4,9 @@ Subcommands
 -----------
 query   Display history records for a specific test name.
 stats   Show aggregate statistics (top-failing, top-flaky, or named test).
+trend   Show daily/weekly pass-rate, flake-rate and coverage-run trends.
+record  Append a test run to a per-worker journal (no .cdb rewrite).
+compact Fold the journals into the .cdb history store.
 """
 
 from __future__ import annotations
@@ -138,3 +141,73 @@ def cmd_history_stats(args) -> None:
     finally:
         if out is not sys.stdout:
             out.close()
+
+
+# ---------------------------------------------------------------------------
+# history trend
+# ---------------------------------------------------------------------------
+
+def cmd_history_trend(args) -> None:
+    """Execute ``pyucis history trend``."""
+    db = _open_ncdb(args.db)
+    series = db.history_trend(getattr(args, "test_name", None),
+                              granularity=getattr(args, "granularity", "day"),
+                              ts_from=_ts(getattr(args, "from_", None)),
+                              ts_to=_ts(getattr(args, "to", None)))
+
+    fmt = getattr(args, "output_format", "text")
+    out = open(args.out, "w") if getattr(args, "out", None) else sys.stdout
+
+    try:
+        if fmt == "json":
+            out.write(json.dumps(series.to_dict(), indent=2) + "\n")
+        else:
+            out.write(f"{'Period':<12} {'Runs':>8} {'Pass %':>8} "
+                      f"{'Flake %':>8} {'Cov %':>8}\n")
+            out.write("-" * 48 + "\n")
+            for ts, runs, pr, fr, cr in zip(series.ts, series.runs,
+                                            series.pass_rate,
+                                            series.flake_rate,
+                                            series.coverage_rate):
+                date = time.strftime("%Y-%m-%d", time.gmtime(ts))
+                out.write(f"{date:<12} {runs:>8} {pr * 100:>8.1f} "
+                          f"{fr * 100:>8.1f} {cr * 100:>8.1f}\n")
+            out.write(f"\nTotal periods: {len(series)}\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+# ---------------------------------------------------------------------------
+# history record / compact
+# ---------------------------------------------------------------------------
+
+_STATUS = {"pass": 0, "fail": 1, "error": 2, "fatal": 3, "compile": 4}
+
+
+def cmd_history_record(args) -> None:
+    """Execute ``pyucis history record``."""
+    from ucis.ncdb.run_journal import RunJournal
+
+    # A named journal stays open for the worker's later runs; an anonymous
+    # one holds just this run and is complete straight away.
+    writer_id = getattr(args, "writer_id", None)
+    journal = RunJournal(args.db, writer_id=writer_id)
+    try:
+        journal.record(args.test_name, seed=args.seed,
+                       status=_STATUS[args.status],
+                       ts=_ts(getattr(args, "ts", None)),
+                       cpu_time=getattr(args, "cpu_time", None),
+                       has_coverage=getattr(args, "coverage", False),
+                       is_rerun=getattr(args, "rerun", False))
+    finally:
+        journal.close(done=writer_id is None)
+
+
+def cmd_history_compact(args) -> None:
+    """Execute ``pyucis history compact``."""
+    from ucis.ncdb.run_journal import compact_journals
+
+    n = compact_journals(args.db,
+                         compress_level=getattr(args, "compress_level", None))
+    print(f"Compacted {n} run(s) into {args.db}")
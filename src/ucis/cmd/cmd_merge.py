@@ -32,7 +32,9 @@ def merge(args):
     # NCDB fast-path merge
     if args.input_format == "ncdb" and args.output_format == "ncdb":
         from ucis.ncdb.ncdb_merger import NcdbMerger
-        NcdbMerger().merge(args.db, args.out)
+        NcdbMerger(compress_level=getattr(args, 'compress_level', None),
+                   workers=getattr(args, 'workers', None)).merge(
+                       args.db, args.out)
         return
 
     if args.input_format == "sqlite" and args.output_format == "sqlite":
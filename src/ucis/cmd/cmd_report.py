@@ -30,6 +30,10 @@ def report(args):
     input_if : FormatIfDb = input_desc.fmt_if()
     output_desc = rgy.getReportDesc(args.output_format)
     output_if : FormatIfRpt = output_desc.fmt_if()
+    if getattr(args, "cache_dir", None) is not None:
+        if not hasattr(output_if, "cache_dir"):
+            raise Exception("Output format %s does not support --cache-dir" % args.output_format)
+        output_if.cache_dir = args.cache_dir
 
     in_db = input_if.read(args.db)
 
@@ -46,13 +50,13 @@ def report(args):
                 if os.path.isdir(args.out):
                     print("Note: removing existing report directory (%s)" % args.out)
                     shutil.rmtree(args.out)
-                    os.makedirs(args.out)
-                    fp = args.out
                 else:
-                    raise Exception("Output format %s requires a directory, but specified destination is a file" % (
+                    raise Exception("Output format %s requires a directory, but specified destination %s is a file" % (
                         args.output_format,
                         args.out
                     ))
+            os.makedirs(args.out)
+            fp = args.out
         else:
             raise Exception("Output format %s is ambiguous about output location: %s" % (
                 args.output_format,
@@ -62,7 +66,7 @@ def report(args):
 
     output_if.report(in_db, fp, [])
 
-    if args.out is not None:
+    if args.out is not None and hasattr(fp, "close"):
         fp.close()
 
     in_db.close()
@@ -11,10 +11,31 @@ from ucis.cmd.show.show_tests import ShowTests
 from ucis.cmd.show.show_hierarchy import ShowHierarchy
 from ucis.cmd.show.show_metrics import ShowMetrics
 from ucis.cmd.show.show_compare import ShowCompare
+from ucis.cmd.show.show_diff import ShowDiff
 from ucis.cmd.show.show_hotspots import ShowHotspots
 from ucis.cmd.show.show_code_coverage import ShowCodeCoverage
 from ucis.cmd.show.show_assertions import ShowAssertions
 from ucis.cmd.show.show_toggle import ShowToggle
+from ucis.cmd.show.show_batch import ShowBatch
+
+
+# Map of show subcommands to their implementations
+SHOW_COMMANDS = {
+    'summary': ShowSummary,
+    'gaps': ShowGaps,
+    'covergroups': ShowCovergroups,
+    'bins': ShowBins,
+    'tests': ShowTests,
+    'hierarchy': ShowHierarchy,
+    'metrics': ShowMetrics,
+    'compare': ShowCompare,
+    'diff': ShowDiff,
+    'hotspots': ShowHotspots,
+    'code-coverage': ShowCodeCoverage,
+    'assertions': ShowAssertions,
+    'toggle': ShowToggle,
+    'batch': ShowBatch,
+}
 
 
 def show(args):
@@ -24,28 +45,12 @@ def show(args):
     Args:
         args: Parsed command-line arguments with 'show_cmd' attribute
     """
-    # Map of show subcommands to their implementations
-    show_commands = {
-        'summary': ShowSummary,
-        'gaps': ShowGaps,
-        'covergroups': ShowCovergroups,
-        'bins': ShowBins,
-        'tests': ShowTests,
-        'hierarchy': ShowHierarchy,
-        'metrics': ShowMetrics,
-        'compare': ShowCompare,
-        'hotspots': ShowHotspots,
-        'code-coverage': ShowCodeCoverage,
-        'assertions': ShowAssertions,
-        'toggle': ShowToggle,
-    }
-    
     show_cmd = args.show_cmd
     
-    if show_cmd not in show_commands:
+    if show_cmd not in SHOW_COMMANDS:
         raise Exception(f"Unknown show command: {show_cmd}")
     
     # Instantiate and execute the command
-    cmd_class = show_commands[show_cmd]
+    cmd_class = SHOW_COMMANDS[show_cmd]
     cmd = cmd_class(args)
     cmd.execute()
@@ -0,0 +1,196 @@
+"""
+Show Batch Command
+
+Runs many show queries against a database that is read only once.
+"""
+import json
+import sys
+from typing import Any, Dict, List, TextIO
+from ucis.cmd.show_base import ShowBase
+
+
+class ShowBatch(ShowBase):
+    """
+    Run a list of show queries against one loaded database.
+
+    Each query is a JSON object naming a show subcommand plus any of that
+    subcommand's options, spelled like their long option names::
+
+        {"cmd": "summary"}
+        {"cmd": "gaps", "threshold": 90}
+        {"cmd": "compare", "compare_db": "nightly.cdb"}
+        {"cmd": "diff", "compare_dbs": ["night1.cdb", "night2.cdb"]}
+        {"cmd": "code-coverage", "output_format": "lcov", "out": "cov.info"}
+
+    Options that are not given take their command-line defaults. All queries
+    share one ``CoverageMetrics`` instance, so the coverage report is built
+    at most once however many queries need it. A query with ``out`` writes
+    its own file, in its own ``output_format``, just as the standalone
+    subcommand would.
+
+    With the metrics cache enabled (the default), each query's result is
+    also stored in the database's sidecar cache, and the database is only
+    read if some query is not found there.
+
+    Queries are read either from a file (``--queries``, a JSON array or one
+    query per line), producing one combined result document, or from
+    standard input (``--stdin``), answering each line with one line of JSON
+    as soon as it has been computed.
+    """
+
+    def __init__(self, args):
+        super().__init__(args)
+        self._parser = None
+
+    def execute(self):
+        """
+        Answer every query, loading the database at most once. Queries
+        answered from the metrics cache do not need it loaded at all.
+        """
+        if self.open_cache() is None:
+            self.load_db()
+        else:
+            self._db_loader = self.read_db
+        try:
+            out = getattr(self.args, 'out', None)
+            if not getattr(self.args, 'stdin', False):
+                self._write_output(self.get_data())
+            elif out is None:
+                self.serve(sys.stdin, sys.stdout)
+            else:
+                with open(out, 'w') as fp:
+                    self.serve(sys.stdin, fp)
+        finally:
+            if self._store is not None:
+                self._store.save()
+            if self._db is not None:
+                self._db.close()
+
+    def get_data(self) -> Dict[str, Any]:
+        """
+        Run every query from ``args.queries``.
+
+        Returns:
+            Dictionary with the database path and one result per query
+        """
+        queries = self.read_queries(self.args.queries)
+        return {
+            "database": self.args.db,
+            "results": [self.run_query(q) for q in queries],
+        }
+
+    def serve(self, fin: TextIO, fout: TextIO):
+        """
+        Answer JSON-lines queries from *fin*, one JSON line per query on *fout*.
+
+        Blank lines are ignored. Each answer is flushed before the next
+        query is read, so a caller can drive this interactively.
+        """
+        for line in fin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                query = json.loads(line)
+            except ValueError as e:
+                result = {"query": line, "error": "Invalid query: %s" % e}
+            else:
+                result = self.run_query(query)
+            fout.write(json.dumps(result) + "\n")
+            fout.flush()
+
+    def run_query(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run one query, reading the database first if it is needed and has
+        not been read yet.
+
+        Args:
+            query: Query object (see class documentation)
+
+        Returns:
+            ``{"query", "data"}`` on success, ``{"query", "out"}`` when the
+            query wrote its own output file, or ``{"query", "error"}``
+        """
+        from ucis.cmd.cmd_show import SHOW_COMMANDS
+
+        result = {"query": query}
+        try:
+            args = self._query_args(query)
+            cmd = SHOW_COMMANDS[args.show_cmd](args)
+            key = cmd.cache_key()
+            data = self.cached_data(key)
+            if data is None:
+                # Shares this command's database, read on first use
+                cmd._db_loader = lambda: self.db
+                cmd.metrics = self.metrics
+                data = cmd.get_data()
+                self.store_data(key, data)
+            if getattr(args, 'out', None) is not None:
+                cmd._write_output(data)
+                result["out"] = args.out
+            else:
+                result["data"] = data
+        except Exception as e:
+            result["error"] = str(e)
+        return result
+
+    @staticmethod
+    def read_queries(path: str) -> List[Dict[str, Any]]:
+        """
+        Read queries from *path* ('-' for standard input).
+
+        The content is either a single JSON document (an array of queries,
+        or one query object) or JSON lines with one query per line.
+        """
+        if path == '-':
+            text = sys.stdin.read()
+        else:
+            with open(path, 'r') as fp:
+                text = fp.read()
+
+        try:
+            queries = json.loads(text)
+        except ValueError:
+            queries = [json.loads(line) for line in text.splitlines()
+                       if line.strip()]
+
+        if isinstance(queries, dict):
+            queries = [queries]
+        if not isinstance(queries, list):
+            raise Exception("Queries must be a JSON array or JSON lines")
+        return queries
+
+    def _query_args(self, query: Dict[str, Any]):
+        """Build the argparse namespace the standalone subcommand would get."""
+        from ucis.cmd.cmd_show import SHOW_COMMANDS
+
+        if not isinstance(query, dict):
+            raise Exception("Query must be a JSON object")
+        options = dict(query)
+        name = options.pop("cmd", None)
+        if name not in SHOW_COMMANDS or name == "batch":
+            raise Exception("Unknown show command: %s" % name)
+
+        argv = ["show", name, self.args.db]
+        if name == "compare":
+            if "compare_db" not in options:
+                raise Exception("compare query requires 'compare_db'")
+            argv.append(options.pop("compare_db"))
+        elif name == "diff":
+            compare_dbs = options.pop("compare_dbs", None)
+            if not compare_dbs or not isinstance(compare_dbs, list):
+                raise Exception("diff query requires a 'compare_dbs' list")
+            argv.extend(compare_dbs)
+
+        if self._parser is None:
+            from ucis.__main__ import get_parser
+            self._parser = get_parser()
+        args = self._parser.parse_args(argv)
+        args.input_format = self.args.input_format
+
+        for key, value in options.items():
+            attr = key.replace('-', '_')
+            if not hasattr(args, attr):
+                raise Exception("Unknown option '%s' for show %s" % (key, name))
+            setattr(args, attr, value)
+        return args
@@ -24,15 +24,10 @@ class ShowBins(ShowBase):
         Returns:
             Dictionary containing bin details
         """
-        from ucis.report.coverage_report_builder import CoverageReportBuilder
-        
-        # Build coverage report
-        report = CoverageReportBuilder.build(self.db)
-        
         # Collect bin data
         result = {
             "database": self.args.db,
-            "bins": self._get_bins(report),
+            "bins": self._get_bins(),
         }
         
         # Add filter metadata
@@ -53,51 +48,18 @@ class ShowBins(ShowBase):
         
         return result
     
-    def _get_bins(self, report) -> List[Dict[str, Any]]:
-        """Get all bins with filtering."""
-        bins = []
-        
-        cg_filter = getattr(self.args, 'covergroup', None)
-        cp_filter = getattr(self.args, 'coverpoint', None)
-        min_hits = getattr(self.args, 'min_hits', None)
-        max_hits = getattr(self.args, 'max_hits', None)
-        
-        if not report.covergroups:
-            return bins
+    def query(self):
+        """BinQuery for this command's filters and sort order."""
+        from ucis.report.bin_query import BinQuery
         
-        for cg in report.covergroups:
-            # Filter by covergroup
-            if cg_filter and cg.name != cg_filter:
-                continue
-            
-            if hasattr(cg, 'coverpoints') and cg.coverpoints:
-                for cp in cg.coverpoints:
-                    # Filter by coverpoint
-                    if cp_filter and cp.name != cp_filter:
-                        continue
-                    
-                    if hasattr(cp, 'bins') and cp.bins:
-                        for bin in cp.bins:
-                            # Filter by hit count
-                            if min_hits is not None and bin.count < min_hits:
-                                continue
-                            if max_hits is not None and bin.count > max_hits:
-                                continue
-                            
-                            bins.append({
-                                "covergroup": cg.name,
-                                "coverpoint": cp.name,
-                                "bin": bin.name,
-                                "count": bin.count,
-                                "at_least": getattr(bin, 'at_least', 1),
-                                "goal_met": bin.count >= getattr(bin, 'at_least', 1),
-                            })
-        
-        # Sort if requested
-        sort_by = getattr(self.args, 'sort', None)
-        if sort_by == 'count':
-            bins.sort(key=lambda x: x['count'], reverse=True)
-        elif sort_by == 'name':
-            bins.sort(key=lambda x: (x['covergroup'], x['coverpoint'], x['bin']))
-        
-        return bins
+        return BinQuery(
+            self.db,
+            covergroup=getattr(self.args, 'covergroup', None),
+            coverpoint=getattr(self.args, 'coverpoint', None),
+            min_hits=getattr(self.args, 'min_hits', None),
+            max_hits=getattr(self.args, 'max_hits', None),
+            sort=getattr(self.args, 'sort', None))
+    
+    def _get_bins(self) -> List[Dict[str, Any]]:
+        """Get all bins with filtering."""
+        return self.query().rows()
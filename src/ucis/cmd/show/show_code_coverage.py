@@ -18,6 +18,12 @@ class ShowCodeCoverage(ShowBase):
     - cobertura (Cobertura XML)
     """
     
+    def cache_key(self):
+        """Only json/text output is cached; exporters read the database."""
+        if getattr(self.args, 'output_format', 'json') not in ('json', 'text', 'txt'):
+            return None
+        return super().cache_key()
+    
     def get_data(self) -> Dict[str, Any]:
         """
         Extract code coverage information.
@@ -25,10 +31,8 @@ class ShowCodeCoverage(ShowBase):
         Returns:
             Dictionary containing coverage data
         """
-        from ucis.report.coverage_report_builder import CoverageReportBuilder
-        
         # Build coverage report
-        report = CoverageReportBuilder.build(self.db)
+        report = self.report
         
         # For now, we'll present functional coverage data
         # In future, this would include actual code coverage (statements, branches, etc.)
@@ -49,34 +53,39 @@ class ShowCodeCoverage(ShowBase):
             return coverage_data
         
         for cg in report.covergroups:
-            cg_data = {
-                "name": cg.name,
-                "coverage": cg.coverage,
-                "items": []
-            }
-            
-            if hasattr(cg, 'coverpoints') and cg.coverpoints:
-                for cp in cg.coverpoints:
-                    cp_data = {
-                        "name": cp.name,
-                        "coverage": cp.coverage,
-                        "hits": []
-                    }
-                    
-                    if hasattr(cp, 'bins') and cp.bins:
-                        for bin in cp.bins:
-                            cp_data["hits"].append({
-                                "name": bin.name,
-                                "count": bin.count,
-                                "covered": bin.count > 0,
-                            })
-                    
-                    cg_data["items"].append(cp_data)
-            
-            coverage_data.append(cg_data)
+            coverage_data.append(self.covergroup_data(cg))
         
         return coverage_data
     
+    @staticmethod
+    def covergroup_data(cg) -> Dict[str, Any]:
+        """Coverage data for one covergroup report object."""
+        cg_data = {
+            "name": cg.name,
+            "coverage": cg.coverage,
+            "items": []
+        }
+        
+        if hasattr(cg, 'coverpoints') and cg.coverpoints:
+            for cp in cg.coverpoints:
+                cp_data = {
+                    "name": cp.name,
+                    "coverage": cp.coverage,
+                    "hits": []
+                }
+                
+                if hasattr(cp, 'bins') and cp.bins:
+                    for bin in cp.bins:
+                        cp_data["hits"].append({
+                            "name": bin.name,
+                            "count": bin.count,
+                            "covered": bin.count > 0,
+                        })
+                
+                cg_data["items"].append(cp_data)
+        
+        return cg_data
+    
     def _write_output(self, data: Dict[str, Any]):
         """
         Write output in the specified format.
@@ -90,6 +99,10 @@ class ShowCodeCoverage(ShowBase):
             import sys
             fp = sys.stdout
             close_fp = False
+        elif out.endswith('.gz'):
+            import gzip
+            fp = gzip.open(out, 'wt', encoding='utf-8')
+            close_fp = True
         else:
             fp = open(out, 'w')
             close_fp = True
@@ -118,13 +131,13 @@ class ShowCodeCoverage(ShowBase):
     def _write_lcov(self, fp):
         """Write LCOV format."""
         from ucis.formatters.format_lcov import LcovFormatter
-        formatter = LcovFormatter()
+        formatter = LcovFormatter(cache_dir=getattr(self.args, 'cache_dir', None))
         formatter.format(self.db, fp)
     
     def _write_cobertura(self, fp):
         """Write Cobertura XML format."""
         from ucis.formatters.format_cobertura import CoberturaFormatter
-        formatter = CoberturaFormatter()
+        formatter = CoberturaFormatter(cache_dir=getattr(self.args, 'cache_dir', None))
         formatter.format(self.db, fp)
     
     def _write_jacoco(self, fp):
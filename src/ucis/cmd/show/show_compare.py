@@ -17,6 +17,13 @@ class ShowCompare(ShowBase):
     - Coverage improvements/regressions
     """
     
+    #: Already-open comparison database; read from ``args.compare_db`` when None
+    compare_db = None
+    
+    def cache_key(self):
+        """Not cached: the result also depends on the comparison database."""
+        return None
+    
     def get_data(self) -> Dict[str, Any]:
         """
         Compare two databases.
@@ -24,40 +31,44 @@ class ShowCompare(ShowBase):
         Returns:
             Dictionary containing comparison results
         """
+        from ucis.report.coverage_index import CoverageIndex
         from ucis.report.coverage_report_builder import CoverageReportBuilder
         from ucis.rgy.format_rgy import FormatRgy
         
-        # Load second database
-        rgy = FormatRgy.inst()
-        if self.args.input_format is None:
-            self.args.input_format = rgy.getDefaultDatabase()
-        
-        input_desc = rgy.getDatabaseDesc(self.args.input_format)
-        input_if = input_desc.fmt_if()
-        db2 = input_if.read(self.args.compare_db)
+        # Load second database, unless the caller holds it open already
+        db2 = self.compare_db
+        if db2 is None:
+            rgy = FormatRgy.inst()
+            if self.args.input_format is None:
+                self.args.input_format = rgy.getDefaultDatabase()
+            
+            input_desc = rgy.getDatabaseDesc(self.args.input_format)
+            input_if = input_desc.fmt_if()
+            db2 = input_if.read(self.args.compare_db)
         
         try:
-            # Build reports for both databases
-            report1 = CoverageReportBuilder.build(self.db)
-            report2 = CoverageReportBuilder.build(db2)
+            # Build indexed reports for both databases
+            index1 = self.index
+            index2 = CoverageIndex(CoverageReportBuilder.build(db2))
             
             result = {
                 "baseline": self.args.db,
                 "comparison": self.args.compare_db,
-                "summary": self._compare_summary(report1, report2),
-                "covergroup_changes": self._compare_covergroups(report1, report2),
-                "bin_changes": self._get_bin_changes(report1, report2),
+                "summary": self._compare_summary(index1, index2),
+                "covergroup_changes": self._compare_covergroups(index1, index2),
+                "bin_changes": self._get_bin_changes(index1, index2),
             }
             
         finally:
-            db2.close()
+            if self.compare_db is None:
+                db2.close()
         
         return result
     
-    def _compare_summary(self, report1, report2) -> Dict[str, Any]:
+    def _compare_summary(self, index1, index2) -> Dict[str, Any]:
         """Compare overall summary statistics."""
-        cov1 = report1.coverage
-        cov2 = report2.coverage
+        cov1 = index1.coverage
+        cov2 = index2.coverage
         delta = cov2 - cov1
         
         return {
@@ -69,13 +80,13 @@ class ShowCompare(ShowBase):
             "regression": delta < 0,
         }
     
-    def _compare_covergroups(self, report1, report2) -> List[Dict[str, Any]]:
+    def _compare_covergroups(self, index1, index2) -> List[Dict[str, Any]]:
         """Compare covergroups between databases."""
         changes = []
         
-        # Create maps of covergroups by name
-        cg1_map = {cg.name: cg for cg in report1.covergroups} if report1.covergroups else {}
-        cg2_map = {cg.name: cg for cg in report2.covergroups} if report2.covergroups else {}
+        # Covergroups by name
+        cg1_map = index1.covergroup_m
+        cg2_map = index2.covergroup_m
         
         # Find all covergroup names
         all_names = set(cg1_map.keys()) | set(cg2_map.keys())
@@ -115,11 +126,11 @@ class ShowCompare(ShowBase):
         
         return changes
     
-    def _get_bin_changes(self, report1, report2) -> Dict[str, Any]:
+    def _get_bin_changes(self, index1, index2) -> Dict[str, Any]:
         """Analyze bin-level changes."""
-        # Collect all bins from both databases
-        bins1 = self._collect_bins(report1)
-        bins2 = self._collect_bins(report2)
+        # All bins from both databases, keyed by 'cg.cp.bin'
+        bins1 = index1.bin_counts
+        bins2 = index2.bin_counts
         
         newly_covered = []
         lost_coverage = []
@@ -142,20 +153,3 @@ class ShowCompare(ShowBase):
             "new_bins": new_bins,
             "new_bins_count": len(new_bins),
         }
-    
-    def _collect_bins(self, report) -> Dict[str, int]:
-        """Collect all bins from a report into a dictionary."""
-        bins = {}
-        
-        if not report.covergroups:
-            return bins
-        
-        for cg in report.covergroups:
-            if hasattr(cg, 'coverpoints') and cg.coverpoints:
-                for cp in cg.coverpoints:
-                    if hasattr(cp, 'bins') and cp.bins:
-                        for bin in cp.bins:
-                            key = f"{cg.name}.{cp.name}.{bin.name}"
-                            bins[key] = bin.count
-        
-        return bins
@@ -25,10 +25,8 @@ class ShowCovergroups(ShowBase):
         Returns:
             Dictionary containing covergroup details
         """
-        from ucis.report.coverage_report_builder import CoverageReportBuilder
-        
         # Build coverage report
-        report = CoverageReportBuilder.build(self.db)
+        report = self.report
         
         # Collect covergroup data
         result = {
@@ -0,0 +1,47 @@
+"""
+Show Diff Command
+
+Compares coveritem hit counts of a baseline database against any number
+of other databases.
+"""
+from typing import Any, Dict
+from ucis.cmd.show_base import ShowBase
+
+
+class ShowDiff(ShowBase):
+    """
+    Diff a baseline database against one or more others.
+
+    Shows, per compared database:
+    - Newly hit and newly lost coveritems
+    - Coveritems added or removed
+    - Coverage and hit-count deltas
+
+    and, across all of them, the coveritems the baseline misses but some
+    other database hits. See :class:`~ucis.report.coverage_diff.CoverageDiff`.
+    """
+
+    def cache_key(self):
+        """Not cached: the result also depends on the other databases."""
+        return None
+
+    def execute(self):
+        """
+        Run the diff. The databases are read by the diff engine itself
+        (NCDB files without building a database object), so none is
+        loaded up front.
+        """
+        self._write_output(self.get_data())
+
+    def get_data(self) -> Dict[str, Any]:
+        """
+        Diff ``args.db`` against each of ``args.compare_dbs``.
+
+        Returns:
+            Dictionary containing the diff results
+        """
+        from ucis.report.coverage_diff import CoverageDiff
+
+        diff = CoverageDiff.load([self.args.db] + list(self.args.compare_dbs),
+                                 input_format=self.args.input_format)
+        return diff.to_dict(limit=getattr(self.args, 'limit', None))
@@ -25,16 +25,14 @@ class ShowGaps(ShowBase):
         Returns:
             Dictionary containing gap information
         """
-        from ucis.report.coverage_report_builder import CoverageReportBuilder
-        
-        # Build coverage report
-        report = CoverageReportBuilder.build(self.db)
+        # Indexed coverage report (bin counts precomputed per coverpoint)
+        index = self.index
         
         # Collect gaps
         gaps = {
             "database": self.args.db,
-            "summary": self._get_gap_summary(report),
-            "uncovered_bins": self._get_uncovered_bins(report),
+            "summary": self._get_gap_summary(index),
+            "uncovered_bins": self._get_uncovered_bins(index),
         }
         
         # Add filtering if requested
@@ -46,66 +44,35 @@ class ShowGaps(ShowBase):
         
         return gaps
     
-    def _get_gap_summary(self, report) -> Dict[str, Any]:
+    def _get_gap_summary(self, index) -> Dict[str, Any]:
         """Calculate gap summary statistics."""
-        total_bins = 0
-        uncovered_bins = 0
-        total_coverpoints = 0
-        partial_coverpoints = 0
-        
-        if report.covergroups:
-            for cg in report.covergroups:
-                if hasattr(cg, 'coverpoints') and cg.coverpoints:
-                    for cp in cg.coverpoints:
-                        total_coverpoints += 1
-                        
-                        if hasattr(cp, 'bins') and cp.bins:
-                            cp_has_gap = False
-                            for bin in cp.bins:
-                                total_bins += 1
-                                if bin.count == 0:
-                                    uncovered_bins += 1
-                                    cp_has_gap = True
-                            
-                            if cp_has_gap and cp.coverage > 0:
-                                partial_coverpoints += 1
-        
-        coverage_pct = 0.0
-        if total_bins > 0:
-            coverage_pct = ((total_bins - uncovered_bins) / total_bins) * 100
-        
         return {
-            "overall_coverage": coverage_pct,
-            "total_bins": total_bins,
-            "covered_bins": total_bins - uncovered_bins,
-            "uncovered_bins": uncovered_bins,
-            "total_coverpoints": total_coverpoints,
-            "partial_coverpoints": partial_coverpoints,
+            "overall_coverage": index.bin_coverage,
+            "total_bins": index.total_bins,
+            "covered_bins": index.covered_bins,
+            "uncovered_bins": index.uncovered_bins,
+            "total_coverpoints": index.total_coverpoints,
+            "partial_coverpoints": index.partial_coverpoints,
         }
     
-    def _get_uncovered_bins(self, report) -> List[Dict[str, Any]]:
+    def _get_uncovered_bins(self, index) -> List[Dict[str, Any]]:
         """Get list of all uncovered bins."""
         uncovered = []
         
         threshold = getattr(self.args, 'threshold', None)
         
-        if report.covergroups:
-            for cg in report.covergroups:
-                if hasattr(cg, 'coverpoints') and cg.coverpoints:
-                    for cp in cg.coverpoints:
-                        # Check if coverpoint meets threshold criteria
-                        if threshold is not None and cp.coverage >= threshold:
-                            continue
-                        
-                        if hasattr(cp, 'bins') and cp.bins:
-                            for bin in cp.bins:
-                                if bin.count == 0:
-                                    uncovered.append({
-                                        "covergroup": cg.name,
-                                        "coverpoint": cp.name,
-                                        "bin": bin.name,
-                                        "at_least": getattr(bin, 'at_least', 1),
-                                        "count": bin.count,
-                                    })
+        for cp in index.coverpoints:
+            # Check if coverpoint meets threshold criteria
+            if threshold is not None and cp.coverage >= threshold:
+                continue
+            
+            for bin in cp.uncovered():
+                uncovered.append({
+                    "covergroup": cp.covergroup,
+                    "coverpoint": cp.name,
+                    "bin": bin.name,
+                    "at_least": getattr(bin, 'at_least', 1),
+                    "count": bin.count,
+                })
         
         return uncovered
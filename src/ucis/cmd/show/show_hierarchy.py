@@ -3,7 +3,7 @@ Show Hierarchy Command
 
 Displays the hierarchical structure of the UCIS database.
 """
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from ucis.cmd.show_base import ShowBase
 
 
@@ -85,6 +85,68 @@ class ShowHierarchy(ShowBase):
         
         return scope_data
     
+    def walk(self, resume: Optional[List[int]] = None
+             ) -> Iterator[Tuple[Dict[str, Any], List[int]]]:
+        """
+        Pre-order walk of the hierarchy as flat rows.
+        
+        Yields ``(row, position)`` pairs, where *position* is the list of
+        child indices from the top-level instances down to the row's scope.
+        Passing a previously yielded position as *resume* restarts the walk
+        at that scope, listing only the scopes along its path rather than
+        re-walking everything before it.
+        """
+        from ucis.scope_type_t import ScopeTypeT
+        
+        max_depth = getattr(self.args, 'max_depth', None)
+        if max_depth is not None and max_depth <= 0:
+            return
+        
+        def children_of(scope):
+            try:
+                return list(scope.scopes(ScopeTypeT.ALL))
+            except Exception:
+                return []
+        
+        # Each frame: [children, next index, path names of the parent]
+        frames = [[list(self.db.scopes(ScopeTypeT.INSTANCE)), 0, []]]
+        if resume:
+            frames[0][1] = resume[0]
+            for idx in resume[1:]:
+                children, i, names = frames[-1]
+                if i >= len(children):
+                    break
+                # Ancestors of the resume point were already emitted
+                parent = children[i]
+                frames[-1][1] = i + 1
+                frames.append([children_of(parent), idx,
+                               names + [parent.getScopeName()]])
+        
+        while frames:
+            children, i, names = frames[-1]
+            if i >= len(children):
+                frames.pop()
+                continue
+            position = [f[1] for f in frames[:-1]]
+            position = [p - 1 for p in position] + [i]
+            frames[-1][1] = i + 1
+            
+            scope = children[i]
+            depth = len(frames) - 1
+            descend = max_depth is None or depth + 1 < max_depth
+            sub = children_of(scope) if descend else []
+            path = names + [scope.getScopeName()]
+            row = {
+                "name": path[-1],
+                "path": "/".join(path),
+                "type": self._get_scope_type_name(scope.getScopeType()),
+                "depth": depth,
+                "child_count": len(sub),
+            }
+            yield row, position
+            if sub:
+                frames.append([sub, 0, path])
+    
     def _get_scope_type_name(self, scope_type) -> str:
         """Convert scope type to human-readable name."""
         from ucis.scope_type_t import ScopeTypeT
@@ -24,10 +24,8 @@ class ShowMetrics(ShowBase):
         Returns:
             Dictionary containing metrics
         """
-        from ucis.report.coverage_report_builder import CoverageReportBuilder
-        
         # Build coverage report
-        report = CoverageReportBuilder.build(self.db)
+        report = self.report
         
         result = {
             "database": self.args.db,
@@ -26,10 +26,8 @@ class ShowSummary(ShowBase):
         Returns:
             Dictionary containing summary information
         """
-        from ucis.report.coverage_report_builder import CoverageReportBuilder
-        
         # Build coverage report
-        report = CoverageReportBuilder.build(self.db)
+        report = self.report
         
         # Collect overall statistics
         summary = {
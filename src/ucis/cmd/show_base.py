@@ -25,14 +25,69 @@ class ShowBase(ABC):
             args: Parsed command-line arguments
         """
         self.args = args
-        self.db = None
+        self._db = None
+        self._db_loader = None
+        self._metrics = None
+        self._store = None
         
-    def execute(self):
+    @property
+    def db(self):
         """
-        Execute the show command.
+        The database. When run through :meth:`execute` it is only read on
+        first access, so a command answered from the metrics cache never
+        reads it.
+        """
+        if self._db is None and self._db_loader is not None:
+            loader, self._db_loader = self._db_loader, None
+            self._db = loader()
+        return self._db
+    
+    @db.setter
+    def db(self, db):
+        self._db = db
+        self._db_loader = None
+    
+    @property
+    def metrics(self):
+        """
+        :class:`~ucis.report.coverage_metrics.CoverageMetrics` for ``self.db``.
+
+        Created on first access. Assign an existing instance to share its
+        cached results between commands run on the same database.
+        """
+        if self._metrics is None:
+            from ucis.report.coverage_metrics import CoverageMetrics
+            self._metrics = CoverageMetrics(
+                self._db, cache=self._store, loader=lambda: self.db)
+        return self._metrics
+    
+    @metrics.setter
+    def metrics(self, metrics):
+        self._metrics = metrics
+    
+    @property
+    def report(self):
+        """``CoverageReport`` for ``self.db``, built once via :attr:`metrics`."""
+        return self.metrics.report
+    
+    @property
+    def index(self):
+        """``CoverageIndex`` over :attr:`report`, built once via :attr:`metrics`."""
+        return self.metrics.index
+    
+    def load_db(self):
+        """
+        Read the database named by ``args.db`` into ``self.db``.
         
-        This is the main entry point called by the command dispatcher.
-        Handles database loading, execution, and output formatting.
+        Detects the input format when ``args.input_format`` is not set.
+        """
+        self.db = self.read_db()
+    
+    def read_db(self):
+        """
+        Read and return the database named by ``args.db``.
+        
+        Detects the input format when ``args.input_format`` is not set.
         """
         from ucis.rgy.format_rgy import FormatRgy
         
@@ -54,18 +109,90 @@ class ShowBase(ABC):
         # Load database
         input_desc = rgy.getDatabaseDesc(self.args.input_format)
         input_if = input_desc.fmt_if()
-        self.db = input_if.read(self.args.db)
+        return input_if.read(self.args.db)
+        
+    def open_cache(self):
+        """
+        Open the persistent metrics cache for ``args.db`` into
+        ``self._store``, unless ``--no-cache`` was given or the database
+        is not a regular file.
+        
+        Returns:
+            The MetricsCache, or None when caching is off
+        """
+        from ucis.report.metrics_cache import MetricsCache
+        
+        self._store = None
+        if not getattr(self.args, 'no_cache', False):
+            cache = MetricsCache(self.args.db)
+            if cache.enabled:
+                self._store = cache
+        return self._store
+    
+    #: Arguments that do not affect get_data() and so are left out of cache keys
+    _UNKEYED_ARGS = ('db', 'input_format', 'output_format', 'out',
+                     'no_cache', 'plusargs', 'show_cmd')
+    
+    def cache_key(self) -> Optional[str]:
+        """
+        Key for this command's get_data() result in the metrics cache.
+        
+        Derived from the command and its options. Subclasses return None
+        when the result depends on more than the database (so must not be
+        cached), or when their output needs the database itself.
+        """
+        options = {k: v for k, v in vars(self.args).items()
+                   if k not in self._UNKEYED_ARGS
+                   and (v is None or isinstance(v, (str, int, float, bool)))}
+        return "show/%s/%s" % (type(self).__name__,
+                               json.dumps(options, sort_keys=True))
+    
+    def cached_data(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Result stored under *key*, or None on a miss or with no cache."""
+        if key is None or self._store is None:
+            return None
+        data = self._store.get(key)
+        if data is not None and "database" in data:
+            # The key leaves out the path, which may be spelled differently
+            data = dict(data, database=self.args.db)
+        return data
+    
+    def store_data(self, key: Optional[str], data: Dict[str, Any]):
+        """Remember *data* under *key* in the metrics cache, if enabled."""
+        if key is not None and self._store is not None:
+            # Store exactly what JSON output would contain
+            self._store.put(key, json.loads(json.dumps(data)))
+    
+    def execute(self):
+        """
+        Execute the show command.
+        
+        This is the main entry point called by the command dispatcher.
+        Handles database loading, execution, and output formatting. The
+        database is read on first use; a result found in the metrics cache
+        (or computed only from cached metrics) does not read it at all.
+        """
+        if self.open_cache() is None:
+            self.load_db()
+        else:
+            self._db_loader = self.read_db
         
         try:
-            # Get data
-            data = self.get_data()
+            key = self.cache_key()
+            data = self.cached_data(key)
+            if data is None:
+                # Get data
+                data = self.get_data()
+                self.store_data(key, data)
             
             # Output
             self._write_output(data)
             
         finally:
-            if self.db:
-                self.db.close()
+            if self._store is not None:
+                self._store.save()
+            if self._db is not None:
+                self._db.close()
     
     @abstractmethod
     def get_data(self) -> Dict[str, Any]:
@@ -31,7 +31,7 @@ from ucis import (
     UCIS_CVGBIN, UCIS_IGNOREBIN
 )
 from ucis.ucis import UCIS
-from ucis.sqlite.sqlite_ucis import SqliteUCIS
+from ucis.mem.mem_ucis import MemUCIS
 from ucis.source_info import SourceInfo
 from ucis.source_t import SourceT
 from ucis.scope_type_t import ScopeTypeT
@@ -53,13 +53,13 @@ class CocotbXmlReader:
         
         Args:
             filename: Path to cocotb-coverage XML file
-            db: Target UCIS database (creates new SQLite in-memory if None)
+            db: Target UCIS database (creates a new MemUCIS if None)
             
         Returns:
             UCIS database with imported coverage
         """
         if db is None:
-            db = SqliteUCIS(":memory:")
+            db = MemUCIS()
         
         self.db = db
         self.scope_map.clear()
@@ -139,9 +139,16 @@ class CocotbXmlReader:
                 elem, parent_scope, tag_name, abs_name, weight, at_least
             )
         
-        # Process child elements recursively
+        # Process child elements recursively. The bins of a coverpoint or
+        # cross are collected and created in one batch.
+        bins = []
         for child in elem:
-            self._process_coverage_element(child, current_scope, is_root=False)
+            if not is_root and self._is_bin_element(child):
+                bins.append(child)
+            else:
+                self._process_coverage_element(child, current_scope, is_root=False)
+        if bins:
+            self._create_bins(bins, current_scope)
     
     def _is_bin_element(self, elem) -> bool:
         """Check if element is a bin element."""
@@ -271,6 +278,27 @@ class CocotbXmlReader:
             flags=FlagsT(0)
         )
     
+    def _create_bins(self, elems, parent_scope):
+        """
+        Create the bins of a coverpoint/cross in batches.
+        
+        Args:
+            elems: Bin XML elements, in document order
+            parent_scope: Parent coverpoint or cross scope
+        """
+        # One createBins() call per run of bins sharing an at_least value
+        runs = []
+        for elem in elems:
+            at_least = int(elem.get('at_least', '1'))
+            if not runs or runs[-1][0] != at_least:
+                runs.append((at_least, []))
+            runs[-1][1].append((elem.get('bin', 'unnamed_bin'),
+                                int(elem.get('hits', '0'))))
+        
+        for at_least, bins in runs:
+            logger.debug(f"Creating {len(bins)} bins (at_least={at_least})")
+            parent_scope.createBins(bins, None, at_least)
+    
     def _create_bin(self, elem, parent_scope, at_least):
         """
         Create a bin in the parent coverpoint/cross.
@@ -317,7 +345,7 @@ def read_cocotb_xml(filename: str, db: Optional[UCIS] = None) -> UCIS:
     
     Args:
         filename: Path to XML file
-        db: Target database (creates new if None)
+        db: Target database (creates a new MemUCIS if None)
         
     Returns:
         UCIS database with imported coverage
@@ -37,13 +37,16 @@ import logging
 
 from ucis import UCIS_INSTANCE, UCIS_COVERGROUP, UCIS_COVERPOINT, UCIS_CROSS
 from ucis.ucis import UCIS
-from ucis.sqlite.sqlite_ucis import SqliteUCIS
+from ucis.mem.mem_ucis import MemUCIS
 from ucis.source_t import SourceT
 from ucis.scope_type_t import ScopeTypeT
 from ucis.flags_t import FlagsT
 
 logger = logging.getLogger(__name__)
 
+# LibYAML's C parser when PyYAML was built with it
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class CocotbYamlReader:
     """Reader for cocotb-coverage YAML format."""
@@ -58,13 +61,13 @@ class CocotbYamlReader:
         
         Args:
             filename: Path to cocotb-coverage YAML file
-            db: Target UCIS database (creates new SQLite in-memory if None)
+            db: Target UCIS database (creates a new MemUCIS if None)
             
         Returns:
             UCIS database with imported coverage
         """
         if db is None:
-            db = SqliteUCIS(":memory:")
+            db = MemUCIS()
         
         self.db = db
         self.scope_map.clear()
@@ -72,7 +75,7 @@ class CocotbYamlReader:
         # Parse YAML file
         try:
             with open(filename, 'r') as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=_SafeLoader)
         except Exception as e:
             logger.error(f"Failed to parse YAML file {filename}: {e}")
             raise
@@ -217,8 +220,10 @@ class CocotbYamlReader:
             logger.debug(f"Created coverpoint: {path}")
         
         # Create bins
-        for bin_name, hits in bins_hits.items():
-            self._create_bin_from_yaml(coverpoint, str(bin_name), hits, at_least)
+        self._create_bins_from_yaml(
+            coverpoint,
+            [(str(bin_name), hits) for bin_name, hits in bins_hits.items()],
+            at_least)
         
         self.scope_map[path] = coverpoint
     
@@ -234,27 +239,20 @@ class CocotbYamlReader:
                 return True
         return False
     
-    def _create_bin_from_yaml(self, parent_scope, bin_name: str, hits: int, at_least: int):
+    def _create_bins_from_yaml(self, parent_scope, bins: list, at_least: int):
         """
-        Create a bin in the coverpoint/cross.
+        Create the bins of a coverpoint/cross in one batch.
         
         Args:
             parent_scope: Parent coverpoint or cross
-            bin_name: Bin name
-            hits: Hit count
+            bins: (bin name, hits) pairs
             at_least: Minimum hits required
         """
         try:
-            parent_scope.createBin(
-                name=bin_name,
-                srcinfo=None,
-                at_least=at_least,
-                count=hits,
-                rhs=None
-            )
-            logger.debug(f"Created bin '{bin_name}' with {hits} hits")
+            parent_scope.createBins(bins, None, at_least)
+            logger.debug(f"Created {len(bins)} bins")
         except (AttributeError, TypeError) as e:
-            logger.warning(f"Failed to create bin '{bin_name}': {e}")
+            logger.warning(f"Failed to create bins: {e}")
     
     def _ensure_parent_scope(self, path: str):
         """
@@ -300,7 +298,7 @@ def read_cocotb_yaml(filename: str, db: Optional[UCIS] = None) -> UCIS:
     
     Args:
         filename: Path to YAML file
-        db: Target database (creates new if None)
+        db: Target database (creates a new MemUCIS if None)
         
     Returns:
         UCIS database with imported coverage
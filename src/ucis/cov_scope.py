@@ -62,6 +62,8 @@ class CovScope(Scope):
         InstanceScope: Design instance scope
     """
     
+    __slots__ = ()
+    
     def __init__(self):
         
         pass
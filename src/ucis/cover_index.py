@@ -44,6 +44,8 @@ class CoverIndex(object):
         UCIS LRM Section 8.11.5 "ucis_IncrementCover"
     """
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         
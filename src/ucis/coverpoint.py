@@ -75,6 +75,8 @@ class Coverpoint(CvgScope):
         UCIS LRM Section 6.4.3.3 "UCIS_COVERPOINT"
     """
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.setComment("")
@@ -177,5 +179,33 @@ class Coverpoint(CvgScope):
             coverdata,
             srcinfo)
         
-        return index        
+        return index
+
+    def createBins(
+            self,
+            bins,
+            srcinfo : SourceInfo = None,
+            at_least : int = 1,
+            kind = CoverTypeT.CVGBIN):
+        """Create several bins of the same kind in one call.
+
+        Equivalent to calling :meth:`createBin` for each ``(name, count)``
+        pair in order, but lets a backend add the whole batch at once —
+        importers that know all the bins of a coverpoint up front should
+        prefer it.
+
+        Args:
+            bins: Iterable of ``(name, count)`` pairs.
+            srcinfo: Source location shared by the bins.
+            at_least: Threshold count for each bin.
+            kind: Bin type shared by the bins.
+
+        Example:
+            >>> cp.createBins([("low", 3), ("high", 0)], at_least=1)
+
+        See Also:
+            createBin(): Create a single bin
+        """
+        for name, count in bins:
+            self.createBin(name, srcinfo, at_least, count, None, kind)        
         
\ No newline at end of file
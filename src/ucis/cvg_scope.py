@@ -67,6 +67,8 @@ class CvgScope(FuncCovScope):
         UCIS LRM Section 6.4.3 "Functional Coverage"
     """
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.setAtLeast(1)
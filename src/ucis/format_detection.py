@@ -25,7 +25,9 @@ including cocotb-coverage (XML/YAML) and AVL (JSON).
 import json
 import logging
 from pathlib import Path
-from typing import Optional, Callable
+from concurrent.futures import ProcessPoolExecutor
+import os
+from typing import Callable, List, Optional, Sequence
 from enum import Enum
 
 try:
@@ -221,7 +223,13 @@ def get_reader(filename: str) -> Optional[Callable]:
         Reader function or None if format unknown
     """
     fmt = detect_format(filename)
-    
+    reader = _reader_for(fmt)
+    if reader is None:
+        logger.error(f"Unknown format for: {filename}")
+    return reader
+
+
+def _reader_for(fmt: CoverageFormat) -> Optional[Callable]:
     if fmt == CoverageFormat.COCOTB_XML:
         from ucis.cocotb.cocotb_xml_reader import read_cocotb_xml
         return read_cocotb_xml
@@ -232,7 +240,6 @@ def get_reader(filename: str) -> Optional[Callable]:
         from ucis.avl.avl_json_reader import read_avl_json
         return read_avl_json
     else:
-        logger.error(f"Unknown format for: {filename}")
         return None
 
 
@@ -255,3 +262,72 @@ def read_coverage_file(filename: str, db=None):
         raise ValueError(f"Could not detect format for: {filename}")
     
     return reader(filename, db)
+
+
+def read_coverage_files(filenames: Sequence[str],
+                        fmt: Optional[CoverageFormat] = None,
+                        workers: Optional[int] = None,
+                        db=None):
+    """
+    Read many coverage files and merge them into one database.
+    
+    Files are split into chunks that worker processes read and merge on
+    their own; the parent then adds up the per-chunk databases. Scopes are
+    matched by name and bin counts summed (see
+    :class:`ucis.merge.scope_accumulator.ScopeAccumulator`).
+    
+    Args:
+        filenames: Paths of the coverage files
+        fmt: Format of all the files; detected per file if None, which
+             parses each file one extra time
+        workers: Worker processes; defaults to the CPU count. 1 reads all
+                 files in the calling process
+        db: Target UCIS database (creates a new MemUCIS if None)
+        
+    Returns:
+        UCIS database with the merged coverage
+        
+    Raises:
+        ValueError: If the format of a file cannot be detected
+    """
+    from ucis.merge.scope_accumulator import ScopeAccumulator
+    
+    filenames = list(filenames)
+    if fmt is not None and _reader_for(fmt) is None:
+        raise ValueError(f"Unsupported coverage format: {fmt}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    # A few chunks per worker evens out uneven file sizes
+    n_chunks = min(len(filenames), max(1, workers) * 4)
+    
+    acc = ScopeAccumulator(db)
+    if workers <= 1 or n_chunks <= 1:
+        for filename in filenames:
+            acc.add(_read_one(filename, fmt))
+        return acc.db
+    
+    # Contiguous chunks merged in order give the same scope and bin order
+    # as reading the files one after another
+    size = -(-len(filenames) // n_chunks)
+    chunks = [filenames[i:i + size] for i in range(0, len(filenames), size)]
+    n_chunks = len(chunks)
+    with ProcessPoolExecutor(max_workers=min(workers, n_chunks)) as pool:
+        for chunk_db in pool.map(_read_chunk, chunks, [fmt] * n_chunks):
+            acc.add(chunk_db)
+    return acc.db
+
+
+def _read_one(filename: str, fmt: Optional[CoverageFormat]):
+    if fmt is None:
+        return read_coverage_file(filename)
+    return _reader_for(fmt)(filename)
+
+
+def _read_chunk(filenames: List[str], fmt: Optional[CoverageFormat]):
+    """Worker-process side of read_coverage_files()."""
+    from ucis.merge.scope_accumulator import ScopeAccumulator
+    
+    acc = ScopeAccumulator()
+    for filename in filenames:
+        acc.add(_read_one(filename, fmt))
+    return acc.db
@@ -17,14 +17,20 @@ class DbFormatIfLcov(FormatIfDb):
     def write(self, db, file_or_filename, ctx=None):
         from ucis.formatters.format_lcov import LcovFormatter
         formatter = LcovFormatter()
-        with open(file_or_filename, "w") as fp:
-            formatter.format(db, fp)
+        if not isinstance(file_or_filename, str):
+            formatter.format(db, file_or_filename)
+        elif file_or_filename.endswith(".gz"):
+            import gzip
+            with gzip.open(file_or_filename, "wt", encoding="utf-8") as fp:
+                formatter.format(db, fp)
+        else:
+            with open(file_or_filename, "w") as fp:
+                formatter.format(db, fp)
         if ctx:
             # LCOV cannot fully represent functional coverage; warn if the DB
             # contains any covergroups
             from ucis.report.coverage_report_builder import CoverageReportBuilder
-            rpt = CoverageReportBuilder.build(db)
-            if rpt and rpt.covergroups:
+            if next(CoverageReportBuilder.iter_covergroups(db), None) is not None:
                 ctx.warn(
                     "LCOV format maps functional coverage to pseudo-files; "
                     "data may not be tool-compatible"
@@ -37,10 +37,10 @@ Clover XML Structure:
   </coverage>
 """
 
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
 import time
 
+from ucis.formatters.stream_writer import XmlStreamWriter, text_output
+
 
 class CloverFormatter:
     """Format UCIS coverage data as Clover XML."""
@@ -49,198 +49,148 @@ class CloverFormatter:
         """
         Convert UCIS coverage data to Clover XML format.
         
+        XML is written incrementally, one file per covergroup, as the
+        database is traversed. Clover places each element's metrics after
+        its children, so a single pass suffices.
+        
         Args:
             db: UCIS database object
-            fp: File pointer to write XML to
+            fp: File pointer to write XML to (text, or binary such as a
+                ``gzip.GzipFile``)
         """
         from ucis.report.coverage_report_builder import CoverageReportBuilder
         
-        # Build coverage report
-        coverage_report = CoverageReportBuilder.build(db)
-        
-        # Create root coverage element
-        root = ET.Element('coverage',
-                          generated=str(int(time.time())),
-                          clover='4.4.1')
-        
-        # Create project element
-        project = ET.SubElement(root, 'project',
-                                timestamp=str(int(time.time())),
-                                name='ucis_coverage')
-        
-        # Initialize project-level metrics
-        proj_statements = 0
-        proj_covered_statements = 0
-        proj_conditionals = 0
-        proj_covered_conditionals = 0
-        proj_methods = 0
-        proj_covered_methods = 0
-        proj_complexity = 0
-        proj_loc = 0
-        
-        # Process coverage data
-        if coverage_report.covergroups:
-            # Create package for functional coverage
-            package = ET.SubElement(project, 'package', name='functional')
+        with text_output(fp) as out:
+            w = XmlStreamWriter(out)
             
-            pkg_statements = 0
-            pkg_covered_statements = 0
-            pkg_conditionals = 0
-            pkg_covered_conditionals = 0
-            pkg_methods = 0
-            pkg_covered_methods = 0
+            # Create root coverage element
+            w.start('coverage', {
+                'generated': str(int(time.time())),
+                'clover': '4.4.1'})
             
-            for covergroup in coverage_report.covergroups:
-                cg_name = covergroup.name
-                
-                # Each covergroup becomes a file
-                file_elem = ET.SubElement(package, 'file',
-                                          name=f'{cg_name}.sv',
-                                          path=f'functional/{cg_name}.sv')
-                
-                file_statements = 0
-                file_covered_statements = 0
-                file_conditionals = 0
-                file_covered_conditionals = 0
-                file_methods = 0
-                file_covered_methods = 0
-                
-                # Each covergroup is also a class within the file
-                class_elem = ET.SubElement(file_elem, 'class', name=cg_name)
-                
-                class_statements = 0
-                class_covered_statements = 0
-                class_conditionals = 0
-                class_covered_conditionals = 0
-                class_methods = 0
-                class_covered_methods = 0
-                
-                line_num = 1
-                
-                # Process coverpoints
-                if covergroup.coverpoints:
-                    for coverpoint in covergroup.coverpoints:
-                        class_methods += 1
-                        if coverpoint.coverage > 0:
-                            class_covered_methods += 1
-                        
-                        # Each bin becomes a line
-                        for bin_item in coverpoint.bins:
-                            count = bin_item.count
-                            
-                            # Treat bin as statement
-                            class_statements += 1
-                            if count > 0:
-                                class_covered_statements += 1
-                            
-                            # Add line element (statement type)
-                            line = ET.SubElement(class_elem, 'line',
-                                                num=str(line_num),
-                                                count=str(count),
-                                                type='stmt',
-                                                truecount='0',
-                                                falsecount='0')
-                            line_num += 1
-                            
-                            # Also count as conditional if bin represents a condition
-                            class_conditionals += 1
-                            if count > 0:
-                                class_covered_conditionals += 1
-                
-                # Add class metrics
-                class_elements = class_statements + class_conditionals + class_methods
-                class_covered_elements = class_covered_statements + class_covered_conditionals + class_covered_methods
-                
-                self._add_metrics(class_elem,
-                                 statements=class_statements,
-                                 covered_statements=class_covered_statements,
-                                 conditionals=class_conditionals,
-                                 covered_conditionals=class_covered_conditionals,
-                                 methods=class_methods,
-                                 covered_methods=class_covered_methods,
-                                 elements=class_elements,
-                                 covered_elements=class_covered_elements)
-                
-                # Update file metrics (same as class in this case)
-                file_statements = class_statements
-                file_covered_statements = class_covered_statements
-                file_conditionals = class_conditionals
-                file_covered_conditionals = class_covered_conditionals
-                file_methods = class_methods
-                file_covered_methods = class_covered_methods
-                
-                # Add file metrics
-                file_elements = file_statements + file_conditionals + file_methods
-                file_covered_elements = file_covered_statements + file_covered_conditionals + file_covered_methods
-                
-                self._add_metrics(file_elem,
-                                 statements=file_statements,
-                                 covered_statements=file_covered_statements,
-                                 conditionals=file_conditionals,
-                                 covered_conditionals=file_covered_conditionals,
-                                 methods=file_methods,
-                                 covered_methods=file_covered_methods,
-                                 elements=file_elements,
-                                 covered_elements=file_covered_elements)
+            # Create project element
+            w.start('project', {
+                'timestamp': str(int(time.time())),
+                'name': 'ucis_coverage'})
+            
+            # Package-level metrics: [statements, covered_statements,
+            # conditionals, covered_conditionals, methods, covered_methods]
+            pkg = None
+            proj_complexity = 0
+            proj_loc = 0
+            
+            for covergroup in CoverageReportBuilder.iter_covergroups(db):
+                if pkg is None:
+                    # Create package for functional coverage
+                    w.start('package', {'name': 'functional'})
+                    pkg = [0] * 6
                 
-                # Update package totals
-                pkg_statements += file_statements
-                pkg_covered_statements += file_covered_statements
-                pkg_conditionals += file_conditionals
-                pkg_covered_conditionals += file_covered_conditionals
-                pkg_methods += file_methods
-                pkg_covered_methods += file_covered_methods
+                file_metrics, line_num = self._write_file(w, covergroup)
+                for i, v in enumerate(file_metrics):
+                    pkg[i] += v
+                proj_loc = line_num - 1
+                w.flush()
             
-            # Add package metrics
-            pkg_elements = pkg_statements + pkg_conditionals + pkg_methods
-            pkg_covered_elements = pkg_covered_statements + pkg_covered_conditionals + pkg_covered_methods
+            proj = pkg if pkg is not None else [0] * 6
             
-            self._add_metrics(package,
-                             statements=pkg_statements,
-                             covered_statements=pkg_covered_statements,
-                             conditionals=pkg_conditionals,
-                             covered_conditionals=pkg_covered_conditionals,
-                             methods=pkg_methods,
-                             covered_methods=pkg_covered_methods,
-                             elements=pkg_elements,
-                             covered_elements=pkg_covered_elements)
+            if pkg is not None:
+                # Add package metrics
+                self._add_metrics(w, *pkg,
+                                  elements=pkg[0] + pkg[2] + pkg[4],
+                                  covered_elements=pkg[1] + pkg[3] + pkg[5])
+                w.end()
             
-            # Update project totals
-            proj_statements = pkg_statements
-            proj_covered_statements = pkg_covered_statements
-            proj_conditionals = pkg_conditionals
-            proj_covered_conditionals = pkg_covered_conditionals
-            proj_methods = pkg_methods
-            proj_covered_methods = pkg_covered_methods
-            proj_loc = line_num - 1
+            # Add project metrics
+            self._add_metrics(w, *proj,
+                              elements=proj[0] + proj[2] + proj[4],
+                              covered_elements=proj[1] + proj[3] + proj[5],
+                              complexity=proj_complexity,
+                              loc=proj_loc,
+                              ncloc=proj_loc)
+            w.close()
+    
+    def _write_file(self, w: XmlStreamWriter, covergroup):
+        """
+        Write the file element for a covergroup.
+        
+        Returns:
+            Tuple of the file's metrics list and the next line number
+        """
+        cg_name = covergroup.name
+        
+        # Each covergroup becomes a file
+        w.start('file', {
+            'name': f'{cg_name}.sv',
+            'path': f'functional/{cg_name}.sv'})
         
-        # Add project metrics
-        proj_elements = proj_statements + proj_conditionals + proj_methods
-        proj_covered_elements = proj_covered_statements + proj_covered_conditionals + proj_covered_methods
+        # Each covergroup is also a class within the file
+        w.start('class', {'name': cg_name})
         
-        self._add_metrics(project,
-                         statements=proj_statements,
-                         covered_statements=proj_covered_statements,
-                         conditionals=proj_conditionals,
-                         covered_conditionals=proj_covered_conditionals,
-                         methods=proj_methods,
-                         covered_methods=proj_covered_methods,
-                         elements=proj_elements,
-                         covered_elements=proj_covered_elements,
-                         complexity=proj_complexity,
-                         loc=proj_loc,
-                         ncloc=proj_loc)
+        class_statements = 0
+        class_covered_statements = 0
+        class_conditionals = 0
+        class_covered_conditionals = 0
+        class_methods = 0
+        class_covered_methods = 0
         
-        # Convert to pretty-printed XML string and write to file
-        xml_str = self._prettify(root)
-        fp.write(xml_str)
+        line_num = 1
+        
+        # Process coverpoints
+        if covergroup.coverpoints:
+            for coverpoint in covergroup.coverpoints:
+                class_methods += 1
+                if coverpoint.coverage > 0:
+                    class_covered_methods += 1
+                
+                # Each bin becomes a line
+                for bin_item in coverpoint.bins:
+                    count = bin_item.count
+                    
+                    # Treat bin as statement
+                    class_statements += 1
+                    if count > 0:
+                        class_covered_statements += 1
+                    
+                    # Add line element (statement type)
+                    w.empty('line', {
+                        'num': str(line_num),
+                        'count': str(count),
+                        'type': 'stmt',
+                        'truecount': '0',
+                        'falsecount': '0'})
+                    line_num += 1
+                    
+                    # Also count as conditional if bin represents a condition
+                    class_conditionals += 1
+                    if count > 0:
+                        class_covered_conditionals += 1
+        
+        metrics = [class_statements, class_covered_statements,
+                   class_conditionals, class_covered_conditionals,
+                   class_methods, class_covered_methods]
+        elements = class_statements + class_conditionals + class_methods
+        covered_elements = class_covered_statements + class_covered_conditionals + class_covered_methods
+        
+        # Add class metrics
+        self._add_metrics(w, *metrics,
+                          elements=elements,
+                          covered_elements=covered_elements)
+        w.end()
+        
+        # File metrics are the same as the class in this case
+        self._add_metrics(w, *metrics,
+                          elements=elements,
+                          covered_elements=covered_elements)
+        w.end()
+        
+        return metrics, line_num
     
-    def _add_metrics(self, parent, statements=0, covered_statements=0,
+    def _add_metrics(self, w: XmlStreamWriter, statements=0, covered_statements=0,
                      conditionals=0, covered_conditionals=0,
                      methods=0, covered_methods=0,
                      elements=0, covered_elements=0,
                      complexity=None, loc=None, ncloc=None):
-        """Add a metrics element to parent."""
+        """Write a metrics element."""
         attrs = {
             'statements': str(statements),
             'coveredstatements': str(covered_statements),
@@ -260,10 +210,4 @@ class CloverFormatter:
         if ncloc is not None:
             attrs['ncloc'] = str(ncloc)
         
-        ET.SubElement(parent, 'metrics', **attrs)
-    
-    def _prettify(self, elem):
-        """Return a pretty-printed XML string."""
-        rough_string = ET.tostring(elem, encoding='unicode')
-        reparsed = minidom.parseString(rough_string)
-        return reparsed.toprettyxml(indent="  ")
+        w.empty('metrics', attrs)
@@ -4,9 +4,11 @@ Cobertura Format Exporter
 Exports UCIS coverage data to Cobertura XML format.
 Cobertura format is widely used in Java/Jenkins ecosystems.
 """
-from typing import TextIO
-from xml.etree.ElementTree import Element, SubElement, tostring
-from xml.dom import minidom
+import io
+import time
+from typing import Optional, TextIO
+
+from ucis.formatters.stream_writer import XmlStreamWriter, text_output
 
 
 class CoberturaFormatter:
@@ -39,43 +41,83 @@ class CoberturaFormatter:
     </coverage>
     """
     
-    def __init__(self):
-        pass
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Args:
+            cache_dir: Optional fragment cache directory. When set, the
+                ``<class>`` element for each covergroup is reused from the
+                previous run if its bins and counts are unchanged.
+        """
+        self.cache_dir = cache_dir
         
     def format(self, db, output: TextIO):
         """
         Format database as Cobertura XML.
         
+        XML is written incrementally, one ``<class>`` per covergroup. The
+        overall rates on ``<coverage>`` and ``<package>`` precede the
+        classes, so they are computed by a first pass that discards each
+        covergroup once it has been counted; memory use is bounded by the
+        largest covergroup rather than the whole database.
+        
         Args:
             db: UCIS database
-            output: Output file/stream
+            output: Output file/stream (text, or binary such as a
+                ``gzip.GzipFile``)
         """
         from ucis.report.coverage_report_builder import CoverageReportBuilder
         
-        # Build coverage report
-        report = CoverageReportBuilder.build(db)
+        coverage, n_cg = self._total_coverage(
+            CoverageReportBuilder.iter_covergroups(db))
         
-        # Create XML structure
-        root = self._create_coverage_element(report)
-        
-        # Add sources
-        sources = SubElement(root, 'sources')
-        SubElement(sources, 'source').text = '/functional'
-        
-        # Add packages
-        packages = SubElement(root, 'packages')
-        self._add_packages(packages, report)
-        
-        # Pretty print and write
-        xml_str = self._prettify(root)
-        output.write(xml_str)
+        with text_output(output) as out:
+            w = XmlStreamWriter(out)
+            w.start('coverage', self._coverage_attrs(coverage))
+            
+            # Add sources
+            w.start('sources')
+            w.text('source', '/functional')
+            w.end()
+            
+            # Add packages
+            if n_cg == 0:
+                w.empty('packages')
+            else:
+                w.start('packages')
+                # Create one package for all covergroups
+                w.start('package', {
+                    'name': 'functional',
+                    'line-rate': f'{coverage / 100.0:.4f}',
+                    'branch-rate': f'{coverage / 100.0:.4f}',
+                    'complexity': '0',
+                })
+                w.start('classes')
+                self._write_classes(
+                    w, CoverageReportBuilder.iter_covergroups(db))
+                w.end()
+                w.end()
+                w.end()
+            w.close()
+    
+    @staticmethod
+    def _total_coverage(covergroups):
+        """Weighted overall coverage, as computed by CoverageReportBuilder."""
+        coverage = 0.0
+        div = 0
+        n_cg = 0
+        for cg in covergroups:
+            if cg.weight > 0:
+                coverage += cg.coverage * cg.weight
+            div += cg.weight
+            n_cg += 1
+        return (coverage / div if div > 0 else 0.0), n_cg
     
-    def _create_coverage_element(self, report) -> Element:
-        """Create root coverage element."""
-        line_rate = report.coverage / 100.0
-        branch_rate = report.coverage / 100.0
+    def _coverage_attrs(self, coverage) -> dict:
+        """Attributes of the root coverage element."""
+        line_rate = coverage / 100.0
+        branch_rate = coverage / 100.0
         
-        coverage = Element('coverage', {
+        return {
             'line-rate': f'{line_rate:.4f}',
             'branch-rate': f'{branch_rate:.4f}',
             'lines-covered': '0',
@@ -84,32 +126,40 @@ class CoberturaFormatter:
             'branches-valid': '0',
             'complexity': '0',
             'version': '1.0',
-            'timestamp': str(int(__import__('time').time())),
-        })
-        
-        return coverage
+            'timestamp': str(int(time.time())),
+        }
     
-    def _add_packages(self, packages: Element, report):
-        """Add package elements."""
-        if not report.covergroups:
-            return
-        
-        # Create one package for all covergroups
-        pkg = SubElement(packages, 'package', {
-            'name': 'functional',
-            'line-rate': f'{report.coverage / 100.0:.4f}',
-            'branch-rate': f'{report.coverage / 100.0:.4f}',
-            'complexity': '0',
-        })
+    def _write_classes(self, w: XmlStreamWriter, covergroups):
+        """Write one class element per covergroup, flushing after each."""
+        cache = None
+        if self.cache_dir is not None:
+            from ucis.formatters.fragment_cache import FragmentCache, covergroup_key
+            cache = FragmentCache(self.cache_dir, 'cobertura')
         
-        classes = SubElement(pkg, 'classes')
+        depth = w.depth
+        for cg in covergroups:
+            if cache is None:
+                self._write_class(w, cg)
+            else:
+                w.raw(cache.render(
+                    cache.digest(depth, covergroup_key(cg)),
+                    lambda: self._format_class(cg, depth)))
+            w.flush()
         
-        for cg in report.covergroups:
-            self._add_class(classes, cg)
+        if cache is not None:
+            cache.close()
+    
+    def _format_class(self, cg, depth: int) -> str:
+        """Render the class element for one covergroup as a string."""
+        buf = io.StringIO()
+        w = XmlStreamWriter(buf, depth=depth, declaration=False)
+        self._write_class(w, cg)
+        w.close()
+        return buf.getvalue()
     
-    def _add_class(self, classes: Element, cg):
-        """Add a class element for a covergroup."""
-        cls = SubElement(classes, 'class', {
+    def _write_class(self, w: XmlStreamWriter, cg):
+        """Write a class element for a covergroup."""
+        w.start('class', {
             'name': cg.name,
             'filename': f'functional/{cg.name}.sv',
             'line-rate': f'{cg.coverage / 100.0:.4f}',
@@ -117,43 +167,53 @@ class CoberturaFormatter:
             'complexity': '0',
         })
         
-        methods = SubElement(cls, 'methods')
-        lines = SubElement(cls, 'lines')
+        coverpoints = cg.coverpoints if hasattr(cg, 'coverpoints') else None
+        if not coverpoints:
+            w.empty('methods')
+            w.empty('lines')
+            w.end()
+            return
         
+        w.start('methods')
         line_num = 1
+        for cp in coverpoints:
+            # Add method for coverpoint
+            w.start('method', {
+                'name': cp.name,
+                'signature': '()',
+                'line-rate': f'{cp.coverage / 100.0:.4f}',
+                'branch-rate': f'{cp.coverage / 100.0:.4f}',
+            })
+            
+            # Add lines for bins
+            if hasattr(cp, 'bins') and cp.bins:
+                w.start('lines')
+                for bin in cp.bins:
+                    w.empty('line', {
+                        'number': str(line_num),
+                        'hits': str(bin.count),
+                        'branch': 'true',
+                    })
+                    line_num += 1
+                w.end()
+            else:
+                w.empty('lines')
+            w.end()
+        w.end()
         
-        if hasattr(cg, 'coverpoints') and cg.coverpoints:
-            for cp in cg.coverpoints:
-                # Add method for coverpoint
-                method = SubElement(methods, 'method', {
-                    'name': cp.name,
-                    'signature': '()',
-                    'line-rate': f'{cp.coverage / 100.0:.4f}',
-                    'branch-rate': f'{cp.coverage / 100.0:.4f}',
-                })
-                
-                method_lines = SubElement(method, 'lines')
-                
-                # Add lines for bins
-                if hasattr(cp, 'bins') and cp.bins:
-                    for bin in cp.bins:
-                        SubElement(method_lines, 'line', {
-                            'number': str(line_num),
-                            'hits': str(bin.count),
-                            'branch': 'true',
-                        })
-                        
-                        # Also add to class lines
-                        SubElement(lines, 'line', {
-                            'number': str(line_num),
-                            'hits': str(bin.count),
-                            'branch': 'true',
-                        })
-                        
-                        line_num += 1
-    
-    def _prettify(self, elem: Element) -> str:
-        """Return pretty-printed XML string."""
-        rough_string = tostring(elem, encoding='unicode')
-        reparsed = minidom.parseString(rough_string)
-        return reparsed.toprettyxml(indent="  ")
+        # Class lines repeat the bins of every method
+        if line_num == 1:
+            w.empty('lines')
+        else:
+            w.start('lines')
+            line_num = 1
+            for cp in coverpoints:
+                for bin in (cp.bins or ()):
+                    w.empty('line', {
+                        'number': str(line_num),
+                        'hits': str(bin.count),
+                        'branch': 'true',
+                    })
+                    line_num += 1
+            w.end()
+        w.end()
@@ -4,10 +4,18 @@ HTML Interactive Report Formatter
 Generates a single-file interactive HTML coverage report for UCIS data.
 The report includes hierarchical navigation, filtering, visualization,
 and source code viewing capabilities.
+
+For very large databases, ``HtmlFormatter.format_dir`` writes a multi-file
+report instead: ``index.html`` carries the summary and the top levels of
+the hierarchy, and deeper subtrees / source files are written as separate
+compressed shards (``shards/<id>.js``) that the page loads on demand.
 """
+import collections
 import json
 import base64
 import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import TextIO, Dict, List, Any, Optional
 from ucis.scope_type_t import ScopeTypeT
 from ucis.cover_type_t import CoverTypeT
@@ -27,7 +35,11 @@ class HtmlFormatter:
     def __init__(self, 
                  include_source: bool = True,
                  compress: bool = True,
-                 theme: str = 'light'):
+                 theme: str = 'light',
+                 shard_depth: int = 2,
+                 workers: Optional[int] = None,
+                 compress_level: int = 9,
+                 cache_dir: Optional[str] = None):
         """
         Initialize HTML formatter.
         
@@ -35,19 +47,37 @@ class HtmlFormatter:
             include_source: Embed source file contents in report
             compress: Compress JSON data with gzip
             theme: Default theme ('light' or 'dark')
+            shard_depth: Hierarchy levels held in index.html and in each
+                shard (multi-file mode only)
+            workers: Threads used to serialize and compress shards
+                (multi-file mode only; defaults to the CPU count)
+            compress_level: gzip compression level (1-9)
+            cache_dir: Optional fragment cache directory. In multi-file
+                mode, shards whose content is unchanged since the previous
+                run are reused instead of being compressed again.
         """
         self.include_source = include_source
         self.compress = compress
         self.theme = theme
+        self.shard_depth = max(1, shard_depth)
+        self.workers = workers
+        self.compress_level = compress_level
+        self.cache_dir = cache_dir
+        self._rollup = None
+        self._shards = None
     
-    def format(self, db, output: TextIO):
+    def format(self, db, output: TextIO, rollup=None):
         """
         Generate single-file HTML report.
         
         Args:
             db: UCIS database
             output: Output file/stream
+            rollup: Optional pre-built CoverageRollup for *db* (for example
+                ``CoverageMetrics.rollup``); built on demand when omitted
         """
+        self._rollup = rollup
+        
         # 1. Extract coverage data
         data = self._build_coverage_data(db)
         
@@ -69,6 +99,44 @@ class HtmlFormatter:
         # 5. Write output
         output.write(html)
     
+    def format_dir(self, db, out_dir: str, rollup=None):
+        """
+        Generate a multi-file HTML report in *out_dir*.
+        
+        ``index.html`` holds the metadata, summary and the first
+        ``shard_depth`` levels of the hierarchy. Each deeper subtree is
+        written to ``shards/s<N>.js`` and each source file to
+        ``shards/f<N>.js``. Shards are serialized and compressed on a thread
+        pool while the database is still being traversed, so only the
+        shards currently in flight are held in memory.
+        
+        Args:
+            db: UCIS database
+            out_dir: Output directory (created if it does not exist)
+            rollup: Optional pre-built CoverageRollup for *db*
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        self._rollup = rollup
+        self._shards = _ShardWriter(self, out_dir)
+        try:
+            data = self._build_coverage_data(db)
+            data['sharded'] = True
+            if self.include_source:
+                data['sources'] = self._extract_sources(db)
+        finally:
+            shards, self._shards = self._shards, None
+            shards.close()
+        
+        if self.compress:
+            data_json = self._compress_json(data)
+            data_attr = 'data-compressed="true"'
+        else:
+            data_json = json.dumps(data, separators=(',', ':'))
+            data_attr = 'data-compressed="false"'
+        
+        with open(os.path.join(out_dir, 'index.html'), 'w') as fp:
+            fp.write(self._render_template(data_json, data_attr, self.theme))
+    
     def _build_coverage_data(self, db) -> Dict[str, Any]:
         """
         Extract coverage data from UCIS database.
@@ -76,6 +144,10 @@ class HtmlFormatter:
         Returns:
             Dictionary with coverage data in JSON-serializable format
         """
+        if self._rollup is None:
+            from ucis.report.coverage_rollup import CoverageRollup
+            self._rollup = CoverageRollup(db)
+        
         data = {
             'metadata': self._extract_metadata(db),
             'summary': self._calculate_summary(db),
@@ -119,16 +191,14 @@ class HtmlFormatter:
             'uncovered_items': 0,
         }
         
-        # Calculate coverage by type
+        # Per-type totals come from the single-pass rollup
         type_stats = {}
-        
-        # Iterate through all scopes (use None to get all)
-        try:
-            for scope in db.scopes(None):
-                self._accumulate_coverage(scope, type_stats)
-        except:
-            # If scopes() doesn't work with None, try without it
-            pass
+        totals = self._rollup.totals
+        for cov_type in totals.types():
+            name = self._get_cover_type_name(cov_type)
+            stats = type_stats.setdefault(name, {'total': 0, 'covered': 0})
+            stats['total'] += totals.total(cov_type)
+            stats['covered'] += totals.covered(cov_type)
         
         # Calculate percentages
         for cov_type, stats in type_stats.items():
@@ -147,29 +217,6 @@ class HtmlFormatter:
         
         return summary
     
-    def _accumulate_coverage(self, scope, type_stats: Dict):
-        """Recursively accumulate coverage statistics."""
-        # Process cover items in this scope
-        for cover_item in scope.coverItems():
-            cov_type = self._get_cover_type_name(cover_item.getType())
-            
-            if cov_type not in type_stats:
-                type_stats[cov_type] = {'total': 0, 'covered': 0}
-            
-            type_stats[cov_type]['total'] += 1
-            
-            # Check if covered
-            cover_data = cover_item.getCoverData()
-            if cover_data and cover_data.data > 0:
-                type_stats[cov_type]['covered'] += 1
-        
-        # Recurse into child scopes
-        try:
-            for child in scope.scopes(None):
-                self._accumulate_coverage(child, type_stats)
-        except:
-            pass
-    
     def _get_cover_type_name(self, cover_type: CoverTypeT) -> str:
         """Convert cover type enum to string."""
         type_names = {
@@ -189,9 +236,12 @@ class HtmlFormatter:
         scopes = []
         scope_id = [0]  # Use list to maintain reference
         
+        # In multi-file mode, count remaining levels before a shard cut
+        depth = self.shard_depth - 1 if self._shards is not None else None
+        
         try:
-            for scope in db.scopes(None):
-                scope_data = self._extract_scope(scope, scope_id)
+            for scope in db.scopes(ScopeTypeT.ALL):
+                scope_data = self._extract_scope(scope, scope_id, depth)
                 if scope_data:
                     scopes.append(scope_data)
         except:
@@ -199,8 +249,16 @@ class HtmlFormatter:
         
         return scopes
     
-    def _extract_scope(self, scope, scope_id: List[int]) -> Optional[Dict[str, Any]]:
-        """Extract single scope with recursion."""
+    def _extract_scope(self, 
+                       scope, 
+                       scope_id: List[int],
+                       depth: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Extract single scope with recursion.
+        
+        When *depth* reaches 0 in multi-file mode, the scope's children are
+        written to a separate shard and the scope records the shard id.
+        """
         current_id = f"scope_{scope_id[0]}"
         scope_id[0] += 1
         
@@ -218,12 +276,8 @@ class HtmlFormatter:
         
         # Extract source location if available
         source_info = scope.getSourceInfo()
-        if source_info:
-            scope_data['source'] = {
-                'file': source_info.getFileName(),
-                'line': source_info.getLineNum(),
-                'column': source_info.getToken(),
-            }
+        if self._source_file(source_info):
+            scope_data['source'] = self._source_location(source_info)
         
         # For coverpoints, extract bin details
         if scope_type == ScopeTypeT.COVERPOINT:
@@ -236,71 +290,64 @@ class HtmlFormatter:
                 scope_data['at_least'] = 1
         
         # Extract child scopes
-        try:
-            for child in scope.scopes(None):
-                child_data = self._extract_scope(child, scope_id)
-                if child_data:
-                    scope_data['children'].append(child_data)
-        except:
-            pass
+        if depth == 0:
+            children = self._extract_children(scope, scope_id, self.shard_depth - 1)
+            if children:
+                shard_id = self._shards.new_id('s')
+                self._shards.submit(shard_id, {'children': children})
+                scope_data['shard'] = shard_id
+                scope_data['child_count'] = len(children)
+        else:
+            scope_data['children'] = self._extract_children(
+                scope, scope_id, None if depth is None else depth - 1)
         
-        # Extract cover items (non-bin items)
-        for cover_item in scope.coverItems():
+        # Extract cover items (non-bin items; coverpoint bins are above)
+        item_mask = CoverTypeT.ALL
+        if scope_type == ScopeTypeT.COVERPOINT:
+            item_mask &= ~(CoverTypeT.CVGBIN | CoverTypeT.IGNOREBIN | CoverTypeT.ILLEGALBIN)
+        for cover_item in scope.coverItems(item_mask):
             item_data = self._extract_cover_item(cover_item)
             if item_data:
                 scope_data['coveritems'].append(item_data)
         
         return scope_data
     
+    def _extract_children(self, scope, scope_id: List[int], depth: Optional[int]) -> List[Dict[str, Any]]:
+        """Extract the child scopes of *scope*."""
+        children = []
+        try:
+            for child in scope.scopes(ScopeTypeT.ALL):
+                child_data = self._extract_scope(child, scope_id, depth)
+                if child_data:
+                    children.append(child_data)
+        except:
+            pass
+        return children
+    
+    def _source_file(self, source_info) -> Optional[str]:
+        """File name referenced by a SourceInfo, or None."""
+        if source_info is None or source_info.file is None:
+            return None
+        return source_info.file.getFileName()
+    
+    def _source_location(self, source_info) -> Dict[str, Any]:
+        """Convert a SourceInfo to the report's source-location dict."""
+        return {
+            'file': self._source_file(source_info),
+            'line': source_info.line,
+            'column': source_info.token,
+        }
+    
     def _get_scope_type_name(self, scope_type: ScopeTypeT) -> str:
         """Convert scope type enum to string."""
         return scope_type.name
     
     def _calculate_scope_coverage(self, scope) -> float:
-        """Calculate coverage percentage for a scope."""
-        total = 0
-        covered = 0
-        
-        # Count cover items
-        for cover_item in scope.coverItems():
-            total += 1
-            cover_data = cover_item.getCoverData()
-            if cover_data and cover_data.data > 0:
-                covered += 1
-        
-        # Recurse into children
-        try:
-            for child in scope.scopes(None):
-                child_total, child_covered = self._count_coverage(child)
-                total += child_total
-                covered += child_covered
-        except:
-            pass
-        
-        if total > 0:
-            return (covered / total) * 100
-        return 0.0
-    
-    def _count_coverage(self, scope) -> tuple:
-        """Count total and covered items recursively."""
-        total = 0
-        covered = 0
-        
-        for cover_item in scope.coverItems():
-            total += 1
-            cover_data = cover_item.getCoverData()
-            if cover_data and cover_data.data > 0:
-                covered += 1
-        
-        try:
-            for child in scope.scopes(None):
-                child_total, child_covered = self._count_coverage(child)
-                total += child_total
-                covered += child_covered
-        except:
-            pass
-        
-        return total, covered
+        """Coverage percentage for a scope's subtree, read from the rollup."""
+        entry = self._rollup.scope(scope) if self._rollup is not None else None
+        if entry is None:
+            return 0.0
+        return entry.coverage_pct()
     
     def _extract_cover_item(self, cover_item) -> Optional[Dict[str, Any]]:
         """Extract cover item data."""
@@ -310,20 +357,16 @@ class HtmlFormatter:
         
         item_data = {
             'name': cover_item.getName(),
-            'type': self._get_cover_type_name(cover_item.getType()),
+            'type': self._get_cover_type_name(cover_data.type),
             'hits': cover_data.data,
             'goal': cover_data.at_least if hasattr(cover_data, 'at_least') else 1,
-            'status': 'covered' if cover_data.data > 0 else 'uncovered',
+            'status': 'covered' if cover_data.data >= cover_data.at_least else 'uncovered',
         }
         
         # Extract source location if available
         source_info = cover_item.getSourceInfo()
-        if source_info:
-            item_data['source'] = {
-                'file': source_info.getFileName(),
-                'line': source_info.getLineNum(),
-                'column': source_info.getToken(),
-            }
+        if self._source_file(source_info):
+            item_data['source'] = self._source_location(source_info)
         
         return item_data
     
@@ -371,12 +414,8 @@ class HtmlFormatter:
                 
                 # Extract source location if available
                 source_info = bin_idx.getSourceInfo()
-                if source_info:
-                    bin_data['source'] = {
-                        'file': source_info.getFileName(),
-                        'line': source_info.getLineNum(),
-                        'column': source_info.getToken(),
-                    }
+                if self._source_file(source_info):
+                    bin_data['source'] = self._source_location(source_info)
                 
                 bins.append(bin_data)
         except Exception as e:
@@ -406,41 +445,53 @@ class HtmlFormatter:
         source_files = set()
         
         def collect_sources(scope):
-            source_info = scope.getSourceInfo()
-            if source_info:
-                file_path = source_info.getFileName()
-                if file_path:
-                    source_files.add(file_path)
+            file_path = self._source_file(scope.getSourceInfo())
+            if file_path:
+                source_files.add(file_path)
             
             try:
-                for child in scope.scopes(None):
+                for child in scope.scopes(ScopeTypeT.ALL):
                     collect_sources(child)
             except:
                 pass
             
-            for cover_item in scope.coverItems():
-                source_info = cover_item.getSourceInfo()
-                if source_info:
-                    file_path = source_info.getFileName()
-                    if file_path:
-                        source_files.add(file_path)
+            for cover_item in scope.coverItems(CoverTypeT.ALL):
+                file_path = self._source_file(cover_item.getSourceInfo())
+                if file_path:
+                    source_files.add(file_path)
         
         try:
-            for scope in db.scopes(None):
+            for scope in db.scopes(ScopeTypeT.ALL):
                 collect_sources(scope)
         except:
             pass
         
         # For now, just record file paths (actual source loading would require file system access)
-        for file_path in source_files:
+        for file_path in sorted(source_files):
             sources[file_path] = {
                 'path': file_path,
                 'language': self._detect_language(file_path),
                 'content': None,  # Could be populated if files are accessible
             }
+            if self._shards is not None:
+                # Multi-file mode: content is read (if accessible) and
+                # written by a shard worker; the index only keeps the id
+                shard_id = self._shards.new_id('f')
+                entry = dict(sources[file_path])
+                self._shards.submit(shard_id, lambda e=entry: self._load_source(e))
+                sources[file_path]['shard'] = shard_id
         
         return sources
     
+    def _load_source(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Populate a source entry with file content when readable."""
+        try:
+            with open(entry['path'], 'r', errors='replace') as fp:
+                entry['content'] = fp.read()
+        except OSError:
+            pass
+        return entry
+    
     def _detect_language(self, file_path: str) -> str:
         """Detect source language from file extension."""
         if file_path.endswith('.v'):
@@ -457,9 +508,12 @@ class HtmlFormatter:
     
     def _compress_json(self, data: Dict) -> str:
         """Compress JSON data with gzip and base64 encode."""
-        json_str = json.dumps(data, separators=(',', ':'))
+        return self._compress_text(json.dumps(data, separators=(',', ':')))
+    
+    def _compress_text(self, json_str: str) -> str:
+        """Compress serialized JSON with gzip and base64 encode."""
         json_bytes = json_str.encode('utf-8')
-        compressed = gzip.compress(json_bytes, compresslevel=9)
+        compressed = gzip.compress(json_bytes, compresslevel=self.compress_level)
         encoded = base64.b64encode(compressed).decode('ascii')
         return encoded
     
@@ -580,7 +634,7 @@ class HtmlFormatter:
                                  style="padding-left: 0.5rem;">
                                 <span class="tree-toggle" 
                                       @click.stop="toggleScope(scope.id)"
-                                      x-show="scope.children && scope.children.length > 0"
+                                      x-show="hasChildren(scope)"
                                       x-text="isScopeExpanded(scope.id) ? '▼' : '▶'"></span>
                                 <span class="tree-icon" x-text="getScopeIcon(scope.type)"></span>
                                 <span class="tree-name" x-text="scope.name"></span>
@@ -601,7 +655,7 @@ class HtmlFormatter:
                                                  style="padding-left: 2rem;">
                                                 <span class="tree-toggle" 
                                                       @click.stop="toggleScope(child1.id)"
-                                                      x-show="child1.children && child1.children.length > 0"
+                                                      x-show="hasChildren(child1)"
                                                       x-text="isScopeExpanded(child1.id) ? '▼' : '▶'"></span>
                                                 <span class="tree-icon" x-text="getScopeIcon(child1.type)"></span>
                                                 <span class="tree-name" x-text="child1.name"></span>
@@ -622,7 +676,7 @@ class HtmlFormatter:
                                                                  style="padding-left: 3.5rem;">
                                                                 <span class="tree-toggle" 
                                                                       @click.stop="toggleScope(child2.id)"
-                                                                      x-show="child2.children && child2.children.length > 0"
+                                                                      x-show="hasChildren(child2)"
                                                                       x-text="isScopeExpanded(child2.id) ? '▼' : '▶'"></span>
                                                                 <span class="tree-icon" x-text="getScopeIcon(child2.type)"></span>
                                                                 <span class="tree-name" x-text="child2.name"></span>
@@ -1390,6 +1444,44 @@ class HtmlFormatter:
         // D3.js (v7.x) - Data visualization
         // Using CDN for simplicity - can be inlined in production
         
+        // Multi-file reports: each shard script calls ucisShard()
+        const ucisShardWaiters = {};
+        const ucisShardPromises = {};
+        
+        window.ucisShard = function(id, compressed, payload) {
+            const waiter = ucisShardWaiters[id];
+            if (!waiter) return;
+            delete ucisShardWaiters[id];
+            ucisDecode(compressed, payload).then(waiter.resolve, waiter.reject);
+        };
+        
+        function ucisLoadShard(id) {
+            if (!ucisShardPromises[id]) {
+                ucisShardPromises[id] = new Promise((resolve, reject) => {
+                    ucisShardWaiters[id] = { resolve, reject };
+                    const script = document.createElement('script');
+                    script.src = 'shards/' + id + '.js';
+                    script.onerror = () => {
+                        delete ucisShardWaiters[id];
+                        delete ucisShardPromises[id];
+                        reject(new Error('Failed to load shard ' + id));
+                    };
+                    document.head.appendChild(script);
+                });
+            }
+            return ucisShardPromises[id];
+        }
+        
+        // Decode embedded or shard data (base64 gzip when compressed)
+        async function ucisDecode(compressed, payload) {
+            if (!compressed) {
+                return (typeof payload === 'string') ? JSON.parse(payload) : payload;
+            }
+            const bytes = Uint8Array.from(atob(payload), c => c.charCodeAt(0));
+            const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+            return JSON.parse(await new Response(stream).text());
+        }
+        
         document.addEventListener('alpine:init', () => {
             Alpine.data('coverageApp', () => ({
                 // State
@@ -1400,6 +1492,7 @@ class HtmlFormatter:
                 filterThreshold: 0,
                 selectedScope: null,
                 expandedScopes: {},
+                scopeIndex: {},
                 
                 // Data (loaded from JSON)
                 data: {},
@@ -1408,8 +1501,8 @@ class HtmlFormatter:
                 charts: {},
                 
                 // Initialize
-                init() {
-                    this.loadData();
+                async init() {
+                    await this.loadData();
                     this.expandAllScopes();
                     
                     // Wait for D3 to load then render charts
@@ -1419,21 +1512,40 @@ class HtmlFormatter:
                 },
                 
                 // Load coverage data from embedded JSON
-                loadData() {
+                async loadData() {
                     const dataElement = document.getElementById('coverage-data');
                     const isCompressed = dataElement.getAttribute('data-compressed') === 'true';
                     
-                    if (isCompressed) {
-                        // TODO: Decompress with pako.js
-                        console.warn('Compressed data not yet supported');
+                    try {
+                        this.data = await ucisDecode(isCompressed, dataElement.textContent.trim());
+                    } catch (e) {
+                        console.warn('Failed to decode coverage data:', e);
                         this.data = { summary: {}, scopes: [] };
-                    } else {
-                        this.data = JSON.parse(dataElement.textContent);
                     }
+                    this.indexScopes(this.data.scopes);
                     
                     console.log('Coverage data loaded:', this.data);
                 },
                 
+                indexScopes(scopes) {
+                    (scopes || []).forEach(scope => {
+                        this.scopeIndex[scope.id] = scope;
+                        this.indexScopes(scope.children);
+                    });
+                },
+                
+                // Fetch the children of a sharded scope on first expansion
+                async loadScopeShard(scope) {
+                    const shard = await ucisLoadShard(scope.shard);
+                    scope.children = shard.children;
+                    scope.shardLoaded = true;
+                    this.indexScopes(scope.children);
+                },
+                
+                hasChildren(scope) {
+                    return (scope.children && scope.children.length > 0) || !!scope.shard;
+                },
+                
                 // View switching
                 switchView(view) {
                     this.currentView = view;
@@ -1725,8 +1837,18 @@ class HtmlFormatter:
                 },
                 
                 // Tree navigation
-                toggleScope(scopeId) {
-                    this.expandedScopes[scopeId] = !this.expandedScopes[scopeId];
+                async toggleScope(scopeId) {
+                    const expand = !this.expandedScopes[scopeId];
+                    const scope = this.scopeIndex[scopeId];
+                    if (expand && scope && scope.shard && !scope.shardLoaded) {
+                        try {
+                            await this.loadScopeShard(scope);
+                        } catch (e) {
+                            console.warn(e);
+                            return;
+                        }
+                    }
+                    this.expandedScopes[scopeId] = expand;
                 },
                 
                 isScopeExpanded(scopeId) {
@@ -1914,3 +2036,73 @@ class HtmlFormatter:
             document.head.appendChild(d3Script);
         })();
         """
+
+
+class _ShardWriter(object):
+    """
+    Writes report shards for ``HtmlFormatter.format_dir``.
+    
+    Each shard is a small script, ``ucisShard(id, compressed, payload);``,
+    so the report also works when opened from the local filesystem, where
+    browsers refuse ``fetch()`` of sibling files. Serialization, gzip and
+    file output run on a thread pool; at most ``2 * workers`` shards are in
+    flight so memory stays bounded regardless of database size. When the
+    formatter has a ``cache_dir``, compressed payloads are looked up in a
+    FragmentCache by the digest of their JSON, so unchanged subtrees skip
+    compression on regeneration.
+    """
+    
+    def __init__(self, formatter: HtmlFormatter, out_dir: str):
+        self._fmt = formatter
+        self._dir = os.path.join(out_dir, 'shards')
+        os.makedirs(self._dir, exist_ok=True)
+        workers = formatter.workers or os.cpu_count() or 1
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._pending = collections.deque()
+        self._max_pending = 2 * workers
+        self._count = 0
+        self._cache = None
+        if formatter.cache_dir is not None and formatter.compress:
+            from ucis.formatters.fragment_cache import FragmentCache
+            self._cache = FragmentCache(
+                formatter.cache_dir, 'html-%d' % formatter.compress_level)
+    
+    def new_id(self, prefix: str) -> str:
+        self._count += 1
+        return '%s%d' % (prefix, self._count)
+    
+    def submit(self, shard_id: str, data):
+        """Queue *data* (or a callable producing it) for writing."""
+        while len(self._pending) >= self._max_pending:
+            self._pending.popleft().result()
+        self._pending.append(self._pool.submit(self._write, shard_id, data))
+    
+    def _write(self, shard_id: str, data):
+        if callable(data):
+            data = data()
+        path = os.path.join(self._dir, shard_id + '.js')
+        with open(path, 'w') as fp:
+            if self._fmt.compress:
+                text = json.dumps(data, separators=(',', ':'))
+                if self._cache is None:
+                    payload = self._fmt._compress_text(text)
+                else:
+                    payload = self._cache.render(
+                        self._cache.digest(text),
+                        lambda: self._fmt._compress_text(text))
+                fp.write('ucisShard(%s,true,"' % json.dumps(shard_id))
+                fp.write(payload)
+                fp.write('");\n')
+            else:
+                fp.write('ucisShard(%s,false,' % json.dumps(shard_id))
+                json.dump(data, fp, separators=(',', ':'))
+                fp.write(');\n')
+    
+    def close(self):
+        try:
+            while self._pending:
+                self._pending.popleft().result()
+        finally:
+            self._pool.shutdown()
+        if self._cache is not None:
+            self._cache.close()
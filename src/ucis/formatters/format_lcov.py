@@ -4,7 +4,7 @@ LCOV Format Exporter
 Exports UCIS coverage data to LCOV format (.info files).
 LCOV is widely used for C/C++ code coverage and supported by many CI/CD tools.
 """
-from typing import TextIO
+from typing import Optional, TextIO
 
 
 class LcovFormatter:
@@ -27,30 +27,41 @@ class LcovFormatter:
     end_of_record
     """
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Args:
+            cache_dir: Optional fragment cache directory. When set, the
+                record for each covergroup is reused from the previous run
+                if its bins and counts are unchanged.
+        """
         self.test_name = None
+        self.cache_dir = cache_dir
         
     def format(self, db, output: TextIO):
         """
         Format database as LCOV.
         
+        Records are written one covergroup at a time as the database is
+        traversed, so memory use does not grow with database size.
+        
         Args:
             db: UCIS database
-            output: Output file/stream
+            output: Output file/stream (text, or binary such as a
+                ``gzip.GzipFile``)
         """
         from ucis.report.coverage_report_builder import CoverageReportBuilder
+        from ucis.formatters.stream_writer import text_output
         
-        # Build coverage report
-        report = CoverageReportBuilder.build(db)
-        
-        # Write test name if available
-        test_name = self._get_test_name(db)
-        if test_name:
-            output.write(f"TN:{test_name}\n")
-        
-        # LCOV expects source file-based coverage
-        # For UCIS functional coverage, we'll map covergroups to "files"
-        self._write_coverage_as_files(report, output)
+        with text_output(output) as out:
+            # Write test name if available
+            test_name = self._get_test_name(db)
+            if test_name:
+                out.write(f"TN:{test_name}\n")
+            
+            # LCOV expects source file-based coverage
+            # For UCIS functional coverage, we'll map covergroups to "files"
+            self._write_coverage_as_files(
+                CoverageReportBuilder.iter_covergroups(db), out)
         
     def _get_test_name(self, db) -> str:
         """Extract test name from database."""
@@ -62,60 +73,76 @@ class LcovFormatter:
             pass
         return "ucis_coverage"
     
-    def _write_coverage_as_files(self, report, output: TextIO):
+    def _write_coverage_as_files(self, covergroups, output: TextIO):
         """Write coverage data as LCOV file records."""
-        if not report.covergroups:
-            return
+        cache = None
+        if self.cache_dir is not None:
+            from ucis.formatters.fragment_cache import FragmentCache, covergroup_key
+            cache = FragmentCache(self.cache_dir, 'lcov')
         
-        for cg in report.covergroups:
-            # Treat each covergroup as a "source file"
-            source_file = f"functional/{cg.name}.sv"
-            output.write(f"SF:{source_file}\n")
-            
-            # Track statistics
-            functions_found = 0
-            functions_hit = 0
-            lines_found = 0
-            lines_hit = 0
-            branches_found = 0
-            branches_hit = 0
-            
-            line_num = 1
-            
-            if hasattr(cg, 'coverpoints') and cg.coverpoints:
-                for cp in cg.coverpoints:
-                    # Treat coverpoint as a function
-                    functions_found += 1
-                    output.write(f"FN:{line_num},{cp.name}\n")
-                    
-                    hit_count = 1 if cp.coverage > 0 else 0
-                    if hit_count > 0:
-                        functions_hit += 1
-                    output.write(f"FNDA:{hit_count},{cp.name}\n")
-                    
-                    # Map bins to lines
-                    if hasattr(cp, 'bins') and cp.bins:
-                        for bin in cp.bins:
-                            lines_found += 1
-                            output.write(f"DA:{line_num},{bin.count}\n")
-                            if bin.count > 0:
-                                lines_hit += 1
-                            line_num += 1
-                            
-                            # Treat bins as branches
-                            branches_found += 1
-                            branch_taken = 1 if bin.count > 0 else 0
-                            output.write(f"BRDA:{line_num-1},0,0,{bin.count if branch_taken else '-'}\n")
-                            if branch_taken:
-                                branches_hit += 1
-                    
-                    line_num += 1
-            
-            # Write summary
-            output.write(f"FNF:{functions_found}\n")
-            output.write(f"FNH:{functions_hit}\n")
-            output.write(f"LF:{lines_found}\n")
-            output.write(f"LH:{lines_hit}\n")
-            output.write(f"BRF:{branches_found}\n")
-            output.write(f"BRH:{branches_hit}\n")
-            output.write("end_of_record\n")
+        for cg in covergroups:
+            if cache is None:
+                output.write(self._format_covergroup(cg))
+            else:
+                output.write(cache.render(
+                    cache.digest(covergroup_key(cg)),
+                    lambda: self._format_covergroup(cg)))
+        
+        if cache is not None:
+            cache.close()
+    
+    def _format_covergroup(self, cg) -> str:
+        """Render one covergroup as an LCOV file record."""
+        out = []
+        # Treat each covergroup as a "source file"
+        source_file = f"functional/{cg.name}.sv"
+        out.append(f"SF:{source_file}\n")
+        
+        # Track statistics
+        functions_found = 0
+        functions_hit = 0
+        lines_found = 0
+        lines_hit = 0
+        branches_found = 0
+        branches_hit = 0
+        
+        line_num = 1
+        
+        if hasattr(cg, 'coverpoints') and cg.coverpoints:
+            for cp in cg.coverpoints:
+                # Treat coverpoint as a function
+                functions_found += 1
+                out.append(f"FN:{line_num},{cp.name}\n")
+                
+                hit_count = 1 if cp.coverage > 0 else 0
+                if hit_count > 0:
+                    functions_hit += 1
+                out.append(f"FNDA:{hit_count},{cp.name}\n")
+                
+                # Map bins to lines
+                if hasattr(cp, 'bins') and cp.bins:
+                    for bin in cp.bins:
+                        lines_found += 1
+                        out.append(f"DA:{line_num},{bin.count}\n")
+                        if bin.count > 0:
+                            lines_hit += 1
+                        line_num += 1
+                        
+                        # Treat bins as branches
+                        branches_found += 1
+                        branch_taken = 1 if bin.count > 0 else 0
+                        out.append(f"BRDA:{line_num-1},0,0,{bin.count if branch_taken else '-'}\n")
+                        if branch_taken:
+                            branches_hit += 1
+                
+                line_num += 1
+        
+        # Write summary
+        out.append(f"FNF:{functions_found}\n")
+        out.append(f"FNH:{functions_hit}\n")
+        out.append(f"LF:{lines_found}\n")
+        out.append(f"LH:{lines_hit}\n")
+        out.append(f"BRF:{branches_found}\n")
+        out.append(f"BRH:{branches_hit}\n")
+        out.append("end_of_record\n")
+        return ''.join(out)
@@ -0,0 +1,125 @@
+"""
+Content-addressed fragment cache for incremental report regeneration.
+
+Formatters split their output into fragments (one per covergroup, per HTML
+shard, ...) and compute a digest for each from the coverage data it is
+rendered from. ``FragmentCache`` keeps the rendered text of every fragment
+under ``<cache_dir>/<namespace>/<digest>``; on the next run a fragment whose
+digest is unchanged is read back instead of being re-rendered. Several
+databases and concurrent runs may share a cache directory, so
+:meth:`FragmentCache.close` only prunes fragments that no run has used for
+``max_age`` seconds.
+"""
+import hashlib
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+
+class FragmentCache(object):
+    """
+    Per-formatter fragment store.
+
+    Args:
+        cache_dir: Root cache directory (created if it does not exist)
+        namespace: Sub-directory for this formatter (e.g. ``'lcov'``). It
+            should also encode any formatter option that affects rendering.
+        max_age: Seconds after its last use that a fragment is pruned by
+            :meth:`close`; ``None`` never prunes.
+    """
+
+    #: Default ``max_age``: one week
+    DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+    def __init__(self, cache_dir: str, namespace: str,
+                 max_age: Optional[float] = DEFAULT_MAX_AGE):
+        self.path = os.path.join(cache_dir, namespace)
+        os.makedirs(self.path, exist_ok=True)
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._used = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(*parts) -> str:
+        """Stable digest of *parts* (str/int/float/tuple/list nesting)."""
+        h = hashlib.sha1()
+        h.update(repr(parts).encode('utf-8'))
+        return h.hexdigest()
+
+    def get(self, digest: str) -> Optional[str]:
+        """Cached text for *digest*, or ``None`` on a miss."""
+        path = os.path.join(self.path, digest)
+        try:
+            with open(path, 'r', encoding='utf-8') as fp:
+                text = fp.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            # The modification time records the last use, for pruning
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+            self._used.add(digest)
+        return text
+
+    def put(self, digest: str, text: str):
+        """Store *text* under *digest*."""
+        path = os.path.join(self.path, digest)
+        # Write-then-rename so an interrupted run never leaves a truncated
+        # fragment behind under a valid digest
+        tmp = '%s.%d.%d.tmp' % (path, os.getpid(), threading.get_ident())
+        with open(tmp, 'w', encoding='utf-8') as fp:
+            fp.write(text)
+        os.replace(tmp, path)
+        with self._lock:
+            self._used.add(digest)
+
+    def render(self, digest: str, fn: Callable[[], str]) -> str:
+        """Return the cached text for *digest*, calling *fn* on a miss."""
+        text = self.get(digest)
+        if text is None:
+            text = fn()
+            self.put(digest, text)
+        return text
+
+    def close(self):
+        """
+        Remove fragments unused for ``max_age`` seconds. Temporary files
+        are never removed, as another run may still be writing them.
+        """
+        if self.max_age is None:
+            return
+        cutoff = time.time() - self.max_age
+        for name in os.listdir(self.path):
+            if name in self._used or name.endswith('.tmp'):
+                continue
+            path = os.path.join(self.path, name)
+            try:
+                if os.stat(path).st_mtime < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+def covergroup_key(cg) -> tuple:
+    """
+    Cache key for a ``CoverageReport.Covergroup``: every name, weight,
+    at-least threshold and hit count that affects rendered output.
+    """
+    def bins(lst):
+        return tuple((b.name, b.goal, b.count) for b in lst)
+    return (
+        cg.name, cg.instname, cg.weight, cg.coverage,
+        tuple((cp.name, cp.weight, cp.coverage, bins(cp.bins),
+               bins(cp.ignore_bins), bins(cp.illegal_bins))
+              for cp in cg.coverpoints),
+        tuple((cr.name, cr.weight, cr.coverage, bins(cr.bins))
+              for cr in cg.crosses),
+        tuple(covergroup_key(sub) for sub in cg.covergroups))
@@ -0,0 +1,104 @@
+"""
+Incremental writers shared by the CI-export formatters.
+
+``XmlStreamWriter`` emits pretty-printed XML directly, element by element,
+in the same layout ``minidom.toprettyxml(indent="  ")`` produces, so the
+formatters no longer need to hold an ``ElementTree`` for the whole report.
+
+``text_output`` adapts the output argument: text streams are used as-is,
+while binary streams (including ``gzip.GzipFile``) are wrapped in a UTF-8
+text layer that is detached, not closed, when the formatter finishes.
+"""
+import contextlib
+import io
+from typing import Iterator, List, Optional, TextIO
+
+
+def _escape_attr(value: str) -> str:
+    return (value.replace('&', '&amp;').replace('<', '&lt;')
+            .replace('"', '&quot;').replace('>', '&gt;'))
+
+
+def _escape_text(value: str) -> str:
+    return value.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+@contextlib.contextmanager
+def text_output(fp) -> Iterator[TextIO]:
+    """Yield a text stream that writes to *fp* (text or binary)."""
+    if isinstance(fp, (io.RawIOBase, io.BufferedIOBase)):
+        wrapper = io.TextIOWrapper(fp, encoding='utf-8', newline='\n')
+        try:
+            yield wrapper
+        finally:
+            wrapper.flush()
+            wrapper.detach()
+    else:
+        yield fp
+
+
+class XmlStreamWriter(object):
+    """
+    Streaming pretty-printing XML writer.
+
+    Output is accumulated in a small buffer and handed to the underlying
+    stream by :meth:`flush`; formatters flush after each source file so
+    memory use is bounded by the largest single file record.
+
+    Args:
+        fp: Text stream to write to
+        depth: Initial nesting depth (for rendering fragments)
+        declaration: Emit the ``<?xml ...?>`` declaration
+    """
+
+    def __init__(self, fp: TextIO, depth: int = 0, declaration: bool = True):
+        self._fp = fp
+        self._buf: List[str] = []
+        self._stack: List[str] = []
+        self._depth = depth
+        if declaration:
+            self._buf.append('<?xml version="1.0" ?>\n')
+
+    def _open(self, tag: str, attrs: Optional[dict]) -> str:
+        parts = ['  ' * (self._depth + len(self._stack)), '<', tag]
+        for k, v in (attrs or {}).items():
+            parts.append(' %s="%s"' % (k, _escape_attr(str(v))))
+        return ''.join(parts)
+
+    def start(self, tag: str, attrs: Optional[dict] = None):
+        """Open an element that will have child elements."""
+        self._buf.append(self._open(tag, attrs) + '>\n')
+        self._stack.append(tag)
+
+    def end(self):
+        """Close the innermost open element."""
+        tag = self._stack.pop()
+        self._buf.append('%s</%s>\n' % ('  ' * (self._depth + len(self._stack)), tag))
+
+    def empty(self, tag: str, attrs: Optional[dict] = None):
+        """Write an element with no content."""
+        self._buf.append(self._open(tag, attrs) + '/>\n')
+
+    def text(self, tag: str, text: str, attrs: Optional[dict] = None):
+        """Write an element whose only content is *text*."""
+        self._buf.append('%s>%s</%s>\n' % (self._open(tag, attrs), _escape_text(text), tag))
+
+    def raw(self, text: str):
+        """Write pre-rendered markup (e.g. a cached fragment)."""
+        self._buf.append(text)
+
+    @property
+    def depth(self) -> int:
+        """Current nesting depth."""
+        return self._depth + len(self._stack)
+
+    def flush(self):
+        if self._buf:
+            self._fp.write(''.join(self._buf))
+            self._buf.clear()
+
+    def close(self):
+        """Close any open elements and flush."""
+        while self._stack:
+            self.end()
+        self.flush()
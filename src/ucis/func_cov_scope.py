@@ -55,6 +55,8 @@ class FuncCovScope(CovScope):
         UCIS LRM Section 6.4.3 "Functional Coverage"
     """
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         
@@ -2,9 +2,18 @@
 Database handle management for MCP server.
 
 Manages open UCIS databases, format detection, and resource cleanup.
+
+Parsed databases are shared: opening a path that is already loaded (with
+the same format and an unchanged mtime/size) returns a new handle onto the
+existing database object instead of parsing the file again. Loaded
+databases are reference-counted by their handles; once unreferenced they
+stay resident for reuse until evicted in LRU order by the entry/byte
+budget passed to ``DatabaseManager``.
 """
-from typing import Dict, Optional, Any
+from collections import OrderedDict
+from typing import Dict, Optional, Any, Tuple
 import os
+import threading
 from pathlib import Path
 
 
@@ -18,6 +27,8 @@ class DatabaseHandle:
         self.format_type = format_type
         self.mode = mode
         self.metadata = {}
+        #: Serializes access to ``db_obj`` from the MCP worker pool
+        self.lock = threading.RLock()
     
     def to_dict(self) -> Dict[str, Any]:
         """Return dictionary representation."""
@@ -30,12 +41,44 @@ class DatabaseHandle:
         }
 
 
+class _LoadedDatabase:
+    """A parsed database shared by every handle opened on the same file."""
+    
+    __slots__ = ('key', 'db_obj', 'refcount', 'size', 'lock')
+    
+    def __init__(self, key: Tuple, db_obj: Any, size: int):
+        self.key = key
+        self.db_obj = db_obj
+        self.refcount = 0
+        #: Budget charge; the file size is used as a proxy for memory use
+        self.size = size
+        #: Shared by all handles, since they share ``db_obj``
+        self.lock = threading.RLock()
+
+
 class DatabaseManager:
     """Manages open UCIS databases for the MCP server."""
     
-    def __init__(self):
+    def __init__(self, max_entries: Optional[int] = 8,
+                 max_bytes: Optional[int] = None):
+        """
+        Args:
+            max_entries: Maximum number of parsed databases kept resident
+                (None for no limit)
+            max_bytes: Maximum total on-disk size of resident databases
+                (None for no limit)
+        
+        Databases referenced by an open handle are never evicted, so the
+        budget may be exceeded while many distinct files are open.
+        """
         self._databases: Dict[str, DatabaseHandle] = {}
         self._next_id = 1
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._loaded: "OrderedDict[Tuple, _LoadedDatabase]" = OrderedDict()
+        self._loaded_bytes = 0
+        self._handle_entry: Dict[str, _LoadedDatabase] = {}
     
     def _generate_id(self) -> str:
         """Generate unique database ID."""
@@ -88,29 +131,142 @@ class DatabaseManager:
         if format_type is None:
             format_type = self._detect_format(path)
         
-        # Import format handler
-        from ucis.db_format_rgy import DbFormatRgy
+        # Take metadata before reading, so a rewrite during the read is
+        # seen as a change on the next access
+        metadata = self._file_metadata(path)
+        entry = self._acquire(path, format_type, metadata)
         
-        format_rgy = DbFormatRgy()
-        db_format = format_rgy.get_db_format(format_type)
+        # Create handle (databases may be opened from several threads)
+        with self._lock:
+            db_id = self._generate_id()
+            handle = DatabaseHandle(db_id, entry.db_obj, path, format_type, mode)
+            handle.metadata = metadata
+            handle.lock = entry.lock
+            self._databases[db_id] = handle
+            self._handle_entry[db_id] = entry
+        return handle
+    
+    @staticmethod
+    def _cache_key(path: str, format_type: str, metadata: Dict[str, Any]) -> Tuple:
+        return (os.path.realpath(path), format_type,
+                metadata["file_mtime"], metadata["file_size"])
+    
+    def _acquire(self, path: str, format_type: str,
+                 metadata: Dict[str, Any]) -> _LoadedDatabase:
+        """Return a referenced shared entry for *path*, loading it if needed."""
+        key = self._cache_key(path, format_type, metadata)
+        with self._lock:
+            entry = self._loaded.get(key)
+            if entry is not None:
+                entry.refcount += 1
+                self._loaded.move_to_end(key)
+                return entry
         
-        if db_format is None:
-            raise ValueError(f"Unknown database format: {format_type}")
+        # Parse outside the lock so other databases can be served meanwhile
+        db_obj = self._read(path, format_type)
         
-        # Open database
-        db_obj = db_format.read(path)
+        with self._lock:
+            entry = self._loaded.get(key)
+            if entry is None:
+                entry = _LoadedDatabase(key, db_obj, metadata["file_size"])
+                self._loaded[key] = entry
+                self._loaded_bytes += entry.size
+                db_obj = None
+            else:
+                # Another thread loaded the same file concurrently
+                self._loaded.move_to_end(key)
+            entry.refcount += 1
+            evicted = self._evict()
         
-        # Create handle
-        db_id = self._generate_id()
-        handle = DatabaseHandle(db_id, db_obj, path, format_type, mode)
+        self._close_all_objs(evicted + ([db_obj] if db_obj is not None else []))
+        return entry
+    
+    def _release(self, entry: _LoadedDatabase):
+        """Drop one reference to *entry*, evicting if over budget."""
+        with self._lock:
+            entry.refcount -= 1
+            evicted = self._evict()
+        self._close_all_objs(evicted)
+    
+    def _evict(self) -> list:
+        """
+        Evict unreferenced entries, least recently used first, until within
+        budget. Must be called with ``_lock`` held; returns the database
+        objects to close once the lock is released.
+        """
+        evicted = []
+        for key in list(self._loaded.keys()):
+            over_entries = (self.max_entries is not None
+                            and len(self._loaded) > self.max_entries)
+            over_bytes = (self.max_bytes is not None
+                          and self._loaded_bytes > self.max_bytes)
+            if not (over_entries or over_bytes):
+                break
+            entry = self._loaded[key]
+            if entry.refcount > 0:
+                continue
+            del self._loaded[key]
+            self._loaded_bytes -= entry.size
+            evicted.append(entry.db_obj)
+        return evicted
+    
+    @staticmethod
+    def _close_all_objs(db_objs):
+        for db_obj in db_objs:
+            try:
+                db_obj.close()
+            except Exception:
+                pass
+    
+    def cache_info(self) -> Dict[str, Any]:
+        """Statistics about the shared database cache."""
+        with self._lock:
+            return {
+                "entries": len(self._loaded),
+                "bytes": self._loaded_bytes,
+                "referenced": sum(1 for e in self._loaded.values() if e.refcount > 0),
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+    
+    def _read(self, path: str, format_type: str) -> Any:
+        """Read the database at *path* with the given format."""
+        from ucis.rgy.format_rgy import FormatRgy
         
-        # Store metadata
-        handle.metadata = {
+        rgy = FormatRgy.inst()
+        if not rgy.hasDatabaseFormat(format_type):
+            raise ValueError(f"Unknown database format: {format_type}")
+        
+        return rgy.getDatabaseDesc(format_type).fmt_if().read(path)
+    
+    @staticmethod
+    def _file_metadata(path: str) -> Dict[str, Any]:
+        return {
             "file_size": os.path.getsize(path),
             "file_mtime": os.path.getmtime(path),
         }
+    
+    def reload_database(self, db_id: str) -> Optional[DatabaseHandle]:
+        """
+        Re-read a database from disk (e.g. after the file was rewritten),
+        keeping its ID.
         
-        self._databases[db_id] = handle
+        Returns:
+            The updated handle, or None if *db_id* is not open
+        """
+        handle = self._databases.get(db_id)
+        if handle is None:
+            return None
+        metadata = self._file_metadata(handle.path)
+        entry = self._acquire(handle.path, handle.format_type, metadata)
+        with self._lock:
+            old = self._handle_entry.get(db_id)
+            self._handle_entry[db_id] = entry
+            handle.db_obj = entry.db_obj
+            handle.metadata = metadata
+            handle.lock = entry.lock
+        if old is not None:
+            self._release(old)
         return handle
     
     def get_database(self, db_id: str) -> Optional[DatabaseHandle]:
@@ -124,15 +280,25 @@ class DatabaseManager:
         Returns:
             True if closed, False if not found
         """
-        if db_id in self._databases:
+        with self._lock:
+            if db_id not in self._databases:
+                return False
             del self._databases[db_id]
-            return True
-        return False
+            entry = self._handle_entry.pop(db_id, None)
+        if entry is not None:
+            self._release(entry)
+        return True
     
     def list_databases(self) -> list[Dict[str, Any]]:
         """List all open databases."""
         return [handle.to_dict() for handle in self._databases.values()]
     
     def close_all(self):
-        """Close all databases."""
-        self._databases.clear()
+        """Close all databases and empty the shared cache."""
+        with self._lock:
+            self._databases.clear()
+            self._handle_entry.clear()
+            evicted = [e.db_obj for e in self._loaded.values()]
+            self._loaded.clear()
+            self._loaded_bytes = 0
+        self._close_all_objs(evicted)
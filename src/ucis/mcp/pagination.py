@@ -0,0 +1,74 @@
+"""
+Cursor-based pagination for MCP tool results.
+
+Large results (bin lists, hierarchies, per-covergroup coverage) are returned
+a page at a time. A page carries ``next_cursor``, an opaque continuation
+token that the client passes back to get the following page; it is ``None``
+on the last page. Tokens are bound to the query that produced them, so
+a token cannot be replayed against a different database or filter set.
+
+Pages are bounded both by an item ``limit`` and by the size of their JSON
+encoding (``max_bytes``); at least one item is always returned so that
+pagination makes progress.
+"""
+import base64
+import hashlib
+import json
+from typing import Any, List, Optional
+
+
+#: Default bound on the JSON size of one page of items
+DEFAULT_MAX_BYTES = 1 << 20
+
+
+class CursorError(ValueError):
+    """Raised for malformed or mismatched continuation tokens."""
+    pass
+
+
+def query_fingerprint(*parts) -> str:
+    """Short digest identifying a query (tool, database, filters)."""
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str)
+                        .encode('utf-8')).hexdigest()[:16]
+
+
+def encode_cursor(fingerprint: str, position: Any) -> str:
+    """Encode a continuation token for *position* within a query."""
+    data = json.dumps({"q": fingerprint, "p": position}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(token: Optional[str], fingerprint: str, default: Any = 0) -> Any:
+    """
+    Return the position stored in *token*, or *default* when no token is
+    given.
+
+    Raises:
+        CursorError: If the token is malformed or belongs to another query
+    """
+    if not token:
+        return default
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+        fp, position = data["q"], data["p"]
+    except Exception:
+        raise CursorError("Invalid cursor")
+    if fp != fingerprint:
+        raise CursorError("Cursor does not belong to this query")
+    return position
+
+
+def bound_page(items: List[Any], max_bytes: Optional[int]) -> List[Any]:
+    """
+    Trim *items* to the longest prefix whose JSON encoding fits in
+    *max_bytes* (always keeping at least one item).
+    """
+    if max_bytes is None:
+        return items
+    size = 2
+    for i, item in enumerate(items):
+        size += len(json.dumps(item, separators=(',', ':'))) + 1
+        if size > max_bytes and i > 0:
+            return items[:i]
+    return items
+
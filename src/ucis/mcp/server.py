@@ -154,6 +154,14 @@ TOOLS = [
                 "max_depth": {
                     "type": "integer",
                     "description": "Maximum depth to traverse"
+                },
+                "cursor": {
+                    "type": "string",
+                    "description": "Continuation token (next_cursor) from a previous page"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum scopes per page"
                 }
             },
             "required": ["db_id"]
@@ -203,6 +211,14 @@ TOOLS = [
                     "type": "string",
                     "description": "Sort by 'count' or 'name'",
                     "enum": ["count", "name"]
+                },
+                "cursor": {
+                    "type": "string",
+                    "description": "Continuation token (next_cursor) from a previous page"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum bins per page"
                 }
             },
             "required": ["db_id"]
@@ -226,6 +242,30 @@ TOOLS = [
             "required": ["db_id", "compare_db_id"]
         }
     ),
+    Tool(
+        name="diff_databases",
+        description="Diff a baseline UCIS database against one or more others "
+                    "(newly hit/lost coverage items, per-database deltas)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "db_id": {
+                    "type": "string",
+                    "description": "Baseline database ID"
+                },
+                "compare_db_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "IDs of the databases to compare against the baseline"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum item paths listed per category (default: 100)"
+                }
+            },
+            "required": ["db_id", "compare_db_ids"]
+        }
+    ),
     Tool(
         name="get_hotspots",
         description="Identify coverage hotspots and high-value targets",
@@ -262,6 +302,14 @@ TOOLS = [
                     "type": "string",
                     "description": "Output format",
                     "enum": ["json", "lcov", "cobertura", "jacoco", "clover"]
+                },
+                "cursor": {
+                    "type": "string",
+                    "description": "Continuation token (next_cursor) from a previous page"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum covergroups per page"
                 }
             },
             "required": ["db_id"]
@@ -337,7 +385,9 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         elif name == "get_hierarchy":
             result = await tools.get_hierarchy(
                 arguments["db_id"],
-                arguments.get("max_depth")
+                arguments.get("max_depth"),
+                arguments.get("cursor"),
+                arguments.get("limit")
             )
         elif name == "get_metrics":
             result = await tools.get_metrics(arguments["db_id"])
@@ -348,13 +398,21 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
                 arguments.get("coverpoint"),
                 arguments.get("min_hits"),
                 arguments.get("max_hits"),
-                arguments.get("sort_by")
+                arguments.get("sort_by"),
+                arguments.get("cursor"),
+                arguments.get("limit")
             )
         elif name == "compare_databases":
             result = await tools.compare_databases(
                 arguments["db_id"],
                 arguments["compare_db_id"]
             )
+        elif name == "diff_databases":
+            result = await tools.diff_databases(
+                arguments["db_id"],
+                arguments["compare_db_ids"],
+                arguments.get("limit", 100)
+            )
         elif name == "get_hotspots":
             result = await tools.get_hotspots(
                 arguments["db_id"],
@@ -364,7 +422,9 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         elif name == "get_code_coverage":
             result = await tools.get_code_coverage(
                 arguments["db_id"],
-                arguments.get("output_format", "json")
+                arguments.get("output_format", "json"),
+                arguments.get("cursor"),
+                arguments.get("limit")
             )
         elif name == "get_assertions":
             result = await tools.get_assertions(arguments["db_id"])
@@ -404,6 +464,7 @@ def main():
         sys.exit(1)
     finally:
         # Cleanup
+        tools.shutdown()
         db_manager.close_all()
 
 
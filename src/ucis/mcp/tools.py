@@ -2,16 +2,147 @@
 MCP tools implementation for PyUCIS.
 
 Each tool corresponds to an MCP tool that agents can invoke.
+
+Tool bodies do blocking work (database traversal, report building), so they
+are dispatched to a bounded thread pool rather than run on the asyncio event
+loop; one slow query no longer stalls every other client request. Successful
+results are memoised per ``(tool, databases, arguments)``. The key includes
+each database's file mtime, so a database rewritten on disk is reloaded and
+its stale results are never served.
 """
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Sequence
+import argparse
+import asyncio
 import json
+import os
+
+from .pagination import (DEFAULT_MAX_BYTES, bound_page, decode_cursor,
+                         encode_cursor, query_fingerprint)
 
 
 class ToolImplementations:
     """Implementation of all MCP tools."""
     
-    def __init__(self, db_manager):
+    #: Default page sizes for the paginated tools
+    DEFAULT_BIN_LIMIT = 1000
+    DEFAULT_HIERARCHY_LIMIT = 500
+    DEFAULT_COVERGROUP_LIMIT = 50
+    
+    def __init__(self, db_manager, max_workers: Optional[int] = None,
+                 cache_size: int = 256,
+                 max_page_bytes: Optional[int] = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            db_manager: DatabaseManager holding the open databases
+            max_workers: Worker threads for tool bodies (default: up to 4)
+            cache_size: Maximum number of memoised tool results
+            max_page_bytes: Bound on the JSON size of one page of a
+                paginated result (None for no bound)
+        """
         self.db_manager = db_manager
+        self.max_page_bytes = max_page_bytes
+        if max_workers is None:
+            max_workers = min(4, os.cpu_count() or 1)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ucis-mcp")
+        self._cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._cache_size = cache_size
+    
+    def shutdown(self):
+        """Stop the worker pool."""
+        self._executor.shutdown(wait=True)
+    
+    def clear_cache(self, db_id: Optional[str] = None):
+        """Drop memoised results (for one database, or all)."""
+        if db_id is None:
+            self._cache.clear()
+            return
+        for key in [k for k in self._cache if any(d == db_id for d, _ in k[1])]:
+            del self._cache[key]
+    
+    @staticmethod
+    def _show_cmd(cls, handle, **kwargs):
+        """
+        Create a ``ucis show`` command object bound to an open database.
+        
+        Show commands take parsed CLI arguments and normally load the
+        database themselves; here the argument namespace is synthesized
+        and the already-open database object is attached.
+        """
+        kwargs.setdefault("db", handle.path)
+        kwargs.setdefault("input_format", handle.format_type)
+        kwargs.setdefault("output_format", "json")
+        kwargs.setdefault("out", None)
+        cmd = cls(argparse.Namespace(**kwargs))
+        cmd.db = handle.db_obj
+        return cmd
+    
+    async def _run_blocking(self, fn: Callable, *args):
+        """Run *fn* on the worker pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+    
+    async def _run(self, tool: str, handles: Sequence, args: tuple,
+                   body: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run a tool *body* against *handles* on the worker pool, with
+        memoisation. Databases whose file changed on disk are reloaded
+        first. Failed calls are returned as error results and not cached.
+        """
+        for handle in handles:
+            if self._is_stale(handle):
+                await self._run_blocking(self._reload, handle)
+                # The cache is only touched on the event loop thread
+                self.clear_cache(handle.db_id)
+        
+        key = (tool,
+               tuple((h.db_id, h.metadata.get("file_mtime")) for h in handles),
+               args)
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+            return result
+        
+        result = await self._run_blocking(self._call, handles, body)
+        if result.get("success"):
+            self._cache[key] = result
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return result
+    
+    @staticmethod
+    def _is_stale(handle) -> bool:
+        mtime = handle.metadata.get("file_mtime")
+        if mtime is None:
+            return False
+        try:
+            return os.path.getmtime(handle.path) != mtime
+        except OSError:
+            return False
+    
+    def _reload(self, handle):
+        with handle.lock:
+            self.db_manager.reload_database(handle.db_id)
+    
+    @staticmethod
+    def _call(handles: Sequence, body: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        # Database objects are not thread-safe: hold each handle's lock,
+        # taken in a fixed order so multi-database tools cannot deadlock
+        locks = [h.lock for h in sorted(set(handles), key=lambda h: h.db_id)]
+        for lock in locks:
+            lock.acquire()
+        try:
+            return body()
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        finally:
+            for lock in reversed(locks):
+                lock.release()
     
     async def open_database(self, path: str, format_type: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -25,7 +156,8 @@ class ToolImplementations:
             Database handle information
         """
         try:
-            handle = self.db_manager.open_database(path, format_type)
+            handle = await self._run_blocking(
+                self.db_manager.open_database, path, format_type)
             return {
                 "success": True,
                 "database": handle.to_dict()
@@ -47,6 +179,7 @@ class ToolImplementations:
             Success status
         """
         success = self.db_manager.close_database(db_id)
+        self.clear_cache(db_id)
         return {
             "success": success,
             "message": "Database closed" if success else "Database not found"
@@ -105,21 +238,18 @@ class ToolImplementations:
                 "error": f"Database not found: {db_id}"
             }
         
-        try:
+        def run():
             from ucis.cmd.show.show_summary import ShowSummary
             
-            show_cmd = ShowSummary(handle.db_obj)
+            show_cmd = self._show_cmd(ShowSummary, handle)
             data = show_cmd.get_data()
             
             return {
                 "success": True,
                 "summary": data
             }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e)
-            }
+        
+        return await self._run("get_coverage_summary", (handle,), (), run)
     
     async def get_coverage_gaps(self, db_id: str, threshold: Optional[float] = None) -> Dict[str, Any]:
         """
@@ -139,21 +269,18 @@ class ToolImplementations:
                 "error": f"Database not found: {db_id}"
             }
         
-        try:
+        def run():
             from ucis.cmd.show.show_gaps import ShowGaps
             
-            show_cmd = ShowGaps(handle.db_obj, threshold=threshold)
+            show_cmd = self._show_cmd(ShowGaps, handle, threshold=threshold)
             data = show_cmd.get_data()
             
             return {
                 "success": True,
                 "gaps": data
             }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e)
-            }
+        
+        return await self._run("get_coverage_gaps", (handle,), (threshold,), run)
     
     async def get_covergroups(self, db_id: str, include_bins: bool = False) -> Dict[str, Any]:
         """
@@ -173,21 +300,18 @@ class ToolImplementations:
                 "error": f"Database not found: {db_id}"
             }
         
-        try:
+        def run():
             from ucis.cmd.show.show_covergroups import ShowCovergroups
             
-            show_cmd = ShowCovergroups(handle.db_obj, include_bins=include_bins)
+            show_cmd = self._show_cmd(ShowCovergroups, handle, include_bins=include_bins)
             data = show_cmd.get_data()
             
             return {
                 "success": True,
                 "covergroups": data
             }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e)
-            }
+        
+        return await self._run("get_covergroups", (handle,), (include_bins,), run)
     
     async def get_tests(self, db_id: str) -> Dict[str, Any]:
         """
@@ -206,32 +330,36 @@ class ToolImplementations:
                 "error": f"Database not found: {db_id}"
             }
         
-        try:
+        def run():
             from ucis.cmd.show.show_tests import ShowTests
             
-            show_cmd = ShowTests(handle.db_obj)
+            show_cmd = self._show_cmd(ShowTests, handle)
             data = show_cmd.get_data()
             
             return {
                 "success": True,
                 "tests": data
             }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e)
-            }
+        
+        return await self._run("get_tests", (handle,), (), run)
     
-    async def get_hierarchy(self, db_id: str, max_depth: Optional[int] = None) -> Dict[str, Any]:
+    async def get_hierarchy(self, db_id: str, max_depth: Optional[int] = None,
+                            cursor: Optional[str] = None,
+                            limit: Optional[int] = None) -> Dict[str, Any]:
         """
-        Get design hierarchy.
+        Get design hierarchy, one page of scopes at a time.
+        
+        Scopes are returned as flat rows in pre-order (each with its
+        ``path``, ``depth`` and ``child_count``).
         
         Args:
             db_id: Database ID
             max_depth: Maximum depth to traverse
+            cursor: Continuation token from a previous page
+            limit: Maximum scopes per page
         
         Returns:
-            Hierarchical structure of design
+            A page of the hierarchy and ``next_cursor`` (None on the last page)
         """
         handle = self.db_manager.get_database(db_id)
         if not handle:
@@ -239,22 +367,38 @@ class ToolImplementations:
                 "success": False,
                 "error": f"Database not found: {db_id}"
             }
+        if limit is None:
+            limit = self.DEFAULT_HIERARCHY_LIMIT
         
-        try:
+        def run():
             from ucis.cmd.show.show_hierarchy import ShowHierarchy
             
-            show_cmd = ShowHierarchy(handle.db_obj, max_depth=max_depth)
-            data = show_cmd.get_data()
+            fp = query_fingerprint("get_hierarchy", handle.path, max_depth)
+            resume = decode_cursor(cursor, fp, None)
+            show_cmd = self._show_cmd(ShowHierarchy, handle, max_depth=max_depth)
+            
+            # Fetch one extra row to learn where the next page starts
+            rows, positions = [], []
+            for row, position in show_cmd.walk(resume):
+                rows.append(row)
+                positions.append(position)
+                if len(rows) > limit:
+                    break
+            page = bound_page(rows[:limit], self.max_page_bytes)
+            next_cursor = None
+            if len(page) < len(rows):
+                next_cursor = encode_cursor(fp, positions[len(page)])
             
             return {
                 "success": True,
-                "hierarchy": data
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e)
+                "hierarchy": {
+                    "database": handle.path,
+                    "scopes": page,
+                    "next_cursor": next_cursor,
+                }
             }
+        
+        return await self._run("get_hierarchy", (handle,), (max_depth, cursor, limit), run)
     
     async def get_metrics(self, db_id: str) -> Dict[str, Any]:
         """
@@ -273,27 +417,29 @@ class ToolImplementations:
                 "error": f"Database not found: {db_id}"
             }
         
-        try:
+        def run():
             from ucis.cmd.show.show_metrics import ShowMetrics
             
-            show_cmd = ShowMetrics(handle.db_obj)
+            show_cmd = self._show_cmd(ShowMetrics, handle)
             data = show_cmd.get_data()
             
             return {
                 "success": True,
                 "metrics": data
             }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e)
-            }
+        
+        return await self._run("get_metrics", (handle,), (), run)
     
     async def get_bins(self, db_id: str, covergroup: Optional[str] = None, 
                       coverpoint: Optional[str] = None, min_hits: Optional[int] = None,
-                      max_hits: Optional[int] = None, sort_by: Optional[str] = None) -> Dict[str, Any]:
+                      max_hits: Optional[int] = None, sort_by: Optional[str] = None,
+                      cursor: Optional[str] = None,
+                      limit: Optional[int] = None) -> Dict[str, Any]:
         """
-        Get bin-level coverage details.
+        Get bin-level coverage details, one page at a time.
+        
+        Filtering, sorting and paging are done by the query layer (in SQL
+        for SQLite databases), so only the requested page is materialized.
         
         Args:
             db_id: Database ID
@@ -302,9 +448,12 @@ class ToolImplementations:
             min_hits: Minimum hit count
             max_hits: Maximum hit count
             sort_by: Sort by 'count' or 'name'
+            cursor: Continuation token from a previous page
+            limit: Maximum bins per page
         
         Returns:
-            Bin details
+            A page of bin details, the total matching count and
+            ``next_cursor`` (None on the last page)
         """
         handle = self.db_manager.get_database(db_id)
         if not handle:
@@ -312,23 +461,37 @@ class ToolImplementations:
                 "success": False,
                 "error": f"Database not found: {db_id}"
             }
+        if limit is None:
+            limit = self.DEFAULT_BIN_LIMIT
         
-        try:
+        def run():
             from ucis.cmd.show.show_bins import ShowBins
             
-            show_cmd = ShowBins(handle.db_obj, covergroup=covergroup, coverpoint=coverpoint,
-                              min_hits=min_hits, max_hits=max_hits, sort_by=sort_by)
-            data = show_cmd.get_data()
+            fp = query_fingerprint("get_bins", handle.path, covergroup, coverpoint,
+                                   min_hits, max_hits, sort_by)
+            offset = decode_cursor(cursor, fp)
+            show_cmd = self._show_cmd(ShowBins, handle, covergroup=covergroup, coverpoint=coverpoint,
+                                      min_hits=min_hits, max_hits=max_hits, sort=sort_by)
+            rows, total = show_cmd.query().page(offset, limit)
+            page = bound_page(rows, self.max_page_bytes)
+            end = offset + len(page)
+            
+            data = {
+                "database": handle.path,
+                "bins": page,
+                "total_bins": total,
+                "offset": offset,
+                "next_cursor": encode_cursor(fp, end) if end < total else None,
+            }
             
             return {
                 "success": True,
                 "bins": data
             }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e)
-            }
+        
+        return await self._run("get_bins", (handle,),
+                               (covergroup, coverpoint, min_hits, max_hits, sort_by,
+                                cursor, limit), run)
     
     async def compare_databases(self, db_id: str, compare_db_id: str) -> Dict[str, Any]:
         """
@@ -355,21 +518,64 @@ class ToolImplementations:
                 "error": f"Comparison database not found: {compare_db_id}"
             }
         
-        try:
+        def run():
             from ucis.cmd.show.show_compare import ShowCompare
             
-            show_cmd = ShowCompare(handle1.db_obj, handle2.db_obj)
+            show_cmd = self._show_cmd(ShowCompare, handle1,
+                                      compare_db=handle2.path,
+                                      input_format=handle2.format_type)
+            show_cmd.compare_db = handle2.db_obj
             data = show_cmd.get_data()
             
             return {
                 "success": True,
                 "comparison": data
             }
-        except Exception as e:
+        
+        return await self._run("compare_databases", (handle1, handle2), (), run)
+    
+    async def diff_databases(self, db_id: str, compare_db_ids: Sequence[str],
+                             limit: Optional[int] = 100) -> Dict[str, Any]:
+        """
+        Diff a baseline database against one or more other databases.
+        
+        Args:
+            db_id: Baseline database ID
+            compare_db_ids: IDs of the databases to compare against it
+            limit: Maximum coveritem paths listed per category
+        
+        Returns:
+            Per-database differences and a cross-database summary
+        """
+        ids = [db_id] + list(compare_db_ids)
+        handles = [self.db_manager.get_database(i) for i in ids]
+        for i, handle in zip(ids, handles):
+            if not handle:
+                return {
+                    "success": False,
+                    "error": f"Database not found: {i}"
+                }
+        if len(handles) < 2:
             return {
                 "success": False,
-                "error": str(e)
+                "error": "At least one comparison database is required"
+            }
+        
+        def run():
+            from ucis.report.coverage_diff import CoverageDiff
+            
+            # NCDB files are read directly from disk (without building a
+            # database object); other formats use the open database
+            sources = [h.path if h.format_type == "ncdb" else h.db_obj
+                       for h in handles]
+            diff = CoverageDiff.load(sources, names=[h.path for h in handles])
+            
+            return {
+                "success": True,
+                "diff": diff.to_dict(limit=limit)
             }
+        
+        return await self._run("diff_databases", handles, (limit,), run)
     
     async def get_hotspots(self, db_id: str, threshold: float = 80.0, limit: int = 10) -> Dict[str, Any]:
         """
@@ -390,32 +596,36 @@ class ToolImplementations:
                 "error": f"Database not found: {db_id}"
             }
         
-        try:
+        def run():
             from ucis.cmd.show.show_hotspots import ShowHotspots
             
-            show_cmd = ShowHotspots(handle.db_obj, threshold=threshold, limit=limit)
+            show_cmd = self._show_cmd(ShowHotspots, handle, threshold=threshold, limit=limit)
             data = show_cmd.get_data()
             
             return {
                 "success": True,
                 "hotspots": data
             }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e)
-            }
+        
+        return await self._run("get_hotspots", (handle,), (threshold, limit), run)
     
-    async def get_code_coverage(self, db_id: str, output_format: str = "json") -> Dict[str, Any]:
+    async def get_code_coverage(self, db_id: str, output_format: str = "json",
+                                cursor: Optional[str] = None,
+                                limit: Optional[int] = None) -> Dict[str, Any]:
         """
-        Get code coverage with support for multiple export formats.
+        Get code coverage with support for multiple export formats, one
+        page of covergroups at a time.
         
         Args:
             db_id: Database ID
             output_format: Format (json, lcov, cobertura, jacoco, clover)
+            cursor: Continuation token from a previous page
+            limit: Maximum covergroups per page
         
         Returns:
-            Code coverage data
+            Code coverage data and ``next_cursor`` (None on the last page).
+            ``overall_coverage``, over all covergroups, is included on the
+            first page.
         """
         handle = self.db_manager.get_database(db_id)
         if not handle:
@@ -423,23 +633,54 @@ class ToolImplementations:
                 "success": False,
                 "error": f"Database not found: {db_id}"
             }
+        if limit is None:
+            limit = self.DEFAULT_COVERGROUP_LIMIT
         
-        try:
+        def run():
+            import itertools
             from ucis.cmd.show.show_code_coverage import ShowCodeCoverage
+            from ucis.report.coverage_report_builder import CoverageReportBuilder
             
-            show_cmd = ShowCodeCoverage(handle.db_obj, output_format=output_format)
-            data = show_cmd.get_data()
+            fp = query_fingerprint("get_code_coverage", handle.path, output_format)
+            offset = decode_cursor(cursor, fp)
+            
+            # Only the covergroups on this page are built; skipped ones are
+            # passed over by index
+            scopes = list(itertools.islice(
+                CoverageReportBuilder.covergroup_scopes(handle.db_obj),
+                offset, offset + limit + 1))
+            builder = CoverageReportBuilder(handle.db_obj)
+            covergroups = [builder.build_covergroup(cg) for cg in scopes[:limit]]
+            items = bound_page(
+                [ShowCodeCoverage.covergroup_data(cg) for cg in covergroups],
+                self.max_page_bytes)
+            end = offset + len(items)
+            more = len(items) < len(scopes)
+            
+            data = {
+                "database": handle.path,
+                "coverage_type": "functional",
+            }
+            if offset == 0 and not more:
+                div = sum(cg.weight for cg in covergroups)
+                data["overall_coverage"] = (sum(
+                    cg.coverage * cg.weight for cg in covergroups if cg.weight > 0
+                ) / div) if div > 0 else 0.0
+            elif offset == 0:
+                # Hit counts of the remaining covergroups suffice
+                data["overall_coverage"] = CoverageReportBuilder.overall_coverage(
+                    handle.db_obj)
+            data["covergroups"] = items
+            data["next_cursor"] = encode_cursor(fp, end) if more else None
             
             return {
                 "success": True,
                 "code_coverage": data,
                 "format": output_format
             }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e)
-            }
+        
+        return await self._run("get_code_coverage", (handle,),
+                               (output_format, cursor, limit), run)
     
     async def get_assertions(self, db_id: str) -> Dict[str, Any]:
         """
@@ -458,21 +699,18 @@ class ToolImplementations:
                 "error": f"Database not found: {db_id}"
             }
         
-        try:
+        def run():
             from ucis.cmd.show.show_assertions import ShowAssertions
             
-            show_cmd = ShowAssertions(handle.db_obj)
+            show_cmd = self._show_cmd(ShowAssertions, handle)
             data = show_cmd.get_data()
             
             return {
                 "success": True,
                 "assertions": data
             }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e)
-            }
+        
+        return await self._run("get_assertions", (handle,), (), run)
     
     async def get_toggle_coverage(self, db_id: str) -> Dict[str, Any]:
         """
@@ -491,18 +729,15 @@ class ToolImplementations:
                 "error": f"Database not found: {db_id}"
             }
         
-        try:
+        def run():
             from ucis.cmd.show.show_toggle import ShowToggle
             
-            show_cmd = ShowToggle(handle.db_obj)
+            show_cmd = self._show_cmd(ShowToggle, handle)
             data = show_cmd.get_data()
             
             return {
                 "success": True,
                 "toggle": data
             }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e)
-            }
+        
+        return await self._run("get_toggle_coverage", (handle,), (), run)
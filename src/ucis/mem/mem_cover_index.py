@@ -9,6 +9,8 @@ from ucis.source_info import SourceInfo
 
 class MemCoverIndex(CoverIndex):
     
+    __slots__ = ('name', 'data', 'srcinfo', '_attributes')
+    
     def __init__(self, 
                  name : str,
                  data : CoverData,
@@ -0,0 +1,346 @@
+'''
+Compact, array-backed coveritem storage for MemUCIS.
+
+In the default MemUCIS mode every bin is a MemCoverIndex holding its own
+CoverData and SourceInfo objects.  When a database is created with
+``MemUCIS(compact=True)`` each scope instead keeps its coveritems in a
+MemCoverStore: a set of parallel typed arrays (one element per bin) plus
+database-wide interning tables for bin names and source locations.
+
+MemCoverIndexView / MemCoverDataView are lightweight proxies produced on
+access; reads and writes go straight through to the arrays, so code written
+against the regular CoverIndex/CoverData API keeps working unchanged.
+'''
+from array import array
+from typing import Dict, List, Tuple
+
+from ucis.cover_data import CoverData
+from ucis.cover_index import CoverIndex
+from ucis.cover_type_t import CoverTypeT
+from ucis.source_info import SourceInfo
+
+
+class MemCoverTables(object):
+    """Database-wide interning tables shared by all MemCoverStore instances."""
+
+    __slots__ = ('names', 'name_m', 'srcinfos', 'srcinfo_m')
+
+    def __init__(self):
+        self.names : List[str] = []
+        self.name_m : Dict[str,int] = {}
+        self.srcinfos : List[SourceInfo] = []
+        self.srcinfo_m : Dict[Tuple,int] = {}
+
+    def intern_name(self, name : str) -> int:
+        if name is None:
+            return -1
+        ret = self.name_m.get(name)
+        if ret is None:
+            ret = len(self.names)
+            self.names.append(name)
+            self.name_m[name] = ret
+        return ret
+
+    def intern_srcinfo(self, srcinfo : SourceInfo) -> int:
+        if srcinfo is None:
+            return -1
+        key = (id(srcinfo.file), srcinfo.line, srcinfo.token)
+        ret = self.srcinfo_m.get(key)
+        if ret is None:
+            ret = len(self.srcinfos)
+            self.srcinfos.append(srcinfo)
+            self.srcinfo_m[key] = ret
+        return ret
+
+    def name(self, name_id : int) -> str:
+        return self.names[name_id] if name_id >= 0 else None
+
+    def srcinfo(self, srcinfo_id : int) -> SourceInfo:
+        return self.srcinfos[srcinfo_id] if srcinfo_id >= 0 else None
+
+
+class MemCoverStore(object):
+    """Parallel-array storage for the coveritems of a single scope.
+
+    Behaves like the ``List[MemCoverIndex]`` used by the default storage
+    mode (``len``, indexing, iteration, ``append``, ``pop``), yielding
+    MemCoverIndexView objects.  Rarely-used per-bin fields (limit, bitlen,
+    user attributes) are kept in a sparse side dict.
+    """
+
+    __slots__ = ('tables', 'counts', 'at_least', 'weight', 'goal',
+                 'type', 'flags', 'name_id', 'srcinfo_id', 'extra')
+
+    def __init__(self, tables : MemCoverTables):
+        self.tables = tables
+        self.counts = array('q')
+        self.at_least = array('q')
+        self.weight = array('q')
+        self.goal = array('q')
+        self.type = array('Q')
+        self.flags = array('Q')
+        self.name_id = array('l')
+        self.srcinfo_id = array('l')
+        # idx -> {field: value} for limit, bitlen and '_attributes'
+        self.extra : Dict[int,dict] = {}
+
+    def add(self, name : str, data : CoverData, srcinfo : SourceInfo) -> int:
+        """Append a coveritem and return its index within the scope.
+
+        The fields of *data* are copied into the arrays; later changes to
+        *data* are not seen by the store.  Modify the coveritem through the
+        view returned by indexing instead.
+        """
+        idx = len(self.counts)
+        tables = self.tables
+        self.name_id.append(tables.intern_name(name))
+        self.srcinfo_id.append(tables.intern_srcinfo(srcinfo))
+        self.counts.append(0)
+        self.at_least.append(1)
+        self.weight.append(0)
+        self.goal.append(0)
+        self.type.append(0)
+        self.flags.append(0)
+        if data is not None:
+            self.set_data(idx, data)
+        return idx
+
+    def add_bins(self, bins, srcinfo : SourceInfo, at_least : int,
+                 kind : CoverTypeT, flags : int):
+        """Append ``(name, count)`` coverpoint bins sharing the other fields.
+
+        Produces the same rows as :meth:`add` with a goal and weight of 1.
+        """
+        tables = self.tables
+        intern_name = tables.intern_name
+        n0 = len(self.counts)
+        for name, count in bins:
+            self.name_id.append(intern_name(name))
+            self.counts.append(count)
+        n = len(self.counts) - n0
+        self.srcinfo_id.extend([tables.intern_srcinfo(srcinfo)] * n)
+        self.at_least.extend([at_least] * n)
+        self.weight.extend([1] * n)
+        self.goal.extend([1] * n)
+        self.type.extend([int(kind)] * n)
+        self.flags.extend([int(flags)] * n)
+
+    def set_data(self, idx : int, data : CoverData):
+        self.counts[idx] = data.data
+        self.at_least[idx] = getattr(data, 'at_least', 1)
+        self.weight[idx] = data.weight
+        self.goal[idx] = data.goal
+        self.type[idx] = int(data.type) if data.type is not None else 0
+        self.flags[idx] = int(data.flags) if data.flags is not None else 0
+        for f in ('limit', 'bitlen'):
+            self._set_extra(idx, f, getattr(data, f, 0))
+
+    def get_extra(self, idx : int, field : str, dflt=None):
+        e = self.extra.get(idx)
+        return e.get(field, dflt) if e is not None else dflt
+
+    def _set_extra(self, idx : int, field : str, value):
+        if not value and idx not in self.extra:
+            return
+        self.extra.setdefault(idx, {})[field] = value
+
+    def append(self, item : CoverIndex):
+        """Append an existing CoverIndex (list-compatible)."""
+        self.add(item.getName(), item.getCoverData(), item.getSourceInfo())
+
+    def pop(self, idx : int = -1) -> CoverIndex:
+        """Remove a coveritem and return it (list-compatible).
+
+        The returned view is backed by a detached single-row store, so it
+        keeps every field of the removed coveritem.
+        """
+        n = len(self.counts)
+        if idx < 0:
+            idx += n
+        if not 0 <= idx < n:
+            raise IndexError("coveritem index out of range")
+        row = MemCoverStore(self.tables)
+        for col in ('counts', 'at_least', 'weight', 'goal', 'type', 'flags',
+                    'name_id', 'srcinfo_id'):
+            getattr(row, col).append(getattr(self, col)[idx])
+        if idx in self.extra:
+            row.extra[0] = self.extra[idx]
+        ret = MemCoverIndexView(row, 0)
+        for col in (self.counts, self.at_least, self.weight, self.goal,
+                    self.type, self.flags, self.name_id, self.srcinfo_id):
+            col.pop(idx)
+        # Re-key sparse fields above the removed index
+        self.extra = {(k if k < idx else k - 1): v
+                      for k, v in self.extra.items() if k != idx}
+        return ret
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [MemCoverIndexView(self, i)
+                    for i in range(*idx.indices(len(self.counts)))]
+        n = len(self.counts)
+        if idx < 0:
+            idx += n
+        if not 0 <= idx < n:
+            raise IndexError("coveritem index out of range")
+        return MemCoverIndexView(self, idx)
+
+    def __iter__(self):
+        for i in range(len(self.counts)):
+            yield MemCoverIndexView(self, i)
+
+    def __bool__(self):
+        return len(self.counts) > 0
+
+
+class MemCoverDataView(CoverData):
+    """CoverData proxy that reads and writes one row of a MemCoverStore."""
+
+    __slots__ = ('_store', '_idx')
+
+    def __init__(self, store : MemCoverStore, idx : int):
+        # Intentionally does not call CoverData.__init__: all fields are
+        # properties backed by the store.
+        self._store = store
+        self._idx = idx
+
+    @property
+    def type(self):
+        return CoverTypeT(self._store.type[self._idx])
+
+    @type.setter
+    def type(self, v):
+        self._store.type[self._idx] = int(v)
+
+    @property
+    def flags(self):
+        return self._store.flags[self._idx]
+
+    @flags.setter
+    def flags(self, v):
+        self._store.flags[self._idx] = int(v)
+
+    @property
+    def data(self):
+        return self._store.counts[self._idx]
+
+    @data.setter
+    def data(self, v):
+        self._store.counts[self._idx] = v
+
+    @property
+    def goal(self):
+        return self._store.goal[self._idx]
+
+    @goal.setter
+    def goal(self, v):
+        self._store.goal[self._idx] = v
+
+    @property
+    def weight(self):
+        return self._store.weight[self._idx]
+
+    @weight.setter
+    def weight(self, v):
+        self._store.weight[self._idx] = v
+
+    @property
+    def at_least(self):
+        return self._store.at_least[self._idx]
+
+    @at_least.setter
+    def at_least(self, v):
+        self._store.at_least[self._idx] = v
+
+    @property
+    def limit(self):
+        return self._store.get_extra(self._idx, 'limit', 0)
+
+    @limit.setter
+    def limit(self, v):
+        self._store._set_extra(self._idx, 'limit', v)
+
+    @property
+    def bitlen(self):
+        return self._store.get_extra(self._idx, 'bitlen', 0)
+
+    @bitlen.setter
+    def bitlen(self, v):
+        self._store._set_extra(self._idx, 'bitlen', v)
+
+
+class MemCoverIndexView(CoverIndex):
+    """CoverIndex proxy for one row of a MemCoverStore.
+
+    Views are created on access and are not cached, so two views of the same
+    bin compare equal but are not identical.  A view's index is not adjusted
+    if an earlier coveritem is later removed from the scope.
+    """
+
+    __slots__ = ('_store', '_idx')
+
+    def __init__(self, store : MemCoverStore, idx : int):
+        self._store = store
+        self._idx = idx
+
+    def __eq__(self, other):
+        return (isinstance(other, MemCoverIndexView)
+                and other._store is self._store and other._idx == self._idx)
+
+    def __hash__(self):
+        return hash((id(self._store), self._idx))
+
+    @property
+    def name(self) -> str:
+        return self._store.tables.name(self._store.name_id[self._idx])
+
+    @property
+    def data(self) -> CoverData:
+        return MemCoverDataView(self._store, self._idx)
+
+    @property
+    def srcinfo(self) -> SourceInfo:
+        return self._store.tables.srcinfo(self._store.srcinfo_id[self._idx])
+
+    def getName(self) -> str:
+        return self.name
+
+    def getCoverData(self) -> CoverData:
+        return MemCoverDataView(self._store, self._idx)
+
+    def getSourceInfo(self) -> SourceInfo:
+        return self.srcinfo
+
+    def incrementCover(self, amt=1):
+        self._store.counts[self._idx] += amt
+
+    def setCoverData(self, data : CoverData):
+        """Replace the cover data for this item."""
+        self._store.set_data(self._idx, data)
+
+    def getCoverFlags(self) -> int:
+        return self._store.flags[self._idx]
+
+    def setCoverFlags(self, flags : int):
+        self._store.flags[self._idx] = int(flags)
+
+    def setAttribute(self, key : str, value : str):
+        """Set a user-defined attribute on this coveritem."""
+        attrs = self._store.get_extra(self._idx, '_attributes')
+        if attrs is None:
+            attrs = {}
+            self._store._set_extra(self._idx, '_attributes', attrs)
+        attrs[key] = value
+
+    def getAttribute(self, key : str):
+        """Get a user-defined attribute by key."""
+        attrs = self._store.get_extra(self._idx, '_attributes')
+        return attrs.get(key) if attrs is not None else None
+
+    def getAttributes(self):
+        """Get all user-defined attributes as a dict."""
+        attrs = self._store.get_extra(self._idx, '_attributes')
+        return dict(attrs) if attrs is not None else {}
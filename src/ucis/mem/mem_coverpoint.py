@@ -4,14 +4,21 @@ Created on Mar 22, 2020
 @author: ballance
 '''
 from ucis import UCIS_COVERPOINT
+from ucis.cover_data import CoverData
+from ucis.cover_flags_t import CoverFlagsT
 from ucis.cover_index import CoverIndex
+from ucis.cover_type_t import CoverTypeT
 from ucis.coverpoint import Coverpoint
+from ucis.mem.mem_cover_index import MemCoverIndex
+from ucis.mem.mem_cover_store import MemCoverStore
 from ucis.mem.mem_cvg_scope import MemCvgScope
 from ucis.source_info import SourceInfo
 
 
 class MemCoverpoint(MemCvgScope,Coverpoint):
     
+    __slots__ = ()
+    
     def __init__(self,
                  parent,
                  name : str,
@@ -21,5 +28,21 @@ class MemCoverpoint(MemCvgScope,Coverpoint):
         MemCvgScope.__init__(self, parent, name, srcinfo, weight, source, 
                              UCIS_COVERPOINT, 0)
         Coverpoint.__init__(self)
-        
-        
\ No newline at end of file
+
+    def createBins(self, bins, srcinfo : SourceInfo = None,
+                   at_least : int = 1, kind = CoverTypeT.CVGBIN):
+        flags = CoverFlagsT.IS_32BIT|CoverFlagsT.HAS_GOAL|CoverFlagsT.HAS_WEIGHT
+        if self.m_cover_tables is not None:
+            items = self.m_cover_items
+            if not isinstance(items, MemCoverStore):
+                items = self._make_cover_store()
+            items.add_bins(bins, srcinfo, at_least, kind, flags)
+            return
+        items = self.m_cover_items
+        for name, count in bins:
+            coverdata = CoverData(kind, flags)
+            coverdata.data = count
+            coverdata.at_least = at_least
+            coverdata.goal = 1
+            coverdata.weight = 1
+            items.append(MemCoverIndex(name, coverdata, srcinfo))
@@ -8,6 +8,9 @@ from ucis.cvg_scope import CvgScope
 
 class MemCvgScope(MemScope,CvgScope):
     
+    __slots__ = ('m_at_least', 'm_auto_bin_max', 'm_detect_overlap',
+                 'm_strobe', 'm_comment', 'm_get_inst_coverage')
+    
     def __init__(self,
                  parent,
                  name,
@@ -28,11 +28,12 @@ class MemFactory():
     
     
     @staticmethod
-    def create() -> UCIS:
+    def create(compact : bool = False) -> UCIS:
         """
-        Creates a new in-memory database. 
+        Creates a new in-memory database. When compact is True, coveritems
+        are stored in array-backed form to reduce memory use.
         """
-        return MemUCIS()
+        return MemUCIS(compact=compact)
     
     
     @staticmethod
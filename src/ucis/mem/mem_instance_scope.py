@@ -77,8 +77,7 @@ class MemInstanceScope(MemScope,InstanceScope):
         ci = MemCoverItem(self, name, data, sourceinfo)
         self.m_cover_item_l.append(ci)
         # Also track in parent's m_cover_items for coverItems() iteration
-        from ucis.mem.mem_cover_index import MemCoverIndex
-        self.m_cover_items.append(MemCoverIndex(name, data, sourceinfo))
+        MemScope.createNextCover(self, name, data, sourceinfo)
         return ret
     
     def createToggle(self,
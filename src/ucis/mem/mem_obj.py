@@ -26,6 +26,8 @@ from ucis.str_property import StrProperty
 
 class MemObj(Obj):
     
+    __slots__ = ('_str_properties',)
+    
     def __init__(self):
         Obj.__init__(self)
         self._str_properties = {}
@@ -38,11 +38,17 @@ from ucis.toggle_type_t import ToggleTypeT
 from ucis.unimpl_error import UnimplError
 
 from ucis.mem.mem_cover_index import MemCoverIndex
+from ucis.mem.mem_cover_store import MemCoverStore
 from ucis.mem.mem_cover_index_iterator import MemCoverIndexIterator
 
 
 class MemScope(MemObj,Scope):
     
+    __slots__ = ('m_parent', 'm_name', 'm_srcinfo', 'm_weight', 'm_source',
+                 'm_type', 'm_flags', 'm_goal', 'm_source_type', 'm_is_under_du',
+                 'm_children', 'm_cover_items', 'm_cover_tables',
+                 '_attributes', '_tags')
+    
     def __init__(self,
                  parent : 'MemScope',
                  name : str,
@@ -64,6 +70,9 @@ class MemScope(MemObj,Scope):
         self.m_is_under_du = 0
         self.m_children = []
         self.m_cover_items : List['CoverIndex'] = []
+        # Non-None when the owning database uses compact (array-backed)
+        # coveritem storage. Shared by every scope in the database.
+        self.m_cover_tables = getattr(parent, 'm_cover_tables', None)
         
     def addChild(self, c):
         self.m_children.append(c)
@@ -139,10 +148,24 @@ class MemScope(MemObj,Scope):
         name:str, 
         data:CoverData, 
         sourceinfo:SourceInfo)->CoverIndex:
+        if self.m_cover_tables is not None:
+            items = self.m_cover_items
+            if not isinstance(items, MemCoverStore):
+                items = self._make_cover_store()
+            return items[items.add(name, data, sourceinfo)]
         ret = MemCoverIndex(name, data, sourceinfo)
         self.m_cover_items.append(ret)
         return ret
 
+    def _make_cover_store(self) -> MemCoverStore:
+        # Array storage is only allocated once a scope receives its first
+        # coveritem, so pure hierarchy scopes stay small.
+        store = MemCoverStore(self.m_cover_tables)
+        for item in self.m_cover_items:
+            store.append(item)
+        self.m_cover_items = store
+        return store
+
     def createScope(self,
                 name : str,
                 srcinfo : SourceInfo,
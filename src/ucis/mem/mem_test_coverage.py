@@ -3,7 +3,9 @@ MemTestCoverage — in-memory per-test contribution query API.
 
 Mirrors the SqliteTestCoverage interface so callers can work with either
 backend identically.  Operates on MemUCIS._per_test_data which maps
-history_idx → {bin_index → count}.
+history_idx → {bin_index → count}.  When that mapping is an NCDB
+ContribStore, its bin→tests index answers the per-bin queries without
+decoding every test's contributions.
 """
 
 from typing import List, Optional, Tuple
@@ -53,6 +55,13 @@ class MemTestCoverage:
             return nodes[history_idx].getLogicalName()
         return None
 
+    def _bin_counts(self, history_idx: int) -> dict:
+        per_test = self._db._per_test_data
+        if hasattr(per_test, "bin_counts"):
+            # Leaves an encoded ContribStore row encoded
+            return per_test.bin_counts(history_idx)
+        return per_test.get(history_idx, {})
+
     def _total_bins(self) -> int:
         """Count total bins across all scopes (same order as counts.bin)."""
         from ucis.ncdb.dfs_util import dfs_scope_list
@@ -70,10 +79,15 @@ class MemTestCoverage:
 
     def get_tests_for_coveritem(self, bin_index: int) -> CoverItemTestInfo:
         """Find all tests that contributed to *bin_index*."""
+        per_test = self._db._per_test_data
+        if hasattr(per_test, "tests_for_bin"):
+            hits = per_test.tests_for_bin(bin_index)
+        else:
+            hits = [(hist_idx, bin_counts.get(bin_index, 0))
+                    for hist_idx, bin_counts in per_test.items()]
         tests = []
         total_hits = 0
-        for hist_idx, bin_counts in self._db._per_test_data.items():
-            count = bin_counts.get(bin_index, 0)
+        for hist_idx, count in hits:
             if count:
                 name = self._history_name(hist_idx) or str(hist_idx)
                 tests.append((hist_idx, name, count))
@@ -83,13 +97,16 @@ class MemTestCoverage:
 
     def get_coveritems_for_test(self, history_idx: int) -> List[int]:
         """Return all bin indices hit by the test at *history_idx*."""
-        return sorted(self._db._per_test_data.get(history_idx, {}).keys())
+        return sorted(self._bin_counts(history_idx).keys())
 
     def get_unique_coveritems(self, history_idx: int) -> List[int]:
         """Return bin indices hit ONLY by *history_idx* (not any other test)."""
-        my_bins = set(self._db._per_test_data.get(history_idx, {}).keys())
+        per_test = self._db._per_test_data
+        if hasattr(per_test, "unique_bins"):
+            return per_test.unique_bins(history_idx)
+        my_bins = set(per_test.get(history_idx, {}).keys())
         other_bins: set = set()
-        for idx, bin_counts in self._db._per_test_data.items():
+        for idx, bin_counts in per_test.items():
             if idx != history_idx:
                 other_bins.update(bin_counts.keys())
         return sorted(my_bins - other_bins)
@@ -99,7 +116,7 @@ class MemTestCoverage:
         name = self._history_name(history_idx)
         if name is None:
             return None
-        bin_counts = self._db._per_test_data.get(history_idx, {})
+        bin_counts = self._bin_counts(history_idx)
         total_items = len(bin_counts)
         total_contribution = sum(bin_counts.values())
         unique_items = len(self.get_unique_coveritems(history_idx))
@@ -33,6 +33,7 @@ from ..mem.mem_du_scope import MemDUScope
 from ..mem.mem_history_node import MemHistoryNode
 from ..mem.mem_instance_coverage import MemInstanceCoverage
 from ..mem.mem_instance_scope import MemInstanceScope
+from ..mem.mem_cover_store import MemCoverTables
 from ..mem.mem_scope import MemScope
 from ..mem.mem_source_file import MemSourceFile
 from ..scope_type_t import ScopeTypeT
@@ -45,8 +46,15 @@ from ucis.unimpl_error import UnimplError
 
 
 class MemUCIS(MemScope,UCIS):
+    """In-memory UCIS database.
+
+    When *compact* is True, coveritems are stored in per-scope parallel
+    arrays (see MemCoverStore) rather than as individual MemCoverIndex and
+    CoverData objects. This trades a small per-access cost for a much
+    smaller heap footprint on databases with millions of bins.
+    """
     
-    def __init__(self):
+    def __init__(self, compact : bool = False):
         MemScope.__init__(
             self,
             None,
@@ -57,6 +65,7 @@ class MemUCIS(MemScope,UCIS):
             ScopeTypeT.RESERVEDSCOPE,
             0)
         UCIS.__init__(self)
+        self.m_cover_tables = MemCoverTables() if compact else None
         self.ucis_version = "1.0"
         self.writtenBy = getpass.getuser()
         self.writtenTime = int(datetime.timestamp(datetime.now()))
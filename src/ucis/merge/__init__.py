@@ -17,3 +17,4 @@
 # under the License.
 
 from .db_merger import *
+from .scope_accumulator import ScopeAccumulator
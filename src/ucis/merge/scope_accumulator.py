@@ -0,0 +1,198 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Incremental merge of functional-coverage trees, one database at a time.
+
+DbMerger merges all of its source databases in a single call and expects
+the instance -> covergroup -> coverinstance -> coverpoint layout written by
+simulators.  Batch imports of cocotb-coverage and AVL files need something
+different: the trees those readers build nest covergroups, and thousands of
+small databases should be folded into the result as they are read rather
+than all held in memory first.
+
+ScopeAccumulator keeps a destination database and adds source databases
+into it.  Scopes are matched by (type, name) under their parent and created
+when missing; the counts of coveritems with the same (name, type) are
+summed, and new coveritems are created in batches with ``createBins``.
+"""
+
+from typing import Dict, List, Tuple
+
+from ucis import UCIS_OTHER, UCIS_INSTANCE, UCIS_DU_MODULE, UCIS_ENABLED_STMT, \
+    UCIS_ENABLED_BRANCH, UCIS_ENABLED_COND, UCIS_ENABLED_EXPR, UCIS_ENABLED_FSM, \
+    UCIS_ENABLED_TOGGLE, UCIS_INST_ONCE, UCIS_SCOPE_UNDER_DU
+from ucis.cover_data import CoverData
+from ucis.cover_type_t import CoverTypeT
+from ucis.coverpoint import Coverpoint
+from ucis.mem.mem_ucis import MemUCIS
+from ucis.scope_type_t import ScopeTypeT
+from ucis.ucis import UCIS
+
+
+class ScopeAccumulator(object):
+    """Sums coverage databases into one destination database.
+
+    Args:
+        db: Destination database; a new MemUCIS when None.
+    """
+
+    def __init__(self, db : UCIS = None):
+        self.db = MemUCIS() if db is None else db
+        # id(dst scope) -> {(scope type, name): dst child scope}
+        self._children : Dict[int, Dict[Tuple, object]] = {}
+        # id(dst scope) -> {(name, cover type): dst coveritem}
+        self._items : Dict[int, Dict[Tuple, object]] = {}
+        # Destination scopes are kept alive, so that the ids stay unique
+        self._scopes : List[object] = []
+
+    def add(self, src_db : UCIS):
+        """Add the coverage of *src_db* into the destination database."""
+        for src_iscope in src_db.scopes(ScopeTypeT.INSTANCE):
+            key = (ScopeTypeT.INSTANCE, src_iscope.getScopeName())
+            children = self._child_map(self.db)
+            dst_iscope = children.get(key)
+            if dst_iscope is None:
+                dst_iscope = self._create_instance(src_iscope)
+                children[key] = dst_iscope
+            self._add_scope(dst_iscope, src_iscope)
+
+    def _create_instance(self, src_iscope):
+        src_du = src_iscope.getInstanceDu()
+        dst_du = self.db.createScope(
+            src_du.getScopeName(),
+            src_du.getSourceInfo(),
+            src_du.getWeight(),
+            UCIS_OTHER,
+            UCIS_DU_MODULE,
+            UCIS_ENABLED_STMT | UCIS_ENABLED_BRANCH
+            | UCIS_ENABLED_COND | UCIS_ENABLED_EXPR
+            | UCIS_ENABLED_FSM | UCIS_ENABLED_TOGGLE
+            | UCIS_INST_ONCE | UCIS_SCOPE_UNDER_DU)
+        return self.db.createInstance(
+            src_iscope.getScopeName(),
+            src_iscope.getSourceInfo(),
+            src_iscope.getWeight(),
+            UCIS_OTHER,
+            UCIS_INSTANCE,
+            dst_du,
+            UCIS_INST_ONCE)
+
+    def _child_map(self, dst_scope) -> Dict[Tuple, object]:
+        ret = self._children.get(id(dst_scope))
+        if ret is None:
+            ret = {}
+            for child in dst_scope.scopes(ScopeTypeT.ALL):
+                ret.setdefault((child.getScopeType(), child.getScopeName()), child)
+            self._children[id(dst_scope)] = ret
+            self._scopes.append(dst_scope)
+        return ret
+
+    def _add_scope(self, dst_scope, src_scope):
+        children = self._child_map(dst_scope)
+        for src_child in src_scope.scopes(ScopeTypeT.ALL):
+            key = (src_child.getScopeType(), src_child.getScopeName())
+            if key[0] == ScopeTypeT.INSTANCE:
+                # Nested instances are matched at the top level only
+                continue
+            dst_child = children.get(key)
+            if dst_child is None:
+                dst_child = self._create_scope(dst_scope, children, src_child)
+                children[key] = dst_child
+            self._add_scope(dst_child, src_child)
+        self._add_items(dst_scope, src_scope)
+
+    def _create_scope(self, dst_parent, siblings, src):
+        name = src.getScopeName()
+        srcinfo = src.getSourceInfo()
+        weight = src.getWeight()
+        scope_t = src.getScopeType()
+        if scope_t == ScopeTypeT.COVERGROUP:
+            return dst_parent.createCovergroup(name, srcinfo, weight, UCIS_OTHER)
+        elif scope_t == ScopeTypeT.COVERINSTANCE:
+            return dst_parent.createCoverInstance(name, srcinfo, weight, UCIS_OTHER)
+        elif scope_t == ScopeTypeT.COVERPOINT:
+            return dst_parent.createCoverpoint(name, srcinfo, weight, UCIS_OTHER)
+        elif scope_t == ScopeTypeT.CROSS:
+            coverpoint_l = []
+            for i in range(src.getNumCrossedCoverpoints()):
+                cp_name = src.getIthCrossedCoverpoint(i).getScopeName()
+                dst_cp = siblings.get((ScopeTypeT.COVERPOINT, cp_name))
+                if dst_cp is None:
+                    raise Exception("Cannot find coverpoint %s when creating cross %s" % (
+                        cp_name, name))
+                coverpoint_l.append(dst_cp)
+            return dst_parent.createCross(name, srcinfo, weight, UCIS_OTHER,
+                                          coverpoint_l)
+        else:
+            return dst_parent.createScope(name, srcinfo, weight, UCIS_OTHER,
+                                          scope_t, 0)
+
+    def _add_items(self, dst_scope, src_scope):
+        items = self._items.get(id(dst_scope))
+        new_runs = []       # [(cover type, at_least, [(name, count)])]
+        for ci in src_scope.coverItems(CoverTypeT.ALL):
+            if items is None:
+                items = {}
+                for dst_ci in dst_scope.coverItems(CoverTypeT.ALL):
+                    items.setdefault(
+                        (dst_ci.getName(), int(dst_ci.getCoverData().type)), dst_ci)
+                self._items[id(dst_scope)] = items
+            cvg_data = ci.getCoverData()
+            key = (ci.getName(), int(cvg_data.type))
+            dst_ci = items.get(key)
+            if dst_ci is not None:
+                dst_ci.incrementCover(cvg_data.data)
+                continue
+            if not isinstance(dst_scope, Coverpoint):
+                # Code-coverage and other non-bin items: one at a time
+                items[key] = dst_scope.createNextCover(
+                    key[0], _copy_data(cvg_data), None)
+                continue
+            run_key = (cvg_data.type, cvg_data.at_least)
+            if not new_runs or new_runs[-1][:2] != run_key:
+                new_runs.append(run_key + ([],))
+            new_runs[-1][2].append((key[0], cvg_data.data))
+            # Repeated names within one source are merged into the first
+            items[key] = _PendingItem(new_runs[-1][2], len(new_runs[-1][2]) - 1)
+
+        if new_runs:
+            for cover_t, at_least, bins in new_runs:
+                dst_scope.createBins(bins, None, at_least, cover_t)
+            # Rebuilt on next use, now with the items just created
+            del self._items[id(dst_scope)]
+
+
+def _copy_data(src) -> CoverData:
+    ret = CoverData(src.type, src.flags)
+    for f in ('data', 'goal', 'weight', 'limit', 'bitlen', 'at_least'):
+        setattr(ret, f, getattr(src, f))
+    return ret
+
+
+class _PendingItem(object):
+    """Stands in for a coveritem queued for creation by ``createBins``."""
+
+    __slots__ = ('bins', 'idx')
+
+    def __init__(self, bins, idx):
+        self.bins = bins
+        self.idx = idx
+
+    def incrementCover(self, amt=1):
+        name, count = self.bins[self.idx]
+        self.bins[self.idx] = (name, count + amt)
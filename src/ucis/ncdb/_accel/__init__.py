@@ -1,10 +1,12 @@
 """
 _accel/__init__.py — transparent shim for the ncdb C accelerator.
 
-Exports three functions that are used by varint.py and counts.py:
+Exports four functions that are used by varint.py, counts.py and
+string_table.py:
   - encode_varints(values) -> bytes
   - decode_varints(data, count, offset) -> (list[int], int)
   - add_uint32_arrays(a, b) -> list[int]
+  - expand_front_coded(shared, suffix_lens, suffixes, sep) -> bytes
 
 When the compiled extension (_ncdb_accel.so) is available, these delegate
 to the C implementation.  When not available, they fall back to pure Python
@@ -26,7 +28,13 @@ _HERE = os.path.dirname(os.path.abspath(__file__))
 _lib = None
 _ffi = None
 
+# Only pay for importing cffi and parsing the cdef when there is a compiled
+# library to bind to.
+_so_matches = sorted(glob.glob(os.path.join(_HERE, "_ncdb_accel*.so")))
+
 try:
+    if not _so_matches:
+        raise ImportError("ncdb accelerator not built")
     import cffi as _cffi_mod
     _ffi = _cffi_mod.FFI()
     _ffi.cdef(r"""
@@ -37,10 +45,12 @@ try:
                                  uint64_t *out_values);
         void ncdb_add_uint32_arrays(const uint32_t *a, const uint32_t *b,
                                     size_t count, uint32_t *out);
+        int64_t ncdb_expand_front_coded(const uint64_t *shared,
+                                        const uint64_t *suffix_len, size_t count,
+                                        const uint8_t *suffixes, size_t suffixes_len,
+                                        int sep, uint8_t *out, size_t out_cap);
     """)
-    _so_matches = sorted(glob.glob(os.path.join(_HERE, "_ncdb_accel*.so")))
-    if _so_matches:
-        _lib = _ffi.dlopen(_so_matches[-1])
+    _lib = _ffi.dlopen(_so_matches[-1])
 except Exception:
     pass
 
@@ -63,21 +73,20 @@ if HAS_ACCEL:
 else:
     def encode_varints(values) -> bytes:
         """Encode a sequence of non-negative ints as LEB128 (pure Python)."""
-        parts = []
+        out = bytearray()
+        append = out.append
         for value in values:
-            if value < 0:
-                raise ValueError(f"varint requires non-negative integer, got {value}")
-            result = []
-            while True:
-                byte = value & 0x7F
+            if value < 0x80:
+                if value < 0:
+                    raise ValueError(
+                        f"varint requires non-negative integer, got {value}")
+                append(value)
+                continue
+            while value >= 0x80:
+                append((value & 0x7F) | 0x80)
                 value >>= 7
-                if value != 0:
-                    byte |= 0x80
-                result.append(byte)
-                if value == 0:
-                    break
-            parts.append(bytes(result))
-        return b"".join(parts)
+            append(value)
+        return bytes(out)
 
 # ── decode_varints ─────────────────────────────────────────────────────────
 
@@ -102,20 +111,32 @@ else:
 
         Returns (list[int], new_offset).
         """
+        end = offset + count
+        run = data[offset:end]
+        if len(run) == count and (not run or max(run) < 0x80):
+            # All single-byte values (the common case for small fields)
+            return list(run), end
         values = []
-        for _ in range(count):
-            result = 0
-            shift = 0
-            while True:
-                if offset >= len(data):
-                    raise ValueError("Buffer too short for varint")
+        append = values.append
+        try:
+            for _ in range(count):
                 byte = data[offset]
                 offset += 1
-                result |= (byte & 0x7F) << shift
-                shift += 7
-                if not (byte & 0x80):
-                    break
-            values.append(result)
+                if byte < 0x80:
+                    append(byte)
+                    continue
+                result = byte & 0x7F
+                shift = 7
+                while True:
+                    byte = data[offset]
+                    offset += 1
+                    result |= (byte & 0x7F) << shift
+                    if byte < 0x80:
+                        break
+                    shift += 7
+                append(result)
+        except IndexError:
+            raise ValueError("Buffer too short for varint") from None
         return values, offset
 
 # ── add_uint32_arrays ──────────────────────────────────────────────────────
@@ -133,3 +154,50 @@ else:
     def add_uint32_arrays(a, b) -> list:
         """Element-wise sum of two equal-length int sequences (pure Python)."""
         return [x + y for x, y in zip(a, b)]
+
+# ── expand_front_coded ─────────────────────────────────────────────────────
+
+if HAS_ACCEL:
+    def expand_front_coded(shared, suffix_lens, suffixes: bytes,
+                           sep: bytes = b"") -> bytes:
+        """Rebuild front-coded byte strings (C-accelerated).
+
+        String i is ``shared[i]`` bytes of string i-1 followed by the next
+        ``suffix_lens[i]`` bytes of *suffixes*.  Returns the strings
+        concatenated, each followed by *sep* (empty or one byte).
+        """
+        n = len(shared)
+        cap = sum(shared) + len(suffixes) + n * len(sep)
+        out = _ffi.new("uint8_t[]", max(cap, 1))
+        written = _lib.ncdb_expand_front_coded(
+            _ffi.new("uint64_t[]", shared), _ffi.new("uint64_t[]", suffix_lens),
+            n, _ffi.from_buffer(suffixes), len(suffixes),
+            sep[0] if sep else -1, out, cap)
+        if written < 0:
+            raise ValueError("ncdb_expand_front_coded: malformed front coding")
+        return bytes(_ffi.buffer(out, written))
+else:
+    def expand_front_coded(shared, suffix_lens, suffixes: bytes,
+                           sep: bytes = b"") -> bytes:
+        """Rebuild front-coded byte strings (pure Python).
+
+        String i is ``shared[i]`` bytes of string i-1 followed by the next
+        ``suffix_lens[i]`` bytes of *suffixes*.  Returns the strings
+        concatenated, each followed by *sep* (empty or one byte).
+        """
+        out = []
+        append = out.append
+        prev = b""
+        pos = 0
+        for n, m in zip(shared, suffix_lens):
+            if n > len(prev):
+                raise ValueError("expand_front_coded: malformed front coding")
+            end = pos + m
+            prev = prev[:n] + suffixes[pos:end] if n else suffixes[pos:end]
+            pos = end
+            append(prev)
+        if pos > len(suffixes):
+            raise ValueError("expand_front_coded: malformed front coding")
+        if sep:
+            append(b"")
+        return sep.join(out)
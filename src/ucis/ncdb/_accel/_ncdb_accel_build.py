@@ -41,6 +41,10 @@ int  ncdb_decode_varints(const uint8_t *data, size_t data_len,
                          uint64_t *out_values);
 void ncdb_add_uint32_arrays(const uint32_t *a, const uint32_t *b,
                             size_t count, uint32_t *out);
+int64_t ncdb_expand_front_coded(const uint64_t *shared,
+                                const uint64_t *suffix_len, size_t count,
+                                const uint8_t *suffixes, size_t suffixes_len,
+                                int sep, uint8_t *out, size_t out_cap);
 """
 
 
@@ -79,3 +79,39 @@ void ncdb_add_uint32_arrays(const uint32_t *a, const uint32_t *b,
         out[i] = a[i] + b[i];
     }
 }
+
+
+/* ── ncdb_expand_front_coded ──────────────────────────────────────────────
+ *
+ * Rebuild 'count' front-coded strings (see string_table.py).  String i is
+ * the first shared[i] bytes of string i-1 followed by the next
+ * suffix_len[i] bytes of 'suffixes'.  The strings are written to 'out'
+ * back to back, each followed by the byte 'sep' unless 'sep' is negative.
+ *
+ * Returns the number of bytes written, or -1 if a shared length exceeds
+ * the previous string or 'suffixes' / 'out' would be overrun.
+ */
+int64_t ncdb_expand_front_coded(const uint64_t *shared,
+                                const uint64_t *suffix_len, size_t count,
+                                const uint8_t *suffixes, size_t suffixes_len,
+                                int sep, uint8_t *out, size_t out_cap)
+{
+    size_t pos = 0;         /* write position in out */
+    size_t src = 0;         /* read position in suffixes */
+    size_t prev = 0;        /* start of the previous string in out */
+    size_t prev_len = 0;
+    for (size_t i = 0; i < count; i++) {
+        uint64_t n = shared[i];
+        uint64_t m = suffix_len[i];
+        if (n > prev_len || m > suffixes_len - src) return -1;
+        if (n + m + (sep >= 0) > out_cap - pos) return -1;
+        memcpy(out + pos, out + prev, n);
+        memcpy(out + pos + n, suffixes + src, m);
+        src += m;
+        prev = pos;
+        prev_len = n + m;
+        pos += prev_len;
+        if (sep >= 0) out[pos++] = (uint8_t)sep;
+    }
+    return (int64_t)pos;
+}
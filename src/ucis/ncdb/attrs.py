@@ -1,57 +1,81 @@
 """
 attrs.bin — user-defined attribute serialization.
 
-Format v1 (legacy): JSON object
-  {"version": 1, "entries": [{"idx": <int>, "attrs": {<key>: <val>}}, ...]}
+Format v3 (current), all fields varints:
+  version          (3)
+  string header    (see string_table.encode_member_strings)
+  num_scopes, num_coveritems, num_history, num_global
+  scopes:      delta_idx × num_scopes, num_attrs × num_scopes
+  coveritems:  delta_scope_idx × num_coveritems, ci_idx × num_coveritems,
+               num_attrs × num_coveritems
+  history:     kind × num_history (HistoryNodeKind), idx × num_history,
+               num_attrs × num_history
+  attrs:       (key, value) pairs of the scopes, coveritems and history
+               entries in that order, then the num_global global pairs
+    key:   string index
+    value: string index << 1, with bit 0 set when the string is the JSON
+           encoding of a non-string value
 
-Format v2 (current): JSON object with sections for scopes, coveritems,
-history nodes, and global attrs.
+Format v2 (legacy, still read): JSON object with sections for scopes,
+coveritems, history nodes, and global attrs.
   {"version": 2,
    "scopes": [{"idx": <int>, "attrs": {<key>: <val>}}, ...],
    "coveritems": [{"scope_idx": <int>, "ci_idx": <int>, "attrs": {...}}, ...],
    "history": [{"idx": <int>, "attrs": {...}}, ...],
    "global": {<key>: <val>}}
+
+Format v1 (legacy, still read): JSON object
+  {"version": 1, "entries": [{"idx": <int>, "attrs": {<key>: <val>}}, ...]}
 """
 
 import json
 
-from .dfs_util import dfs_scope_list
+from .dfs_util import DfsScopeSerializer, dfs_scope_list
+from .string_table import (
+    StringTable, decode_member_strings, encode_member_strings,
+)
+from .varint import decode_varint, decode_varints, encode_varint, encode_varints
 from ucis.history_node_kind import HistoryNodeKind
 
-_VERSION = 2
+_VERSION = 3
 _COVER_ALL = 0xFFFFFFFF
+_HISTORY_KINDS = (HistoryNodeKind.TEST, HistoryNodeKind.MERGE)
 
 
-class AttrsWriter:
-    """Serialize user-defined attributes to attrs.bin bytes."""
+class AttrsWriter(DfsScopeSerializer):
+    """Serialize user-defined attributes to attrs.bin bytes.
 
-    def serialize(self, db) -> bytes:
-        scopes = dfs_scope_list(db)
-        scope_entries = []
-        for idx, scope in enumerate(scopes):
-            if not hasattr(scope, 'getAttributes'):
-                continue
+    Args:
+        string_table: Table the attribute strings are added to, normally
+            the one written to strings.bin.  When None the member embeds
+            a private table.
+    """
+
+    needs_cover_items = True
+
+    def __init__(self, string_table: StringTable = None):
+        self._string_table = string_table
+
+    def begin(self) -> None:
+        self._scope_entries = []
+        self._ci_entries = []
+
+    def add_scope(self, idx, scope, cover_items) -> None:
+        if hasattr(scope, 'getAttributes'):
             attrs = scope.getAttributes()
             if attrs:
-                scope_entries.append({"idx": idx, "attrs": attrs})
+                self._scope_entries.append((idx, attrs))
 
-        ci_entries = []
-        for idx, scope in enumerate(scopes):
-            try:
-                items = list(scope.coverItems(_COVER_ALL))
-            except Exception:
+        for ci_idx, ci in enumerate(cover_items):
+            if not hasattr(ci, 'getAttributes'):
                 continue
-            for ci_idx, ci in enumerate(items):
-                if not hasattr(ci, 'getAttributes'):
-                    continue
-                attrs = ci.getAttributes()
-                if attrs:
-                    ci_entries.append({
-                        "scope_idx": idx, "ci_idx": ci_idx, "attrs": attrs
-                    })
+            attrs = ci.getAttributes()
+            if attrs:
+                self._ci_entries.append((idx, ci_idx, attrs))
 
+    def finish(self, db) -> bytes:
         hist_entries = []
-        for kind in (HistoryNodeKind.TEST, HistoryNodeKind.MERGE):
+        for kind in _HISTORY_KINDS:
             try:
                 nodes = list(db.historyNodes(kind))
             except Exception:
@@ -61,30 +85,69 @@ class AttrsWriter:
                     continue
                 attrs = node.getAttributes()
                 if attrs:
-                    hist_entries.append({
-                        "idx": hi, "kind": kind.name, "attrs": attrs
-                    })
+                    hist_entries.append((int(kind), hi, attrs))
 
         global_attrs = {}
         if hasattr(db, 'getAttributes'):
-            global_attrs = db.getAttributes()
+            global_attrs = db.getAttributes() or {}
 
-        payload = {
-            "version": _VERSION,
-            "scopes": scope_entries,
-            "coveritems": ci_entries,
-            "history": hist_entries,
-            "global": global_attrs,
-        }
-        return json.dumps(payload, separators=(',', ':')).encode()
+        scope_entries = self._scope_entries
+        ci_entries = self._ci_entries
+        if not (scope_entries or ci_entries or hist_entries or global_attrs):
+            return b""
+        strings = self._string_table
+        embed = strings is None
+        if embed:
+            strings = StringTable()
+
+        header = [len(scope_entries), len(ci_entries), len(hist_entries),
+                  len(global_attrs)]
+        pairs = []
+        prev = 0
+        for idx, _ in scope_entries:
+            header.append(idx - prev)
+            prev = idx
+        header.extend(len(attrs) for _, attrs in scope_entries)
+        prev = 0
+        for scope_idx, _, _ in ci_entries:
+            header.append(scope_idx - prev)
+            prev = scope_idx
+        header.extend(ci_idx for _, ci_idx, _ in ci_entries)
+        header.extend(len(attrs) for _, _, attrs in ci_entries)
+        header.extend(kind for kind, _, _ in hist_entries)
+        header.extend(hi for _, hi, _ in hist_entries)
+        header.extend(len(attrs) for _, _, attrs in hist_entries)
+
+        for attrs in ([e[-1] for e in scope_entries] + [e[-1] for e in ci_entries]
+                      + [e[-1] for e in hist_entries] + [global_attrs]):
+            for key, val in attrs.items():
+                pairs.append(strings.add(key))
+                if isinstance(val, str):
+                    pairs.append(strings.add(val) << 1)
+                else:
+                    pairs.append(strings.add(json.dumps(val)) << 1 | 1)
+
+        buf = bytearray(encode_varint(_VERSION))
+        buf.extend(encode_member_strings(strings, embed))
+        buf.extend(encode_varints(header))
+        buf.extend(encode_varints(pairs))
+        return bytes(buf)
 
 
 class AttrsReader:
     """Deserialize attrs.bin bytes and apply attributes."""
 
-    def deserialize(self, data: bytes, db) -> None:
+    def deserialize(self, data: bytes, db, string_table: StringTable = None) -> None:
+        """Apply the attributes in *data* to *db*.
+
+        *string_table* is the archive's strings.bin table; it is not
+        needed for members that embed their own table or are legacy JSON.
+        """
         if not data:
             return
+        if data[:1] != b"{":
+            self._deserialize_v3(data, db, string_table)
+            return
         payload = json.loads(data.decode())
         version = payload.get("version", 1)
 
@@ -93,6 +156,83 @@ class AttrsReader:
         elif version == 2:
             self._deserialize_v2(payload, db)
 
+    def _deserialize_v3(self, data, db, string_table):
+        version, offset = decode_varint(data, 0)
+        if version != _VERSION:
+            raise ValueError(f"Unsupported attrs.bin version: {version}")
+        strings, offset = decode_member_strings(data, offset, string_table)
+        counts, offset = decode_varints(data, 4, offset)
+        n_scopes, n_cis, n_hist, n_global = counts
+        header, offset = decode_varints(
+            data, 2 * n_scopes + 3 * n_cis + 3 * n_hist, offset)
+        pos = 0
+        scope_idx = _running_sum(header[pos:pos + n_scopes])
+        pos += n_scopes
+        scope_n = header[pos:pos + n_scopes]
+        pos += n_scopes
+        ci_scope_idx = _running_sum(header[pos:pos + n_cis])
+        pos += n_cis
+        ci_idx = header[pos:pos + n_cis]
+        pos += n_cis
+        ci_n = header[pos:pos + n_cis]
+        pos += n_cis
+        hist_kind = header[pos:pos + n_hist]
+        pos += n_hist
+        hist_idx = header[pos:pos + n_hist]
+        pos += n_hist
+        hist_n = header[pos:pos + n_hist]
+        n_pairs = sum(scope_n) + sum(ci_n) + sum(hist_n) + n_global
+        pairs, _ = decode_varints(data, 2 * n_pairs, offset)
+
+        get_string = strings.get
+
+        def _attrs(start, n):
+            for i in range(start, start + 2 * n, 2):
+                val = pairs[i + 1]
+                text = get_string(val >> 1)
+                yield get_string(pairs[i]), json.loads(text) if val & 1 else text
+
+        scopes = dfs_scope_list(db)
+        pos = 0
+        for idx, n in zip(scope_idx, scope_n):
+            if idx < len(scopes) and hasattr(scopes[idx], 'setAttribute'):
+                for key, val in _attrs(pos, n):
+                    scopes[idx].setAttribute(key, val)
+            pos += 2 * n
+
+        items = None
+        items_idx = -1
+        for idx, ci_i, n in zip(ci_scope_idx, ci_idx, ci_n):
+            if idx != items_idx and idx < len(scopes):
+                # Entries are grouped by scope: list each scope's items once
+                items_idx = idx
+                try:
+                    items = list(scopes[idx].coverItems(_COVER_ALL))
+                except Exception:
+                    items = []
+            if idx == items_idx and ci_i < len(items) \
+                    and hasattr(items[ci_i], 'setAttribute'):
+                for key, val in _attrs(pos, n):
+                    items[ci_i].setAttribute(key, val)
+            pos += 2 * n
+
+        hist_nodes = {}
+        for kind in _HISTORY_KINDS:
+            try:
+                hist_nodes[int(kind)] = list(db.historyNodes(kind))
+            except Exception:
+                pass
+        for kind, idx, n in zip(hist_kind, hist_idx, hist_n):
+            nodes = hist_nodes.get(kind, [])
+            if idx < len(nodes) and hasattr(nodes[idx], 'setAttribute'):
+                for key, val in _attrs(pos, n):
+                    nodes[idx].setAttribute(key, val)
+            pos += 2 * n
+
+        if hasattr(db, 'setAttribute'):
+            for key, val in _attrs(pos, n_global):
+                db.setAttribute(key, val)
+
     def _deserialize_v1(self, payload, db):
         """Legacy v1: scope attrs only."""
         entries = payload.get("entries", [])
@@ -154,6 +294,15 @@ class AttrsReader:
             if hasattr(db, 'setAttribute'):
                 db.setAttribute(key, val)
 
-    def apply(self, db, data: bytes) -> None:
+    def apply(self, db, data: bytes, string_table: StringTable = None) -> None:
         """Alias for deserialize (matches other readers' API)."""
-        self.deserialize(data, db)
+        self.deserialize(data, db, string_table)
+
+
+def _running_sum(deltas):
+    out = []
+    total = 0
+    for d in deltas:
+        total += d
+        out.append(total)
+    return out
@@ -1,14 +1,14 @@
 """
 history/bucket_index.bin — index mapping bucket sequence numbers to date
-ranges and aggregate counts.
+ranges, aggregate counts and the test names each bucket holds.
 
-This 24-byte-per-entry index allows regression trend queries and targeted
-bucket reads without opening individual bucket files.
+This index allows regression trend queries and targeted bucket reads
+without opening individual bucket files.
 
 Binary layout (little-endian)::
 
     magic         u32   0x42494458  ('BIDX')
-    version       u8    1
+    version       u8    1 or 2
     num_buckets   u32
 
     entries[num_buckets]:     sorted by bucket_seq
@@ -20,24 +20,111 @@ Binary layout (little-endian)::
       min_name_id  u32
       max_name_id  u32
 
-24 bytes per entry.  3650 entries (10 years) ≈ 87 KB.
+    name_filters[num_buckets]:   version 2 only, same order as entries
+      kind         u8    FILTER_NONE / FILTER_BITMAP / FILTER_BLOOM
+      size         varint  byte length of data
+      data         u8[size]
+
+28 bytes per entry.  3650 entries (10 years) ≈ 100 KB.
+
+A name filter records which name_ids occur in the bucket, so that
+:meth:`BucketIndex.buckets_for_name` skips buckets whose
+``[min_name_id, max_name_id]`` range merely spans the name.  Two encodings
+are used, whichever is smaller:
+
+* ``FILTER_BITMAP`` — one bit per name_id in ``[min_name_id, max_name_id]``
+  (bit ``i`` of byte ``i // 8`` for ``min_name_id + i``).  Exact.
+* ``FILTER_BLOOM`` — a Bloom filter of ``BLOOM_BITS_PER_NAME`` bits per
+  distinct name with ``BLOOM_HASHES`` probes (about 1 % false positives,
+  never false negatives).
+
+Version 1 files (no filters) are still read; such buckets fall back to the
+min/max range check.  An index without any filter is written as version 1.
 """
 
 from __future__ import annotations
 
+import bisect
 import struct
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
+
+from .varint import decode_varint, encode_varint
 
 MAGIC   = 0x42494458   # 'BIDX'
-VERSION = 1
+VERSION = 2
+
+FILTER_NONE   = 0
+FILTER_BITMAP = 1
+FILTER_BLOOM  = 2
+
+BLOOM_BITS_PER_NAME = 10
+BLOOM_HASHES        = 7
 
 _HDR   = struct.Struct("<IBI")    # magic, version, num_buckets
-_ENTRY = struct.Struct("<IIIIIII")  # 7 × u32 = 28 bytes ... wait, design says 24 bytes
-# Design: bucket_seq(4) ts_start(4) ts_end(4) num_records(4) fail_count(4) min_name_id(4) max_name_id(4) = 28 bytes
-# The design doc says "24 bytes/entry" but lists 7 fields × 4 bytes = 28. We use 28 (correct).
+_ENTRY = struct.Struct("<IIIIIII")  # 7 × u32 = 28 bytes
 assert _ENTRY.size == 28
 
+_MASK32 = 0xFFFFFFFF
+
+
+def _bloom_probes(name_id: int, nbits: int):
+    """Bit positions for *name_id* (double hashing over two 32-bit mixes)."""
+    h1 = (name_id * 0x9E3779B1) & _MASK32
+    h2 = (((name_id ^ 0x5BD1E995) * 0x85EBCA6B) & _MASK32) | 1
+    return [(h1 + i * h2) % nbits for i in range(BLOOM_HASHES)]
+
+
+class NameFilter:
+    """Set of the name_ids present in one bucket (see module docstring)."""
+
+    __slots__ = ("kind", "base", "data")
+
+    def __init__(self, kind: int, base: int, data: bytes) -> None:
+        self.kind = kind
+        self.base = base
+        self.data = data
+
+    @classmethod
+    def build(cls, name_ids: Iterable[int], base: int) -> "NameFilter":
+        """Build the smaller of a bitmap or a Bloom filter over *name_ids*.
+
+        *base* is the bucket's ``min_name_id``; the bitmap starts there.
+        """
+        ids = {nid for nid in name_ids if nid >= base}
+        if not ids:
+            return cls(FILTER_BITMAP, base, b"")
+        lo, hi = base, max(ids)
+        bitmap_size = (hi - lo) // 8 + 1
+        bloom_size = (len(ids) * BLOOM_BITS_PER_NAME + 7) // 8
+        if bitmap_size <= bloom_size:
+            bits = bytearray(bitmap_size)
+            for nid in ids:
+                off = nid - lo
+                bits[off >> 3] |= 1 << (off & 7)
+            return cls(FILTER_BITMAP, lo, bytes(bits))
+        bits = bytearray(bloom_size)
+        nbits = bloom_size * 8
+        for nid in ids:
+            for pos in _bloom_probes(nid, nbits):
+                bits[pos >> 3] |= 1 << (pos & 7)
+        return cls(FILTER_BLOOM, lo, bytes(bits))
+
+    def may_contain(self, name_id: int) -> bool:
+        """False only if *name_id* is certainly absent from the bucket."""
+        data = self.data
+        if self.kind == FILTER_BITMAP:
+            off = name_id - self.base
+            if off < 0 or (off >> 3) >= len(data):
+                return False
+            return bool(data[off >> 3] & (1 << (off & 7)))
+        if not data:
+            return False
+        for pos in _bloom_probes(name_id, len(data) * 8):
+            if not data[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
 
 @dataclass
 class BucketIndexEntry:
@@ -49,6 +136,8 @@ class BucketIndexEntry:
     fail_count:  int
     min_name_id: int
     max_name_id: int
+    name_filter: Optional[NameFilter] = field(default=None, compare=False,
+                                              repr=False)
 
     @property
     def pass_rate(self) -> float:
@@ -56,68 +145,135 @@ class BucketIndexEntry:
             return 1.0
         return (self.num_records - self.fail_count) / self.num_records
 
+    def may_contain(self, name_id: int) -> bool:
+        """False if the bucket certainly holds no record for *name_id*."""
+        if name_id < self.min_name_id or name_id > self.max_name_id:
+            return False
+        if self.name_filter is None:
+            return True
+        return self.name_filter.may_contain(name_id)
+
 
 class BucketIndex:
     """In-memory representation of ``history/bucket_index.bin``.
 
+    Time-range queries bisect a ``ts_start``-sorted view of the entries
+    (built on first use after a change) instead of scanning every bucket.
+
     Example::
 
         idx = BucketIndex()
         idx.add_bucket(seq=0, ts_start=1700000000, ts_end=1700086399,
                        num_records=5000, fail_count=12,
-                       min_name_id=0, max_name_id=99)
+                       min_name_id=0, max_name_id=99,
+                       name_ids=[0, 7, 99])
         data = idx.serialize()
         idx2 = BucketIndex.deserialize(data)
     """
 
     def __init__(self) -> None:
         self._entries: List[BucketIndexEntry] = []
+        # Lazily built: entries sorted by ts_start, their ts_start keys and
+        # the running maximum of ts_end over that order.
+        self._by_start: Optional[List[BucketIndexEntry]] = None
+        self._start_keys: List[int] = []
+        self._max_end: List[int] = []
 
     def add_bucket(self, seq: int, ts_start: int, ts_end: int,
                    num_records: int, fail_count: int,
-                   min_name_id: int, max_name_id: int) -> None:
+                   min_name_id: int, max_name_id: int,
+                   name_ids: Optional[Iterable[int]] = None) -> None:
         """Add or update the index entry for bucket *seq*.
 
-        Entries are kept sorted by *seq*.
+        Entries are kept sorted by *seq*.  When *name_ids* (the name_ids of
+        the bucket's records, duplicates allowed) is given, a name filter
+        is stored with the entry.
         """
         entry = BucketIndexEntry(
             bucket_seq=seq, ts_start=ts_start, ts_end=ts_end,
             num_records=num_records, fail_count=fail_count,
             min_name_id=min_name_id, max_name_id=max_name_id,
+            name_filter=(NameFilter.build(name_ids, min_name_id)
+                         if name_ids is not None else None),
         )
-        # Replace existing or insert in sorted order
-        for i, e in enumerate(self._entries):
-            if e.bucket_seq == seq:
-                self._entries[i] = entry
-                return
-            if e.bucket_seq > seq:
-                self._entries.insert(i, entry)
-                return
-        self._entries.append(entry)
+        self._insert(entry)
+
+    def _insert(self, entry: BucketIndexEntry) -> None:
+        self._by_start = None
+        entries = self._entries
+        if not entries or entries[-1].bucket_seq < entry.bucket_seq:
+            entries.append(entry)
+            return
+        i = self._seq_position(entry.bucket_seq)
+        if i < len(entries) and entries[i].bucket_seq == entry.bucket_seq:
+            entries[i] = entry
+        else:
+            entries.insert(i, entry)
+
+    def remove_bucket(self, seq: int) -> Optional[BucketIndexEntry]:
+        """Remove and return the entry for bucket *seq* (``None`` if absent)."""
+        i = self._seq_position(seq)
+        if i < len(self._entries) and self._entries[i].bucket_seq == seq:
+            self._by_start = None
+            return self._entries.pop(i)
+        return None
+
+    def _seq_position(self, seq: int) -> int:
+        # bisect's key= argument needs Python 3.10
+        return bisect.bisect_left([e.bucket_seq for e in self._entries], seq)
+
+    def last_bucket(self) -> Optional[BucketIndexEntry]:
+        """Return the entry with the highest sequence number, if any."""
+        return self._entries[-1] if self._entries else None
+
+    def entries(self) -> List[BucketIndexEntry]:
+        """Return all entries in bucket_seq order."""
+        return list(self._entries)
+
+    def _build_ts_index(self) -> None:
+        by_start = sorted(self._entries, key=lambda e: e.ts_start)
+        max_end = []
+        running = -1
+        for e in by_start:
+            running = max(running, e.ts_end)
+            max_end.append(running)
+        self._by_start = by_start
+        self._start_keys = [e.ts_start for e in by_start]
+        self._max_end = max_end
+
+    def _overlapping(self, ts_from: Optional[int],
+                     ts_to: Optional[int]) -> List[BucketIndexEntry]:
+        """Entries overlapping [ts_from, ts_to], in bucket_seq order."""
+        if ts_from is None and ts_to is None:
+            return self._entries
+        if self._by_start is None:
+            self._build_ts_index()
+        # Entries [lo, hi) of the ts_start order are the only candidates:
+        # beyond hi every bucket starts after ts_to, and before lo every
+        # bucket (hence the running max) ends before ts_from.
+        hi = (len(self._by_start) if ts_to is None
+              else bisect.bisect_right(self._start_keys, ts_to))
+        lo = 0 if ts_from is None else bisect.bisect_left(self._max_end, ts_from)
+        hits = self._by_start[lo:hi]
+        if ts_from is not None:
+            hits = [e for e in hits if e.ts_end >= ts_from]
+        hits.sort(key=lambda e: e.bucket_seq)
+        return hits
 
     def buckets_in_range(self, ts_from: int, ts_to: int) -> List[BucketIndexEntry]:
         """Return entries whose time range overlaps [ts_from, ts_to]."""
-        return [e for e in self._entries
-                if e.ts_end >= ts_from and e.ts_start <= ts_to]
+        return list(self._overlapping(ts_from, ts_to))
 
     def buckets_for_name(self, name_id: int,
                          ts_from: Optional[int] = None,
                          ts_to:   Optional[int] = None) -> List[BucketIndexEntry]:
         """Return entries that may contain records for *name_id*.
 
-        Filters by ``min_name_id ≤ name_id ≤ max_name_id`` and optionally
-        by time range.
+        Filters by time range, then by ``min_name_id ≤ name_id ≤
+        max_name_id`` and the entry's name filter when it has one.
         """
-        results = []
-        for e in self._entries:
-            if e.min_name_id > name_id or e.max_name_id < name_id:
-                continue
-            if ts_from is not None and e.ts_end < ts_from:
-                continue
-            if ts_to is not None and e.ts_start > ts_to:
-                continue
-            results.append(e)
-        return results
+        return [e for e in self._overlapping(ts_from, ts_to)
+                if e.may_contain(name_id)]
 
     def pass_rate_series(self) -> List[Tuple[int, float]]:
         """Return ``(ts_start, pass_rate)`` pairs for all buckets in order."""
@@ -137,13 +293,22 @@ class BucketIndex:
 
     def serialize(self) -> bytes:
         """Encode the index to bytes for storage in the ZIP archive."""
-        header = _HDR.pack(MAGIC, VERSION, len(self._entries))
-        rows = b""
+        has_filters = any(e.name_filter is not None for e in self._entries)
+        parts = [_HDR.pack(MAGIC, VERSION if has_filters else 1,
+                           len(self._entries))]
         for e in self._entries:
-            rows += _ENTRY.pack(e.bucket_seq, e.ts_start, e.ts_end,
-                                e.num_records, e.fail_count,
-                                e.min_name_id, e.max_name_id)
-        return header + rows
+            parts.append(_ENTRY.pack(e.bucket_seq, e.ts_start, e.ts_end,
+                                     e.num_records, e.fail_count,
+                                     e.min_name_id, e.max_name_id))
+        if has_filters:
+            for e in self._entries:
+                f = e.name_filter
+                if f is None:
+                    parts.append(bytes((FILTER_NONE,)) + encode_varint(0))
+                else:
+                    parts.append(bytes((f.kind,)) + encode_varint(len(f.data)))
+                    parts.append(f.data)
+        return b"".join(parts)
 
     @classmethod
     def deserialize(cls, data: bytes) -> "BucketIndex":
@@ -155,17 +320,26 @@ class BucketIndex:
         magic, version, num_buckets = _HDR.unpack_from(data, 0)
         if magic != MAGIC:
             raise ValueError(f"Bad magic 0x{magic:08X}, expected 0x{MAGIC:08X}")
-        if version != VERSION:
+        if version not in (1, VERSION):
             raise ValueError(f"Unsupported bucket_index version {version}")
 
         idx = cls()
         offset = _HDR.size
-        for _ in range(num_buckets):
-            fields = _ENTRY.unpack_from(data, offset)
-            offset += _ENTRY.size
+        for fields in _ENTRY.iter_unpack(
+                data[offset:offset + num_buckets * _ENTRY.size]):
             idx._entries.append(BucketIndexEntry(
                 bucket_seq=fields[0], ts_start=fields[1], ts_end=fields[2],
                 num_records=fields[3], fail_count=fields[4],
                 min_name_id=fields[5], max_name_id=fields[6],
             ))
+        offset += num_buckets * _ENTRY.size
+
+        if version >= 2:
+            for e in idx._entries:
+                kind = data[offset]
+                size, offset = decode_varint(data, offset + 1)
+                if kind != FILTER_NONE:
+                    e.name_filter = NameFilter(
+                        kind, e.min_name_id, bytes(data[offset:offset + size]))
+                offset += size
         return idx
@@ -39,15 +39,19 @@ MEMBER_CROSS       = "cross.bin"
 MEMBER_FORMAL      = "formal.bin"
 MEMBER_DESIGN_UNITS = "design_units.json"
 MEMBER_PROPERTIES  = "properties.json"
-MEMBER_CONTRIB_DIR = "contrib/"
+MEMBER_CONTRIB     = "contrib.bin"
+MEMBER_CONTRIB_BINS = "contrib_bins.bin"
+MEMBER_CONTRIB_DIR = "contrib/"           # legacy: one member per history node
 
 # ── v2 history store ZIP member names ─────────────────────────────────────
 
 MEMBER_TEST_REGISTRY  = "test_registry.bin"
 MEMBER_TEST_STATS     = "test_stats.bin"
 MEMBER_BUCKET_INDEX   = "history/bucket_index.bin"
+MEMBER_HISTORY_ROLLUP = "history/rollup.bin"
 MEMBER_CONTRIB_INDEX  = "contrib_index.bin"
 MEMBER_SQUASH_LOG     = "squash_log.bin"
+MEMBER_JOURNAL_STATE  = "journal_state.json"
 MEMBER_TESTPLAN       = "testplan.json"
 MEMBER_WAIVERS        = "waivers.json"
 
@@ -56,6 +60,10 @@ MEMBER_WAIVERS        = "waivers.json"
 HISTORY_BUCKET_DIR    = "history/"
 HISTORY_BUCKET_MAX_RECORDS = 10_000
 
+# ── run journals (write-ahead ingestion, see run_journal.py) ──────────────
+
+JOURNAL_DIR_SUFFIX    = ".journal"   # <db>.cdb.journal/ holds the journals
+
 # ── v2 test-run status codes (stored in status_flags nibble) ──────────────
 
 HIST_STATUS_OK      = 0
@@ -1,86 +1,345 @@
 """
-contrib/ — per-test coverage contribution serialization.
+contrib.bin — per-test coverage contribution serialization.
 
-Each history node with non-empty contributions gets one ZIP member:
-    contrib/{history_idx}.bin
+All per-test contributions are stored in one ZIP member, ``contrib.bin``,
+as a compressed sparse row (CSR) table: one row per history node that
+contributed, holding the (bin_index, count) pairs of that node.
 
-Binary layout of each member:
+Binary layout of contrib.bin:
+    version    : varint (1)
+    num_rows   : varint
+    key_delta  : varint × num_rows   (history_idx - previous history_idx)
+    num_entries: varint × num_rows
+    row_len    : varint × num_rows   (byte length of each row)
+    rows       : concatenated; each row is
+        delta_bin_index : varint × num_entries   (ascending bin_index)
+        count           : varint × num_entries
+
+The optional inverted index, ``contrib_bins.bin``, has the same layout
+with the roles swapped: one row per bin_index, holding the
+(history_idx, count) pairs of the tests that hit the bin.  Its
+num_entries column is the number of tests per bin, which is all that
+"what did this test uniquely cover" needs.
+
+Only the header columns are decoded when the members are read; rows are
+decoded on demand and rows that were not touched are copied verbatim when
+the database is written again.  The index is copied verbatim while no row
+has changed and rebuilt otherwise.
+
+Databases written before contrib.bin existed store one member per
+history node, ``contrib/{history_idx}.bin``:
     num_entries : varint
     For each entry (sorted by bin_index, delta-encoded):
         delta_bin_index : varint   (bin_index - previous_bin_index)
         count           : varint
 
-Delta encoding exploits spatial locality; entries must be in ascending
-bin_index order.  The file is absent when the history node has no
-contributions.
+Those members are still read.
 
 The ContribWriter produces a dict {member_name: bytes} for the ZIP writer.
-The ContribReader reads all contrib/* members from the ZIP and calls
-db.record_test_association() to populate db._per_test_data.
+The ContribReader attaches a ContribStore to db._per_test_data.
 """
 
-import io
+from collections.abc import MutableMapping
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+from .constants import MEMBER_CONTRIB, MEMBER_CONTRIB_BINS, MEMBER_CONTRIB_DIR
+from .varint import decode_varint, decode_varints, encode_varints
+
+_VERSION = 1
+
+
+def is_contrib_member(name: str) -> bool:
+    """Return True if *name* is a ZIP member holding per-test contributions."""
+    return (name == MEMBER_CONTRIB or name == MEMBER_CONTRIB_BINS
+            or name.startswith(MEMBER_CONTRIB_DIR))
+
+
+def _encode_row(pairs) -> Tuple[int, bytes]:
+    """Encode (key, value) pairs, sorted by key, as one row."""
+    keys = [k for k, _ in pairs]
+    deltas = [b - a for a, b in zip([0] + keys, keys)]
+    return len(keys), encode_varints(deltas + [v for _, v in pairs])
+
+
+def _decode_row(data: bytes, start: int, n: int) -> Dict[int, int]:
+    values, _ = decode_varints(data, 2 * n, start)
+    return dict(zip(accumulate(values[:n]), values[n:]))
+
+
+def _encode_table(rows) -> bytes:
+    """Encode [(key, num_entries, row_bytes)], sorted by key."""
+    keys = [k for k, _, _ in rows]
+    header = [_VERSION, len(rows)]
+    header += [b - a for a, b in zip([0] + keys, keys)]
+    header += [n for _, n, _ in rows]
+    header += [len(r) for _, _, r in rows]
+    return encode_varints(header) + b"".join(r for _, _, r in rows)
+
+
+def _decode_table(data: bytes) -> Dict[int, Tuple[bytes, int, int, int]]:
+    """Decode the header of a table: {key: (data, start, end, num_entries)}."""
+    version, offset = decode_varint(data, 0)
+    if version != _VERSION:
+        raise ValueError(f"Unsupported contrib version {version}")
+    num_rows, offset = decode_varint(data, offset)
+    header, offset = decode_varints(data, 3 * num_rows, offset)
+    ends = list(accumulate(header[2 * num_rows:], initial=offset))
+    if ends[-1] != len(data):
+        raise ValueError("contrib row lengths do not match the member size")
+    return {key: (data, start, end, n) for key, n, start, end in zip(
+        accumulate(header[:num_rows]), header[num_rows:2 * num_rows],
+        ends, ends[1:])}
+
+
+class ContribStore(MutableMapping):
+    """Per-test contributions: a mapping of history_idx → {bin_index → count}.
+
+    Rows read from contrib.bin stay encoded until they are needed.
+    Indexing the store hands out the row as a mutable dict, after which
+    the row is re-encoded on write and the inverted index is no longer
+    trusted; the read-only queries :meth:`bin_counts`,
+    :meth:`tests_for_bin` and :meth:`unique_bins` leave rows untouched.
+
+    Args:
+        rows: Optional mapping of history_idx → {bin_index → count} to
+            start from.  Empty rows are dropped.
+    """
+
+    def __init__(self, rows=None):
+        # history_idx -> dict (live) or (data, start, end, n) (encoded)
+        self._rows: Dict[int, object] = {}
+        self._index_data: Optional[bytes] = None
+        self._index: Optional[Dict[int, Tuple[bytes, int, int, int]]] = None
+        self._modified = False
+        if rows:
+            for hist_idx, bin_counts in rows.items():
+                if bin_counts:
+                    self._rows[hist_idx] = dict(bin_counts)
+            self._modified = True
+
+    @classmethod
+    def from_bytes(cls, data: bytes, index: Optional[bytes] = None) -> "ContribStore":
+        """Wrap a contrib.bin member and, optionally, its contrib_bins.bin index."""
+        store = cls()
+        if data:
+            store._rows = _decode_table(data)
+        if index:
+            store._index_data = index
+        return store
+
+    @classmethod
+    def from_members(cls, members: Dict[str, bytes]) -> "ContribStore":
+        """Build a store from the contribution members of an NCDB file.
+
+        Legacy ``contrib/{history_idx}.bin`` members are decoded into live
+        rows, so that they are written out as contrib.bin.
+        """
+        store = cls.from_bytes(members.get(MEMBER_CONTRIB, b""),
+                               members.get(MEMBER_CONTRIB_BINS))
+        for member_name, data in members.items():
+            if not member_name.startswith(MEMBER_CONTRIB_DIR):
+                continue
+            # Parse history_idx from filename: "contrib/{idx}.bin"
+            basename = member_name[len(MEMBER_CONTRIB_DIR):]
+            try:
+                hist_idx = int(basename.rstrip(".bin").split(".")[0])
+            except ValueError:
+                continue  # skip malformed names
+            num_entries, offset = decode_varint(data, 0)
+            values, _ = decode_varints(data, 2 * num_entries, offset)
+            bin_counts = store[hist_idx] if hist_idx in store else {}
+            for bin_idx, count in zip(accumulate(values[0::2]), values[1::2]):
+                bin_counts[bin_idx] = bin_counts.get(bin_idx, 0) + count
+            if bin_counts:
+                store[hist_idx] = bin_counts
+        return store
+
+    # ── Mapping protocol ──────────────────────────────────────────────────
+
+    def __getitem__(self, hist_idx: int) -> Dict[int, int]:
+        row = self._rows[hist_idx]
+        if not isinstance(row, dict):
+            row = _decode_row(row[0], row[1], row[3])
+            self._rows[hist_idx] = row
+        # The caller may modify the row
+        self._modified = True
+        return row
+
+    def __setitem__(self, hist_idx: int, bin_counts: Dict[int, int]):
+        self._rows[hist_idx] = bin_counts
+        self._modified = True
+
+    def __delitem__(self, hist_idx: int):
+        del self._rows[hist_idx]
+        self._modified = True
 
-from .constants import MEMBER_CONTRIB_DIR
-from .varint import encode_varint, decode_varint
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, hist_idx) -> bool:
+        return hist_idx in self._rows
+
+    # ── Read-only queries ─────────────────────────────────────────────────
+
+    def bin_counts(self, hist_idx: int) -> Dict[int, int]:
+        """Return {bin_index: count} for *hist_idx*; empty when absent.
+
+        The returned dict is a copy and the row stays encoded.
+        """
+        row = self._rows.get(hist_idx)
+        if row is None:
+            return {}
+        if isinstance(row, dict):
+            return dict(row)
+        return _decode_row(row[0], row[1], row[3])
+
+    def tests_for_bin(self, bin_index: int) -> List[Tuple[int, int]]:
+        """Return [(history_idx, count)] of the tests that hit *bin_index*."""
+        index = self._bin_index()
+        if index is not None:
+            row = index.get(bin_index)
+            if row is None:
+                return []
+            return list(_decode_row(row[0], row[1], row[3]).items())
+        ret = []
+        for hist_idx in self._rows:
+            count = self.bin_counts(hist_idx).get(bin_index)
+            if count is not None:
+                ret.append((hist_idx, count))
+        return ret
+
+    def unique_bins(self, hist_idx: int) -> List[int]:
+        """Return the sorted bin indices hit by *hist_idx* and no other test."""
+        mine = self.bin_counts(hist_idx)
+        index = self._bin_index()
+        if index is not None:
+            return sorted(b for b in mine if index[b][3] == 1)
+        others = set()
+        for idx in self._rows:
+            if idx != hist_idx:
+                others.update(self.bin_counts(idx))
+        return sorted(mine.keys() - others)
+
+    def _bin_index(self):
+        """Return the decoded index header, or None when it cannot be used."""
+        if self._modified or self._index_data is None:
+            return None
+        if self._index is None:
+            self._index = _decode_table(self._index_data)
+        return self._index
+
+    # ── Building and writing ──────────────────────────────────────────────
+
+    def add_store(self, other: "ContribStore", hist_offset: int = 0):
+        """Add the rows of *other*, with *hist_offset* added to each history_idx.
+
+        Encoded rows of *other* are taken over without being decoded.
+
+        Raises:
+            ValueError: If a shifted history_idx is already present.
+        """
+        for hist_idx, row in other._rows.items():
+            key = hist_idx + hist_offset
+            if key in self._rows:
+                raise ValueError(f"Duplicate contribution row for history {key}")
+            self._rows[key] = dict(row) if isinstance(row, dict) else row
+        if other._rows:
+            self._modified = True
+
+    def serialize(self, with_index: bool = True) -> Dict[str, bytes]:
+        """Return {member_name: bytes}; empty when there are no contributions.
+
+        Args:
+            with_index: Also write the contrib_bins.bin inverted index.
+        """
+        rows = []
+        for hist_idx in sorted(self._rows):
+            row = self._rows[hist_idx]
+            if isinstance(row, dict):
+                if not row:
+                    continue
+                n, row_bytes = _encode_row(sorted(row.items()))
+                rows.append((hist_idx, n, row_bytes))
+            else:
+                rows.append((hist_idx, row[3], row[0][row[1]:row[2]]))
+        if not rows:
+            return {}
+        members = {MEMBER_CONTRIB: _encode_table(rows)}
+        if with_index:
+            if not self._modified and self._index_data is not None:
+                members[MEMBER_CONTRIB_BINS] = self._index_data
+            else:
+                members[MEMBER_CONTRIB_BINS] = self._build_index()
+        return members
+
+    def _build_index(self) -> bytes:
+        # bin_index -> history indices and counts, in ascending history order
+        hists: Dict[int, List[int]] = {}
+        counts: Dict[int, List[int]] = {}
+        for hist_idx in sorted(self._rows):
+            for bin_idx, count in self.bin_counts(hist_idx).items():
+                tests = hists.get(bin_idx)
+                if tests is None:
+                    hists[bin_idx] = [hist_idx]
+                    counts[bin_idx] = [count]
+                else:
+                    tests.append(hist_idx)
+                    counts[bin_idx].append(count)
+        rows = []
+        for bin_idx in sorted(hists):
+            tests = hists[bin_idx]
+            rows.append((bin_idx, len(tests), encode_varints(
+                [b - a for a, b in zip([0] + tests, tests)] + counts[bin_idx])))
+        return _encode_table(rows)
 
 
 class ContribWriter:
-    """Serialize per-test contributions from MemUCIS._per_test_data."""
+    """Serialize per-test contributions from MemUCIS._per_test_data.
+
+    Args:
+        with_index: Also write the contrib_bins.bin inverted index.
+    """
+
+    def __init__(self, with_index: bool = True):
+        self.with_index = with_index
 
     def serialize(self, db) -> dict:
-        """Return a dict of {member_name: bytes} for all history nodes with contributions.
+        """Return a dict of {member_name: bytes} for contrib.bin and its index.
 
         Returns an empty dict when no per-test data is present.
         """
         per_test = getattr(db, '_per_test_data', {})
-        members = {}
-        for hist_idx, bin_counts in per_test.items():
-            if not bin_counts:
-                continue
-            sorted_entries = sorted(bin_counts.items())  # ascending bin_index
-            buf = io.BytesIO()
-            buf.write(encode_varint(len(sorted_entries)))
-            prev_bin = 0
-            for bin_idx, count in sorted_entries:
-                buf.write(encode_varint(bin_idx - prev_bin))
-                buf.write(encode_varint(count))
-                prev_bin = bin_idx
-            members[f"{MEMBER_CONTRIB_DIR}{hist_idx}.bin"] = buf.getvalue()
-        return members
+        if not isinstance(per_test, ContribStore):
+            per_test = ContribStore(per_test)
+        return per_test.serialize(self.with_index)
 
 
 class ContribReader:
     """Deserialize per-test contributions and populate MemUCIS._per_test_data."""
 
     def apply(self, db, contrib_members: dict) -> None:
-        """Read all contrib/*.bin members and call db.record_test_association().
+        """Attach the contributions in *contrib_members* to *db*.
+
+        When *db* already holds per-test data, the contributions are added
+        to it through db.record_test_association().
 
         Args:
             db:              MemUCIS (or NcdbUCIS) instance to populate.
-            contrib_members: Dict mapping member name → bytes for all
+            contrib_members: Dict mapping member name → bytes for the
+                             contrib.bin, contrib_bins.bin and legacy
                              contrib/* entries extracted from the ZIP.
         """
         if not contrib_members:
             return
 
-        for member_name, data in contrib_members.items():
-            if not member_name.startswith(MEMBER_CONTRIB_DIR):
-                continue
-            # Parse history_idx from filename: "contrib/{idx}.bin"
-            basename = member_name[len(MEMBER_CONTRIB_DIR):]
-            try:
-                hist_idx = int(basename.rstrip(".bin").split(".")[0])
-            except ValueError:
-                continue  # skip malformed names
-
-            buf = data
-            offset = 0
-            num_entries, offset = decode_varint(buf, offset)
-            prev_bin = 0
-            for _ in range(num_entries):
-                delta, offset = decode_varint(buf, offset)
-                count, offset = decode_varint(buf, offset)
-                bin_idx = prev_bin + delta
+        store = ContribStore.from_members(contrib_members)
+        if not db._per_test_data:
+            db._per_test_data = store
+            return
+        for hist_idx in store:
+            for bin_idx, count in store.bin_counts(hist_idx).items():
                 db.record_test_association(hist_idx, bin_idx, count)
-                prev_bin = bin_idx
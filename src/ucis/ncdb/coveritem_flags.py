@@ -16,29 +16,36 @@ from ucis.cover_type_t import CoverTypeT
 from ucis.scope_type_t import ScopeTypeT
 
 from .varint import encode_varint, decode_varint
-from .dfs_util import dfs_scope_list
+from .dfs_util import DfsScopeSerializer, dfs_scope_list
 from .constants import COVER_TYPE_DEFAULTS
 
 _VERSION = 1
 _COVER_ALL = 0xFFFFFFFF
 
 
-class CoveritemFlagsWriter:
+class CoveritemFlagsWriter(DfsScopeSerializer):
     """Serialize non-zero coveritem flags to binary bytes."""
 
-    def serialize(self, db) -> bytes:
-        entries = []
-        global_ci_idx = 0
-        scopes = dfs_scope_list(db)
-        for scope in scopes:
-            for ci in scope.coverItems(_COVER_ALL):
-                flags = ci.getCoverFlags()
-                ct = ci.getCoverData().type
-                default_flags = COVER_TYPE_DEFAULTS.get(ct, (0, 0, 1))[0]
-                if flags != default_flags:
-                    entries.append((global_ci_idx, flags))
-                global_ci_idx += 1
-
+    needs_cover_items = True
+
+    def begin(self) -> None:
+        self._entries = []
+        self._ci_idx = 0
+
+    def add_scope(self, idx, scope, cover_items) -> None:
+        entries = self._entries
+        global_ci_idx = self._ci_idx
+        for ci in cover_items:
+            flags = ci.getCoverFlags()
+            ct = ci.getCoverData().type
+            default_flags = COVER_TYPE_DEFAULTS.get(ct, (0, 0, 1))[0]
+            if flags != default_flags:
+                entries.append((global_ci_idx, flags))
+            global_ci_idx += 1
+        self._ci_idx = global_ci_idx
+
+    def finish(self, db) -> bytes:
+        entries = self._entries
         if not entries:
             return b""
 
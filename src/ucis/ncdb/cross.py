@@ -21,33 +21,35 @@ import json
 
 from ucis.scope_type_t import ScopeTypeT
 
-from .dfs_util import dfs_scope_list
+from .dfs_util import DfsScopeSerializer, dfs_scope_list
 
 _VERSION = 1
 
 
-class CrossWriter:
+class CrossWriter(DfsScopeSerializer):
     """Serialize CROSS scope coverpoint links to cross.json bytes."""
 
-    def serialize(self, db) -> bytes:
-        entries = []
-        for idx, scope in enumerate(dfs_scope_list(db)):
-            if scope.getScopeType() != ScopeTypeT.CROSS:
-                continue
-            n = 0
-            try:
-                n = scope.getNumCrossedCoverpoints()
-            except Exception:
-                pass
-            if n == 0:
-                continue
-            crossed = [scope.getIthCrossedCoverpoint(i).getScopeName()
-                       for i in range(n)]
-            entries.append({"idx": idx, "crossed": crossed})
+    def begin(self) -> None:
+        self._entries = []
 
-        if not entries:
+    def add_scope(self, idx, scope, cover_items) -> None:
+        if scope.getScopeType() != ScopeTypeT.CROSS:
+            return
+        n = 0
+        try:
+            n = scope.getNumCrossedCoverpoints()
+        except Exception:
+            pass
+        if n == 0:
+            return
+        crossed = [scope.getIthCrossedCoverpoint(i).getScopeName()
+                   for i in range(n)]
+        self._entries.append({"idx": idx, "crossed": crossed})
+
+    def finish(self, db) -> bytes:
+        if not self._entries:
             return b""
-        payload = {"version": _VERSION, "entries": entries}
+        payload = {"version": _VERSION, "entries": self._entries}
         return json.dumps(payload, separators=(',', ':')).encode()
 
 
@@ -41,7 +41,11 @@ class DbFormatIfNcdb(FormatIfDb):
         return NcdbReader().read(path)
 
     def write(self, db: UCIS, file_or_filename) -> None:
-        """Write *db* to an NCDB .cdb file."""
+        """Write *db* to an NCDB .cdb file.
+
+        The ``compress_level`` option (see :meth:`init`) selects the zlib
+        level of the ZIP members.
+        """
         from .ncdb_writer import NcdbWriter
         if isinstance(file_or_filename, str):
             path = file_or_filename
@@ -49,7 +53,8 @@ class DbFormatIfNcdb(FormatIfDb):
             path = file_or_filename.name
         else:
             raise ValueError("NCDB format requires a file path")
-        NcdbWriter().write(db, path)
+        NcdbWriter(compress_level=self.options.get('compress_level')).write(
+            db, path)
 
     @classmethod
     def register(cls, rgy):
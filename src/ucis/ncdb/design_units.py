@@ -17,27 +17,30 @@ import json
 
 from ucis.scope_type_t import ScopeTypeT
 
-from .dfs_util import dfs_scope_list
+from .dfs_util import DfsScopeSerializer, dfs_scope_list
 
 _VERSION = 1
 
 
-class DesignUnitsWriter:
+class DesignUnitsWriter(DfsScopeSerializer):
     """Serialize DU scope index to design_units.json bytes."""
 
-    def serialize(self, db) -> bytes:
-        units = []
-        for idx, scope in enumerate(dfs_scope_list(db)):
-            scope_type = scope.getScopeType()
-            if ScopeTypeT.DU_ANY(scope_type):
-                units.append({
-                    "name": scope.getScopeName(),
-                    "idx":  idx,
-                    "type": int(scope_type),
-                })
-        if not units:
+    def begin(self) -> None:
+        self._units = []
+
+    def add_scope(self, idx, scope, cover_items) -> None:
+        scope_type = scope.getScopeType()
+        if ScopeTypeT.DU_ANY(scope_type):
+            self._units.append({
+                "name": scope.getScopeName(),
+                "idx":  idx,
+                "type": int(scope_type),
+            })
+
+    def finish(self, db) -> bytes:
+        if not self._units:
             return b""
-        payload = {"version": _VERSION, "units": units}
+        payload = {"version": _VERSION, "units": self._units}
         return json.dumps(payload, separators=(',', ':')).encode()
 
 
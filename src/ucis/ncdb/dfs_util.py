@@ -5,6 +5,10 @@ Produces a flat list of (scope, dfs_index) pairs in the same DFS order
 that scope_tree.py uses for encoding, so that index-based serializers
 (attrs.json, tags.json, properties.bin) can map directly to scope_tree
 offsets without re-reading the binary.
+
+``DfsScopeSerializer`` is the common base of those serializers.  Its
+per-scope hook lets ``NcdbWriter`` feed every member from the single walk
+that encodes scope_tree.bin instead of each member re-walking the database.
 """
 
 from ucis.scope_type_t import ScopeTypeT
@@ -12,6 +16,8 @@ from ucis.cover_type_t import CoverTypeT
 
 from .constants import TOGGLE_BIN_0_TO_1, TOGGLE_BIN_1_TO_0
 
+_COVER_ALL = 0xFFFFFFFF
+
 
 def _is_toggle_pair(scope) -> bool:
     """Match the toggle-pair detection logic in scope_tree.py."""
@@ -49,3 +55,44 @@ def dfs_scope_list(db) -> list:
 
     db._dfs_scope_cache = result
     return result
+
+
+class DfsScopeSerializer:
+    """Base for member serializers keyed by DFS scope index.
+
+    Subclasses implement :meth:`add_scope`, called once per scope in
+    dfs_scope_list() order, and :meth:`finish`, which returns the member
+    bytes.  Set *needs_cover_items* when :meth:`add_scope` uses the
+    scope's coveritems; otherwise it receives ``None`` from
+    :meth:`serialize`.
+    """
+
+    needs_cover_items = False
+
+    def begin(self) -> None:
+        """Reset per-database state before the first :meth:`add_scope`."""
+
+    def add_scope(self, idx: int, scope, cover_items) -> None:
+        """Record *scope* at DFS index *idx*.
+
+        *cover_items* is the list of the scope's coveritems in
+        ``coverItems()`` order.
+        """
+        raise NotImplementedError
+
+    def finish(self, db) -> bytes:
+        """Return the serialized member once all scopes have been added."""
+        raise NotImplementedError
+
+    def serialize(self, db) -> bytes:
+        """Walk *db* on its own and return the serialized member."""
+        self.begin()
+        for idx, scope in enumerate(dfs_scope_list(db)):
+            cover_items = None
+            if self.needs_cover_items:
+                try:
+                    cover_items = list(scope.coverItems(_COVER_ALL))
+                except Exception:
+                    cover_items = []
+            self.add_scope(idx, scope, cover_items)
+        return self.finish(db)
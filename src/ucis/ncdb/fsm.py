@@ -32,7 +32,7 @@ import json
 from ucis.scope_type_t import ScopeTypeT
 from ucis.cover_type_t import CoverTypeT
 
-from .dfs_util import dfs_scope_list
+from .dfs_util import DfsScopeSerializer, dfs_scope_list
 
 _VERSION = 1
 
@@ -44,31 +44,35 @@ def _fsm_scopes(db):
             yield idx, scope
 
 
-class FsmWriter:
+class FsmWriter(DfsScopeSerializer):
     """Serialize FSM state-index overrides to fsm.json bytes.
 
     Returns empty bytes when all state indices follow the default
     0, 1, 2, … sequence (the common case).
     """
 
-    def serialize(self, db) -> bytes:
-        entries = []
-        for fsm_idx, scope in _fsm_scopes(db):
-            # Collect state indices from the _states dict (MemFSMScope).
-            states_dict = getattr(scope, '_states', None)
-            if not states_dict:
-                continue
-            state_entries = []
-            for i, (name, state) in enumerate(states_dict.items()):
-                idx = getattr(state, 'index', i)
-                if idx != i:  # non-sequential → store
-                    state_entries.append({"name": name, "index": idx})
-            if state_entries:
-                entries.append({"fsm_idx": fsm_idx, "states": state_entries})
-
-        if not entries:
+    def begin(self) -> None:
+        self._entries = []
+
+    def add_scope(self, fsm_idx, scope, cover_items) -> None:
+        if scope.getScopeType() != ScopeTypeT.FSM:
+            return
+        # Collect state indices from the _states dict (MemFSMScope).
+        states_dict = getattr(scope, '_states', None)
+        if not states_dict:
+            return
+        state_entries = []
+        for i, (name, state) in enumerate(states_dict.items()):
+            idx = getattr(state, 'index', i)
+            if idx != i:  # non-sequential → store
+                state_entries.append({"name": name, "index": idx})
+        if state_entries:
+            self._entries.append({"fsm_idx": fsm_idx, "states": state_entries})
+
+    def finish(self, db) -> bytes:
+        if not self._entries:
             return b""
-        payload = {"version": _VERSION, "entries": entries}
+        payload = {"version": _VERSION, "entries": self._entries}
         return json.dumps(payload, separators=(',', ':')).encode()
 
 
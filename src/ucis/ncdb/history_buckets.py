@@ -12,7 +12,7 @@ Binary layout (little-endian, stored compressed inside the ZIP)::
       version         u8    1
       num_records     u32
       num_names       u16   unique name_ids in this bucket
-      ts_base         u32   unix timestamp of first record
+      ts_base         u32   unix timestamp of the earliest record
 
     Name index  (num_names entries, sorted by name_id):
       name_id         u32
@@ -107,6 +107,16 @@ class BucketWriter:
     def is_full(self) -> bool:
         return len(self._records) >= HISTORY_BUCKET_MAX_RECORDS
 
+    def can_add(self, seed_id: int) -> bool:
+        """True if a record with *seed_id* fits in this bucket.
+
+        False when the bucket is full or its local seed dictionary already
+        holds 255 other seeds.
+        """
+        if self.is_full():
+            return False
+        return seed_id in self._seed_local or len(self._seed_ids) < 255
+
     def seal(self, use_lzma: bool = True) -> bytes:
         """Serialise and compress the bucket.
 
@@ -131,7 +141,9 @@ class BucketWriter:
         if not records:
             ts_base = 0
         else:
-            ts_base = records[0].ts
+            # Each name's first delta is taken from ts_base, so it must be
+            # the earliest timestamp, not that of the lowest name_id.
+            ts_base = min(r.ts for r in records)
 
         # Build name index
         name_groups: Dict[int, List[int]] = {}  # name_id → list of row indices
@@ -280,6 +292,10 @@ class BucketReader:
         _, start_row, count = self._name_index[lo]
         return self._records[start_row: start_row + count]
 
+    def name_ids(self) -> List[int]:
+        """Return the distinct name_ids in this bucket, ascending."""
+        return [nid for nid, _, _ in self._name_index]
+
     def all_records(self) -> Iterable[BucketRecord]:
         """Iterate over all records in row order."""
         return iter(self._records)
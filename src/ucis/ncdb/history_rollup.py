@@ -0,0 +1,422 @@
+"""
+history/rollup.bin — downsampled per-day and per-week run aggregates.
+
+Trend views (pass rate, flake rate, coverage-producing runs over time) read
+this member instead of decoding every history bucket.  It is updated
+incrementally each time a bucket is sealed and rebuilt from the buckets by
+the merger, so a series for one test or for all tests is a handful of
+dictionary lookups.
+
+Each table holds one *cell* per (period, key), where the key is ``0`` for
+the aggregate over all tests and ``name_id + 1`` for a single test.
+
+Binary layout (little-endian)::
+
+    magic         u32   0x524C5550  ('RLUP')
+    version       u8    1
+    num_tables    u8
+
+    tables[num_tables]:
+      granularity u32   period length in seconds (86400 = day, 604800 = week)
+      num_keys    u32
+      keys[num_keys]:             sorted by key
+        key          u32   0 = all tests, name_id + 1 otherwise
+        num_cells    u32   cells in the key's block (all but the latest)
+        offset       u32   byte offset of the block in the cell blocks
+        size         u32   byte length of the block
+        last_period  u32   period of the block's last cell (0 if empty)
+        tail_period  u32   period of the latest cell
+        tail         u32[6]  the latest cell's fields, as below
+      cell blocks: for each key, its cells except the latest, sorted by
+        period, each as 7 varints:
+        period_delta  period − previous cell's period (first: period)
+        runs
+        fails         runs with status ≠ HIST_STATUS_OK
+        transitions   pass↔fail changes between consecutive runs of one
+                      test inside the period
+        pairs         consecutive-run pairs inside the period
+                      (runs − number of distinct tests)
+        cov_runs      runs flagged HIST_FLAG_HAS_COVERAGE
+        last_status   status of the test's latest run (0 for key 0)
+
+Periods are counted in UTC: day ``p`` starts at ``p * 86400``, week ``p``
+starts on Monday at ``p * 604800 − 3 * 86400``.
+
+Keeping each key's latest cell outside its block makes updates append-only:
+runs in a key's latest or a new period never decode the older cells, and
+untouched blocks are written back verbatim.
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ucis.ncdb.constants import HIST_FLAG_HAS_COVERAGE, HIST_STATUS_OK
+from ucis.ncdb.varint import decode_varints, encode_varints
+
+MAGIC   = 0x524C5550   # 'RLUP'
+VERSION = 1
+
+GRANULARITY_DAY  = 86400
+GRANULARITY_WEEK = 7 * 86400
+GRANULARITIES    = (GRANULARITY_DAY, GRANULARITY_WEEK)
+
+# Unix time 0 is a Thursday; shift so that weeks start on Monday.
+_WEEK_SHIFT = 3 * 86400
+
+_HDR   = struct.Struct("<IBB")      # magic, version, num_tables
+_TABLE = struct.Struct("<II")       # granularity, num_keys
+_KEY   = struct.Struct("<12I")      # see "keys" in the module docstring
+
+# Cell fields (a list, updated in place)
+_RUNS, _FAILS, _TRANS, _PAIRS, _COV, _LAST = range(6)
+_NFIELDS = 6
+
+KEY_ALL = 0
+
+
+def _shift(granularity: int) -> int:
+    return _WEEK_SHIFT if granularity == GRANULARITY_WEEK else 0
+
+
+def period_of(granularity: int, ts: int) -> int:
+    """Return the period number containing unix time *ts*."""
+    return (ts + _shift(granularity)) // granularity
+
+
+def period_start(granularity: int, period: int) -> int:
+    """Return the unix time at which *period* starts."""
+    return period * granularity - _shift(granularity)
+
+
+@dataclass
+class RollupSeries:
+    """Ready-to-plot trend arrays, one element per period with runs.
+
+    Attributes:
+        granularity:   Period length in seconds.
+        ts:            Period start times (unix seconds, ascending).
+        runs:          Runs in each period.
+        pass_rate:     Fraction of runs with status ``HIST_STATUS_OK``.
+        flake_rate:    Fraction of consecutive same-test run pairs whose
+                       outcome flipped between pass and fail.
+        coverage_rate: Fraction of runs that produced coverage data.
+    """
+    granularity:   int
+    ts:            List[int] = field(default_factory=list)
+    runs:          List[int] = field(default_factory=list)
+    pass_rate:     List[float] = field(default_factory=list)
+    flake_rate:    List[float] = field(default_factory=list)
+    coverage_rate: List[float] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def to_dict(self) -> dict:
+        return {
+            "granularity": self.granularity,
+            "ts": self.ts,
+            "runs": self.runs,
+            "pass_rate": self.pass_rate,
+            "flake_rate": self.flake_rate,
+            "coverage_rate": self.coverage_rate,
+        }
+
+
+class _Table:
+    """Cells of one granularity.
+
+    A key is held either decoded (``_cells``: period → cell) or as its
+    latest cell (``_tails``) plus the still-encoded older cells
+    (``_blocks``: ``[num_cells, last_period, bytes]``).  Runs usually land
+    in a key's latest period or a new one, which the second form handles
+    without decoding the key's history.
+    """
+
+    __slots__ = ("granularity", "_cells", "_tails", "_blocks")
+
+    def __init__(self, granularity: int) -> None:
+        self.granularity = granularity
+        self._cells: Dict[int, Dict[int, list]] = {}
+        self._tails: Dict[int, Tuple[int, list]] = {}
+        self._blocks: Dict[int, list] = {}
+
+    def keys(self) -> List[int]:
+        return sorted(set(self._cells) | set(self._tails))
+
+    def get(self, key: int) -> Optional[Dict[int, list]]:
+        """Return all cells of *key* (decoding it), or ``None``."""
+        cells = self._cells.get(key)
+        if cells is None and key in self._tails:
+            num_cells, _, blob = self._blocks.pop(key)
+            vals, _ = decode_varints(blob, num_cells * (_NFIELDS + 1))
+            cells = {}
+            period = 0
+            for i in range(0, len(vals), _NFIELDS + 1):
+                period += vals[i]
+                cells[period] = vals[i + 1:i + 1 + _NFIELDS]
+            tail_period, tail = self._tails.pop(key)
+            cells[tail_period] = tail
+            self._cells[key] = cells
+        return cells
+
+    def peek(self, key: int, period: int) -> Optional[list]:
+        """Return the cell of (*key*, *period*) if there is one."""
+        tail = self._tails.get(key)
+        if tail is not None:
+            if period > tail[0]:
+                return None
+            if period == tail[0]:
+                return tail[1]
+        return (self.get(key) or {}).get(period)
+
+    def cell(self, key: int, period: int) -> list:
+        """Return the mutable cell of (*key*, *period*), creating it."""
+        cells = self._cells.get(key)
+        if cells is None:
+            tail = self._tails.get(key)
+            if tail is None or period > tail[0]:
+                c = [0] * _NFIELDS
+                if tail is None:
+                    self._blocks[key] = [0, 0, b""]
+                else:
+                    block = self._blocks[key]
+                    block[2] += encode_varints([tail[0] - block[1]] + tail[1])
+                    block[0] += 1
+                    block[1] = tail[0]
+                self._tails[key] = (period, c)
+                return c
+            if period == tail[0]:
+                return tail[1]
+            cells = self.get(key)
+        c = cells.get(period)
+        if c is None:
+            c = cells[period] = [0] * _NFIELDS
+        return c
+
+    def clear_periods(self, first: int, last: int, keys: Iterable[int]) -> None:
+        for key in keys:
+            cells = self.get(key)
+            if cells:
+                for p in [p for p in cells if first <= p <= last]:
+                    del cells[p]
+
+    def encode(self) -> bytes:
+        directory = []
+        blocks = []
+        offset = 0
+        for key in self.keys():
+            if key in self._tails:
+                num_cells, last_period, block = self._blocks[key]
+                tail_period, tail = self._tails[key]
+            else:
+                cells = self._cells[key]
+                if not cells:
+                    continue
+                periods = sorted(cells)
+                tail_period = periods.pop()
+                tail = cells[tail_period]
+                vals = []
+                last_period = 0
+                for p in periods:
+                    vals.append(p - last_period)
+                    vals.extend(cells[p])
+                    last_period = p
+                num_cells = len(periods)
+                block = encode_varints(vals) if vals else b""
+            directory.append(_KEY.pack(key, num_cells, offset, len(block),
+                                       last_period, tail_period, *tail))
+            blocks.append(block)
+            offset += len(block)
+        return b"".join([_TABLE.pack(self.granularity, len(directory))]
+                        + directory + blocks)
+
+
+class HistoryRollup:
+    """In-memory representation of ``history/rollup.bin``.
+
+    Example::
+
+        rollup = HistoryRollup()
+        rollup.add_records(BucketReader(data).all_records())
+        series = rollup.series(name_id=3, granularity=GRANULARITY_WEEK)
+        plot(series.ts, series.pass_rate)
+    """
+
+    def __init__(self) -> None:
+        self._tables: Dict[int, _Table] = {g: _Table(g) for g in GRANULARITIES}
+
+    # ── update ────────────────────────────────────────────────────────────
+
+    def add_records(self, records: Iterable) -> None:
+        """Fold run records (``name_id``, ``ts``, ``status``, ``flags``)
+        into every table.  Records are applied in timestamp order.
+        """
+        records = sorted(records, key=lambda r: r.ts)
+        for table in self._tables.values():
+            _apply(table, records)
+
+    def span(self, ts_start: int, ts_end: int) -> Tuple[int, int]:
+        """Return the time range covered by all periods, in any table,
+        that overlap [*ts_start*, *ts_end*]."""
+        lo, hi = ts_start, ts_end
+        for g in self._tables:
+            lo = min(lo, period_start(g, period_of(g, ts_start)))
+            hi = max(hi, period_start(g, period_of(g, ts_end) + 1) - 1)
+        return lo, hi
+
+    def rebuild_span(self, ts_start: int, ts_end: int, records: Iterable,
+                     name_ids: Iterable[int] = ()) -> None:
+        """Drop the periods overlapping [*ts_start*, *ts_end*] and recompute
+        them from *records*.
+
+        *records* must hold every run that should remain inside
+        :meth:`span` of that range (runs outside it are ignored).  Cells of
+        tests without such a run are only dropped when listed in
+        *name_ids* — pass the tests of the runs being taken out.
+        """
+        records = sorted(records, key=lambda r: r.ts)
+        keys = {KEY_ALL} | {n + 1 for n in name_ids} | \
+            {r.name_id + 1 for r in records}
+        for g, table in self._tables.items():
+            first, last = period_of(g, ts_start), period_of(g, ts_end)
+            table.clear_periods(first, last, keys)
+            _apply(table, [r for r in records
+                           if first <= period_of(g, r.ts) <= last])
+
+    # ── query ─────────────────────────────────────────────────────────────
+
+    def series(self, name_id: Optional[int] = None,
+               granularity: int = GRANULARITY_DAY,
+               ts_from: Optional[int] = None,
+               ts_to: Optional[int] = None,
+               pending: Iterable = ()) -> RollupSeries:
+        """Return the trend of one test (*name_id*) or of all tests.
+
+        Args:
+            name_id:     Test to report; ``None`` for all tests together.
+            granularity: :data:`GRANULARITY_DAY` or :data:`GRANULARITY_WEEK`.
+            ts_from:     Only periods ending at or after this time.
+            ts_to:       Only periods starting at or before this time.
+            pending:     Extra records not yet folded in (e.g. the open
+                         bucket); they are included without modifying
+                         the rollup.
+        """
+        if granularity not in self._tables:
+            raise ValueError(f"Unsupported rollup granularity {granularity}")
+        table = self._tables[granularity]
+        key = KEY_ALL if name_id is None else name_id + 1
+        cells = table.get(key) or {}
+
+        pending = sorted(pending, key=lambda r: r.ts)
+        if pending:
+            overlay: Dict[Tuple[int, int], list] = {}
+            _apply(table, pending, overlay)
+            cells = dict(cells)
+            for (k, p), cell in overlay.items():
+                if k == key:
+                    cells[p] = cell
+
+        first = None if ts_from is None else period_of(granularity, ts_from)
+        last = None if ts_to is None else period_of(granularity, ts_to)
+        out = RollupSeries(granularity=granularity)
+        for p in sorted(cells):
+            if (first is not None and p < first) or \
+                    (last is not None and p > last):
+                continue
+            c = cells[p]
+            runs = c[_RUNS]
+            if not runs:
+                continue
+            out.ts.append(period_start(granularity, p))
+            out.runs.append(runs)
+            out.pass_rate.append((runs - c[_FAILS]) / runs)
+            out.flake_rate.append(c[_TRANS] / c[_PAIRS] if c[_PAIRS] else 0.0)
+            out.coverage_rate.append(c[_COV] / runs)
+        return out
+
+    # ── serialization ─────────────────────────────────────────────────────
+
+    def serialize(self) -> bytes:
+        """Encode the rollup to bytes for storage in the ZIP archive."""
+        return b"".join([_HDR.pack(MAGIC, VERSION, len(self._tables))]
+                        + [t.encode() for t in self._tables.values()])
+
+    @classmethod
+    def deserialize(cls, data: bytes) -> "HistoryRollup":
+        """Reconstruct a HistoryRollup from raw bytes.
+
+        Only the key directories are parsed here; cells are decoded per key
+        on first use.
+
+        Raises:
+            ValueError: if magic or version is wrong.
+        """
+        magic, version, num_tables = _HDR.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Bad rollup magic 0x{magic:08X}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported rollup version {version}")
+
+        rollup = cls()
+        offset = _HDR.size
+        for _ in range(num_tables):
+            granularity, num_keys = _TABLE.unpack_from(data, offset)
+            offset += _TABLE.size
+            table = _Table(granularity)
+            base = offset + num_keys * _KEY.size
+            end = base
+            for fields in _KEY.iter_unpack(data[offset:base]):
+                key, num_cells, start, size, last_period, tail_period = \
+                    fields[:6]
+                table._blocks[key] = [
+                    num_cells, last_period,
+                    bytes(data[base + start:base + start + size])]
+                table._tails[key] = (tail_period, list(fields[6:]))
+                end = max(end, base + start + size)
+            offset = end
+            rollup._tables[granularity] = table
+        return rollup
+
+
+def _apply(table: _Table, records: List,
+           overlay: Optional[Dict[Tuple[int, int], list]] = None) -> None:
+    """Fold ts-ordered *records* into *table*.
+
+    With an *overlay*, touched cells are copied into it (keyed by
+    ``(key, period)``) and *table* itself is left unchanged.
+    """
+    g = table.granularity
+    shift = _shift(g)
+
+    def cell(key, p):
+        if overlay is None:
+            return table.cell(key, p)
+        c = overlay.get((key, p))
+        if c is None:
+            base = table.peek(key, p)
+            c = overlay[(key, p)] = list(base) if base else [0] * _NFIELDS
+        return c
+
+    for r in records:
+        p = (r.ts + shift) // g
+        c = cell(r.name_id + 1, p)
+        tot = cell(KEY_ALL, p)
+        failed = r.status != HIST_STATUS_OK
+        if c[_RUNS]:
+            c[_PAIRS] += 1
+            tot[_PAIRS] += 1
+            if (c[_LAST] != HIST_STATUS_OK) != failed:
+                c[_TRANS] += 1
+                tot[_TRANS] += 1
+        c[_RUNS] += 1
+        tot[_RUNS] += 1
+        if failed:
+            c[_FAILS] += 1
+            tot[_FAILS] += 1
+        if r.flags & HIST_FLAG_HAS_COVERAGE:
+            c[_COV] += 1
+            tot[_COV] += 1
+        c[_LAST] = r.status
@@ -14,7 +14,12 @@ Two merge paths:
     The result is written as a new NCDB file via NcdbWriter.
 
 History nodes from all sources are accumulated in the output.  A new
-MERGE HistoryNode is appended to record the operation.
+MERGE HistoryNode is appended to record the operation.  Per-test
+contributions (contrib.bin) follow their history nodes: each source's
+history indices are shifted by the number of nodes before it.
+
+Both paths write the target with the merger's *compress_level* and
+*workers* (see :class:`~ucis.ncdb.ncdb_writer.NcdbWriter`).
 
 v2 binary history (if present in any source) is merged correctly:
   - TestRegistry names/seeds are unioned; stable name_id remaps are computed
@@ -34,6 +39,8 @@ from typing import Dict, List, Optional, Tuple
 
 from .ncdb_reader import NcdbReader
 from .ncdb_writer import NcdbWriter
+from .zip_writer import write_zip
+from .contrib import ContribStore, is_contrib_member
 from .manifest import Manifest
 from .counts import CountsReader, CountsWriter
 from .history import HistoryWriter, HistoryReader
@@ -42,6 +49,7 @@ from .constants import (
     MEMBER_COUNTS, MEMBER_HISTORY, MEMBER_SOURCES,
     MEMBER_TEST_REGISTRY, MEMBER_TEST_STATS,
     MEMBER_BUCKET_INDEX, MEMBER_CONTRIB_INDEX, MEMBER_SQUASH_LOG,
+    MEMBER_HISTORY_ROLLUP,
     HISTORY_BUCKET_DIR, HISTORY_FORMAT_V2,
     HIST_STATUS_OK, HIST_STATUS_FAIL,
     MEMBER_TESTPLAN, MEMBER_WAIVERS,
@@ -55,6 +63,10 @@ from ucis.mem.mem_history_node import MemHistoryNode
 class NcdbMerger:
     """Merge N NCDB source files into a single NCDB target file."""
 
+    def __init__(self, compress_level: int = None, workers: int = None):
+        self.compress_level = compress_level
+        self.workers = workers
+
     def merge(self, sources: List[str], target: str) -> None:
         """Merge *sources* into *target*.
 
@@ -94,7 +106,9 @@ class NcdbMerger:
 
         # Gather all history nodes from all sources
         all_history = []
+        hist_offsets = []
         for s in sources:
+            hist_offsets.append(len(all_history))
             all_history.extend(self._read_history(s))
 
         # Add a MERGE history node
@@ -131,14 +145,19 @@ class NcdbMerger:
             strings_bytes    = zf.read(MEMBER_STRINGS)
             scope_tree_bytes = zf.read(MEMBER_SCOPE_TREE)
             sources_bytes    = zf.read(MEMBER_SOURCES)
-            # Gather existing contrib/* members from all sources (copy verbatim)
-            contrib_members_all: Dict[str, bytes] = {}
 
-        for src in sources:
+        # Concatenate per-test contributions, shifting each source's
+        # history indices to where its nodes land in all_history.  Rows are
+        # taken over still encoded; only the bin index is rebuilt.
+        contrib = ContribStore()
+        for src, hist_offset in zip(sources, hist_offsets):
             with zipfile.ZipFile(src, "r") as zf:
-                for n_member in zf.namelist():
-                    if n_member.startswith("contrib/"):
-                        contrib_members_all[n_member] = zf.read(n_member)
+                contrib_members = {n: zf.read(n) for n in zf.namelist()
+                                   if is_contrib_member(n)}
+            if contrib_members:
+                contrib.add_store(ContribStore.from_members(contrib_members),
+                                  hist_offset)
+        contrib_members_all = contrib.serialize()
 
         counts_bytes  = CountsWriter().serialize(merged_counts)
         history_bytes = HistoryWriter().serialize(all_history)
@@ -152,22 +171,23 @@ class NcdbMerger:
         testplan_bytes = self._merge_testplans(sources)
         waivers_bytes  = self._merge_waivers(sources)
 
-        with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            zf.writestr(MEMBER_MANIFEST,   new_manifest.serialize())
-            zf.writestr(MEMBER_STRINGS,    strings_bytes)
-            zf.writestr(MEMBER_SCOPE_TREE, scope_tree_bytes)
-            zf.writestr(MEMBER_COUNTS,     counts_bytes)
-            zf.writestr(MEMBER_HISTORY,    history_bytes)
-            zf.writestr(MEMBER_SOURCES,    sources_bytes)
-            for member_name, member_bytes in contrib_members_all.items():
-                zf.writestr(member_name, member_bytes)
-            for member_name, member_bytes in v2_members.items():
-                zf.writestr(member_name, member_bytes,
-                            compress_type=zipfile.ZIP_STORED)
-            if testplan_bytes:
-                zf.writestr(MEMBER_TESTPLAN, testplan_bytes)
-            if waivers_bytes:
-                zf.writestr(MEMBER_WAIVERS, waivers_bytes)
+        members = [
+            (MEMBER_MANIFEST,   new_manifest.serialize(), True),
+            (MEMBER_STRINGS,    strings_bytes, True),
+            (MEMBER_SCOPE_TREE, scope_tree_bytes, True),
+            (MEMBER_COUNTS,     counts_bytes, True),
+            (MEMBER_HISTORY,    history_bytes, True),
+            (MEMBER_SOURCES,    sources_bytes, True),
+        ]
+        for member_name, member_bytes in contrib_members_all.items():
+            members.append((member_name, member_bytes, True))
+        for member_name, member_bytes in v2_members.items():
+            members.append((member_name, member_bytes, False))
+        if testplan_bytes:
+            members.append((MEMBER_TESTPLAN, testplan_bytes, True))
+        if waivers_bytes:
+            members.append((MEMBER_WAIVERS, waivers_bytes, True))
+        write_zip(target, members, self.compress_level, self.workers)
 
     # ── Cross-schema fallback ─────────────────────────────────────────────
 
@@ -207,7 +227,7 @@ class NcdbMerger:
             merge_node.getKind(),
         )
 
-        NcdbWriter().write(out_db, target)
+        NcdbWriter(self.compress_level, self.workers).write(out_db, target)
 
         for db in dbs:
             db.close()
@@ -223,6 +243,7 @@ class NcdbMerger:
         from .contrib_index import ContribIndex, POLICY_PASS_ONLY
         from .squash_log import SquashLog
         from .history_buckets import BucketWriter, BucketReader
+        from .history_rollup import HistoryRollup
 
         # --- Step 1: load per-source v2 state ---
         src_states = []
@@ -307,7 +328,7 @@ class NcdbMerger:
             rid_offset = run_id_offsets[src_idx]
             src_bidx = state['bucket_index']
 
-            for bidx_entry in src_bidx._entries:
+            for bidx_entry in src_bidx.entries():
                 old_seq = bidx_entry.bucket_seq
                 compressed = state['buckets'].get(old_seq)
                 if compressed is None:
@@ -316,16 +337,31 @@ class NcdbMerger:
                 if n_remap or s_remap:
                     compressed = _remap_bucket(compressed, n_remap, s_remap)
                 merged_buckets[new_seq] = compressed
-                # Remap name_ids in the index entry
-                min_nid = n_remap.get(bidx_entry.min_name_id, bidx_entry.min_name_id)
-                max_nid = n_remap.get(bidx_entry.max_name_id, bidx_entry.max_name_id)
-                merged_bidx.add_bucket(
-                    new_seq, bidx_entry.ts_start, bidx_entry.ts_end,
-                    bidx_entry.num_records, bidx_entry.fail_count,
-                    min(min_nid, max_nid), max(min_nid, max_nid),
-                )
+                if n_remap:
+                    # Remapping does not preserve order, so the name range
+                    # and filter are rebuilt from the bucket's names.
+                    name_ids = BucketReader(compressed).name_ids()
+                    merged_bidx.add_bucket(
+                        new_seq, bidx_entry.ts_start, bidx_entry.ts_end,
+                        bidx_entry.num_records, bidx_entry.fail_count,
+                        min(name_ids), max(name_ids), name_ids=name_ids,
+                    )
+                else:
+                    merged_bidx.add_bucket(
+                        new_seq, bidx_entry.ts_start, bidx_entry.ts_end,
+                        bidx_entry.num_records, bidx_entry.fail_count,
+                        bidx_entry.min_name_id, bidx_entry.max_name_id,
+                    )
+                    merged_bidx.last_bucket().name_filter = \
+                        bidx_entry.name_filter
                 new_seq += 1
 
+        # --- Step 5b: rebuild the trend rollup from the merged buckets ---
+        merged_rollup = HistoryRollup()
+        merged_rollup.add_records(
+            rec for data in merged_buckets.values()
+            for rec in BucketReader(data).all_records())
+
         # --- Step 6: merge ContribIndex ---
         merged_cidx = ContribIndex(merge_policy=POLICY_PASS_ONLY)
         for src_idx, state in enumerate(src_states):
@@ -362,6 +398,7 @@ class NcdbMerger:
         result[MEMBER_BUCKET_INDEX]  = merged_bidx.serialize()
         result[MEMBER_CONTRIB_INDEX] = merged_cidx.serialize()
         result[MEMBER_SQUASH_LOG]    = merged_slog.serialize()
+        result[MEMBER_HISTORY_ROLLUP] = merged_rollup.serialize()
         for seq, data in merged_buckets.items():
             result[f"{HISTORY_BUCKET_DIR}{seq:06d}.bin"] = data
 
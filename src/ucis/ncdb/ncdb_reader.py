@@ -16,7 +16,7 @@ from .properties import PropertiesReader
 from .toggle import ToggleReader
 from .fsm import FsmReader
 from .cross import CrossReader
-from .contrib import ContribReader
+from .contrib import ContribReader, is_contrib_member
 from .formal import FormalReader
 from .coveritem_flags import CoveritemFlagsReader
 from .design_units import DesignUnitsReader
@@ -25,7 +25,7 @@ from .constants import (
     MEMBER_MANIFEST, MEMBER_STRINGS, MEMBER_SCOPE_TREE,
     MEMBER_COUNTS, MEMBER_HISTORY, MEMBER_SOURCES,
     MEMBER_ATTRS, MEMBER_TAGS, MEMBER_PROPERTIES, MEMBER_TOGGLE, MEMBER_FSM,
-    MEMBER_CROSS, MEMBER_DESIGN_UNITS, MEMBER_CONTRIB_DIR, MEMBER_FORMAL,
+    MEMBER_CROSS, MEMBER_DESIGN_UNITS, MEMBER_FORMAL,
     NCDB_FORMAT,
     MEMBER_COVERITEM_FLAGS,
     MEMBER_TEST_REGISTRY, MEMBER_TEST_STATS,
@@ -96,9 +96,9 @@ class NcdbReader:
         du_bytes     = zf_data.get(MEMBER_DESIGN_UNITS,      b'')
         formal_bytes = zf_data.get(MEMBER_FORMAL,            b'')
         ci_flags_bytes = zf_data.get(MEMBER_COVERITEM_FLAGS, b'')
-        # Collect all contrib/* members
+        # Collect contrib.bin, its index and any legacy contrib/* members
         contrib_members = {
-            n: zf_data[n] for n in names if n.startswith(MEMBER_CONTRIB_DIR)
+            n: zf_data[n] for n in names if is_contrib_member(n)
         }
 
         manifest = Manifest.from_bytes(manifest_bytes)
@@ -132,9 +132,9 @@ class NcdbReader:
         if tags_bytes:
             TagsReader().deserialize(tags_bytes, db)
         if props_bytes:
-            PropertiesReader().apply(db, props_bytes)
+            PropertiesReader().apply(db, props_bytes, string_table)
         if toggle_bytes:
-            ToggleReader().apply(db, toggle_bytes)
+            ToggleReader().apply(db, toggle_bytes, string_table)
         # FSM reader always runs (rebuilds _states/_transitions from cover items)
         FsmReader().apply(db, fsm_bytes)
         if cross_bytes:
@@ -204,7 +204,7 @@ class NcdbReader:
                 hn.setComment(node.getComment())
 
         if attrs_bytes:
-            AttrsReader().deserialize(attrs_bytes, db)
+            AttrsReader().deserialize(attrs_bytes, db, string_table)
 
         # v2 binary history members (optional — present only in v2 archives)
         if manifest.history_format == HISTORY_FORMAT_V2:
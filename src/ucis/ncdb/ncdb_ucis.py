@@ -21,6 +21,7 @@ Binary history v2 usage::
                              status=HIST_STATUS_OK, has_coverage=True)
     entry  = db.get_test_stats("uart_smoke")
     print(entry.flake_score)
+    trend  = db.history_trend("uart_smoke", granularity="week")
 """
 
 import time
@@ -36,10 +37,11 @@ from .constants import (
     MEMBER_COUNTS, MEMBER_HISTORY, MEMBER_SOURCES,
     MEMBER_ATTRS, MEMBER_TAGS, MEMBER_PROPERTIES,
     MEMBER_TOGGLE, MEMBER_FSM, MEMBER_CROSS, MEMBER_DESIGN_UNITS,
-    MEMBER_CONTRIB_DIR, MEMBER_FORMAL,
+    MEMBER_FORMAL,
     MEMBER_TEST_REGISTRY, MEMBER_TEST_STATS,
     MEMBER_BUCKET_INDEX, MEMBER_CONTRIB_INDEX, MEMBER_SQUASH_LOG,
-    HISTORY_BUCKET_DIR, HISTORY_FORMAT_V2,
+    MEMBER_JOURNAL_STATE, MEMBER_HISTORY_ROLLUP,
+    HISTORY_BUCKET_DIR, HISTORY_BUCKET_MAX_RECORDS, HISTORY_FORMAT_V2,
     HIST_FLAG_IS_RERUN, HIST_FLAG_HAS_COVERAGE,
     NCDB_FORMAT,
 )
@@ -78,6 +80,7 @@ class NcdbUCIS(MemUCIS):
         self._bucket_index = None
         self._contrib_index = None
         self._squash_log = None
+        self._rollup = None            # HistoryRollup, loaded on demand
         self._current_bucket_writer = None
         self._sealed_buckets: Dict[int, bytes] = {}  # seq → compressed bytes
         self._history_v2_dirty: bool = False
@@ -150,6 +153,9 @@ class NcdbUCIS(MemUCIS):
             flags |= HIST_FLAG_IS_RERUN
         if has_coverage:
             flags |= HIST_FLAG_HAS_COVERAGE
+        if not self._current_bucket_writer.can_add(seed_id):
+            # Out of local seed slots: start a new bucket for this record
+            self._seal_current_bucket()
         self._current_bucket_writer.add(name_id, seed_id, ts, status, flags)
 
         if self._current_bucket_writer.is_full():
@@ -222,6 +228,43 @@ class NcdbUCIS(MemUCIS):
 
         return results
 
+    def history_trend(self, name: Optional[str] = None,
+                      granularity: str = "day",
+                      ts_from: Optional[int] = None,
+                      ts_to: Optional[int] = None):
+        """Return pass-rate, flake-rate and coverage-run trend arrays.
+
+        Read from the ``history/rollup.bin`` aggregates, so the cost does
+        not grow with the number of runs.  Runs recorded this session but
+        not yet sealed into a bucket are included.
+
+        Args:
+            name:        Test name, or ``None`` for all tests together.
+            granularity: ``"day"`` or ``"week"`` (UTC, weeks start Monday).
+            ts_from:     Optional lower bound timestamp (inclusive).
+            ts_to:       Optional upper bound timestamp (inclusive).
+
+        Returns:
+            :class:`~ucis.ncdb.history_rollup.RollupSeries`.
+        """
+        from .history_rollup import (
+            GRANULARITY_DAY, GRANULARITY_WEEK, RollupSeries,
+        )
+        granularities = {"day": GRANULARITY_DAY, "week": GRANULARITY_WEEK}
+        if granularity not in granularities:
+            raise ValueError(f"granularity must be 'day' or 'week', "
+                             f"got {granularity!r}")
+        g = granularities[granularity]
+        self._ensure_v2_history()
+        name_id = None
+        if name is not None:
+            name_id = self._test_registry._name_to_id.get(name)
+            if name_id is None:
+                return RollupSeries(granularity=g)
+        return self._ensure_rollup().series(
+            name_id, g, ts_from=ts_from, ts_to=ts_to,
+            pending=self._current_bucket_writer._records)
+
     def get_test_stats(self, name: str):
         """Return the TestStatsEntry for *name*, or None if not seen.
 
@@ -319,14 +362,27 @@ class NcdbUCIS(MemUCIS):
             ts_start    = min(r.ts for r in recs)
             ts_end      = max(r.ts for r in recs)
             fail_count  = sum(1 for r in recs if r.status == HIST_STATUS_FAIL)
-            min_name_id = min(r.name_id for r in recs)
-            max_name_id = max(r.name_id for r in recs)
+            name_ids    = [r.name_id for r in recs]
             out_bidx = BucketIndex.deserialize(self._bucket_index.serialize())
             out_bidx.add_bucket(seq, ts_start, ts_end,
                                 len(recs), fail_count,
-                                min_name_id, max_name_id)
+                                min(name_ids), max(name_ids),
+                                name_ids=name_ids)
 
         members[MEMBER_BUCKET_INDEX] = out_bidx.serialize()
+
+        from .history_rollup import HistoryRollup
+        rollup = self._ensure_rollup()
+        if self._current_bucket_writer is not None and \
+                self._current_bucket_writer.num_records > 0:
+            rollup = HistoryRollup.deserialize(rollup.serialize())
+            rollup.add_records(self._current_bucket_writer._records)
+        members[MEMBER_HISTORY_ROLLUP] = rollup.serialize()
+
+        # Journal consumption offsets travel with the history they describe
+        journal_state = self._zf_cache.get(MEMBER_JOURNAL_STATE)
+        if journal_state:
+            members[MEMBER_JOURNAL_STATE] = journal_state
         return members
 
     # ── Testplan API ──────────────────────────────────────────────────────
@@ -480,16 +536,16 @@ class NcdbUCIS(MemUCIS):
 
         if attrs_data:
             from .attrs import AttrsReader
-            AttrsReader().deserialize(attrs_data, self)
+            AttrsReader().deserialize(attrs_data, self, string_table)
         if tags_data:
             from .tags import TagsReader
             TagsReader().deserialize(tags_data, self)
         if props_data:
             from .properties import PropertiesReader
-            PropertiesReader().apply(self, props_data)
+            PropertiesReader().apply(self, props_data, string_table)
         if toggle_data:
             from .toggle import ToggleReader
-            ToggleReader().apply(self, toggle_data)
+            ToggleReader().apply(self, toggle_data, string_table)
         from .fsm import FsmReader
         FsmReader().apply(self, fsm_data)
         if cross_data:
@@ -499,11 +555,11 @@ class NcdbUCIS(MemUCIS):
         self._du_index = DesignUnitsReader().build_index(du_data, self)
 
         # Per-test contributions (optional)
+        from .contrib import ContribReader, is_contrib_member
         contrib_members = {
-            name: data[name] for name in data if name.startswith(MEMBER_CONTRIB_DIR)
+            name: data[name] for name in data if is_contrib_member(name)
         }
         if contrib_members:
-            from .contrib import ContribReader
             ContribReader().apply(self, contrib_members)
 
         # Formal verification data (optional)
@@ -573,6 +629,60 @@ class NcdbUCIS(MemUCIS):
 
         # Start a fresh current bucket (for new records written this session)
         self._current_bucket_writer = BucketWriter()
+        self._rollup = None
+
+    def _ensure_rollup(self):
+        """Return the HistoryRollup for the sealed buckets, loading it from
+        ``history/rollup.bin`` or, for files written without one, building
+        it from the buckets."""
+        if self._rollup is None:
+            from .history_rollup import HistoryRollup
+            from .history_buckets import BucketReader
+            data = self._zf_cache.get(MEMBER_HISTORY_ROLLUP)
+            if data:
+                self._rollup = HistoryRollup.deserialize(data)
+            else:
+                self._rollup = HistoryRollup()
+                self._rollup.add_records(
+                    rec for seq in sorted(self._sealed_buckets)
+                    for rec in BucketReader(
+                        self._sealed_buckets[seq]).all_records())
+        return self._rollup
+
+    def _reopen_last_bucket(self) -> None:
+        """Move the last sealed bucket back into the current bucket writer
+        if it has room, so that appended runs fill it up instead of
+        starting another small bucket.  Only valid while the current
+        bucket is empty.
+        """
+        from .history_buckets import BucketWriter, BucketReader
+        if self._current_bucket_writer.num_records or \
+                not self._bucket_index.num_buckets:
+            return
+        last = self._bucket_index.last_bucket()
+        data = self._sealed_buckets.get(last.bucket_seq)
+        if data is None or last.num_records >= HISTORY_BUCKET_MAX_RECORDS:
+            return
+        w = BucketWriter()
+        for rec in BucketReader(data).all_records():
+            if not w.can_add(rec.seed_id):
+                return
+            w.add(rec.name_id, rec.seed_id, rec.ts, rec.status, rec.flags)
+        rollup = self._ensure_rollup()
+        del self._sealed_buckets[last.bucket_seq]
+        self._bucket_index.remove_bucket(last.bucket_seq)
+        self._current_bucket_writer = w
+
+        # Take the bucket's runs back out of the rollup: recompute the
+        # periods it touched from the buckets that remain.
+        lo, hi = rollup.span(last.ts_start, last.ts_end)
+        remaining = []
+        for entry in self._bucket_index.buckets_in_range(lo, hi):
+            data = self._sealed_buckets.get(entry.bucket_seq)
+            if data is not None:
+                remaining.extend(BucketReader(data).all_records())
+        rollup.rebuild_span(last.ts_start, last.ts_end, remaining,
+                            name_ids={r.name_id for r in w._records})
 
     def _seal_current_bucket(self) -> None:
         """Seal the current bucket and start a new one."""
@@ -581,6 +691,7 @@ class NcdbUCIS(MemUCIS):
         if w.num_records == 0:
             return
         seq = self._bucket_index.next_seq()
+        rollup = self._ensure_rollup()
         data = w.seal(use_lzma=True)
         self._sealed_buckets[seq] = data
 
@@ -597,7 +708,9 @@ class NcdbUCIS(MemUCIS):
             fail_count=fail_count,
             min_name_id=min(name_ids),
             max_name_id=max(name_ids),
+            name_ids=name_ids,
         )
+        rollup.add_records(all_recs)
         self._current_bucket_writer = BucketWriter()
 
 
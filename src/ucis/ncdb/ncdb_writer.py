@@ -1,9 +1,11 @@
 """
 NcdbWriter — serialize a UCIS model to a ZIP .cdb (NCDB) file.
-"""
 
-import zipfile
-from datetime import datetime, timezone
+The scope tree is walked once: while ScopeTreeWriter encodes scope_tree.bin
+it also feeds every DFS-index-keyed member serializer (attrs, tags,
+properties, toggle, fsm, cross, design units, coveritem flags).  The
+members are then compressed in parallel by :func:`~.zip_writer.write_zip`.
+"""
 
 from .string_table import StringTable
 from .scope_tree import ScopeTreeWriter
@@ -21,6 +23,7 @@ from .formal import FormalWriter
 from .coveritem_flags import CoveritemFlagsWriter
 from .design_units import DesignUnitsWriter
 from .manifest import Manifest
+from .zip_writer import write_zip
 from .constants import (
     MEMBER_MANIFEST, MEMBER_STRINGS, MEMBER_SCOPE_TREE,
     MEMBER_COUNTS, MEMBER_HISTORY, MEMBER_SOURCES,
@@ -33,26 +36,48 @@ from .constants import (
 from ucis.history_node_kind import HistoryNodeKind
 
 
+_EMPTY_TAGS = b'{"version":1,"entries":[]}'
+
+
 class NcdbWriter:
-    """Write a UCIS database to an NCDB .cdb ZIP file."""
+    """Write a UCIS database to an NCDB .cdb ZIP file.
+
+    Args:
+        compress_level: zlib level (0-9) for the ZIP members.  Lower levels
+            write faster at the cost of file size, which suits intermediate
+            files; 0 stores the members uncompressed.  Defaults to 6.
+        workers: Threads compressing members in parallel (default: one
+            per CPU).
+    """
+
+    def __init__(self, compress_level: int = None, workers: int = None):
+        self.compress_level = compress_level
+        self.workers = workers
 
     def write(self, db, path: str) -> None:
         """Serialize *db* (UCIS) to the file at *path*."""
         string_table = StringTable()
         file_handles: list = []
 
-        # 1. Serialize scope tree (populates string_table, file_handles, counts)
-        st_writer = ScopeTreeWriter(string_table, file_handles)
+        # 1. Serialize scope tree (populates string_table, file_handles,
+        #    counts) and, in the same walk, the DFS-index-keyed members
+        attrs_w, tags_w, props_w, toggle_w, fsm_w, cross_w, du_w, ci_flags_w = \
+            scope_members = (AttrsWriter(string_table), TagsWriter(),
+                             PropertiesWriter(string_table),
+                             ToggleWriter(string_table), FsmWriter(),
+                             CrossWriter(), DesignUnitsWriter(),
+                             CoveritemFlagsWriter())
+        for member in scope_members:
+            member.begin()
+        st_writer = ScopeTreeWriter(string_table, file_handles,
+                                    listeners=scope_members)
         scope_tree_bytes = st_writer.write(db)
         counts = st_writer.counts_list
 
         # 2. Serialize counts
         counts_bytes = CountsWriter().serialize(counts)
 
-        # 3. Serialize strings
-        strings_bytes = string_table.serialize()
-
-        # 4. History nodes
+        # 3. History nodes
         history_nodes = list(db.historyNodes(HistoryNodeKind.ALL
                                               if hasattr(HistoryNodeKind, 'ALL')
                                               else HistoryNodeKind.TEST))
@@ -66,7 +91,7 @@ class NcdbWriter:
             all_nodes = list(db.historyNodes(HistoryNodeKind.TEST))
         history_bytes = HistoryWriter().serialize(all_nodes)
 
-        # 5. Source files
+        # 4. Source files
         # Use file handles discovered during scope_tree walk; fall back to db.getSourceFiles()
         if not file_handles:
             try:
@@ -75,17 +100,20 @@ class NcdbWriter:
                 file_handles = []
         sources_bytes = SourcesWriter().serialize(file_handles)
 
-        # 6. Sparse optional members
-        attrs_bytes   = AttrsWriter().serialize(db)
-        tags_bytes    = TagsWriter().serialize(db)
-        props_bytes   = PropertiesWriter().serialize(db)
-        toggle_bytes  = ToggleWriter().serialize(db)
-        fsm_bytes     = FsmWriter().serialize(db)
-        cross_bytes   = CrossWriter().serialize(db)
-        du_bytes      = DesignUnitsWriter().serialize(db)
+        # 5. Sparse optional members
+        attrs_bytes   = attrs_w.finish(db)
+        tags_bytes    = tags_w.finish(db)
+        props_bytes   = props_w.finish(db)
+        toggle_bytes  = toggle_w.finish(db)
+        fsm_bytes     = fsm_w.finish(db)
+        cross_bytes   = cross_w.finish(db)
+        du_bytes      = du_w.finish(db)
         contrib_members = ContribWriter().serialize(db)
         formal_bytes  = FormalWriter().serialize(db)
-        ci_flags_bytes = CoveritemFlagsWriter().serialize(db)
+        ci_flags_bytes = ci_flags_w.finish(db)
+
+        # 6. Serialize strings, once the members above have added theirs
+        strings_bytes = string_table.serialize()
 
         # 7. Manifest
         manifest = Manifest.build(db, scope_tree_bytes, counts, all_nodes)
@@ -100,43 +128,44 @@ class NcdbWriter:
         manifest_bytes = manifest.serialize()
 
         # 8. Write ZIP
-        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            zf.writestr(MEMBER_MANIFEST,   manifest_bytes)
-            zf.writestr(MEMBER_STRINGS,    strings_bytes)
-            zf.writestr(MEMBER_SCOPE_TREE, scope_tree_bytes)
-            zf.writestr(MEMBER_COUNTS,     counts_bytes)
-            zf.writestr(MEMBER_HISTORY,    history_bytes)
-            zf.writestr(MEMBER_SOURCES,    sources_bytes)
-            _EMPTY_ATTRS_V2 = b'{"version":2,"scopes":[],"coveritems":[],"history":[],"global":{}}'
-            if attrs_bytes not in (b'{"version":1,"entries":[]}', _EMPTY_ATTRS_V2):
-                zf.writestr(MEMBER_ATTRS, attrs_bytes)
-            if tags_bytes != b'{"version":1,"entries":[]}':
-                zf.writestr(MEMBER_TAGS, tags_bytes)
-            if props_bytes:
-                zf.writestr(MEMBER_PROPERTIES, props_bytes)
-            if toggle_bytes:
-                zf.writestr(MEMBER_TOGGLE, toggle_bytes)
-            if fsm_bytes:
-                zf.writestr(MEMBER_FSM, fsm_bytes)
-            if cross_bytes:
-                zf.writestr(MEMBER_CROSS, cross_bytes)
-            if du_bytes:
-                zf.writestr(MEMBER_DESIGN_UNITS, du_bytes)
-            for member_name, member_bytes in contrib_members.items():
-                zf.writestr(member_name, member_bytes)
-            if formal_bytes:
-                zf.writestr(MEMBER_FORMAL, formal_bytes)
-            if ci_flags_bytes:
-                zf.writestr(MEMBER_COVERITEM_FLAGS, ci_flags_bytes)
-            # v2 binary history members (stored uncompressed — pre-compressed)
-            for member_name, member_bytes in v2_members.items():
-                zf.writestr(member_name, member_bytes,
-                            compress_type=zipfile.ZIP_STORED)
-            # Testplan (optional)
-            testplan = getattr(db, '_testplan', None)
-            if testplan is not None:
-                zf.writestr(MEMBER_TESTPLAN, testplan.serialize())
-            # Waivers (optional)
-            waivers = getattr(db, '_waivers', None)
-            if waivers is not None:
-                zf.writestr(MEMBER_WAIVERS, waivers.serialize())
+        members = [
+            (MEMBER_MANIFEST,   manifest_bytes, True),
+            (MEMBER_STRINGS,    strings_bytes, True),
+            (MEMBER_SCOPE_TREE, scope_tree_bytes, True),
+            (MEMBER_COUNTS,     counts_bytes, True),
+            (MEMBER_HISTORY,    history_bytes, True),
+            (MEMBER_SOURCES,    sources_bytes, True),
+        ]
+        if attrs_bytes:
+            members.append((MEMBER_ATTRS, attrs_bytes, True))
+        if tags_bytes != _EMPTY_TAGS:
+            members.append((MEMBER_TAGS, tags_bytes, True))
+        if props_bytes:
+            members.append((MEMBER_PROPERTIES, props_bytes, True))
+        if toggle_bytes:
+            members.append((MEMBER_TOGGLE, toggle_bytes, True))
+        if fsm_bytes:
+            members.append((MEMBER_FSM, fsm_bytes, True))
+        if cross_bytes:
+            members.append((MEMBER_CROSS, cross_bytes, True))
+        if du_bytes:
+            members.append((MEMBER_DESIGN_UNITS, du_bytes, True))
+        for member_name, member_bytes in contrib_members.items():
+            members.append((member_name, member_bytes, True))
+        if formal_bytes:
+            members.append((MEMBER_FORMAL, formal_bytes, True))
+        if ci_flags_bytes:
+            members.append((MEMBER_COVERITEM_FLAGS, ci_flags_bytes, True))
+        # v2 binary history members (stored uncompressed — pre-compressed)
+        for member_name, member_bytes in v2_members.items():
+            members.append((member_name, member_bytes, False))
+        # Testplan (optional)
+        testplan = getattr(db, '_testplan', None)
+        if testplan is not None:
+            members.append((MEMBER_TESTPLAN, testplan.serialize(), True))
+        # Waivers (optional)
+        waivers = getattr(db, '_waivers', None)
+        if waivers is not None:
+            members.append((MEMBER_WAIVERS, waivers.serialize(), True))
+
+        write_zip(path, members, self.compress_level, self.workers)
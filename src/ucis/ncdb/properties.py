@@ -1,7 +1,17 @@
 """
 properties.json — typed UCIS scope/coveritem/history property serialization.
 
-Format: JSON object
+Format v2 (current), all fields varints:
+  version          (2)
+  string header    (see string_table.encode_member_strings)
+  num_entries
+  delta_idx × num_entries   DFS scope index delta from the previous entry
+  key       × num_entries   StrProperty value
+  value     × num_entries   string index
+
+The member keeps its historical name although it is no longer JSON.
+
+Format v1 (legacy, still read): JSON object
   {"version": 1, "entries": [
     {"kind": "scope", "idx": <int>, "key": <int>, "type": "str"|"int"|"real", "value": <val>},
     ...
@@ -20,34 +30,61 @@ StrProperty.COMMENT is queried via the standard getStringProperty() API.
 import json
 
 from ucis.str_property import StrProperty
-from ucis.ncdb.dfs_util import dfs_scope_list
+from ucis.ncdb.dfs_util import DfsScopeSerializer, dfs_scope_list
+from ucis.ncdb.string_table import (
+    StringTable, decode_member_strings, encode_member_strings,
+)
+from ucis.ncdb.varint import (
+    decode_varint, decode_varints, encode_varint, encode_varints,
+)
 
-_VERSION = 1
+_VERSION = 2
+_VERSION_JSON = 1
 
 # Fallback: non-MemObj scopes — probe only COMMENT (the common case).
 _PROBE_STR_PROPERTIES = (StrProperty.COMMENT,)
 
 
-class PropertiesWriter:
-    """Serialize scope properties to properties.json bytes."""
+class PropertiesWriter(DfsScopeSerializer):
+    """Serialize scope properties to properties.json bytes.
 
-    def serialize(self, db) -> bytes:
-        scopes = dfs_scope_list(db)
-        entries = []
-        for idx, scope in enumerate(scopes):
-            sp = self._get_str_properties(scope)
-            for key, val in sp:
-                entries.append({
-                    "kind": "scope",
-                    "idx":  idx,
-                    "key":  int(key),
-                    "type": "str",
-                    "value": val,
-                })
+    Args:
+        string_table: Table the property values are added to, normally
+            the one written to strings.bin.  When None the member embeds
+            a private table.
+    """
+
+    def __init__(self, string_table: StringTable = None):
+        self._string_table = string_table
+
+    def begin(self) -> None:
+        self._entries = []
+
+    def add_scope(self, idx, scope, cover_items) -> None:
+        for key, val in self._get_str_properties(scope):
+            self._entries.append((idx, int(key), val))
+
+    def finish(self, db) -> bytes:
+        entries = self._entries
         if not entries:
             return b""
-        payload = {"version": _VERSION, "entries": entries}
-        return json.dumps(payload, separators=(',', ':')).encode()
+        strings = self._string_table
+        embed = strings is None
+        if embed:
+            strings = StringTable()
+        values = []
+        prev = 0
+        for idx, _, _ in entries:
+            values.append(idx - prev)
+            prev = idx
+        values.extend(key for _, key, _ in entries)
+        values.extend(strings.add(val) for _, _, val in entries)
+
+        buf = bytearray(encode_varint(_VERSION))
+        buf.extend(encode_member_strings(strings, embed))
+        buf.extend(encode_varint(len(entries)))
+        buf.extend(encode_varints(values))
+        return bytes(buf)
 
     def _get_str_properties(self, scope):
         """Yield (StrProperty, value) pairs that are explicitly set on *scope*."""
@@ -71,11 +108,42 @@ class PropertiesWriter:
 class PropertiesReader:
     """Deserialize properties.json and apply properties to the scope tree."""
 
-    def apply(self, db, data: bytes) -> None:
+    def apply(self, db, data: bytes, string_table: StringTable = None) -> None:
+        """Apply the properties in *data* to the scopes of *db*.
+
+        *string_table* is the archive's strings.bin table; it is not
+        needed for members that embed their own table or are legacy JSON.
+        """
         if not data:
             return
+        if data[:1] == b"{":
+            self._apply_json(db, data)
+            return
+        version, offset = decode_varint(data, 0)
+        if version != _VERSION:
+            raise ValueError(f"Unsupported properties.json version: {version}")
+        strings, offset = decode_member_strings(data, offset, string_table)
+        count, offset = decode_varint(data, offset)
+        if not count:
+            return
+        values, _ = decode_varints(data, 3 * count, offset)
+        scopes = dfs_scope_list(db)
+        idx = 0
+        for delta, key_int, value in zip(values, values[count:],
+                                         values[2 * count:]):
+            idx += delta
+            if idx >= len(scopes):
+                continue
+            try:
+                scopes[idx].setStringProperty(-1, StrProperty(key_int),
+                                              strings.get(value))
+            except (ValueError, Exception):
+                pass
+
+    def _apply_json(self, db, data: bytes) -> None:
+        """Legacy v1: JSON entries."""
         payload = json.loads(data.decode())
-        if payload.get("version") != _VERSION:
+        if payload.get("version") != _VERSION_JSON:
             raise ValueError(
                 f"Unsupported properties.json version: {payload.get('version')}")
         entries = payload.get("entries", [])
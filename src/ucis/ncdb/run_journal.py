@@ -0,0 +1,431 @@
+"""
+Run journals — concurrent write-ahead ingestion of test runs into an NCDB
+history store.
+
+Recording runs through :meth:`~ucis.ncdb.ncdb_ucis.NcdbUCIS.add_test_run`
+needs the whole store in memory and a full rewrite of the .cdb, so only one
+process can do it at a time.  Journals split this into two steps:
+
+* Each regression worker appends compact run records to its own journal
+  file in ``<db>.cdb.journal/`` (:class:`RunJournal`).  Workers never touch
+  the .cdb or each other's files, so no locking is needed.
+* :func:`compact_journals` folds all new journal records into
+  ``test_registry.bin``, ``test_stats.bin``, the history buckets and
+  ``contrib_index.bin``, then atomically replaces the .cdb.  Records are
+  applied in timestamp order, so run_ids follow the order the runs
+  happened in.  Only one compaction runs at a time (lock file).
+
+The .cdb remembers how far each journal has been consumed
+(``journal_state.json``), so compaction can run while workers are still
+appending, and a crash at any point neither loses nor double-counts runs.
+A journal closed by its writer is renamed ``<id>.done`` and deleted once it
+has been folded in.  Offsets are keyed by writer_id and the random nonce in
+the journal header, so a later journal reusing a writer_id starts afresh.
+
+Journal file layout (little-endian)::
+
+    Header:
+      magic       u32   0x4C4E4A52  ('RJNL')
+      version     u8    1
+      nonce       u8[8] random; tells journals with the same writer_id apart
+
+    Records (appended; a torn tail is ignored until completed):
+      length      u32   payload bytes
+      payload:
+        ts          varint  unix timestamp
+        status      u8      HIST_STATUS_*
+        flags       u8      HIST_FLAG_* bits
+        cpu_time    f64     seconds; NaN when unknown
+        name_len    varint, name   UTF-8
+        seed_len    varint, seed   UTF-8
+      crc32       u32   of payload
+
+Usage::
+
+    # In each worker
+    with RunJournal("regress.cdb") as journal:
+        journal.record("uart_smoke", seed=42, status=HIST_STATUS_OK,
+                       has_coverage=True)
+
+    # Periodically (cron, end of regression, ...)
+    compact_journals("regress.cdb")
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import socket
+import struct
+import time
+import uuid
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .constants import (
+    HISTORY_BUCKET_DIR, HISTORY_FORMAT_V2, JOURNAL_DIR_SUFFIX,
+    MEMBER_MANIFEST, MEMBER_JOURNAL_STATE,
+    MEMBER_TEST_REGISTRY, MEMBER_TEST_STATS, MEMBER_CONTRIB_INDEX,
+    MEMBER_SQUASH_LOG, MEMBER_BUCKET_INDEX, MEMBER_HISTORY_ROLLUP,
+    HIST_FLAG_IS_RERUN, HIST_FLAG_HAS_COVERAGE,
+)
+from .varint import encode_varint, decode_varint
+
+MAGIC   = 0x4C4E4A52   # 'RJNL'
+VERSION = 1
+
+_HDR = struct.Struct("<IB8s")
+_LEN = struct.Struct("<I")
+_F64 = struct.Struct("<d")
+
+_ACTIVE_SUFFIX = ".jnl"
+_DONE_SUFFIX   = ".done"
+_LOCK_NAME     = ".compact.lock"
+
+
+@dataclass
+class JournalRecord:
+    """One test run as recorded in a journal."""
+    name:     str
+    seed:     str
+    ts:       int
+    status:   int
+    flags:    int
+    cpu_time: Optional[float] = None
+
+
+def journal_dir(cdb_path: str) -> str:
+    """Directory holding the journals of the .cdb at *cdb_path*."""
+    return cdb_path + JOURNAL_DIR_SUFFIX
+
+
+# ── writer ────────────────────────────────────────────────────────────────
+
+class RunJournal:
+    """Append-only journal of test runs for one worker.
+
+    Args:
+        cdb_path:  The NCDB file the runs are destined for (need not exist
+                   yet).
+        writer_id: Journal name, unique per worker.  Defaults to
+                   ``<host>-<pid>-<random>``.  Reusing the id of a journal
+                   that is still open (e.g. across a worker's restarts)
+                   continues that journal; a record left torn by a crash
+                   is discarded first.  Once a closed journal has been
+                   compacted away its id may be reused for a new journal.
+        sync:      fsync after every record, for durability across power
+                   loss (a worker crash never loses written records).
+    """
+
+    def __init__(self, cdb_path: str, writer_id: Optional[str] = None,
+                 sync: bool = False) -> None:
+        if writer_id is None:
+            writer_id = "%s-%d-%s" % (socket.gethostname(), os.getpid(),
+                                      uuid.uuid4().hex[:8])
+        if os.sep in writer_id or (os.altsep and os.altsep in writer_id):
+            raise ValueError("writer_id must not contain a path separator")
+        self.writer_id = writer_id
+        self.sync = sync
+        directory = journal_dir(cdb_path)
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, writer_id + _ACTIVE_SUFFIX)
+        if os.path.exists(os.path.join(directory, writer_id + _DONE_SUFFIX)):
+            raise FileExistsError(
+                "Journal %r was already closed; use a new writer_id" % writer_id)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+                           0o644)
+        size = os.fstat(self._fd).st_size
+        if size:
+            # Records appended after a torn tail would never be read
+            _, end = read_journal(self.path)
+            if end < size:
+                os.ftruncate(self._fd, end)
+            size = end
+        if size == 0:
+            os.write(self._fd, _HDR.pack(MAGIC, VERSION, os.urandom(8)))
+
+    def record(self, name: str, seed="0", status: int = 0,
+               ts: Optional[int] = None,
+               cpu_time: Optional[float] = None,
+               has_coverage: bool = False,
+               is_rerun: bool = False) -> None:
+        """Append one test run.  Arguments are as for
+        :meth:`~ucis.ncdb.ncdb_ucis.NcdbUCIS.add_test_run`; the run_id is
+        assigned when the journal is compacted.
+        """
+        if self._fd is None:
+            raise ValueError("Journal is closed")
+        if ts is None:
+            ts = int(time.time())
+        flags = 0
+        if is_rerun:
+            flags |= HIST_FLAG_IS_RERUN
+        if has_coverage:
+            flags |= HIST_FLAG_HAS_COVERAGE
+        payload = encode_record(JournalRecord(
+            name=name, seed=str(seed), ts=ts, status=status, flags=flags,
+            cpu_time=cpu_time))
+        # One write per record: readers see whole records or a torn tail.
+        os.write(self._fd, _LEN.pack(len(payload)) + payload
+                 + _LEN.pack(zlib.crc32(payload)))
+        if self.sync:
+            os.fsync(self._fd)
+
+    def close(self, done: bool = True) -> None:
+        """Close the journal.
+
+        Args:
+            done: Mark the journal complete, letting compaction delete it
+                  once consumed.  Pass False to leave it open for a later
+                  :class:`RunJournal` with the same *writer_id*.
+        """
+        if self._fd is None:
+            return
+        os.close(self._fd)
+        self._fd = None
+        if done:
+            os.replace(self.path,
+                       self.path[:-len(_ACTIVE_SUFFIX)] + _DONE_SUFFIX)
+
+    def __enter__(self) -> "RunJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ── record encoding ───────────────────────────────────────────────────────
+
+def encode_record(rec: JournalRecord) -> bytes:
+    """Encode the payload of one journal record."""
+    name = rec.name.encode("utf-8")
+    seed = rec.seed.encode("utf-8")
+    cpu_time = math.nan if rec.cpu_time is None else float(rec.cpu_time)
+    return b"".join((
+        encode_varint(rec.ts), bytes((rec.status & 0xFF, rec.flags & 0xFF)),
+        _F64.pack(cpu_time),
+        encode_varint(len(name)), name, encode_varint(len(seed)), seed))
+
+
+def decode_record(payload: bytes) -> JournalRecord:
+    """Decode a payload produced by :func:`encode_record`."""
+    ts, off = decode_varint(payload, 0)
+    status, flags = payload[off], payload[off + 1]
+    cpu_time, = _F64.unpack_from(payload, off + 2)
+    off += 2 + _F64.size
+    n, off = decode_varint(payload, off)
+    name = payload[off:off + n].decode("utf-8")
+    off += n
+    n, off = decode_varint(payload, off)
+    seed = payload[off:off + n].decode("utf-8")
+    return JournalRecord(name=name, seed=seed, ts=ts, status=status,
+                         flags=flags,
+                         cpu_time=None if math.isnan(cpu_time) else cpu_time)
+
+
+def _read_header(fp, path: str) -> Optional[bytes]:
+    """Check the header of the journal open as *fp*; return its nonce, or
+    None if the header is not completely written yet."""
+    header = fp.read(_HDR.size)
+    if len(header) < _HDR.size:
+        return None
+    magic, version, nonce = _HDR.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f"Bad journal magic 0x{magic:08X} in {path}")
+    if version != VERSION:
+        raise ValueError(f"Unsupported journal version {version} in {path}")
+    return nonce
+
+
+def _journal_key(writer_id: str, path: str) -> Optional[str]:
+    """Key of the journal at *path* in the consumed-offset state:
+    ``<writer_id>/<nonce>``, or None if its header is incomplete."""
+    with open(path, "rb") as fp:
+        nonce = _read_header(fp, path)
+    return None if nonce is None else "%s/%s" % (writer_id, nonce.hex())
+
+
+def read_journal(path: str, offset: int = 0
+                 ) -> Tuple[List[JournalRecord], int]:
+    """Read the complete records of the journal at *path* from *offset*.
+
+    Args:
+        path:   Journal file.
+        offset: Byte offset of the first unread record; 0 for the start.
+
+    Returns:
+        ``(records, end)`` where *end* is the offset just past the last
+        complete, intact record — the *offset* for the next read.
+
+    Raises:
+        ValueError: if the file is not a journal.
+    """
+    with open(path, "rb") as fp:
+        if _read_header(fp, path) is None:
+            return [], offset
+        start = max(offset, _HDR.size)
+        fp.seek(start)
+        data = fp.read()
+
+    pos = 0
+    records = []
+    while pos + _LEN.size <= len(data):
+        length, = _LEN.unpack_from(data, pos)
+        end = pos + _LEN.size + length + _LEN.size
+        if end > len(data):
+            break
+        payload = data[pos + _LEN.size:end - _LEN.size]
+        crc, = _LEN.unpack_from(data, end - _LEN.size)
+        if zlib.crc32(payload) != crc:
+            break
+        records.append(decode_record(payload))
+        pos = end
+    return records, start + pos
+
+
+# ── compaction ────────────────────────────────────────────────────────────
+
+def compact_journals(cdb_path: str, compress_level: Optional[int] = None
+                     ) -> int:
+    """Fold all new journal records into the history store of *cdb_path*.
+
+    Creates an empty NCDB at *cdb_path* first if there is none.  The
+    updated database is written to a temporary file and renamed over
+    *cdb_path*, so readers always see a complete file.
+
+    Args:
+        cdb_path:       NCDB file whose journals to compact.
+        compress_level: zlib level for the rewritten .cdb (see
+                        :class:`~ucis.ncdb.ncdb_writer.NcdbWriter`).
+
+    Returns:
+        Number of runs added.
+
+    Raises:
+        RuntimeError: if another compaction of *cdb_path* is running.
+    """
+    directory = journal_dir(cdb_path)
+    if not os.path.isdir(directory):
+        return 0
+    lock = os.path.join(directory, _LOCK_NAME)
+    try:
+        os.close(os.open(lock, os.O_WRONLY | os.O_CREAT | os.O_EXCL))
+    except FileExistsError:
+        raise RuntimeError(
+            "Journals of %s are already being compacted "
+            "(remove %s if no compaction is running)" % (cdb_path, lock))
+    try:
+        return _compact(cdb_path, directory, compress_level)
+    finally:
+        os.unlink(lock)
+
+
+def _list_journals(directory: str) -> Dict[str, Tuple[str, bool]]:
+    """writer_id → (path, done) for every journal in *directory*."""
+    journals = {}
+    for fname in sorted(os.listdir(directory)):
+        for suffix, done in ((_ACTIVE_SUFFIX, False), (_DONE_SUFFIX, True)):
+            if fname.endswith(suffix):
+                journals[fname[:-len(suffix)]] = (
+                    os.path.join(directory, fname), done)
+    return journals
+
+
+def _compact(cdb_path: str, directory: str, compress_level) -> int:
+    from .ncdb_ucis import NcdbUCIS
+    from .ncdb_writer import NcdbWriter
+    from .manifest import Manifest
+    from .zip_writer import write_zip
+
+    if not os.path.exists(cdb_path):
+        from ucis.mem.mem_ucis import MemUCIS
+        NcdbWriter(compress_level).write(MemUCIS(), cdb_path)
+
+    db = NcdbUCIS(cdb_path)
+    db._read_zip()
+    old_members = db._zf_cache
+    state = {}
+    if MEMBER_JOURNAL_STATE in old_members:
+        state = json.loads(old_members[MEMBER_JOURNAL_STATE])["offsets"]
+
+    # Read everything appended since the last compaction.  A journal may
+    # be closed (renamed to .done) between listing and reading; its
+    # records are then picked up by the next compaction.  State is only
+    # kept for journals that still exist, so a consumed journal's offset
+    # is dropped once its file has been deleted.
+    pending = []          # (ts, writer_id, position, record)
+    new_state = {}
+    consumed_done = []
+    for writer_id, (path, done) in _list_journals(directory).items():
+        try:
+            key = _journal_key(writer_id, path)
+        except FileNotFoundError:
+            prefix = writer_id + "/"
+            new_state.update((k, v) for k, v in state.items()
+                             if k.startswith(prefix))
+            continue
+        if key is None:
+            continue
+        offset = state.get(key, 0)
+        try:
+            records, end = read_journal(path, offset)
+        except FileNotFoundError:
+            if key in state:
+                new_state[key] = offset
+            continue
+        pending.extend((rec.ts, writer_id, i, rec)
+                       for i, rec in enumerate(records))
+        new_state[key] = end
+        if done and end == os.path.getsize(path):
+            consumed_done.append(path)
+
+    # Dropped entries alone do not warrant rewriting the .cdb
+    if pending or any(state.get(k) != v for k, v in new_state.items()):
+        pending.sort(key=lambda p: p[:3])
+        db._ensure_v2_history()
+        db._reopen_last_bucket()
+        for _, _, _, rec in pending:
+            db.add_test_run(rec.name, seed=rec.seed, status=rec.status,
+                            ts=rec.ts, cpu_time=rec.cpu_time,
+                            has_coverage=bool(rec.flags & HIST_FLAG_HAS_COVERAGE),
+                            is_rerun=bool(rec.flags & HIST_FLAG_IS_RERUN))
+        db._seal_current_bucket()
+        old_members[MEMBER_JOURNAL_STATE] = json.dumps(
+            {"version": 2, "offsets": new_state},
+            separators=(',', ':')).encode()
+
+        manifest = Manifest.from_bytes(old_members[MEMBER_MANIFEST])
+        manifest.history_format = HISTORY_FORMAT_V2
+        v2_members = db.get_v2_members()
+        v2_names = (MEMBER_TEST_REGISTRY, MEMBER_TEST_STATS,
+                    MEMBER_CONTRIB_INDEX, MEMBER_SQUASH_LOG,
+                    MEMBER_JOURNAL_STATE)
+        members = [(MEMBER_MANIFEST, manifest.serialize(), True)]
+        for name, data in old_members.items():
+            if name == MEMBER_MANIFEST or name in v2_names or (
+                    name.startswith(HISTORY_BUCKET_DIR)
+                    and name.endswith(".bin")):
+                continue
+            members.append((name, data, True))
+        for name, data in v2_members.items():
+            # Buckets are compressed already
+            is_bucket = (name.startswith(HISTORY_BUCKET_DIR)
+                         and name not in (MEMBER_BUCKET_INDEX,
+                                          MEMBER_HISTORY_ROLLUP))
+            members.append((name, data, not is_bucket))
+
+        tmp = "%s.%d.tmp" % (cdb_path, os.getpid())
+        try:
+            write_zip(tmp, members, compress_level)
+            os.replace(tmp, cdb_path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    # Only now that the new offsets are committed may closed journals go
+    for path in consumed_done:
+        os.unlink(path)
+    return len(pending)
@@ -40,11 +40,13 @@ def _is_toggle_pair(scope) -> bool:
     """True if *scope* is a BRANCH with exactly 2 TOGGLEBIN children."""
     if scope.getScopeType() != ScopeTypeT.BRANCH:
         return False
-    cover_items = list(scope.coverItems(CoverTypeT.ALL))
-    if len(cover_items) != 2:
-        return False
-    child_scopes = list(scope.scopes(ScopeTypeT.ALL))
-    if len(child_scopes) != 0:
+    return _is_toggle_pair_items(list(scope.coverItems(CoverTypeT.ALL)),
+                                 list(scope.scopes(ScopeTypeT.ALL)))
+
+
+def _is_toggle_pair_items(cover_items, child_scopes) -> bool:
+    """_is_toggle_pair() for a BRANCH scope whose children are already listed."""
+    if len(cover_items) != 2 or child_scopes:
         return False
     names = {ci.getName() for ci in cover_items}
     return names == {TOGGLE_BIN_0_TO_1, TOGGLE_BIN_1_TO_0}
@@ -63,20 +65,29 @@ class ScopeTreeWriter:
 
     Also tracks file handles so that sources.json can be written
     consistently with the source IDs embedded in scope_tree.bin.
+
+    *listeners* (``DfsScopeSerializer`` instances) are fed every scope,
+    with its DFS index and coveritems, during the same walk, so that the
+    index-based members need no walk of their own.
     """
 
-    def __init__(self, string_table, file_handles: list = None):
+    def __init__(self, string_table, file_handles: list = None,
+                 listeners=()):
         """
         Args:
             string_table: StringTable instance to populate with names.
             file_handles: Mutable list; file handles will be appended in the
                 order they are first encountered.  The index in this list
                 becomes the file_id stored in scope_tree.bin.
+            listeners: Serializers whose ``add_scope(idx, scope,
+                cover_items)`` is called for each scope in DFS order.
         """
         self._st = string_table
         self._file_handles = file_handles if file_handles is not None else []
         self._fh_index: dict = {}   # filename → int id
         self.counts_list: list = []  # hit counts in DFS order
+        self.scope_count = 0         # scopes written (next DFS index)
+        self._listeners = list(listeners)
         self._buf = io.BytesIO()
 
     # ── Public API ────────────────────────────────────────────────────────
@@ -84,6 +95,7 @@ class ScopeTreeWriter:
     def write(self, db) -> bytes:
         """Walk *db* (UCIS root) and return the serialized scope_tree.bin bytes."""
         self._buf = io.BytesIO()
+        self.scope_count = 0
         for scope in db.scopes(ScopeTypeT.ALL):
             self._write_scope(scope)
         return self._buf.getvalue()
@@ -91,23 +103,36 @@ class ScopeTreeWriter:
     # ── Internal DFS ──────────────────────────────────────────────────────
 
     def _write_scope(self, scope):
-        if _is_toggle_pair(scope):
-            self._write_toggle_pair(scope)
+        # List the children once; the toggle-pair test, the encoding and
+        # the listeners all share these lists.
+        scope_type   = scope.getScopeType()
+        cover_items  = list(scope.coverItems(CoverTypeT.ALL))
+        child_scopes = list(scope.scopes(ScopeTypeT.ALL))
+
+        idx = self.scope_count
+        self.scope_count += 1
+        for listener in self._listeners:
+            listener.add_scope(idx, scope, cover_items)
+
+        if (scope_type == ScopeTypeT.BRANCH
+                and _is_toggle_pair_items(cover_items, child_scopes)):
+            self._write_toggle_pair(scope, cover_items)
         else:
-            self._write_regular_scope(scope)
+            self._write_regular_scope(scope, scope_type, cover_items,
+                                      child_scopes)
 
-    def _write_toggle_pair(self, scope):
+    def _write_toggle_pair(self, scope, cover_items):
         name_ref = self._st.add(scope.getScopeName())
         self._buf.write(bytes([SCOPE_MARKER_TOGGLE_PAIR]))
         self._buf.write(encode_varint(name_ref))
         # Two implicit coveritems: "0 -> 1" then "1 -> 0"
-        cover_items = {ci.getName(): ci for ci in scope.coverItems(CoverTypeT.ALL)}
+        by_name = {ci.getName(): ci for ci in cover_items}
         for name in (TOGGLE_BIN_0_TO_1, TOGGLE_BIN_1_TO_0):
-            ci = cover_items.get(name)
+            ci = by_name.get(name)
             self.counts_list.append(ci.getCoverData().data if ci else 0)
 
-    def _write_regular_scope(self, scope):
-        scope_type = scope.getScopeType()
+    def _write_regular_scope(self, scope, scope_type, cover_items,
+                             child_scopes):
         name_ref   = self._st.add(scope.getScopeName())
 
         # Collect source info
@@ -126,7 +151,6 @@ class ScopeTreeWriter:
                            and int(source_type) != int(SourceT.NONE))
 
         # Cover items under this scope
-        cover_items = list(scope.coverItems(CoverTypeT.ALL))
         num_coveritems = len(cover_items)
 
         # Determine child cover type — always read from the actual first cover
@@ -159,9 +183,6 @@ class ScopeTreeWriter:
         if has_goal:     presence |= PRESENCE_GOAL
         if has_source_type: presence |= PRESENCE_SOURCE_TYPE
 
-        # Count child sub-scopes
-        child_scopes = list(scope.scopes(ScopeTypeT.ALL))
-
         w = self._buf.write
         w(bytes([SCOPE_MARKER_REGULAR]))
         w(encode_varint(int(scope_type)))
@@ -363,3 +384,69 @@ class ScopeTreeReader:
             offset, _ = self._read_scope(data, offset, scope, counts_iter)
 
         return offset, num_coveritems
+
+
+def coveritem_paths(data: bytes, string_table, separator: str = "/"):
+    """Decode the coveritem paths of scope_tree.bin without building scopes.
+
+    Returns ``(paths, at_least)``: one entry per coveritem, in counts.bin
+    order.  A path is the scope names from the root joined by *separator*,
+    followed by the coveritem name.
+    """
+    paths = []
+    at_least = []
+    get = string_table.get
+    prefix = []
+    # Frames of [remaining child scopes]; the root level has no known count
+    stack = [[-1]]
+    offset = 0
+    end = len(data)
+    while stack:
+        frame = stack[-1]
+        if frame[0] == 0 or (frame[0] < 0 and offset >= end):
+            stack.pop()
+            if stack:
+                prefix.pop()        # leaving a scope (not the root level)
+            continue
+        frame[0] -= 1
+        marker = data[offset]
+        offset += 1
+        if marker == SCOPE_MARKER_TOGGLE_PAIR:
+            name_ref, offset = decode_varint(data, offset)
+            base = separator.join(prefix + [get(name_ref)]) + separator
+            for bin_name in (TOGGLE_BIN_0_TO_1, TOGGLE_BIN_1_TO_0):
+                paths.append(base + bin_name)
+                at_least.append(1)
+            continue
+
+        _, offset = decode_varint(data, offset)             # scope type
+        name_ref, offset = decode_varint(data, offset)
+        presence, offset = decode_varint(data, offset)
+        if presence & PRESENCE_FLAGS:
+            _, offset = decode_varint(data, offset)
+        if presence & PRESENCE_SOURCE:
+            for _ in range(3):
+                _, offset = decode_varint(data, offset)
+        if presence & PRESENCE_WEIGHT:
+            _, offset = decode_varint(data, offset)
+        override = None
+        if presence & PRESENCE_AT_LEAST:
+            override, offset = decode_varint(data, offset)
+        if presence & PRESENCE_GOAL:
+            _, offset = decode_varint(data, offset)
+        if presence & PRESENCE_SOURCE_TYPE:
+            _, offset = decode_varint(data, offset)
+        num_children, offset = decode_varint(data, offset)
+        num_coveritems, offset = decode_varint(data, offset)
+
+        prefix.append(get(name_ref))
+        if num_coveritems > 0:
+            _, offset = decode_varint(data, offset)          # cover type
+            base = separator.join(prefix) + separator
+            item_at_least = override if override is not None else 1
+            for _ in range(num_coveritems):
+                ci_name_ref, offset = decode_varint(data, offset)
+                paths.append(base + get(ci_name_ref))
+                at_least.append(item_at_least)
+        stack.append([num_children])
+    return paths, at_least
@@ -2,23 +2,46 @@
 Deduplicated string table for the NCDB format.
 
 Strings are stored once in strings.bin; all other members reference them
-by integer index.  The table is length-prefixed, null-terminated UTF-8.
+by integer index.
 
-Binary layout of strings.bin:
+Binary layout of strings.bin (v2, front-coded):
+  [0x00][version: varint = 2]
+  [count: varint]
+  [shared_0: varint] ... [shared_{count-1}: varint]
+  [suffix_len_0: varint] ... [suffix_len_{count-1}: varint]
+  [suffix bytes, concatenated]
+
+String i is the first shared_i bytes of the UTF-8 encoding of string i-1
+followed by its next suffix_len_i suffix bytes.  Strings are added in
+scope-tree order, so names of neighbouring scopes (sig_0, sig_1, ...)
+share prefixes.  The columns decode in bulk and the strings are rebuilt in
+one call to the C accelerator when it is built.
+
+Legacy layout (v1), still read:
   [count: varint]
   [len_0: varint][bytes_0: UTF-8]
-  [len_1: varint][bytes_1: UTF-8]
   ...
 
+A v1 table starts with its count, so a leading 0x00 is either an empty v1
+table (the whole member) or the v2 marker.
+
 Indices are 0-based.  Index 0 is always the empty string "".
 """
 
 import io
-from .varint import encode_varint, decode_varint
+
+from ._accel import expand_front_coded
+from .varint import encode_varint, encode_varints, decode_varint, decode_varints
+
+_VERSION = 2
 
 
 class StringTable:
-    """Build, serialize and deserialize the NCDB string table."""
+    """Build, serialize and deserialize the NCDB string table.
+
+    The string-to-index dict used by :meth:`add` is built on first use, so
+    that a table loaded only for :meth:`get` lookups does not pay for it.
+    """
 
     def __init__(self):
         self._strings: list[str] = []
@@ -30,11 +53,15 @@ class StringTable:
         """Return the index for *s*, adding it if not already present."""
         if s is None:
             s = ""
-        if s not in self._index:
+        index = self._index
+        if index is None:
+            index = self._build_index()
+        idx = index.get(s)
+        if idx is None:
             idx = len(self._strings)
             self._strings.append(s)
-            self._index[s] = idx
-        return self._index[s]
+            index[s] = idx
+        return idx
 
     def get(self, idx: int) -> str:
         """Return the string at *idx*."""
@@ -46,27 +73,128 @@ class StringTable:
     def __iter__(self):
         return iter(self._strings)
 
+    def _build_index(self) -> dict:
+        strings = self._strings
+        # Reversed, so that the first of any duplicate indices wins
+        self._index = dict(zip(reversed(strings),
+                               range(len(strings) - 1, -1, -1)))
+        return self._index
+
     # ── Serialization ─────────────────────────────────────────────────────
 
     def serialize(self) -> bytes:
         """Encode the string table to bytes."""
+        encoded = [s.encode("utf-8") for s in self._strings]
+        shared = []
+        from_bytes = int.from_bytes
+        for prev, cur in zip([b""] + encoded, encoded):
+            if prev[:1] != cur[:1]:
+                shared.append(0)
+                continue
+            n = min(len(prev), len(cur))
+            # The highest differing bit of the big-endian values marks the
+            # first byte that differs
+            diff = from_bytes(prev[:n], "big") ^ from_bytes(cur[:n], "big")
+            shared.append(n - (diff.bit_length() + 7) // 8 if diff else n)
+        suffix_lens = [len(cur) - n for cur, n in zip(encoded, shared)]
+        suffixes = [cur[n:] for cur, n in zip(encoded, shared)]
         buf = io.BytesIO()
-        buf.write(encode_varint(len(self._strings)))
-        for s in self._strings:
-            encoded = s.encode("utf-8")
-            buf.write(encode_varint(len(encoded)))
-            buf.write(encoded)
+        buf.write(b"\x00")
+        buf.write(encode_varint(_VERSION))
+        buf.write(encode_varint(len(shared)))
+        buf.write(encode_varints(shared))
+        buf.write(encode_varints(suffix_lens))
+        buf.write(b"".join(suffixes))
         return buf.getvalue()
 
     @classmethod
     def from_bytes(cls, data: bytes) -> "StringTable":
         """Decode a string table from bytes."""
         table = cls()
-        offset = 0
-        count, offset = decode_varint(data, offset)
-        for _ in range(count):
-            length, offset = decode_varint(data, offset)
-            s = data[offset: offset + length].decode("utf-8")
-            offset += length
-            table.add(s)
+        table._index = None
+        if data[:1] == b"\x00" and len(data) > 1:
+            table._strings = _decode_front_coded(data)
+        else:
+            table._strings = _decode_v1(data)
         return table
+
+
+def _decode_front_coded(data: bytes) -> list:
+    version, offset = decode_varint(data, 1)
+    if version != _VERSION:
+        raise ValueError(f"Unsupported strings.bin version: {version}")
+    count, offset = decode_varint(data, offset)
+    if not count:
+        return []
+    lens, offset = decode_varints(data, 2 * count, offset)
+    shared = lens[:count]
+    suffix_lens = lens[count:]
+    suffixes = data[offset:]
+    if b"\x00" not in suffixes:
+        # One decode for the whole table, split on a byte no string holds
+        strings = expand_front_coded(shared, suffix_lens, suffixes,
+                                     b"\x00").decode("utf-8").split("\x00")
+        strings.pop()
+        return strings
+    joined = expand_front_coded(shared, suffix_lens, suffixes)
+    strings = []
+    pos = 0
+    for n, m in zip(shared, suffix_lens):
+        end = pos + n + m
+        strings.append(joined[pos:end].decode("utf-8"))
+        pos = end
+    return strings
+
+
+def _decode_v1(data: bytes) -> list:
+    strings = []
+    offset = 0
+    count, offset = decode_varint(data, offset)
+    for _ in range(count):
+        length, offset = decode_varint(data, offset)
+        strings.append(data[offset: offset + length].decode("utf-8"))
+        offset += length
+    return strings
+
+
+# ── Members that reference the string table ──────────────────────────────
+#
+# toggle.bin, attrs.bin and properties.json store strings as indices into
+# strings.bin.  NcdbWriter passes its table to their writers; a writer used
+# on its own has no strings.bin to refer to and embeds a private table:
+#
+#   [flags: varint]              bit 0: a private string table follows
+#   [len: varint][StringTable]   only when bit 0 is set
+
+_MEMBER_STRINGS_EMBEDDED = 0x1
+
+
+def encode_member_strings(table: StringTable, embed: bool) -> bytes:
+    """Return the string-table header of a member; see above."""
+    if not embed:
+        return encode_varint(0)
+    data = table.serialize()
+    return (encode_varint(_MEMBER_STRINGS_EMBEDDED)
+            + encode_varint(len(data)) + data)
+
+
+def decode_member_strings(data: bytes, offset: int,
+                          string_table: StringTable = None):
+    """Decode the string-table header of a member.
+
+    Returns:
+        (table, new_offset) — the embedded table when present, else
+        *string_table*.
+
+    Raises:
+        ValueError: the member refers to strings.bin and *string_table*
+            is None.
+    """
+    flags, offset = decode_varint(data, offset)
+    if flags & _MEMBER_STRINGS_EMBEDDED:
+        length, offset = decode_varint(data, offset)
+        table = StringTable.from_bytes(data[offset:offset + length])
+        return table, offset + length
+    if string_table is None:
+        raise ValueError("Member refers to strings.bin; a string table is required")
+    return string_table, offset
@@ -9,24 +9,26 @@ Only scopes that have at least one tag are included (sparse).
 
 import json
 
-from .dfs_util import dfs_scope_list
+from .dfs_util import DfsScopeSerializer, dfs_scope_list
 
 _VERSION = 1
 
 
-class TagsWriter:
+class TagsWriter(DfsScopeSerializer):
     """Serialize scope tags to tags.json bytes."""
 
-    def serialize(self, db) -> bytes:
-        scopes = dfs_scope_list(db)
-        entries = []
-        for idx, scope in enumerate(scopes):
-            if not hasattr(scope, 'getTags'):
-                continue
-            tags = list(scope.getTags()) if scope.getTags() is not None else []
-            if tags:
-                entries.append({"idx": idx, "tags": tags})
-        payload = {"version": _VERSION, "entries": entries}
+    def begin(self) -> None:
+        self._entries = []
+
+    def add_scope(self, idx, scope, cover_items) -> None:
+        if not hasattr(scope, 'getTags'):
+            return
+        tags = list(scope.getTags()) if scope.getTags() is not None else []
+        if tags:
+            self._entries.append({"idx": idx, "tags": tags})
+
+    def finish(self, db) -> bytes:
+        payload = {"version": _VERSION, "entries": self._entries}
         return json.dumps(payload, separators=(',', ':')).encode()
 
 
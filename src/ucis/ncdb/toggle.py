@@ -1,5 +1,5 @@
 """
-toggle.json — TOGGLE scope metadata serialization.
+toggle.bin — TOGGLE scope metadata serialization.
 
 Persists per-toggle-scope fields that are not encoded in scope_tree.bin:
   - canonical name   (full hierarchical signal path)
@@ -7,7 +7,22 @@ Persists per-toggle-scope fields that are not encoded in scope_tree.bin:
   - toggle type      (ToggleTypeT enum value)
   - toggle direction (ToggleDirT enum value)
 
-Format:
+Format v2 (current), all fields varints:
+  version          (2)
+  string header    (see string_table.encode_member_strings)
+  num_entries
+  delta_idx  × num_entries   DFS index delta from the previous entry
+  mask       × num_entries   bit 0 canonical, 1 metric, 2 type, 3 dir
+  values: for each entry, in entry order, the fields its mask selects:
+    canonical: shared   characters shared with the previous canonical name
+               suffix   string index of the remaining characters
+    metric, type, dir: enum value
+
+Canonical names are front-coded against the previous entry's canonical
+name.  The shared prefix stops at a path separator, so that the suffix is
+usually the signal's leaf name and already in strings.bin as a scope name.
+
+Format v1 (legacy, still read): JSON object
   {"version": 1, "entries": [
     {"idx": <int>, "canonical": "<str>", "metric": <int>,
      "type": <int>, "dir": <int>},
@@ -19,15 +34,43 @@ DFS index corresponds to dfs_scope_list() order (same as scope_tree.bin).
 """
 
 import json
+import os
 
 from ucis.scope_type_t import ScopeTypeT
 from ucis.toggle_dir_t import ToggleDirT
 from ucis.toggle_metric_t import ToggleMetricT
 from ucis.toggle_type_t import ToggleTypeT
 
-from .dfs_util import dfs_scope_list
+from .dfs_util import DfsScopeSerializer, dfs_scope_list
+from .string_table import (
+    StringTable, decode_member_strings, encode_member_strings,
+)
+from .varint import decode_varint, decode_varints, encode_varint, encode_varints
+
+_VERSION = 2
+_VERSION_JSON = 1
+
+_HAS_CANONICAL = 0x1
+_HAS_METRIC    = 0x2
+_HAS_TYPE      = 0x4
+_HAS_DIR       = 0x8
 
-_VERSION = 1
+# Number of value varints that follow an entry, by mask
+_MASK_VALUES = [(2 if m & _HAS_CANONICAL else 0) + bin(m >> 1).count("1")
+                for m in range(16)]
+
+_PATH_SEPARATORS = "./"
+
+# Enum fields by mask: ((setter, {value: enum member}), ...) in value
+# order.  Unknown values are skipped, as they are for JSON members.
+_ENUM_FIELDS = tuple((bit, setter, {int(e): e for e in enum_t})
+                     for bit, setter, enum_t in (
+                         (_HAS_METRIC, 'setToggleMetric', ToggleMetricT),
+                         (_HAS_TYPE, 'setToggleType', ToggleTypeT),
+                         (_HAS_DIR, 'setToggleDir', ToggleDirT)))
+_MASK_FIELDS = [tuple((setter, enum_values)
+                      for bit, setter, enum_values in _ENUM_FIELDS if m & bit)
+                for m in range(16)]
 
 # MemToggleScope defaults — matching __init__ in mem_toggle_scope.py
 _DEFAULT_METRIC = int(ToggleMetricT._2STOGGLE)
@@ -35,22 +78,79 @@ _DEFAULT_TYPE   = int(ToggleTypeT.NET)
 _DEFAULT_DIR    = int(ToggleDirT.INTERNAL)
 
 
-class ToggleWriter:
-    """Serialize TOGGLE-scope metadata to toggle.json bytes."""
+def _shared_path_prefix(prev: str, name: str) -> int:
+    """Length of the common prefix of *prev* and *name*, cut back to just
+    after a path separator (or to the whole of *name*)."""
+    n = len(os.path.commonprefix((prev, name)))
+    if n == len(name):
+        return n
+    while n > 0 and name[n - 1] not in _PATH_SEPARATORS:
+        n -= 1
+    return n
 
-    def serialize(self, db) -> bytes:
-        scopes  = dfs_scope_list(db)
-        entries = []
-        for idx, scope in enumerate(scopes):
-            if scope.getScopeType() != ScopeTypeT.TOGGLE:
-                continue
-            entry = self._build_entry(idx, scope)
-            if entry:
-                entries.append(entry)
+
+class ToggleWriter(DfsScopeSerializer):
+    """Serialize TOGGLE-scope metadata to toggle.bin bytes.
+
+    Args:
+        string_table: Table the member's strings are added to, normally
+            the one written to strings.bin.  When None the member embeds
+            a private table.
+    """
+
+    def __init__(self, string_table: StringTable = None):
+        self._string_table = string_table
+
+    def begin(self) -> None:
+        self._entries = []
+
+    def add_scope(self, idx, scope, cover_items) -> None:
+        if scope.getScopeType() != ScopeTypeT.TOGGLE:
+            return
+        entry = self._build_entry(idx, scope)
+        if entry:
+            self._entries.append(entry)
+
+    def finish(self, db) -> bytes:
+        entries = self._entries
         if not entries:
             return b""
-        payload = {"version": _VERSION, "entries": entries}
-        return json.dumps(payload, separators=(',', ':')).encode()
+        strings = self._string_table
+        embed = strings is None
+        if embed:
+            strings = StringTable()
+
+        deltas = []
+        masks = []
+        values = []
+        prev_idx = 0
+        prev_canonical = ""
+        for entry in entries:
+            idx = entry["idx"]
+            deltas.append(idx - prev_idx)
+            prev_idx = idx
+            mask = 0
+            canonical = entry.get("canonical")
+            if canonical is not None:
+                mask |= _HAS_CANONICAL
+                shared = _shared_path_prefix(prev_canonical, canonical)
+                values.append(shared)
+                values.append(strings.add(canonical[shared:]))
+                prev_canonical = canonical
+            for bit, key in ((_HAS_METRIC, "metric"), (_HAS_TYPE, "type"),
+                             (_HAS_DIR, "dir")):
+                if key in entry:
+                    mask |= bit
+                    values.append(entry[key])
+            masks.append(mask)
+
+        buf = bytearray(encode_varint(_VERSION))
+        buf.extend(encode_member_strings(strings, embed))
+        buf.extend(encode_varint(len(entries)))
+        buf.extend(encode_varints(deltas))
+        buf.extend(encode_varints(masks))
+        buf.extend(encode_varints(values))
+        return bytes(buf)
 
     def _build_entry(self, idx, scope) -> dict:
         entry = {"idx": idx}
@@ -113,15 +213,73 @@ class ToggleWriter:
 
 
 class ToggleReader:
-    """Deserialize toggle.json bytes and apply metadata to TOGGLE scopes."""
+    """Deserialize toggle.bin bytes and apply metadata to TOGGLE scopes."""
+
+    def apply(self, db, data: bytes, string_table: StringTable = None) -> None:
+        """Apply the metadata in *data* to the TOGGLE scopes of *db*.
 
-    def apply(self, db, data: bytes) -> None:
+        *string_table* is the archive's strings.bin table; it is not
+        needed for members that embed their own table or are legacy JSON.
+        """
         if not data:
             return
+        if data[:1] == b"{":
+            self._apply_json(db, data)
+            return
+        version, offset = decode_varint(data, 0)
+        if version != _VERSION:
+            raise ValueError(f"Unsupported toggle.bin version: {version}")
+        strings, offset = decode_member_strings(data, offset, string_table)
+        count, offset = decode_varint(data, offset)
+        if not count:
+            return
+        header, offset = decode_varints(data, 2 * count, offset)
+        masks = header[count:]
+        n_values = sum(_MASK_VALUES[m] for m in masks)
+        values, _ = decode_varints(data, n_values, offset)
+
+        scopes = dfs_scope_list(db)
+        n_scopes = len(scopes)
+        get_string = strings.get
+        toggle_t = ScopeTypeT.TOGGLE
+        idx = 0
+        pos = 0
+        canonical = ""
+        for delta, mask in zip(header, masks):
+            idx += delta
+            start = pos
+            pos += _MASK_VALUES[mask]
+            if mask & _HAS_CANONICAL:
+                # Decoded even for skipped entries: later names build on it
+                canonical = canonical[:values[start]] + get_string(values[start + 1])
+                start += 2
+            if idx >= n_scopes:
+                continue
+            scope = scopes[idx]
+            if scope.getScopeType() != toggle_t:
+                continue
+            if mask & _HAS_CANONICAL and hasattr(scope, 'setCanonicalName'):
+                scope.setCanonicalName(canonical)
+            for setter, enum_values in _MASK_FIELDS[mask]:
+                value = enum_values.get(values[start])
+                start += 1
+                if value is not None and hasattr(scope, setter):
+                    getattr(scope, setter)(value)
+
+    @staticmethod
+    def _set(scope, setter, enum_t, value) -> None:
+        if hasattr(scope, setter):
+            try:
+                getattr(scope, setter)(enum_t(value))
+            except (ValueError, Exception):
+                pass
+
+    def _apply_json(self, db, data: bytes) -> None:
+        """Legacy v1: JSON entries."""
         payload = json.loads(data.decode())
-        if payload.get("version") != _VERSION:
+        if payload.get("version") != _VERSION_JSON:
             raise ValueError(
-                f"Unsupported toggle.json version: {payload.get('version')}")
+                f"Unsupported toggle.bin version: {payload.get('version')}")
         entries = payload.get("entries", [])
         if not entries:
             return
@@ -135,18 +293,9 @@ class ToggleReader:
                 continue
             if "canonical" in entry and hasattr(scope, 'setCanonicalName'):
                 scope.setCanonicalName(entry["canonical"])
-            if "metric" in entry and hasattr(scope, 'setToggleMetric'):
-                try:
-                    scope.setToggleMetric(ToggleMetricT(entry["metric"]))
-                except (ValueError, Exception):
-                    pass
-            if "type" in entry and hasattr(scope, 'setToggleType'):
-                try:
-                    scope.setToggleType(ToggleTypeT(entry["type"]))
-                except (ValueError, Exception):
-                    pass
-            if "dir" in entry and hasattr(scope, 'setToggleDir'):
-                try:
-                    scope.setToggleDir(ToggleDirT(entry["dir"]))
-                except (ValueError, Exception):
-                    pass
+            if "metric" in entry:
+                self._set(scope, 'setToggleMetric', ToggleMetricT, entry["metric"])
+            if "type" in entry:
+                self._set(scope, 'setToggleType', ToggleTypeT, entry["type"])
+            if "dir" in entry:
+                self._set(scope, 'setToggleDir', ToggleDirT, entry["dir"])
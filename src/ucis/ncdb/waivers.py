@@ -11,12 +11,24 @@ or as a standalone JSON file.
 Expiry enforcement is the **caller's responsibility** — :meth:`WaiverSet.matches`
 performs only pattern matching.  To filter out expired waivers call
 :meth:`WaiverSet.active_at` first.
+
+A :class:`WaiverSet` compiles its patterns once, on first use.  Scope
+patterns are split at their first wildcard segment: the literal segments in
+front are indexed in a path trie, and the rest of the pattern is matched
+against the rest of the path only at the trie node it hangs from.  At each
+node those remainders are grouped by their last segment when it is literal
+(``**/uart``), and each group is screened with one combined regular
+expression before its patterns are tried one by one.  Fully literal
+patterns are a dictionary lookup.  :meth:`WaiverSet.annotate` uses the
+compiled set to find the waivers of every bin of a database in one walk.
 """
 from __future__ import annotations
 
 import json
+import re
 from dataclasses import dataclass, field
-from typing import List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -72,14 +84,85 @@ class WaiverSet:
 
     def __init__(self, waivers: Optional[List[Waiver]] = None) -> None:
         self.waivers: List[Waiver] = waivers or []
+        self._compiled: Optional[_CompiledWaivers] = None
 
     def add(self, waiver: Waiver) -> None:
         """Append *waiver* to the set."""
         self.waivers.append(waiver)
+        self._compiled = None
 
     def matches_scope(self, scope_path: str, bin_name: str = "") -> bool:
         """Return True if any waiver covers *scope_path* / *bin_name*."""
-        return any(w.matches(scope_path, bin_name) for w in self.waivers)
+        compiled = self._compile()
+        for idx in compiled.scope_matches(scope_path):
+            if not bin_name or compiled.bin_matches(idx, bin_name):
+                return True
+        return False
+
+    def matching_ids(self, scope_path: str, bin_name: str = "") -> List[str]:
+        """Return the ids of the waivers covering *scope_path* / *bin_name*,
+        in set order."""
+        compiled = self._compile()
+        return [self.waivers[idx].id
+                for idx in compiled.scope_matches(scope_path)
+                if not bin_name or compiled.bin_matches(idx, bin_name)]
+
+    def annotate(self, db) -> Dict[int, List[str]]:
+        """Return the waiver ids covering each bin of *db*.
+
+        The database is walked once.  The waivers matching a scope are
+        found once per scope, and only their bin patterns are tried on the
+        scope's bins.  Scope paths are the scope names from the top level
+        down, joined with ``/``.
+
+        Returns:
+            Dict mapping flat bin index (the coveritem order of counts.bin)
+            to the ids of the waivers covering that bin, in set order.
+            Bins no waiver covers are absent.
+        """
+        from ucis.cover_type_t import CoverTypeT
+        from ucis.scope_type_t import ScopeTypeT
+        from .constants import TOGGLE_BIN_0_TO_1, TOGGLE_BIN_1_TO_0
+        from .scope_tree import _is_toggle_pair_items
+
+        compiled = self._compile()
+        ids = [w.id for w in self.waivers]
+        result: Dict[int, List[str]] = {}
+        next_bin = 0
+
+        def _visit(scope, prefix):
+            nonlocal next_bin
+            path = prefix + scope.getScopeName()
+            cover_items = list(scope.coverItems(CoverTypeT.ALL))
+            child_scopes = list(scope.scopes(ScopeTypeT.ALL))
+            matched = compiled.scope_matches(path) if cover_items else ()
+            if matched:
+                if (scope.getScopeType() == ScopeTypeT.BRANCH
+                        and _is_toggle_pair_items(cover_items, child_scopes)):
+                    # Stored as a fixed pair, whatever the item order
+                    names = [TOGGLE_BIN_0_TO_1, TOGGLE_BIN_1_TO_0]
+                else:
+                    names = [ci.getName() for ci in cover_items]
+                for i, name in enumerate(names):
+                    hit = [ids[idx] for idx in matched
+                           if not name or compiled.bin_matches(idx, name)]
+                    if hit:
+                        result[next_bin + i] = hit
+            next_bin += len(cover_items)
+            for child in child_scopes:
+                _visit(child, path + "/")
+
+        for top_scope in db.scopes(ScopeTypeT.ALL):
+            _visit(top_scope, "")
+        return result
+
+    def _compile(self) -> "_CompiledWaivers":
+        compiled = self._compiled
+        # Appending to or replacing ``waivers`` directly also recompiles
+        if (compiled is None or compiled.waivers is not self.waivers
+                or compiled.count != len(self.waivers)):
+            compiled = self._compiled = _CompiledWaivers(self.waivers)
+        return compiled
 
     def active_at(self, timestamp: str) -> "WaiverSet":
         """Return a new :class:`WaiverSet` containing only waivers that are
@@ -164,18 +247,16 @@ class WaiverSet:
 
 def _glob_match(pattern: str, text: str) -> bool:
     """Simple glob match: ``*`` = single-segment wildcard, ``**`` = multi-segment."""
-    import fnmatch
-    # Replace '**' with a temporary token, expand, then match
-    # Use fnmatch with '**' expanded to match any path
-    # Strategy: convert glob to regex
-    import re
-    regex = _glob_to_regex(pattern)
-    return bool(re.fullmatch(regex, text))
+    return _compile_glob(pattern).fullmatch(text) is not None
+
+
+@lru_cache(maxsize=4096)
+def _compile_glob(pattern: str):
+    return re.compile(_glob_to_regex(pattern))
 
 
 def _glob_to_regex(pattern: str) -> str:
     """Convert a glob pattern to a regex string."""
-    import re
     # Parse pattern left-to-right, emitting regex pieces
     result = []
     i = 0
@@ -193,3 +274,113 @@ def _glob_to_regex(pattern: str) -> str:
             result.append(re.escape(pattern[i]))
             i += 1
     return ''.join(result)
+
+
+# ── compiled waiver set ───────────────────────────────────────────────────────
+
+class _PatternGroup:
+    """Remainder patterns tried together at one trie node."""
+
+    __slots__ = ("_by_regex", "_patterns", "_combined")
+
+    def __init__(self) -> None:
+        self._by_regex: Dict[str, List[int]] = {}
+
+    def add(self, regex: str, idx: int) -> None:
+        self._by_regex.setdefault(regex, []).append(idx)
+
+    def finish(self) -> None:
+        self._patterns = [(re.compile(r), idxs)
+                          for r, idxs in self._by_regex.items()]
+        # One pass over the text rules out most paths before any pattern
+        # is tried on its own
+        self._combined = None
+        if len(self._patterns) > 1:
+            self._combined = re.compile(
+                "|".join("(?:%s)" % r for r in self._by_regex))
+
+    def match(self, text: str, out: List[int]) -> None:
+        if self._combined is not None and self._combined.fullmatch(text) is None:
+            return
+        for regex, idxs in self._patterns:
+            if regex.fullmatch(text) is not None:
+                out.extend(idxs)
+
+
+class _TrieNode:
+    """Path-trie node, reached by the literal segments of a pattern prefix."""
+
+    __slots__ = ("children", "by_last", "other")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _TrieNode] = {}
+        # Remainders ending in a literal segment, keyed by that segment
+        self.by_last: Dict[str, _PatternGroup] = {}
+        self.other: Optional[_PatternGroup] = None
+
+
+class _CompiledWaivers:
+    """Matching structures for one list of waivers; see the module docstring."""
+
+    def __init__(self, waivers: List[Waiver]) -> None:
+        self.waivers = waivers
+        self.count = len(waivers)
+        self._exact: Dict[str, List[int]] = {}
+        self._root = _TrieNode()
+        groups = []
+        for idx, w in enumerate(waivers):
+            pattern = w.scope_pattern
+            if "*" not in pattern:
+                self._exact.setdefault(pattern, []).append(idx)
+                continue
+            segs = pattern.split("/")
+            node = self._root
+            n_literal = 0
+            while "*" not in segs[n_literal]:
+                node = node.children.setdefault(segs[n_literal], _TrieNode())
+                n_literal += 1
+            # The literal prefix ends in '/', so the rest translates alone
+            regex = _glob_to_regex("/".join(segs[n_literal:]))
+            last = segs[-1]
+            if "*" in last:
+                if node.other is None:
+                    node.other = _PatternGroup()
+                    groups.append(node.other)
+                group = node.other
+            else:
+                group = node.by_last.get(last)
+                if group is None:
+                    group = node.by_last[last] = _PatternGroup()
+                    groups.append(group)
+            group.add(regex, idx)
+        for group in groups:
+            group.finish()
+        self._bins = [None if w.bin_pattern == "*" else _compile_glob(w.bin_pattern)
+                      for w in waivers]
+
+    def scope_matches(self, scope_path: str) -> List[int]:
+        """Return the indices of the waivers whose scope pattern matches."""
+        out = list(self._exact.get(scope_path, ()))
+        segs = scope_path.split("/")
+        last = segs[-1]
+        node = self._root
+        offset = 0
+        for seg in segs:
+            if node.by_last or node.other is not None:
+                rest = scope_path[offset:]
+                group = node.by_last.get(last)
+                if group is not None:
+                    group.match(rest, out)
+                if node.other is not None:
+                    node.other.match(rest, out)
+            node = node.children.get(seg)
+            if node is None:
+                break
+            offset += len(seg) + 1
+        if len(out) > 1:
+            out.sort()
+        return out
+
+    def bin_matches(self, idx: int, bin_name: str) -> bool:
+        regex = self._bins[idx]
+        return regex is None or regex.fullmatch(bin_name) is not None
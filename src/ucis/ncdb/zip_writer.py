@@ -0,0 +1,145 @@
+"""
+ZIP container output for NCDB files with parallel member compression.
+
+``zipfile`` deflates each member inside ``writestr`` on the calling thread,
+one member after another.  ``write_zip`` instead deflates the members in a
+thread pool (zlib releases the GIL while compressing), then writes the
+already-compressed streams with their local headers, central directory and
+end record.  The result is an ordinary ZIP archive with the same headers
+``zipfile`` writes; at the default level the compressed data is identical
+too.
+
+Archives that would need ZIP64 records (2 GiB or more of data, or more than
+65535 members) are handed to ``zipfile`` instead.
+"""
+
+import os
+import struct
+import sys
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+#: zlib level used when none is given — zlib's own default.
+DEFAULT_COMPRESS_LEVEL = 6
+
+# Members smaller than this are compressed inline; a pool task costs more.
+_PARALLEL_MIN_SIZE = 64 * 1024
+
+_ZIP64_LIMIT = (1 << 31) - 1
+_MAX_MEMBERS = 0xFFFF
+
+# Record layouts as in zipfile.
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_CENTRAL_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+_END_RECORD = struct.Struct("<4s4H2LH")
+_VERSION = 20                       # 2.0: deflate
+_CREATE_SYSTEM = 0 if sys.platform == "win32" else 3
+_UTF8_FLAG = 0x800
+_EXTERNAL_ATTR = 0o600 << 16        # as zipfile.writestr() with a name
+
+
+def _deflate(data: bytes, level: int) -> bytes:
+    co = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return co.compress(data) + co.flush()
+
+
+def _dos_datetime(date_time) -> Tuple[int, int]:
+    year, month, day, hour, minute, second = date_time
+    return (((year - 1980) << 9 | month << 5 | day),
+            (hour << 11 | minute << 5 | second // 2))
+
+
+def write_zip(path: str, members: Iterable[Tuple[str, bytes, bool]],
+              compress_level: Optional[int] = None,
+              workers: Optional[int] = None) -> None:
+    """Write *members* to a new ZIP file at *path*.
+
+    Args:
+        path:           Output file path (overwritten).
+        members:        ``(name, data, compress)`` tuples in archive order.
+                        Members with *compress* false are stored as-is
+                        (e.g. data that is already compressed).
+        compress_level: zlib level 0-9 for the compressed members; 0 stores
+                        them too, which makes the fastest write.
+                        Defaults to :data:`DEFAULT_COMPRESS_LEVEL`.
+        workers:        Compression threads; defaults to the CPU count.
+                        1 compresses on the calling thread.
+    """
+    level = DEFAULT_COMPRESS_LEVEL if compress_level is None else compress_level
+    if not 0 <= level <= 9:
+        raise ValueError("compress_level must be 0-9, got %r" % (level,))
+    members = [(name, data, compress and level > 0)
+               for name, data, compress in members]
+
+    if (len(members) > _MAX_MEMBERS
+            or any(len(data) > _ZIP64_LIMIT for _, data, _ in members)):
+        _write_zipfile(path, members, level)
+        return
+
+    payloads: List[Optional[bytes]] = [None] * len(members)
+    big = []
+    for i, (_, data, compress) in enumerate(members):
+        if not compress:
+            payloads[i] = data
+        elif len(data) >= _PARALLEL_MIN_SIZE:
+            big.append(i)
+        else:
+            payloads[i] = _deflate(data, level)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(big))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for i, payload in zip(big, pool.map(
+                    lambda i: _deflate(members[i][1], level), big)):
+                payloads[i] = payload
+    else:
+        for i in big:
+            payloads[i] = _deflate(members[i][1], level)
+
+    if sum(map(len, payloads)) > _ZIP64_LIMIT:
+        _write_zipfile(path, members, level)
+        return
+
+    dos_date, dos_time = _dos_datetime(time.localtime(time.time())[:6])
+    central = []
+    offset = 0
+    with open(path, "wb") as fp:
+        for (name, data, compress), payload in zip(members, payloads):
+            try:
+                fname = name.encode("ascii")
+                flags = 0
+            except UnicodeEncodeError:
+                fname = name.encode("utf-8")
+                flags = _UTF8_FLAG
+            method = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+            crc = zlib.crc32(data)
+            fp.write(_LOCAL_HEADER.pack(
+                b"PK\x03\x04", _VERSION, 0, flags, method, dos_time,
+                dos_date, crc, len(payload), len(data), len(fname), 0))
+            fp.write(fname)
+            fp.write(payload)
+            central.append(_CENTRAL_HEADER.pack(
+                b"PK\x01\x02", _VERSION, _CREATE_SYSTEM, _VERSION, 0, flags,
+                method, dos_time, dos_date, crc, len(payload), len(data),
+                len(fname), 0, 0, 0, 0, _EXTERNAL_ATTR, offset) + fname)
+            offset += _LOCAL_HEADER.size + len(fname) + len(payload)
+        directory = b"".join(central)
+        fp.write(directory)
+        fp.write(_END_RECORD.pack(
+            b"PK\x05\x06", 0, 0, len(central), len(central),
+            len(directory), offset, 0))
+
+
+def _write_zipfile(path, members, level):
+    """Sequential fallback through ``zipfile`` (handles ZIP64)."""
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED,
+                         compresslevel=level or None) as zf:
+        for name, data, compress in members:
+            zf.writestr(name, data,
+                        compress_type=(zipfile.ZIP_DEFLATED if compress
+                                       else zipfile.ZIP_STORED))
@@ -53,6 +53,8 @@ class Obj():
         UCIS LRM Section 8.4 "User-defined Attribute Functions"
     """
     
+    __slots__ = ()
+    
     def __init__(self):
         pass
     
@@ -0,0 +1,204 @@
+"""
+Filtered, sorted and paged access to functional-coverage bins.
+
+``BinQuery`` returns the rows reported by ``ucis show bins`` (one per
+coverpoint bin of each top-level covergroup), applying the covergroup /
+coverpoint / hit-count filters and the sort order inside the query layer:
+
+* SQLite databases are queried directly, with ``WHERE``, ``ORDER BY`` and
+  ``LIMIT/OFFSET`` evaluated by SQLite, so only the requested page is
+  materialized.
+* Other backends (in-memory, XML, YAML, NCDB) are walked one covergroup at
+  a time; unsorted pages are sliced by index and sorted pages keep only the
+  ``offset + limit`` best rows in a heap.
+"""
+import heapq
+import itertools
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ucis.cover_type_t import CoverTypeT
+from ucis.scope_type_t import ScopeTypeT
+
+
+class BinQuery(object):
+    """
+    Query over coverpoint bins.
+
+    Args:
+        db: UCIS database
+        covergroup: Only bins of covergroups with this name
+        coverpoint: Only bins of coverpoints with this name
+        min_hits: Only bins with at least this many hits
+        max_hits: Only bins with at most this many hits
+        sort: ``'count'`` (descending), ``'name'`` or None (database order)
+    """
+
+    def __init__(self, db,
+                 covergroup: Optional[str] = None,
+                 coverpoint: Optional[str] = None,
+                 min_hits: Optional[int] = None,
+                 max_hits: Optional[int] = None,
+                 sort: Optional[str] = None):
+        self.db = db
+        self.covergroup = covergroup
+        self.coverpoint = coverpoint
+        self.min_hits = min_hits
+        self.max_hits = max_hits
+        self.sort = sort
+
+    @staticmethod
+    def _row(cg_name, cp_name, bin_name, count) -> Dict[str, Any]:
+        # The report's CoverBin carries no at_least; ``show bins`` has
+        # always reported a threshold of 1
+        return {
+            "covergroup": cg_name,
+            "coverpoint": cp_name,
+            "bin": bin_name,
+            "count": count,
+            "at_least": 1,
+            "goal_met": count >= 1,
+        }
+
+    def _is_sqlite(self) -> bool:
+        try:
+            from ucis.sqlite.sqlite_ucis import SqliteUCIS
+        except ImportError:
+            return False
+        return isinstance(self.db, SqliteUCIS)
+
+    def page(self, offset: int = 0,
+             limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Return ``(rows, total)``: up to *limit* rows starting at *offset*,
+        and the total number of rows matching the filters.
+        """
+        if self._is_sqlite():
+            return self._sql_page(offset, limit)
+        return self._mem_page(offset, limit)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """All matching rows."""
+        return self.page()[0]
+
+    # -- SQLite -------------------------------------------------------------
+
+    _SQL_FROM = """
+        FROM scopes inst
+        JOIN scopes cg ON cg.parent_id = inst.scope_id
+                      AND (cg.scope_type & :cg_type) != 0
+        JOIN scopes cp ON cp.parent_id = cg.scope_id
+                      AND (cp.scope_type & :cp_type) != 0
+        JOIN scopes bs ON bs.scope_id = cp.scope_id
+                       OR (bs.parent_id = cp.scope_id
+                           AND (bs.scope_type & :bs_type) != 0)
+        JOIN coveritems ci ON ci.scope_id = bs.scope_id
+                          AND (ci.cover_type & :bin_type) != 0
+        WHERE inst.parent_id = :root
+          AND (inst.scope_type & :inst_type) != 0
+    """
+
+    # Database order, matching CoverageReportBuilder: covergroups and
+    # coverpoints in creation order; a coverpoint's direct bins precede
+    # those of its bin sub-scopes
+    _SQL_NATURAL = ("inst.scope_id, cg.scope_id, cp.scope_id, "
+                    "bs.scope_id != cp.scope_id, bs.scope_id, ci.cover_index")
+
+    def _sql_where(self) -> Tuple[str, Dict[str, Any]]:
+        params = {
+            "root": self.db.scope_id,
+            "inst_type": int(ScopeTypeT.INSTANCE),
+            "cg_type": int(ScopeTypeT.COVERGROUP),
+            "cp_type": int(ScopeTypeT.COVERPOINT),
+            "bs_type": int(ScopeTypeT.CVGBINSCOPE),
+            "bin_type": int(CoverTypeT.CVGBIN),
+        }
+        where = []
+        if self.covergroup:
+            where.append("cg.scope_name = :cg_name")
+            params["cg_name"] = self.covergroup
+        if self.coverpoint:
+            where.append("cp.scope_name = :cp_name")
+            params["cp_name"] = self.coverpoint
+        if self.min_hits is not None:
+            where.append("ci.cover_data >= :min_hits")
+            params["min_hits"] = self.min_hits
+        if self.max_hits is not None:
+            where.append("ci.cover_data <= :max_hits")
+            params["max_hits"] = self.max_hits
+        return "".join(" AND " + w for w in where), params
+
+    def _sql_page(self, offset, limit):
+        conn = self.db.conn
+        where, params = self._sql_where()
+
+        total = conn.execute(
+            "SELECT COUNT(*)" + self._SQL_FROM + where, params).fetchone()[0]
+
+        if self.sort == 'count':
+            order = "ci.cover_data DESC, " + self._SQL_NATURAL
+        elif self.sort == 'name':
+            order = ("cg.scope_name, cp.scope_name, ci.cover_name, "
+                     + self._SQL_NATURAL)
+        else:
+            order = self._SQL_NATURAL
+        params["limit"] = -1 if limit is None else limit
+        params["offset"] = offset
+
+        cursor = conn.execute(
+            "SELECT cg.scope_name, cp.scope_name, ci.cover_name, ci.cover_data"
+            + self._SQL_FROM + where
+            + " ORDER BY " + order + " LIMIT :limit OFFSET :offset", params)
+        return [self._row(*r) for r in cursor], total
+
+    # -- Generic backends ---------------------------------------------------
+
+    def _iter_rows(self) -> Iterator[Dict[str, Any]]:
+        from ucis.report.coverage_report_builder import CoverageReportBuilder
+
+        for cg in CoverageReportBuilder.iter_covergroups(self.db):
+            if self.covergroup and cg.name != self.covergroup:
+                continue
+            for cp in cg.coverpoints:
+                if self.coverpoint and cp.name != self.coverpoint:
+                    continue
+                for b in cp.bins:
+                    if self.min_hits is not None and b.count < self.min_hits:
+                        continue
+                    if self.max_hits is not None and b.count > self.max_hits:
+                        continue
+                    yield self._row(cg.name, cp.name, b.name, b.count)
+
+    def _mem_page(self, offset, limit):
+        if self.sort not in ('count', 'name'):
+            total = 0
+            page = []
+            end = None if limit is None else offset + limit
+            for i, row in enumerate(self._iter_rows()):
+                if i >= offset and (end is None or i < end):
+                    page.append(row)
+                total += 1
+            return page, total
+
+        if self.sort == 'count':
+            def key(item):
+                return (-item[1]["count"], item[0])
+        else:
+            def key(item):
+                row = item[1]
+                return (row["covergroup"], row["coverpoint"], row["bin"], item[0])
+
+        # Sequence numbers keep the sort stable, as list.sort() would
+        counter = itertools.count()
+        total = 0
+
+        def counted():
+            nonlocal total
+            for row in self._iter_rows():
+                total += 1
+                yield (next(counter), row)
+
+        if limit is None:
+            best = sorted(counted(), key=key)
+        else:
+            best = heapq.nsmallest(offset + limit, counted(), key=key)
+        return [row for _, row in best[offset:]], total
@@ -0,0 +1,364 @@
+"""
+Coverage diff across any number of databases.
+
+``CoverageDiff`` compares the coveritem hit counts of a baseline database
+with those of one or more other databases (for example, today's merged
+coverage against each of the last 30 nightly runs).
+
+Every coveritem is identified by its path (scope names from the root and
+the coveritem name, joined by ``/``). Items are aligned across all
+databases once, into one column of counts per database; a count of -1
+marks an item the database does not have. The comparison itself then runs
+over these columns:
+
+* Each column is reduced to a byte string of per-item states (absent,
+  uncovered, covered; covered means ``count >= at_least``).
+* Combining a column's states with the baseline's gives one code per item,
+  and the newly-hit, newly-lost, new and removed items of a comparison are
+  counted and located with ``bytes.count``/``bytes.find``, which run at C
+  speed, instead of with per-item Python logic.
+
+NCDB files are read without building a database object: the coveritem
+paths are decoded straight from ``scope_tree.bin`` and the counts from
+``counts.bin``. Files whose manifests carry the same ``schema_hash`` (and
+the same string table) have identical scope trees, so their count arrays
+line up index for index: the paths are decoded once and only the counts
+of the remaining files are read.
+"""
+from __future__ import annotations
+
+import array
+import itertools
+import operator
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ucis.cover_type_t import CoverTypeT
+from ucis.report.coverage_index import top_k
+from ucis.scope_type_t import ScopeTypeT
+
+
+#: Per-item states in a state string
+ABSENT = 0
+UNCOVERED = 1
+COVERED = 2
+
+# Comparison code of an item: baseline state * 3 + other state
+_NEWLY_HIT = UNCOVERED * 3 + COVERED
+_NEWLY_LOST = COVERED * 3 + UNCOVERED
+_NEW = (ABSENT * 3 + UNCOVERED, ABSENT * 3 + COVERED)
+_REMOVED = (UNCOVERED * 3 + ABSENT, COVERED * 3 + ABSENT)
+
+# Translation tables: 1 for covered items (in a state string) and for
+# newly-lost items (in a code string), 0 otherwise
+_COVERED_ONLY = bytes(1 if c == COVERED else 0 for c in range(256))
+_LOST_ONLY = bytes(1 if c == _NEWLY_LOST else 0 for c in range(256))
+_PLUS_ONE = bytes(range(1, 256)) + bytes(1)
+_TIMES_THREE = bytes(c * 3 % 256 for c in range(256))
+
+
+class CoverageDiff(object):
+    """
+    Coveritem counts of several databases, aligned by path.
+
+    Use :meth:`load` to build one from database files or open databases;
+    the first one is the baseline.
+
+    Attributes:
+        names: Name of each database (its path, by default)
+        paths: Path of each aligned coveritem
+        at_least: Coverage threshold of each aligned coveritem
+        columns: Per database, an ``array('q')`` of counts in ``paths``
+            order, with -1 for coveritems the database does not have
+        same_schema: True when all databases had identical coveritem lists,
+            so no alignment by path was needed
+    """
+
+    def __init__(self, names: List[str], paths: List[str],
+                 at_least: Sequence[int], columns: List[array.array],
+                 same_schema: bool = False):
+        self.names = names
+        self.paths = paths
+        self.at_least = at_least
+        self.columns = columns
+        self.same_schema = same_schema
+        self._unit_at_least = all(al == 1 for al in at_least)
+        self._states: Dict[int, bytes] = {}
+        self._codes: Dict[int, bytes] = {}
+        self._base3: Optional[bytes] = None
+        self._summaries: Dict[int, Dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, sources: Sequence, names: Optional[Sequence[str]] = None,
+             input_format: Optional[str] = None) -> 'CoverageDiff':
+        """
+        Load and align the coveritems of *sources*.
+
+        Args:
+            sources: Database file paths and/or open UCIS databases; the
+                first is the baseline
+            names: Name of each source (default: the path, or
+                ``"db<N>"`` for an open database)
+            input_format: Format of the files (default: detected per file)
+        """
+        if len(sources) < 2:
+            raise ValueError("At least two databases are needed for a diff")
+        if names is None:
+            names = [s if isinstance(s, str) else "db%d" % i
+                     for i, s in enumerate(sources)]
+
+        schemas: Dict[Tuple[str, bytes], Tuple[List[str], List[int]]] = {}
+        loaded = []
+        for src in sources:
+            if isinstance(src, str):
+                loaded.append(_read_file(src, input_format, schemas))
+            else:
+                loaded.append(_walk_db(src))
+
+        paths, at_least = loaded[0][0], loaded[0][1]
+        if all(p is paths for p, _, _ in loaded):
+            return cls(list(names), paths, at_least,
+                       [c for _, _, c in loaded], same_schema=True)
+        return cls._align(list(names), loaded)
+
+    @classmethod
+    def _align(cls, names, loaded) -> 'CoverageDiff':
+        index: Dict[str, int] = {}
+        paths: List[str] = []
+        at_least: List[int] = []
+        for src_paths, src_at_least, _ in loaded:
+            for path, al in zip(src_paths, src_at_least):
+                if path not in index:
+                    index[path] = len(paths)
+                    paths.append(path)
+                    at_least.append(al)
+
+        columns = []
+        for src_paths, _, counts in loaded:
+            col = array.array('q', [-1]) * len(paths)
+            for i, count in zip(map(index.__getitem__, src_paths), counts):
+                col[i] = count
+            columns.append(col)
+        return cls(names, paths, at_least, columns)
+
+    # ------------------------------------------------------------ vectors
+
+    def states(self, i: int) -> bytes:
+        """Per-item state (ABSENT / UNCOVERED / COVERED) of database *i*."""
+        states = self._states.get(i)
+        if states is None:
+            # state = present + covered, from two element-wise comparisons
+            # (absent items hold -1, so fail both)
+            col = self.columns[i]
+            at_least = (itertools.repeat(1) if self._unit_at_least
+                        else map(max, self.at_least, itertools.repeat(0)))
+            covered = bytes(map(operator.ge, col, at_least))
+            if self.same_schema:
+                states = covered.translate(_PLUS_ONE)
+            else:
+                present = bytes(map(operator.ge, col, itertools.repeat(0)))
+                states = bytes(map(operator.add, present, covered))
+            self._states[i] = states
+        return states
+
+    def codes(self, i: int) -> bytes:
+        """Comparison code (baseline state * 3 + state) of database *i*."""
+        codes = self._codes.get(i)
+        if codes is None:
+            if self._base3 is None:
+                self._base3 = self.states(0).translate(_TIMES_THREE)
+            codes = bytes(map(operator.add, self._base3, self.states(i)))
+            self._codes[i] = codes
+        return codes
+
+    def _where(self, codes: bytes, values, limit: Optional[int]) -> List[str]:
+        """Paths of the items whose code is in *values*, in path order."""
+        found = []
+        for value in values:
+            n = 0
+            i = codes.find(value)
+            while i != -1 and (limit is None or n < limit):
+                found.append(i)
+                n += 1
+                i = codes.find(value, i + 1)
+        found.sort()
+        if limit is not None:
+            found = found[:limit]
+        return [self.paths[i] for i in found]
+
+    # ------------------------------------------------------------- results
+
+    def column_summary(self, i: int) -> Dict[str, Any]:
+        """Item, covered-item and hit totals of database *i*."""
+        summary = self._summaries.get(i)
+        if summary is None:
+            states = self.states(i)
+            absent = states.count(ABSENT)
+            present = len(states) - absent
+            covered = states.count(COVERED)
+            summary = self._summaries[i] = {
+                "database": self.names[i],
+                "bins": present,
+                "covered_bins": covered,
+                "bin_coverage": (covered / present * 100) if present else 0.0,
+                # Absent items hold -1
+                "total_hits": sum(self.columns[i]) + absent,
+            }
+        return dict(summary)
+
+    def hits_delta(self, i: int) -> int:
+        """Change in total hits from the baseline, over their common items."""
+        if self.same_schema:
+            return (self.column_summary(i)["total_hits"]
+                    - self.column_summary(0)["total_hits"])
+        base, col = self.columns[0], self.columns[i]
+        return sum(c - b for b, c in zip(base, col) if b >= 0 and c >= 0)
+
+    def compare(self, i: int, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Differences between the baseline and database *i*.
+
+        *limit* bounds each listed set of paths; the counts are always
+        complete.
+        """
+        codes = self.codes(i)
+        base = self.column_summary(0)
+        result = self.column_summary(i)
+        result["coverage_delta"] = result["bin_coverage"] - base["bin_coverage"]
+        result["hits_delta"] = self.hits_delta(i)
+        for key, values in (("newly_hit", (_NEWLY_HIT,)),
+                            ("newly_lost", (_NEWLY_LOST,)),
+                            ("new_bins", _NEW),
+                            ("removed_bins", _REMOVED)):
+            result[key + "_count"] = sum(codes.count(v) for v in values)
+            result[key] = self._where(codes, values, limit)
+        return result
+
+    def missed_by_baseline(self, limit: Optional[int] = None) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Items the baseline does not cover but some other database does,
+        most widely hit first.
+
+        Returns:
+            ``(count, [{"bin", "hit_in"}, ...])`` where ``hit_in`` is the
+            number of other databases covering the item
+        """
+        hit_in = [0] * len(self.paths)
+        for i in range(1, len(self.columns)):
+            hit_in = list(map(operator.add, hit_in,
+                              self.states(i).translate(_COVERED_ONLY)))
+        base = self.states(0)
+        missed = [j for j, n in enumerate(hit_in) if n and base[j] != COVERED]
+        top = top_k(missed, limit, key=lambda j: hit_in[j], largest=True)
+        return len(missed), [{"bin": self.paths[j], "hit_in": hit_in[j]}
+                             for j in top]
+
+    def to_dict(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Full diff of every database against the baseline."""
+        missed_count, missed = self.missed_by_baseline(limit)
+        lost_in = [0] * len(self.paths)
+        comparisons = []
+        for i in range(1, len(self.columns)):
+            comparisons.append(self.compare(i, limit))
+            lost = self.codes(i).translate(_LOST_ONLY)
+            lost_in = list(map(operator.add, lost_in, lost))
+        n_other = len(self.columns) - 1
+        return {
+            "baseline": self.names[0],
+            "databases": self.names[1:],
+            "aligned_bins": len(self.paths),
+            "same_schema": self.same_schema,
+            "baseline_summary": self.column_summary(0),
+            "comparisons": comparisons,
+            "summary": {
+                "lost_in_any_count": len(lost_in) - lost_in.count(0),
+                "lost_in_all_count": lost_in.count(n_other),
+                "missed_by_baseline_count": missed_count,
+                "missed_by_baseline": missed,
+            },
+        }
+
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
+
+def _walk_db(db) -> Tuple[List[str], List[int], array.array]:
+    """Coveritem paths, thresholds and counts of an open database."""
+    paths: List[str] = []
+    at_least: List[int] = []
+    counts = array.array('q')
+
+    def visit(scope, prefix):
+        prefix = prefix + scope.getScopeName() + "/"
+        for ci in scope.coverItems(CoverTypeT.ALL):
+            cd = ci.getCoverData()
+            paths.append(prefix + ci.getName())
+            at_least.append(getattr(cd, 'at_least', 1))
+            counts.append(cd.data)
+        for child in scope.scopes(ScopeTypeT.ALL):
+            visit(child, prefix)
+
+    for top in db.scopes(ScopeTypeT.ALL):
+        visit(top, "")
+    return _unique(paths), at_least, counts
+
+
+def _unique(paths: List[str]) -> List[str]:
+    # Same-named siblings would collide; number repeats in traversal order
+    # ('a/b', 'a/b#1', ...) so identical trees still align
+    if len(set(paths)) == len(paths):
+        return paths
+    seen: Dict[str, int] = {}
+    out = []
+    for p in paths:
+        n = seen.get(p, 0)
+        seen[p] = n + 1
+        out.append(p if n == 0 else "%s#%d" % (p, n))
+    return out
+
+
+def _read_file(path: str, input_format: Optional[str], schemas: Dict):
+    from ucis.rgy.format_rgy import FormatRgy
+
+    rgy = FormatRgy.inst()
+    fmt = input_format
+    if fmt is None:
+        fmt = rgy.detectDatabaseFormat(path) or rgy.getDefaultDatabase()
+    if fmt == 'ncdb':
+        return _read_ncdb(path, schemas)
+
+    db = rgy.getDatabaseDesc(fmt).fmt_if().read(path)
+    try:
+        return _walk_db(db)
+    finally:
+        db.close()
+
+
+def _read_ncdb(path: str, schemas: Dict):
+    """Paths, thresholds and counts of an NCDB file, reusing decoded schemas."""
+    import zipfile
+    from ucis.ncdb.constants import (
+        MEMBER_COUNTS, MEMBER_MANIFEST, MEMBER_SCOPE_TREE, MEMBER_STRINGS)
+    from ucis.ncdb.counts import CountsReader
+    from ucis.ncdb.manifest import Manifest
+    from ucis.ncdb.scope_tree import coveritem_paths
+    from ucis.ncdb.string_table import StringTable
+
+    with zipfile.ZipFile(path, "r") as zf:
+        manifest = Manifest.from_bytes(zf.read(MEMBER_MANIFEST))
+        strings = zf.read(MEMBER_STRINGS)
+        key = (manifest.schema_hash, strings)
+        schema = schemas.get(key) if manifest.schema_hash else None
+        if schema is None:
+            paths, at_least = coveritem_paths(
+                zf.read(MEMBER_SCOPE_TREE), StringTable.from_bytes(strings))
+            schema = (_unique(paths), at_least)
+            if manifest.schema_hash:
+                schemas[key] = schema
+        counts = CountsReader().deserialize(zf.read(MEMBER_COUNTS))
+
+    paths, at_least = schema
+    if len(counts) != len(paths):
+        raise ValueError("%s: %d counts for %d coveritems" % (
+            path, len(counts), len(paths)))
+    return paths, at_least, array.array('q', counts)
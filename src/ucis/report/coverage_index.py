@@ -0,0 +1,141 @@
+"""
+Indexed view of a ``CoverageReport`` for analysis queries.
+
+``CoverageIndex`` walks a report's covergroups, coverpoints and bins once
+and keeps flat per-covergroup and per-coverpoint records (with their bin
+counts precomputed), lookup dictionaries keyed by name and path, and the
+database-wide bin totals. Gap, hotspot and comparison analyses are then
+linear scans over these records instead of separate walks of the report
+tree, and ranked queries use :func:`top_k`, which selects the best *k*
+entries with a heap (O(n log k)) rather than sorting everything.
+"""
+from __future__ import annotations
+
+import heapq
+from typing import Callable, Dict, Iterable, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ucis.report.coverage_report import CoverageReport
+
+
+def top_k(items: Iterable, k: Optional[int], key: Callable,
+          largest: bool = False) -> List:
+    """
+    ``sorted(items, key=key, reverse=largest)[:k]``, computed by partial
+    selection. Ties keep their input order, exactly as with the stable sort.
+    ``k=None`` returns every item.
+    """
+    if k is None or k < 0:
+        return sorted(items, key=key, reverse=largest)[:k]
+    if largest:
+        return heapq.nlargest(k, items, key=key)
+    return heapq.nsmallest(k, items, key=key)
+
+
+class CovergroupEntry:
+    """Index record for one top-level covergroup."""
+
+    __slots__ = ('name', 'coverage', 'weight', 'covergroup')
+
+    def __init__(self, cg):
+        self.name = cg.name
+        self.coverage = cg.coverage
+        self.weight = getattr(cg, 'weight', 1)
+        self.covergroup = cg
+
+
+class CoverpointEntry:
+    """Index record for one coverpoint, with its bin counts precomputed."""
+
+    __slots__ = ('covergroup', 'name', 'coverage', 'total_bins',
+                 'uncovered_bins', 'coverpoint')
+
+    def __init__(self, cg_name: str, cp):
+        self.covergroup = cg_name
+        self.name = cp.name
+        self.coverage = cp.coverage
+        self.coverpoint = cp
+        bins = cp.bins or ()
+        self.total_bins = len(bins)
+        self.uncovered_bins = sum(1 for b in bins if b.count == 0)
+
+    @property
+    def path(self) -> str:
+        return "%s/%s" % (self.covergroup, self.name)
+
+    def uncovered(self) -> List:
+        """The coverpoint's bins with a zero hit count, in report order."""
+        if not self.uncovered_bins:
+            return []
+        return [b for b in self.coverpoint.bins if b.count == 0]
+
+
+class CoverageIndex:
+    """
+    Flat index over the top-level covergroups of *report*.
+
+    Attributes:
+        covergroups: ``CovergroupEntry`` per covergroup, in report order
+        coverpoints: ``CoverpointEntry`` per coverpoint, in report order
+        covergroup_m: Covergroup name -> entry (the last one for duplicates)
+        coverpoint_m: ``"<covergroup>/<coverpoint>"`` -> entry
+        total_bins: Coverpoint bins in the report
+        uncovered_bins: Coverpoint bins with a zero hit count
+        partial_coverpoints: Coverpoints with some uncovered bin but
+            non-zero coverage
+    """
+
+    def __init__(self, report: 'CoverageReport'):
+        self.report = report
+        self.coverage = report.coverage
+        self.covergroups: List[CovergroupEntry] = []
+        self.coverpoints: List[CoverpointEntry] = []
+        self.covergroup_m: Dict[str, CovergroupEntry] = {}
+        self.coverpoint_m: Dict[str, CoverpointEntry] = {}
+        self.total_bins = 0
+        self.uncovered_bins = 0
+        self.partial_coverpoints = 0
+        self._bin_counts: Optional[Dict[str, int]] = None
+
+        for cg in report.covergroups or ():
+            cg_entry = CovergroupEntry(cg)
+            self.covergroups.append(cg_entry)
+            self.covergroup_m[cg.name] = cg_entry
+            for cp in getattr(cg, 'coverpoints', None) or ():
+                entry = CoverpointEntry(cg.name, cp)
+                self.coverpoints.append(entry)
+                self.coverpoint_m[entry.path] = entry
+                self.total_bins += entry.total_bins
+                self.uncovered_bins += entry.uncovered_bins
+                if entry.uncovered_bins and entry.coverage > 0:
+                    self.partial_coverpoints += 1
+
+    @property
+    def total_coverpoints(self) -> int:
+        return len(self.coverpoints)
+
+    @property
+    def covered_bins(self) -> int:
+        return self.total_bins - self.uncovered_bins
+
+    @property
+    def bin_coverage(self) -> float:
+        """Percentage of coverpoint bins hit at least once."""
+        if self.total_bins == 0:
+            return 0.0
+        return self.covered_bins / self.total_bins * 100
+
+    @property
+    def bin_counts(self) -> Dict[str, int]:
+        """
+        ``"<covergroup>.<coverpoint>.<bin>"`` -> hit count for every
+        coverpoint bin, built on first use.
+        """
+        if self._bin_counts is None:
+            counts = {}
+            for entry in self.coverpoints:
+                prefix = "%s.%s." % (entry.covergroup, entry.name)
+                for b in entry.coverpoint.bins or ():
+                    counts[prefix + b.name] = b.count
+            self._bin_counts = counts
+        return self._bin_counts
@@ -15,17 +15,25 @@ Design principles
   preventing double-counting of type-level vs instance-level covergroup scopes.
 * **SQLite fast paths** are used for performance but must produce results
   identical to the API path.
+* **Single traversal**: on non-SQL backends all raw per-type counts come
+  from one ``CoverageRollup`` pass, and all functional statistics from one
+  pass over the ``CoverageReport``.
 * **Caching** is simple dict-based; call ``invalidate()`` whenever the
-  database filter changes.
+  database filter changes. Given a :class:`~ucis.report.metrics_cache.MetricsCache`,
+  results are also persisted to a sidecar file and reused by later sessions
+  on the unchanged database.
 """
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, TYPE_CHECKING
+from typing import Callable, Dict, List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ucis.ucis import UCIS
+    from ucis.report.metrics_cache import MetricsCache
     from ucis.report.coverage_report import CoverageReport
+    from ucis.report.coverage_index import CoverageIndex
+    from ucis.report.coverage_rollup import CoverageRollup
 
 
 # ---------------------------------------------------------------------------
@@ -139,6 +147,9 @@ class TestInfo:
 # CoverageMetrics
 # ---------------------------------------------------------------------------
 
+_MISSING = object()
+
+
 class CoverageMetrics:
     """
     Single source of truth for all coverage metric computation.
@@ -151,11 +162,34 @@ class CoverageMetrics:
     db:
         Any object implementing the ``UCIS`` interface (MemUCIS, SqliteUCIS,
         XmlUCIS, …).
+    cache:
+        Optional persistent ``MetricsCache`` for the database file. Results
+        found there are used instead of being computed; newly computed ones
+        are added to it and written out by :meth:`save_cache`.
+    loader:
+        Optional zero-argument callable returning the database, used when
+        *db* is ``None``. It is only called once a result actually has to be
+        computed, so a session served entirely from *cache* never reads the
+        database.
     """
 
-    def __init__(self, db: 'UCIS'):
-        self._db = db
+    #: Intermediate results that are cheap to re-derive from persisted ones
+    #: and are therefore kept in memory only
+    _TRANSIENT_KEYS = ('rollup', 'functional', 'index')
+
+    def __init__(self, db: Optional['UCIS'], cache: Optional['MetricsCache'] = None,
+                 loader: Optional[Callable[[], 'UCIS']] = None):
+        self._db_obj = db
+        self._loader = loader
         self._cache: Dict[str, object] = {}
+        self._store = cache
+
+    @property
+    def _db(self) -> 'UCIS':
+        if self._db_obj is None and self._loader is not None:
+            loader, self._loader = self._loader, None
+            self._db_obj = loader()
+        return self._db_obj
 
     # ------------------------------------------------------------------ cache
 
@@ -163,9 +197,22 @@ class CoverageMetrics:
         """Discard all cached results (e.g. after changing a test filter)."""
         self._cache.clear()
 
+    def save_cache(self):
+        """Write newly computed results to the persistent cache, if any."""
+        if self._store is not None:
+            self._store.save()
+
     def _cached(self, key: str, compute):
         if key not in self._cache:
-            self._cache[key] = compute()
+            store = self._store
+            if store is None or key in self._TRANSIENT_KEYS:
+                self._cache[key] = compute()
+            else:
+                value = store.get(key, _MISSING)
+                if value is _MISSING:
+                    value = compute()
+                    store.put(key, value)
+                self._cache[key] = value
         return self._cache[key]
 
     # --------------------------------------------------------------- hierarchy
@@ -186,6 +233,34 @@ class CoverageMetrics:
         from ucis.report.coverage_report_builder import CoverageReportBuilder
         return CoverageReportBuilder.build(self._db)
 
+    @property
+    def index(self) -> 'CoverageIndex':
+        """
+        ``CoverageIndex`` over :attr:`report`: flat covergroup / coverpoint
+        records with precomputed bin counts, shared by the gap, hotspot and
+        compare analyses.
+        """
+        return self._cached('index', self._build_index)
+
+    def _build_index(self) -> 'CoverageIndex':
+        from ucis.report.coverage_index import CoverageIndex
+        return CoverageIndex(self.report)
+
+    @property
+    def rollup(self) -> 'CoverageRollup':
+        """
+        Per-scope, per-cover-type ``CoverageRollup`` for the database.
+
+        Built by a single post-order traversal on first access and shared by
+        every API-path query in this class (and by report formatters that are
+        handed this ``CoverageMetrics`` instance).
+        """
+        return self._cached('rollup', self._build_rollup)
+
+    def _build_rollup(self) -> 'CoverageRollup':
+        from ucis.report.coverage_rollup import CoverageRollup
+        return CoverageRollup(self._db)
+
     # ------------------------------------------ functional coverage (CVGBIN)
 
     def functional_bins(self) -> BinStats:
@@ -203,13 +278,108 @@ class CoverageMetrics:
         # the text / JSON reports use.  This also means the SQLite fast path
         # is not needed here — CoverageReportBuilder already handles both
         # backends efficiently.
+        return self._functional()['functional_bins']
+
+    def _functional(self) -> Dict:
+        return self._cached('functional', self._compute_functional)
+
+    def _compute_functional(self) -> Dict:
+        """
+        Compute every functional-coverage statistic in one walk of the report.
+
+        Fills functional bin totals, per-covergroup stats, per-coverpoint
+        stats (with and without bin details) and per-cross stats together so
+        that no caller triggers a second traversal.
+        """
+        cg_stats: List[CovergroupStats] = []
+        cp_stats: List[CoverpointStats] = []
+        cp_stats_bins: List[CoverpointStats] = []
+        cr_stats: List[CrossStats] = []
+
+        def _walk_cg(cg, path_prefix: str) -> tuple:
+            # Returns (total, covered) using the same type-level vs
+            # sub-instance rule as _count_bins_in_cg().
+            cg_path = f'{path_prefix}/{cg.name}' if path_prefix else cg.name
+            for cr in cg.crosses:
+                covered = sum(1 for b in cr.bins if b.hit)
+                cr_stats.append(CrossStats(
+                    name=cr.name,
+                    path=f'{cg_path}/{cr.name}',
+                    bins=BinStats(total=len(cr.bins), covered=covered),
+                    weight=cr.weight,
+                ))
+            total = 0
+            covered = 0
+            if cg.coverpoints or cg.crosses:
+                for cp in cg.coverpoints:
+                    cp_total = len(cp.bins)
+                    cp_covered = sum(1 for b in cp.bins if b.hit)
+                    total += cp_total
+                    covered += cp_covered
+                    details = [BinDetail(name=b.name, count=b.count,
+                                         at_least=b.goal)
+                               for b in cp.bins]
+                    details.extend(BinDetail(name=b.name, count=b.count,
+                                             at_least=b.goal, is_ignore=True)
+                                   for b in cp.ignore_bins)
+                    details.extend(BinDetail(name=b.name, count=b.count,
+                                             at_least=b.goal, is_illegal=True)
+                                   for b in cp.illegal_bins)
+                    for lst, d in ((cp_stats, []), (cp_stats_bins, details)):
+                        lst.append(CoverpointStats(
+                            name=cp.name,
+                            path=f'{cg_path}/{cp.name}',
+                            bins=BinStats(total=cp_total, covered=cp_covered),
+                            bin_details=d,
+                            weight=cp.weight,
+                        ))
+                for cr in cg.crosses:
+                    total += len(cr.bins)
+                    covered += sum(1 for b in cr.bins if b.hit)
+                # Crosses of sub-instances are still reported individually
+                for sub in cg.covergroups:
+                    _walk_crosses(sub, cg_path)
+            else:
+                for sub in cg.covergroups:
+                    t, c = _walk_cg(sub, cg_path)
+                    total += t
+                    covered += c
+            return total, covered
+
+        def _walk_crosses(cg, path_prefix: str):
+            cg_path = f'{path_prefix}/{cg.name}' if path_prefix else cg.name
+            for cr in cg.crosses:
+                cr_stats.append(CrossStats(
+                    name=cr.name,
+                    path=f'{cg_path}/{cr.name}',
+                    bins=BinStats(total=len(cr.bins),
+                                  covered=sum(1 for b in cr.bins if b.hit)),
+                    weight=cr.weight,
+                ))
+            for sub in cg.covergroups:
+                _walk_crosses(sub, cg_path)
+
         total = 0
         covered = 0
         for cg in self.report.covergroups:
-            t, c = self._count_bins_in_cg(cg)
+            t, c = _walk_cg(cg, '')
             total += t
             covered += c
-        return BinStats(total=total, covered=covered)
+            cg_stats.append(CovergroupStats(
+                name=cg.name,
+                path=cg.instname,
+                coverage_pct=cg.coverage,
+                bins=BinStats(total=t, covered=c),
+                weight=cg.weight,
+            ))
+
+        return {
+            'functional_bins': BinStats(total=total, covered=covered),
+            'covergroup_stats': cg_stats,
+            'coverpoint_stats_False': cp_stats,
+            'coverpoint_stats_True': cp_stats_bins,
+            'cross_stats': cr_stats,
+        }
 
     def _count_bins_in_cg(self, cg) -> tuple:
         """
@@ -247,17 +417,7 @@ class CoverageMetrics:
         return self._cached('covergroup_stats', self._compute_covergroup_stats)
 
     def _compute_covergroup_stats(self) -> List[CovergroupStats]:
-        result = []
-        for cg in self.report.covergroups:
-            t, c = self._count_bins_in_cg(cg)
-            result.append(CovergroupStats(
-                name=cg.name,
-                path=cg.instname,
-                coverage_pct=cg.coverage,
-                bins=BinStats(total=t, covered=c),
-                weight=cg.weight,
-            ))
-        return result
+        return self._functional()['covergroup_stats']
 
     def coverpoint_stats(self, include_bins: bool = False) -> List[CoverpointStats]:
         """
@@ -274,70 +434,14 @@ class CoverageMetrics:
                             lambda: self._compute_coverpoint_stats(include_bins))
 
     def _compute_coverpoint_stats(self, include_bins: bool) -> List[CoverpointStats]:
-        result = []
-
-        def _walk_cg(cg, path_prefix: str):
-            cg_path = f'{path_prefix}/{cg.name}' if path_prefix else cg.name
-            if cg.coverpoints or cg.crosses:
-                # Type-level coverpoints/crosses present — use them
-                for cp in cg.coverpoints:
-                    total = len(cp.bins)
-                    covered = sum(1 for b in cp.bins if b.hit)
-                    details = []
-                    if include_bins:
-                        for b in cp.bins:
-                            details.append(BinDetail(
-                                name=b.name, count=b.count, at_least=b.goal))
-                        for b in cp.ignore_bins:
-                            details.append(BinDetail(
-                                name=b.name, count=b.count, at_least=b.goal,
-                                is_ignore=True))
-                        for b in cp.illegal_bins:
-                            details.append(BinDetail(
-                                name=b.name, count=b.count, at_least=b.goal,
-                                is_illegal=True))
-                    result.append(CoverpointStats(
-                        name=cp.name,
-                        path=f'{cg_path}/{cp.name}',
-                        bins=BinStats(total=total, covered=covered),
-                        bin_details=details,
-                        weight=cp.weight,
-                    ))
-            else:
-                # No type-level coverpoints — recurse into sub-instances only
-                for sub in cg.covergroups:
-                    _walk_cg(sub, cg_path)
-
-        for cg in self.report.covergroups:
-            _walk_cg(cg, '')
-        return result
+        return self._functional()[f'coverpoint_stats_{include_bins}']
 
     def cross_stats(self) -> List[CrossStats]:
         """Flat list of ``CrossStats`` for every cross in the database."""
         return self._cached('cross_stats', self._compute_cross_stats)
 
     def _compute_cross_stats(self) -> List[CrossStats]:
-        result = []
-
-        def _walk_cg(cg, path_prefix: str):
-            cg_path = f'{path_prefix}/{cg.name}' if path_prefix else cg.name
-            for cr in cg.crosses:
-                total = len(cr.bins)
-                covered = sum(1 for b in cr.bins if b.hit)
-                result.append(CrossStats(
-                    name=cr.name,
-                    path=f'{cg_path}/{cr.name}',
-                    bins=BinStats(total=total, covered=covered),
-                    weight=cr.weight,
-                ))
-            for sub in cg.crosses:
-                pass   # crosses do not nest
-            for sub in cg.covergroups:
-                _walk_cg(sub, cg_path)
-
-        for cg in self.report.covergroups:
-            _walk_cg(cg, '')
-        return result
+        return self._functional()['cross_stats']
 
     # --------------------------------------- code coverage (STMT/BRANCH/etc.)
 
@@ -366,30 +470,14 @@ class CoverageMetrics:
             except Exception:
                 pass
 
-        # API fallback
-        from ucis.scope_type_t import ScopeTypeT
-        found = set()
+        # API fallback — read from the shared single-pass rollup
         all_types = [
             CoverTypeT.CVGBIN, CoverTypeT.STMTBIN, CoverTypeT.BRANCHBIN,
             CoverTypeT.TOGGLEBIN, CoverTypeT.EXPRBIN, CoverTypeT.CONDBIN,
             CoverTypeT.FSMBIN, CoverTypeT.BLOCKBIN,
         ]
-
-        def _visit(scope):
-            for ct in all_types:
-                if ct not in found:
-                    try:
-                        if next(iter(scope.coverItems(ct)), None) is not None:
-                            found.add(ct)
-                    except Exception:
-                        pass
-            for child in scope.scopes(ScopeTypeT.ALL):
-                _visit(child)
-
-        for scope in self._db.scopes(ScopeTypeT.ALL):
-            _visit(scope)
-
-        return sorted(found, key=lambda t: int(t))
+        totals = self.rollup.totals
+        return [ct for ct in all_types if totals.total(ct) > 0]
 
     def bins_by_type(self, cov_type, test_filter: Optional[str] = None) -> BinStats:
         """
@@ -416,8 +504,6 @@ class CoverageMetrics:
                             lambda: self._query_bins_by_type(cov_type, test_filter))
 
     def _query_bins_by_type(self, cov_type, test_filter: Optional[str]) -> BinStats:
-        from ucis.scope_type_t import ScopeTypeT
-
         # SQLite fast path
         if hasattr(self._db, 'conn'):
             try:
@@ -445,30 +531,8 @@ class CoverageMetrics:
             except Exception:
                 pass
 
-        # API fallback
-        total = 0
-        covered = 0
-
-        def _visit(scope):
-            nonlocal total, covered
-            try:
-                for item in scope.coverItems(cov_type):
-                    total += 1
-                    cd = item.getCoverData()
-                    if cd and cd.data >= cd.at_least:
-                        covered += 1
-            except Exception:
-                pass
-            try:
-                for child in scope.scopes(ScopeTypeT.ALL):
-                    _visit(child)
-            except Exception:
-                pass
-
-        for scope in self._db.scopes(ScopeTypeT.ALL):
-            _visit(scope)
-
-        return BinStats(total=total, covered=covered)
+        # API fallback — read from the shared single-pass rollup
+        return self.rollup.totals.bins(cov_type)
 
     def code_coverage_by_type(self) -> Dict:
         """
@@ -505,11 +569,9 @@ class CoverageMetrics:
             except Exception:
                 pass
 
-        # API fallback
-        result = {}
-        for ct in code_types:
-            result[ct] = self._query_bins_by_type(ct, test_filter=None)
-        return result
+        # API fallback — read from the shared single-pass rollup
+        totals = self.rollup.totals
+        return {ct: totals.bins(ct) for ct in code_types}
 
     def file_coverage(self, test_filter: Optional[str] = None) -> List[FileCoverageStats]:
         """
@@ -26,6 +26,76 @@ class CoverageReport(object):
         self.covergroups.append(cg)
         return cg
     
+    def to_dict(self) -> Dict:
+        """
+        Plain (JSON-serializable) representation of the report.
+        The inverse of :meth:`from_dict`.
+        """
+        def bins(lst):
+            return [[b.name, b.goal, b.count] for b in lst]
+        
+        def cg_d(cg):
+            return {
+                "name": cg.name, "instname": cg.instname,
+                "coverage": cg.coverage, "weight": cg.weight,
+                "coverpoints": [{
+                    "name": cp.name, "coverage": cp.coverage,
+                    "weight": cp.weight, "bins": bins(cp.bins),
+                    "ignore_bins": bins(cp.ignore_bins),
+                    "illegal_bins": bins(cp.illegal_bins)}
+                    for cp in cg.coverpoints],
+                "crosses": [{
+                    "name": cr.name, "coverage": cr.coverage,
+                    "weight": cr.weight, "bins": bins(cr.bins)}
+                    for cr in cg.crosses],
+                "covergroups": [cg_d(sub) for sub in cg.covergroups],
+            }
+        
+        index = {id(cg): i for i, cg in enumerate(self.covergroups)}
+        return {
+            "coverage": self.coverage,
+            "covergroups": [cg_d(cg) for cg in self.covergroups],
+            "covergroup_m": [
+                [name, index[id(cg)]]
+                for name, cg in self.covergroup_m.items()
+                if id(cg) in index],
+        }
+    
+    @staticmethod
+    def from_dict(d : Dict) -> 'CoverageReport':
+        """Rebuild a report from the output of :meth:`to_dict`."""
+        CR = CoverageReport
+        
+        def bins(lst):
+            return [CR.CoverBin(name, goal, count) for name, goal, count in lst]
+        
+        def item(obj, d):
+            obj.coverage = d["coverage"]
+            obj.weight = d["weight"]
+            return obj
+        
+        def cg_o(d):
+            cg = item(CR.Covergroup(d["name"], d["instname"]), d)
+            for cp_d in d["coverpoints"]:
+                cp = item(CR.Coverpoint(cp_d["name"]), cp_d)
+                cp.bins = bins(cp_d["bins"])
+                cp.ignore_bins = bins(cp_d["ignore_bins"])
+                cp.illegal_bins = bins(cp_d["illegal_bins"])
+                cg.coverpoints.append(cp)
+            for cr_d in d["crosses"]:
+                cr = item(CR.Cross(cr_d["name"]), cr_d)
+                cr.bins = bins(cr_d["bins"])
+                cg.crosses.append(cr)
+            cg.covergroups = [cg_o(sub) for sub in d["covergroups"]]
+            return cg
+        
+        report = CoverageReport()
+        report.coverage = d["coverage"]
+        report.covergroups = [cg_o(cg) for cg in d["covergroups"]]
+        for name, idx in d["covergroup_m"]:
+            report.covergroup_m[name] = report.covergroups[idx]
+        return report
+    
     class CoverItem(object):
         """
         Base type for covergroups and coverpoints
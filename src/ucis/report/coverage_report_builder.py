@@ -28,6 +28,82 @@ class CoverageReportBuilder(object):
         
         builder = CoverageReportBuilder(db)
         return builder._build()
+    
+    @staticmethod
+    def iter_covergroups(db : 'UCIS'):
+        """
+        Yields the top-level covergroup report objects of *db* one at a
+        time, in the same order as ``build(db).covergroups``, without
+        retaining them. Used by streaming exporters.
+        """
+        builder = CoverageReportBuilder(db)
+        for cg_t in CoverageReportBuilder.covergroup_scopes(db):
+            yield builder.build_covergroup(cg_t)
+    
+    @staticmethod
+    def covergroup_scopes(db : 'UCIS'):
+        """
+        Yields the top-level covergroup scopes of *db* in report order,
+        without building their report objects.
+        """
+        for iscope in db.scopes(ScopeTypeT.INSTANCE):
+            yield from iscope.scopes(ScopeTypeT.COVERGROUP)
+
+    @staticmethod
+    def overall_coverage(db : 'UCIS') -> float:
+        """
+        Weighted coverage of all covergroups of *db*, equal to
+        ``build(db).coverage`` but computed from hit counts alone, without
+        building report objects.
+        """
+        builder = CoverageReportBuilder(db)
+        coverage = 0.0
+        div = 0
+        for cg_n in CoverageReportBuilder.covergroup_scopes(db):
+            weight = cg_n.getWeight()
+            if weight > 0:
+                coverage += builder.covergroup_coverage(cg_n) * weight
+            div += weight
+        return coverage / div if div > 0 else 0.0
+
+    def covergroup_coverage(self, cg_n) -> float:
+        """Coverage of covergroup scope *cg_n*, as build_covergroup() computes it."""
+        coverage = 0.0
+        div = 0
+        parts = [(self._bin_coverage(self._coverpoint_bin_scopes(cp_n)),
+                  cp_n.getWeight())
+                 for cp_n in cg_n.scopes(ScopeTypeT.COVERPOINT)]
+        # Crosses are weighted 1, as in build_cross()
+        parts.extend((self._bin_coverage([cr_n]), 1)
+                     for cr_n in cg_n.scopes(ScopeTypeT.CROSS))
+        if parts:
+            for cov, weight in parts:
+                if weight > 0:
+                    coverage += cov * weight
+                div += weight
+        else:
+            for sub_n in cg_n.scopes(ScopeTypeT.COVERINSTANCE):
+                weight = sub_n.getWeight()
+                if weight > 0:
+                    coverage += self.covergroup_coverage(sub_n) * weight
+                div += weight
+        return coverage / div if div > 0 else 0.0
+
+    @staticmethod
+    def _coverpoint_bin_scopes(cp_n):
+        return [cp_n] + list(cp_n.scopes(ScopeTypeT.CVGBINSCOPE))
+
+    @staticmethod
+    def _bin_coverage(scopes) -> float:
+        num_hit = 0
+        total = 0
+        for scope in scopes:
+            for ci_n in scope.coverItems(CoverTypeT.CVGBIN):
+                cvg_data = ci_n.getCoverData()
+                total += 1
+                if cvg_data.data >= cvg_data.at_least:
+                    num_hit += 1
+        return (100*num_hit)/total if total > 0 else 0.0
         
 
     def _build(self)->'CoverageReport':
@@ -0,0 +1,175 @@
+"""
+Single-pass coverage rollup.
+
+``CoverageRollup`` walks a UCIS database exactly once (post-order) and
+records, for every scope, the total / covered / weighted counts of the
+coveritems in its subtree broken down by ``CoverTypeT``.  Every metric that
+needs raw per-type or per-scope counts (``CoverageMetrics`` code-coverage
+queries, the HTML formatter's per-scope percentages, …) reads from this
+table instead of re-walking the tree, so report generation is O(N) in the
+number of scopes and coveritems.
+
+A coveritem is *covered* when ``count >= at_least`` (UCIS LRM §5.3).
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Optional, TYPE_CHECKING
+
+from ucis.cover_type_t import CoverTypeT
+from ucis.scope_type_t import ScopeTypeT
+
+if TYPE_CHECKING:
+    from ucis.ucis import UCIS
+    from ucis.report.coverage_metrics import BinStats
+
+
+# Index of each field in a per-type counter list
+TOTAL = 0
+COVERED = 1
+W_TOTAL = 2
+W_COVERED = 3
+
+
+class RollupEntry:
+    """Per-type counts for one scope's subtree (or the whole database)."""
+
+    __slots__ = ('by_type',)
+
+    def __init__(self):
+        # int(CoverTypeT) -> [total, covered, weighted_total, weighted_covered]
+        self.by_type: Dict[int, List[int]] = {}
+
+    def add_item(self, cov_type: int, covered: bool, weight: int):
+        c = self.by_type.get(cov_type)
+        if c is None:
+            c = self.by_type[cov_type] = [0, 0, 0, 0]
+        c[TOTAL] += 1
+        c[W_TOTAL] += weight
+        if covered:
+            c[COVERED] += 1
+            c[W_COVERED] += weight
+
+    def merge(self, other: 'RollupEntry'):
+        for t, oc in other.by_type.items():
+            c = self.by_type.get(t)
+            if c is None:
+                self.by_type[t] = list(oc)
+            else:
+                c[TOTAL] += oc[TOTAL]
+                c[COVERED] += oc[COVERED]
+                c[W_TOTAL] += oc[W_TOTAL]
+                c[W_COVERED] += oc[W_COVERED]
+
+    def _sum(self, mask: int, field: int) -> int:
+        return sum(c[field] for t, c in self.by_type.items() if t & mask)
+
+    def total(self, mask: int = CoverTypeT.ALL) -> int:
+        return self._sum(int(mask), TOTAL)
+
+    def covered(self, mask: int = CoverTypeT.ALL) -> int:
+        return self._sum(int(mask), COVERED)
+
+    def bins(self, mask: int = CoverTypeT.ALL) -> 'BinStats':
+        """``BinStats`` over all cover types selected by *mask*."""
+        from ucis.report.coverage_metrics import BinStats
+        mask = int(mask)
+        return BinStats(total=self._sum(mask, TOTAL),
+                        covered=self._sum(mask, COVERED))
+
+    def coverage_pct(self, mask: int = CoverTypeT.ALL) -> float:
+        mask = int(mask)
+        total = self._sum(mask, TOTAL)
+        if total == 0:
+            return 0.0
+        return self._sum(mask, COVERED) / total * 100.0
+
+    def weighted_pct(self, mask: int = CoverTypeT.ALL) -> float:
+        mask = int(mask)
+        total = self._sum(mask, W_TOTAL)
+        if total == 0:
+            return 0.0
+        return self._sum(mask, W_COVERED) / total * 100.0
+
+    def types(self) -> List[int]:
+        return sorted(t for t, c in self.by_type.items() if c[TOTAL] > 0)
+
+
+class CoverageRollup:
+    """
+    Per-scope rollup table built by one post-order traversal of *db*.
+
+    Scopes are looked up by identity (or by ``scope_id`` for backends whose
+    scope handles are created on demand), so the same scope objects that a
+    consumer obtains from ``db.scopes()`` can be passed to :meth:`scope`.
+    """
+
+    def __init__(self, db: 'UCIS'):
+        self._db = db
+        self._entries: Dict[object, RollupEntry] = {}
+        # Keep handles alive so that id()-based keys stay unique
+        self._scopes: List[object] = []
+        self.totals = RollupEntry()
+        self._build()
+
+    @staticmethod
+    def _key(scope):
+        sid = getattr(scope, 'scope_id', None)
+        return ('id', sid) if sid is not None else id(scope)
+
+    def _build(self):
+        # Iterative post-order so very deep hierarchies do not hit the
+        # recursion limit.  Each stack frame is (scope, entry, child_iter).
+        stack = []
+        for top in self._safe_scopes(self._db):
+            stack.append(self._enter(top))
+            while stack:
+                scope, entry, children = stack[-1]
+                child = next(children, None)
+                if child is not None:
+                    stack.append(self._enter(child))
+                    continue
+                stack.pop()
+                if stack:
+                    stack[-1][1].merge(entry)
+                else:
+                    self.totals.merge(entry)
+
+    def _enter(self, scope):
+        entry = RollupEntry()
+        for item in self._safe_items(scope):
+            cd = item.getCoverData()
+            if cd is None:
+                continue
+            entry.add_item(int(cd.type), cd.data >= cd.at_least,
+                           cd.weight if cd.weight else 1)
+        self._entries[self._key(scope)] = entry
+        self._scopes.append(scope)
+        return (scope, entry, self._safe_scopes(scope))
+
+    @staticmethod
+    def _safe_scopes(scope) -> Iterator:
+        try:
+            return iter(list(scope.scopes(ScopeTypeT.ALL)))
+        except Exception:
+            return iter(())
+
+    @staticmethod
+    def _safe_items(scope) -> Iterator:
+        try:
+            return iter(scope.coverItems(CoverTypeT.ALL))
+        except Exception:
+            return iter(())
+
+    def scope(self, scope) -> Optional[RollupEntry]:
+        """Subtree rollup for *scope*, or ``None`` if it was not visited."""
+        return self._entries.get(self._key(scope))
+
+    def types_present(self) -> List[CoverTypeT]:
+        """``CoverTypeT`` values with at least one item in the database."""
+        result = []
+        for t in self.totals.types():
+            try:
+                result.append(CoverTypeT(t))
+            except ValueError:
+                pass
+        return result
@@ -41,3 +41,47 @@ class FormatRptHtml(FormatIfRpt):
             theme=self.theme
         )
         formatter.format(db, out)
+
+
+class FormatRptHtmlDir(FormatRptHtml):
+    """Multi-file (sharded) HTML report formatter interface for registry."""
+    
+    def __init__(self):
+        super().__init__()
+        self.shard_depth = 2
+        self.workers = None
+        self.compress_level = 6
+        # Only the sharded report reuses cached fragments
+        self.cache_dir = None
+    
+    @classmethod
+    def register(cls, rgy):
+        """Register the multi-file HTML format with the format registry."""
+        desc = FormatDescRpt(
+            cls,
+            name="html-dir",
+            out_flags=FormatRptOutFlags.Dir,
+            description="Produces an interactive HTML report directory with lazily-loaded data shards")
+        rgy.addReportFormat(desc)
+    
+    def report(self, 
+               db: UCIS,
+               out,
+               args):
+        """Generate a multi-file HTML report.
+        
+        Args:
+            db: UCIS database
+            out: Output directory path
+            args: Additional arguments (unused)
+        """
+        formatter = HtmlFormatter(
+            include_source=self.include_source,
+            compress=self.compress,
+            theme=self.theme,
+            shard_depth=self.shard_depth,
+            workers=self.workers,
+            compress_level=self.compress_level,
+            cache_dir=self.cache_dir
+        )
+        formatter.format_dir(db, out)
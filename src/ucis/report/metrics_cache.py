@@ -0,0 +1,229 @@
+"""
+Persistent sidecar cache for coverage metrics.
+
+Computing coverage numbers means reading and walking the whole database, so
+every CLI or TUI session used to start from scratch. ``MetricsCache`` keeps
+computed results in a JSON file next to the database
+(``<db>`` + :data:`CACHE_SUFFIX`), stamped with the database file's size and
+modification time. A later session on the unchanged file reads them back
+instead of recomputing; any change to the database file, or to the cache
+layout version, discards them.
+
+The cache is best-effort: an unreadable or corrupt sidecar is treated as
+empty, and a sidecar that cannot be written (read-only directory) is
+silently skipped.
+"""
+import dataclasses
+import enum
+import json
+import os
+import stat
+import threading
+from typing import Dict, List, Optional
+
+#: Appended to the database path to form the sidecar path
+CACHE_SUFFIX = ".metrics-cache.json"
+
+#: Bump whenever the layout of any stored value changes
+CACHE_VERSION = 1
+
+class MetricsCache(object):
+    """
+    Results cache for one database file.
+
+    Values are anything built from JSON scalars, lists, dicts (any key type),
+    ``CoverTypeT`` values, the ``CoverageMetrics`` dataclasses and
+    ``CoverageReport``. Values of other types are not stored.
+
+    Args:
+        db_path: Path of the database file the results belong to
+        cache_path: Sidecar location (default: ``db_path + CACHE_SUFFIX``)
+    """
+
+    def __init__(self, db_path: str, cache_path: Optional[str] = None):
+        self.db_path = db_path
+        self.path = cache_path if cache_path is not None else db_path + CACHE_SUFFIX
+        self.signature = self.file_signature(db_path)
+        self.hits = 0
+        self.misses = 0
+        self._entries: Optional[Dict[str, str]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def file_signature(path: str) -> Optional[List[int]]:
+        """``[size, mtime_ns]`` of a regular file, or ``None``."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        return [st.st_size, st.st_mtime_ns]
+
+    @property
+    def enabled(self) -> bool:
+        """False when the database is not a regular file (nothing to key on)."""
+        return self.signature is not None
+
+    def _load(self) -> Dict[str, str]:
+        # Sidecar layout: a JSON header line, then one line per entry of
+        # '<json key>\t<json value>'. Values stay as text until requested,
+        # so a lookup only pays for decoding the entry it needs.
+        if self._entries is None:
+            self._entries = {}
+            if not self.enabled:
+                return self._entries
+            try:
+                with open(self.path, 'r', encoding='utf-8') as fp:
+                    header = json.loads(fp.readline())
+                    if (not isinstance(header, dict)
+                            or header.get("version") != CACHE_VERSION
+                            or header.get("signature") != self.signature):
+                        return self._entries
+                    entries = {}
+                    for line in fp:
+                        key, sep, value = line.rstrip('\n').partition('\t')
+                        if not sep:
+                            return self._entries
+                        entries[json.loads(key)] = value
+            except (OSError, ValueError):
+                return self._entries
+            self._entries = entries
+        return self._entries
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._load()
+
+    def get(self, key: str, default=None):
+        """Stored value for *key*, or *default*."""
+        with self._lock:
+            text = self._load().get(key)
+            if text is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+        try:
+            return _decode(json.loads(text))
+        except (KeyError, TypeError, ValueError):
+            return default
+
+    def put(self, key: str, value):
+        """Store *value* under *key* (written out by :meth:`save`)."""
+        try:
+            text = json.dumps(_encode(value), separators=(',', ':'))
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            self._load()[key] = text
+            self._dirty = True
+
+    def save(self):
+        """
+        Write the sidecar if anything was added. Skipped when the database
+        file changed since this cache was opened: the new results may have
+        been computed from the old content.
+        """
+        with self._lock:
+            if not self._dirty or not self.enabled:
+                return
+            if self.file_signature(self.db_path) != self.signature:
+                return
+            header = json.dumps({"version": CACHE_VERSION,
+                                 "signature": self.signature})
+            # Write-then-rename so concurrent readers never see a partial file
+            tmp = '%s.%d.%d.tmp' % (self.path, os.getpid(), threading.get_ident())
+            try:
+                with open(tmp, 'w', encoding='utf-8') as fp:
+                    fp.write(header + '\n')
+                    for key, text in self._entries.items():
+                        fp.write('%s\t%s\n' % (json.dumps(key), text))
+                os.replace(tmp, self.path)
+            except OSError:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+                return
+            self._dirty = False
+
+    def clear(self):
+        """Forget all stored results and remove the sidecar."""
+        with self._lock:
+            self._entries = {}
+            self._dirty = False
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+# ---------------------------------------------------------------------------
+# Value codec
+# ---------------------------------------------------------------------------
+
+_TYPES = None
+
+
+def _types() -> Dict[str, type]:
+    """Named types that may appear in stored values (imported on first use)."""
+    global _TYPES
+    if _TYPES is None:
+        from ucis.cover_type_t import CoverTypeT
+        from ucis.report import coverage_metrics as cm
+        from ucis.report.coverage_report import CoverageReport
+        _TYPES = {t.__name__: t for t in (
+            CoverTypeT, CoverageReport,
+            cm.BinStats, cm.BinDetail, cm.CoverpointStats, cm.CrossStats,
+            cm.CovergroupStats, cm.FileCoverageStats, cm.TestInfo)}
+    return _TYPES
+
+
+def _encode(value):
+    if value is None or isinstance(value, (bool, str, float)):
+        return value
+    if isinstance(value, enum.Enum):
+        _check_known(type(value))
+        return {"$t": type(value).__name__, "v": value.value}
+    if isinstance(value, int):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        if all(type(k) is str for k in value) and "$t" not in value:
+            return {k: _encode(v) for k, v in value.items()}
+        return {"$t": "dict",
+                "v": [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if dataclasses.is_dataclass(value):
+        _check_known(type(value))
+        return {"$t": type(value).__name__,
+                "v": {f.name: _encode(getattr(value, f.name))
+                      for f in dataclasses.fields(value)}}
+    if hasattr(value, 'to_dict'):
+        _check_known(type(value))
+        return {"$t": type(value).__name__, "v": value.to_dict()}
+    raise TypeError("Cannot cache value of type %s" % type(value).__name__)
+
+
+def _check_known(t: type):
+    if _types().get(t.__name__) is not t:
+        raise TypeError("Cannot cache value of type %s" % t.__name__)
+
+
+def _decode(raw):
+    if isinstance(raw, list):
+        return [_decode(v) for v in raw]
+    if not isinstance(raw, dict):
+        return raw
+    if "$t" not in raw:
+        return {k: _decode(v) for k, v in raw.items()}
+    tag, v = raw["$t"], raw["v"]
+    if tag == "dict":
+        return {_decode(k): _decode(val) for k, val in v}
+    t = _types()[tag]
+    if issubclass(t, enum.Enum):
+        return t(v)
+    if dataclasses.is_dataclass(t):
+        return t(**{name: _decode(val) for name, val in v.items()})
+    return t.from_dict(v)
@@ -3,19 +3,43 @@ Created on Jun 22, 2022
 
 @author: mballance
 '''
+import importlib
+import threading
 from typing import Dict
 from .format_if_db import FormatDescDb
 from ucis.rgy.format_if_rpt import FormatDescRpt
-from ucis.report.format_rpt_text import FormatRptText
-from ucis.report.format_rpt_json import FormatRptJson
-from ucis.xml.db_format_if_xml import DbFormatIfXml
-from ucis.lib.db_format_if_lib import DbFormatIfLib
-from ucis.yaml.db_format_if_yaml import DbFormatIfYaml
+
+#: Built-in database formats: name -> 'module:Class' whose register() adds it
+_DB_FORMAT_PROVIDERS = {
+    "xml":         "ucis.xml.db_format_if_xml:DbFormatIfXml",
+    "libucis":     "ucis.lib.db_format_if_lib:DbFormatIfLib",
+    "yaml":        "ucis.yaml.db_format_if_yaml:DbFormatIfYaml",
+    "sqlite":      "ucis.sqlite.db_format_if_sqlite:DbFormatIfSqlite",
+    "vltcov":      "ucis.vltcov.db_format_if_vltcov:DbFormatIfVltCov",
+    "cocotb-xml":  "ucis.cocotb.db_format_if_cocotb:DbFormatIfCocotbXml",
+    "cocotb-yaml": "ucis.cocotb.db_format_if_cocotb:DbFormatIfCocotbYaml",
+    "avl-json":    "ucis.avl.db_format_if_avl:DbFormatIfAvlJson",
+    "lcov":        "ucis.formatters.db_format_if_lcov:DbFormatIfLcov",
+    "ncdb":        "ucis.ncdb.db_format_if_ncdb:DbFormatIfNcdb",
+}
+
+#: Built-in report formats: name -> 'module:Class' whose register() adds it
+_RPT_FORMAT_PROVIDERS = {
+    "json":     "ucis.report.format_rpt_json:FormatRptJson",
+    "txt":      "ucis.report.format_rpt_text:FormatRptText",
+    "html":     "ucis.report.format_rpt_html:FormatRptHtml",
+    "html-dir": "ucis.report.format_rpt_html:FormatRptHtmlDir",
+}
 
 class FormatRgy(object):
     """
     Registry for various format-support objects. Classes to access
     coverage databases and emit reports are registered here.
+
+    Formats are known by name up front, but the module implementing a
+    format is only imported (and its class's ``register()`` called) the
+    first time the format's descriptor is requested. Listing or checking
+    format names never imports a backend.
     """
 
     _in_inst = False    
@@ -26,34 +50,74 @@ class FormatRgy(object):
             raise Exception("Obtain the FormatRgy singleton by calling FormatRgy.inst()")
         self._format_db_m : Dict[str, FormatDescDb] = {}
         self._format_rpt_m : Dict[str, FormatDescRpt] = {}
+        # Formats registered by name whose module has not been loaded yet
+        self._format_db_lazy_m : Dict[str, str] = {}
+        self._format_rpt_lazy_m : Dict[str, str] = {}
+        # Serialises loading lazy formats. Re-entrant, as a provider's
+        # register() may itself look up a format
+        self._lazy_lock = threading.RLock()
         pass
     
     def addDatabaseFormat(self, desc : FormatDescDb):
         self._format_db_m[desc._name] = desc
+        self._format_db_lazy_m.pop(desc._name, None)
     
     def addReportFormat(self, desc : FormatDescRpt):
         self._format_rpt_m[desc._name] = desc
+        self._format_rpt_lazy_m.pop(desc._name, None)
+
+    def addDatabaseFormatProvider(self, name : str, provider : str):
+        """
+        Register database format *name* without importing it. *provider*
+        is a ``'module:Class'`` reference (entry-point syntax); the module
+        is imported and ``Class.register(rgy)`` called on first use.
+        """
+        if name not in self._format_db_m:
+            self._format_db_lazy_m[name] = provider
+
+    def addReportFormatProvider(self, name : str, provider : str):
+        """Register report format *name* lazily; see addDatabaseFormatProvider."""
+        if name not in self._format_rpt_m:
+            self._format_rpt_lazy_m[name] = provider
+
+    def _load_provider(self, provider : str):
+        module, _, attr = provider.partition(':')
+        getattr(importlib.import_module(module), attr).register(self)
+
+    def _load_lazy(self, fmt, format_m, lazy_m):
+        """Load lazily-registered format *fmt* into *format_m*, once."""
+        with self._lazy_lock:
+            provider = lazy_m.get(fmt)
+            if fmt not in format_m and provider is not None:
+                self._load_provider(provider)
+                # Forgotten only once registered, so a failed import can
+                # be retried and other threads never see neither map
+                lazy_m.pop(fmt, None)
     
     def getDatabaseFormats(self):
-        fmts = list(self._format_db_m.keys())
+        fmts = list(self._format_db_m.keys()) + list(self._format_db_lazy_m.keys())
         fmts.sort()
         return fmts
     
     def hasDatabaseFormat(self, fmt):
-        return fmt in self._format_db_m.keys()
+        return fmt in self._format_db_m.keys() or fmt in self._format_db_lazy_m.keys()
     
     def hasReportFormat(self, fmt):
-        return fmt in self._format_rpt_m.keys()
+        return fmt in self._format_rpt_m.keys() or fmt in self._format_rpt_lazy_m.keys()
     
     def getReportFormats(self):
-        fmts = list(self._format_rpt_m.keys())
+        fmts = list(self._format_rpt_m.keys()) + list(self._format_rpt_lazy_m.keys())
         fmts.sort()
         return fmts
     
     def getDatabaseDesc(self, fmt):
+        if fmt not in self._format_db_m and fmt in self._format_db_lazy_m:
+            self._load_lazy(fmt, self._format_db_m, self._format_db_lazy_m)
         return self._format_db_m[fmt]
     
     def getReportDesc(self, fmt):
+        if fmt not in self._format_rpt_m and fmt in self._format_rpt_lazy_m:
+            self._load_lazy(fmt, self._format_rpt_m, self._format_rpt_lazy_m)
         return self._format_rpt_m[fmt]
     
     def getDefaultDatabase(self):
@@ -116,43 +180,10 @@ class FormatRgy(object):
         return None
     
     def _init_rgy(self):
-#        self.addDatabaseFormat(FormatDescDb(
-#            fmt_if, name, flags, description))
-        DbFormatIfXml.register(self)
-        DbFormatIfLib.register(self)
-        DbFormatIfYaml.register(self)
-        
-        # Register SQLite format
-        from ucis.sqlite.db_format_if_sqlite import DbFormatIfSqlite
-        DbFormatIfSqlite.register(self)
-        
-        # Register Verilator format
-        from ucis.vltcov.db_format_if_vltcov import DbFormatIfVltCov
-        DbFormatIfVltCov.register(self)
-        
-        # Register cocotb-coverage formats
-        from ucis.cocotb.db_format_if_cocotb import DbFormatIfCocotbXml, DbFormatIfCocotbYaml
-        DbFormatIfCocotbXml.register(self)
-        DbFormatIfCocotbYaml.register(self)
-        
-        # Register AVL format
-        from ucis.avl.db_format_if_avl import DbFormatIfAvlJson
-        DbFormatIfAvlJson.register(self)
-
-        # Register LCOV format
-        from ucis.formatters.db_format_if_lcov import DbFormatIfLcov
-        DbFormatIfLcov.register(self)
-
-        # Register NCDB format
-        from ucis.ncdb.db_format_if_ncdb import DbFormatIfNcdb
-        DbFormatIfNcdb.register(self)
-        
-        FormatRptJson.register(self)
-        FormatRptText.register(self)
-        
-        # Register HTML format
-        from ucis.report.format_rpt_html import FormatRptHtml
-        FormatRptHtml.register(self)
+        for name, provider in _DB_FORMAT_PROVIDERS.items():
+            self.addDatabaseFormatProvider(name, provider)
+        for name, provider in _RPT_FORMAT_PROVIDERS.items():
+            self.addReportFormatProvider(name, provider)
     
     @classmethod
     def inst(cls):
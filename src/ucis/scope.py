@@ -78,6 +78,8 @@ class Scope(Obj):
         UCIS LRM Section 8.5 "Scope Functions"
     """
     
+    __slots__ = ()
+    
     def __init__(self):
         self.setGoal(100)
 
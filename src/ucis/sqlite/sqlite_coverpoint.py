@@ -176,3 +176,25 @@ class SqliteCoverpoint(SqliteScope, Coverpoint):
         index = self.createNextCover(name, coverdata, srcinfo)
         
         return index
+
+    def createBins(self, bins, srcinfo: SourceInfo = None, at_least: int = 1,
+                   kind: CoverTypeT = CoverTypeT.CVGBIN):
+        """Create bins with one INSERT statement for the whole batch"""
+        if srcinfo is not None and srcinfo.file:
+            return super().createBins(bins, srcinfo, at_least, kind)
+
+        cursor = self.ucis_db.conn.execute(
+            "SELECT MAX(cover_index) FROM coveritems WHERE scope_id = ?",
+            (self.scope_id,)
+        )
+        row = cursor.fetchone()
+        next_index = (row[0] + 1) if (row[0] is not None) else 0
+
+        # Same row values as createBin(): the at_least column holds the goal
+        self.ucis_db.conn.executemany(
+            """INSERT INTO coveritems (scope_id, cover_index, cover_type, cover_name,
+                                       cover_data, at_least, source_file_id, source_line, source_token)
+               VALUES (?, ?, ?, ?, ?, 1, NULL, -1, -1)""",
+            [(self.scope_id, next_index + i, kind, name, count)
+             for i, (name, count) in enumerate(bins)]
+        )
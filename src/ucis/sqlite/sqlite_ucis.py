@@ -52,9 +52,11 @@ class SqliteUCIS(SqliteScope, UCIS):
         Args:
             db_path: Path to database file. If None, creates in-memory database.
         """
-        # Open or create database
+        # Open or create database. The connection may be used from a thread
+        # other than the one that opened it (e.g. the MCP server's worker
+        # pool); callers are responsible for serializing access.
         self.db_path = db_path if db_path else ":memory:"
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
         
         # Check if schema exists
@@ -66,7 +68,7 @@ class SqliteUCIS(SqliteScope, UCIS):
             if self.db_path != ":memory:" and os.path.exists(template):
                 self.conn.close()
                 shutil.copy2(template, self.db_path)
-                self.conn = sqlite3.connect(self.db_path)
+                self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
                 self.conn.row_factory = sqlite3.Row
             else:
                 schema_manager.create_schema(self.conn)
@@ -136,7 +138,7 @@ class SqliteUCIS(SqliteScope, UCIS):
 
         obj.db_path = db_path
         obj.conn = sqlite3.connect(
-            f"file:{db_path}?mode=ro", uri=True
+            f"file:{db_path}?mode=ro", uri=True, check_same_thread=False
         )
         obj.conn.row_factory = sqlite3.Row
 
@@ -170,7 +172,7 @@ class SqliteUCIS(SqliteScope, UCIS):
     def clone(self) -> 'SqliteUCIS':
         """Return a new SqliteUCIS that is an independent copy of this database."""
         self.conn.commit()  # ensure all changes are committed before backup
-        new_conn = sqlite3.connect(":memory:")
+        new_conn = sqlite3.connect(":memory:", check_same_thread=False)
         new_conn.row_factory = sqlite3.Row
         self.conn.backup(new_conn)
 
@@ -13,11 +13,13 @@ import os
 from ucis.tui.models.coverage_model import CoverageModel
 from ucis.tui.views.base_view import BaseView
 from ucis.tui.views.dashboard_view import DashboardView
+from ucis.tui.views.loading_view import LoadingView
 from ucis.tui.components.status_bar import StatusBar
 from ucis.tui.components.help_overlay import HelpOverlay
 from ucis.tui.keybindings import KeyHandler
 from ucis.tui.key_parser import KeyParser
 from ucis.tui.controller import TUIController
+from ucis.tui.loader import BackgroundLoader
 
 _file = None
 
@@ -28,38 +30,43 @@ class TUIApp:
     Manages views, handles navigation, processes keyboard input.
     """
     
-    def __init__(self, db_path: str, input_format: Optional[str] = None):
+    _VIEW_TITLES = [
+        ("dashboard", "Coverage Dashboard"),
+        ("hierarchy", "Design Hierarchy"),
+        ("gaps", "Coverage Gaps"),
+        ("hotspots", "Coverage Hotspots"),
+        ("metrics", "Coverage Metrics"),
+        ("code_coverage", "Code Coverage"),
+        ("test_history", "Test History"),
+        ("testplan", "Testplan Closure"),
+    ]
+    
+    def __init__(self, db_path: str, input_format: Optional[str] = None,
+                 use_cache: bool = True):
         """
         Initialize the TUI application.
         
         Args:
             db_path: Path to the UCIS database file
             input_format: Optional database format (auto-detect if None)
+            use_cache: Read and update the database's metrics cache sidecar
         """
         self.db_path = db_path
         self.input_format = input_format
+        self.use_cache = use_cache
         self.console = Console()
         self.coverage_model = None
         self.controller = None  # Will be initialized in run()
         self.status_bar = StatusBar()
         self.help_overlay = HelpOverlay()
         self.key_parser = None  # Initialized in run()
+        self.loader = None  # Initialized in start_loading()
         
     def run(self):
         """Main event loop."""
-        # Show loading message
-        with self.console.status("[bold green]Loading coverage database...") as status:
-            self.coverage_model = CoverageModel(self.db_path, self.input_format)
-            
-            # Create controller
-            self.controller = TUIController(self.coverage_model, on_quit=self._on_quit)
-            self.controller.running = True
-            
-            # Initialize views and register with controller
-            self._initialize_views()
-        
-        # Switch to dashboard view
-        self.controller.switch_view("dashboard")
+        # The dashboard comes up immediately; the database and each view's
+        # data are loaded in the background and swapped in as they arrive
+        self.start_loading()
         
         # Main render loop
         try:
@@ -67,25 +74,83 @@ class TUIApp:
                 self.live = live
                 
                 while self.controller.running:
-                    # Get keyboard input (this will set raw mode internally)
+                    # Get keyboard input (this will set raw mode internally).
+                    # Returns None after a short timeout, so loader progress
+                    # is picked up even when no key is pressed.
                     key = self._get_key_input()
+                    changed = self.poll_loader()
                     
                     if key:
                         # Let controller handle the key
                         self.controller.handle_key(key)
-                        
+                    
+                    if key or changed:
                         # Refresh display
                         live.update(self._render(), refresh=True)
         finally:
             self.console.clear()
+        
+        if self.coverage_model is None and self.loader.error is not None:
+            raise self.loader.error
+    
+    def start_loading(self):
+        """
+        Create the controller with placeholder views and start loading the
+        database and view data on a background thread.
+        """
+        self.controller = TUIController(self.coverage_model, on_quit=self._on_quit)
+        self.controller.running = True
+        
+        for name, title in self._VIEW_TITLES:
+            self.controller.register_view(name, LoadingView(self, title))
+        self.controller.switch_view("dashboard")
+        
+        self.loader = BackgroundLoader(self._load_model, self._view_factories())
+        self.loader.start()
+    
+    def _load_model(self) -> CoverageModel:
+        # Runs on the loader thread. The model is published here (not when
+        # its event is polled) because the view factories that follow
+        # reach it through ``self.coverage_model``.
+        self.coverage_model = CoverageModel(self.db_path, self.input_format,
+                                            use_cache=self.use_cache)
+        return self.coverage_model
+    
+    def poll_loader(self) -> bool:
+        """
+        Apply results from the background loader.
+        
+        Returns:
+            True if the display needs refreshing
+        """
+        if self.loader is None:
+            return False
+        
+        for kind, value in self.loader.poll():
+            if kind == "model":
+                self.controller.coverage_model = value
+            elif kind == "view":
+                name, view = value
+                self.controller.replace_view(name, view)
+            elif kind == "error":
+                self.controller.set_status(f"Error loading database: {value}", "error")
+            elif kind == "done":
+                if self.loader.error is None:
+                    self.controller.set_status("Database loaded", "success")
+                    # Views have computed their metrics; persist them
+                    self.coverage_model.save_cache()
+                return True
+        
+        # Keep the progress display moving while loading
+        return self.loader.running
     
     def _on_quit(self):
         """Callback when controller quits."""
-        # Can add cleanup here if needed
-        pass
+        if self.coverage_model is not None:
+            self.coverage_model.save_cache()
     
-    def _initialize_views(self):
-        """Initialize all available views."""
+    def _view_factories(self):
+        """``(name, factory)`` pairs for every view, in load order."""
         from ucis.tui.views.hierarchy_view import HierarchyView
         from ucis.tui.views.gaps_view import GapsView
         from ucis.tui.views.hotspots_view import HotspotsView
@@ -94,20 +159,24 @@ class TUIApp:
         from ucis.tui.views.test_history_view import TestHistoryView
         from ucis.tui.views.testplan_view import TestplanView
         
-        # Create views and register with controller
-        views = {
-            "dashboard": DashboardView(self),
-            "hierarchy": HierarchyView(self),
-            "gaps": GapsView(self),
-            "hotspots": HotspotsView(self),
-            "metrics": MetricsView(self),
-            "code_coverage": CodeCoverageView(self),
-            "test_history": TestHistoryView(self),
-            "testplan": TestplanView(self),
+        classes = {
+            "dashboard": DashboardView,
+            "hierarchy": HierarchyView,
+            "gaps": GapsView,
+            "hotspots": HotspotsView,
+            "metrics": MetricsView,
+            "code_coverage": CodeCoverageView,
+            "test_history": TestHistoryView,
+            "testplan": TestplanView,
         }
-        
-        for name, view in views.items():
-            self.controller.register_view(name, view)
+        return [(name, (lambda cls=classes[name]: cls(self)))
+                for name, _ in self._VIEW_TITLES]
+    
+    def _initialize_views(self):
+        """Initialize all available views."""
+        # Create views and register with controller
+        for name, factory in self._view_factories():
+            self.controller.register_view(name, factory())
     
     def _render(self) -> Layout:
         """
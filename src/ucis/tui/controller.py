@@ -54,6 +54,21 @@ class TUIController:
         """Register a view with the controller."""
         self.views[name] = view
     
+    def replace_view(self, name: str, view):
+        """
+        Replace a registered view (e.g. a loading placeholder) in place.
+        
+        If *name* is the current view, the old instance is exited and the
+        new one entered, so the display switches over without navigation.
+        """
+        old = self.views.get(name)
+        self.views[name] = view
+        if self.current_view_name == name:
+            if old is not None and hasattr(old, 'on_exit'):
+                old.on_exit()
+            if hasattr(view, 'on_enter'):
+                view.on_enter()
+    
     def switch_view(self, view_name: str) -> bool:
         """
         Switch to a different view.
@@ -196,7 +211,7 @@ class TUIController:
         
         # Clear test filter
         if key in ('c', 'C'):
-            if self.coverage_model.get_test_filter():
+            if self.coverage_model is not None and self.coverage_model.get_test_filter():
                 self.coverage_model.clear_test_filter()
                 self.set_status("Test filter cleared", "info")
                 return True
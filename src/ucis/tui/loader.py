@@ -0,0 +1,110 @@
+"""
+Background loader for the TUI.
+
+Reads the coverage database and builds each view on a worker thread so the
+UI can come up immediately. Like the controller, this class has no UI
+dependencies: the main loop calls :meth:`BackgroundLoader.poll` between key
+presses and applies the events it returns.
+"""
+import queue
+import threading
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+
+class BackgroundLoader:
+    """
+    Load the coverage model, then build views one at a time, off the UI thread.
+
+    Events returned by :meth:`poll`, in order:
+
+    - ``("model", model)`` once the database has been read
+    - ``("view", (name, view))`` as each view's data becomes available
+    - ``("error", exc)`` if loading fails (no further views follow)
+    - ``("done", None)`` last, whether or not loading succeeded
+    """
+
+    def __init__(self, load_model: Callable[[], Any],
+                 view_factories: Sequence[Tuple[str, Callable[[], Any]]]):
+        """
+        Initialize loader.
+
+        Args:
+            load_model: Reads the database and returns the coverage model
+            view_factories: ``(name, factory)`` pairs, in load order. Each
+                factory is called on the worker thread once the model exists.
+        """
+        self._load_model = load_model
+        self._view_factories = list(view_factories)
+        self._events = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        self.stage = "Starting"
+        self.completed = 0
+        self.total = 1 + len(self._view_factories)
+        self.error: Optional[BaseException] = None
+        self.finished = False
+
+    def start(self):
+        """Start loading on a daemon worker thread."""
+        self._thread = threading.Thread(
+            target=self._run, name="ucis-tui-loader", daemon=True)
+        self._thread.start()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait for loading to finish; returns True if it has."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return self.finished
+
+    @property
+    def running(self) -> bool:
+        """True while the worker is still loading."""
+        return self._thread is not None and not self.finished
+
+    @property
+    def fraction(self) -> float:
+        """Completed fraction of the load, 0.0 to 1.0."""
+        with self._lock:
+            return self.completed / self.total if self.total else 1.0
+
+    def poll(self) -> List[Tuple[str, Any]]:
+        """Return (without blocking) all events posted since the last poll."""
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def _advance(self, stage: Optional[str] = None):
+        with self._lock:
+            if stage is None:
+                self.completed += 1
+            else:
+                self.stage = stage
+
+    def _run(self):
+        try:
+            self._advance("Reading coverage database")
+            model = self._load_model()
+            self._advance()
+            self._events.put(("model", model))
+
+            for name, factory in self._view_factories:
+                self._advance(f"Preparing {name.replace('_', ' ')} view")
+                view = factory()
+                preload = getattr(view, 'preload', None)
+                if preload is not None:
+                    preload()
+                self._advance()
+                self._events.put(("view", (name, view)))
+            self._advance("Loaded")
+        except Exception as e:
+            self.error = e
+            self._advance(f"Failed: {e}")
+            self._events.put(("error", e))
+        finally:
+            self.finished = True
+            self._events.put(("done", None))
@@ -18,19 +18,28 @@ class CoverageModel:
     Delegates all metric computation to :class:`~ucis.report.coverage_metrics.CoverageMetrics`.
     """
     
-    def __init__(self, db_path: str, input_format: Optional[str] = None):
+    def __init__(self, db_path: str, input_format: Optional[str] = None,
+                 use_cache: bool = False):
         """
         Initialize coverage model.
         
         Args:
             db_path: Path to the UCIS database
             input_format: Database format (default: auto-detect)
+            use_cache: Persist computed metrics to the database's sidecar
+                cache file and reuse them in later sessions
         """
         self.db_path = db_path
         self.db = None
         self._cache: Dict[str, Any] = {}
         self.test_filter: Optional[str] = None  # Current test filter
         self._metrics = None
+        self._store = None
+        if use_cache:
+            from ucis.report.metrics_cache import MetricsCache
+            store = MetricsCache(db_path)
+            if store.enabled:
+                self._store = store
         self._load_database(input_format)
     
     def _load_database(self, input_format: Optional[str] = None):
@@ -61,9 +70,14 @@ class CoverageModel:
         """
         if self._metrics is None and self.db is not None:
             from ucis.report.coverage_metrics import CoverageMetrics
-            self._metrics = CoverageMetrics(self.db)
+            self._metrics = CoverageMetrics(self.db, cache=self._store)
         return self._metrics
     
+    def save_cache(self):
+        """Write newly computed metrics to the sidecar cache, if enabled."""
+        if self._store is not None:
+            self._store.save()
+    
     def get_summary(self) -> Dict[str, Any]:
         """
         Get overall coverage summary.
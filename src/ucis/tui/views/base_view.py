@@ -45,6 +45,15 @@ class BaseView(ABC):
         """
         return False
     
+    def preload(self):
+        """
+        Compute data the view needs before it is first shown.
+        
+        Called on the background loader thread after construction; views
+        that otherwise load lazily in :meth:`on_enter` override this.
+        """
+        pass
+    
     def on_enter(self):
         """Called when view becomes active."""
         self.focused = True
@@ -16,6 +16,13 @@ class DashboardView(BaseView):
     Dashboard view showing high-level coverage overview.
     """
     
+    def preload(self):
+        """Compute (and cache) everything the dashboard displays."""
+        self.model.get_database_info()
+        self.model.get_summary()
+        for cov_type in self.model.get_coverage_types():
+            self.model.get_coverage_by_type(cov_type)
+    
     def render(self):
         """Render the dashboard."""
         layout = Layout()
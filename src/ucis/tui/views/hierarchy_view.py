@@ -1,7 +1,7 @@
 """
 Hierarchy View - Navigate design structure and coverage hierarchy.
 """
-from typing import List
+from typing import Callable, List, Optional
 from rich.layout import Layout
 from rich.panel import Panel
 from rich.table import Table
@@ -11,19 +11,81 @@ from ucis.tui.views.base_view import BaseView
 
 
 class HierarchyNode:
-    """Represents a node in the coverage hierarchy."""
+    """
+    Represents a node in the coverage hierarchy.
+
+    Children are created on first access (normally when the node is
+    expanded) by the view's child loader, so only the parts of the design
+    the user has opened exist as node objects. Coverage counts may likewise
+    be left to a counter that the view calls when they are first read, and
+    ``child_count`` may only be 0 or 1 until the children are loaded.
+    """
+
+    __slots__ = ('scope_id', 'scope', 'parent', '_children', '_loader',
+                 'child_count', 'expanded', 'name', 'scope_type', 'depth',
+                 '_total', '_covered', '_counter')
 
     def __init__(self, scope_id: int, name: str, scope_type: int, scope=None, parent=None):
         self.scope_id = scope_id
         self.scope = scope
         self.parent = parent
-        self.children: List["HierarchyNode"] = []
+        self._children: Optional[List["HierarchyNode"]] = None
+        self._loader: Optional[Callable[["HierarchyNode"], List["HierarchyNode"]]] = None
+        self.child_count = 0
         self.expanded = False
         self.name = name if name else "root"
         self.scope_type = scope_type
         self.depth = 0
-        self.total = 0
-        self.covered = 0
+        self._total = 0
+        self._covered = 0
+        self._counter: Optional[Callable[["HierarchyNode"], tuple]] = None
+
+    @property
+    def children(self) -> List["HierarchyNode"]:
+        """Child nodes, fetched from the view's index on first access."""
+        if self._children is None:
+            if self._loader is not None and self.child_count:
+                self.children = self._loader(self)
+            else:
+                self._children = []
+        return self._children
+
+    @children.setter
+    def children(self, value: List["HierarchyNode"]):
+        self._children = value
+        self.child_count = len(value)
+
+    def _count(self):
+        if self._counter is not None:
+            counter, self._counter = self._counter, None
+            self._total, self._covered = counter(self)
+
+    @property
+    def total(self) -> int:
+        """Coverage items in this node's subtree."""
+        self._count()
+        return self._total
+
+    @total.setter
+    def total(self, value: int):
+        self._total = value
+        self._counter = None
+
+    @property
+    def covered(self) -> int:
+        """Covered items in this node's subtree."""
+        self._count()
+        return self._covered
+
+    @covered.setter
+    def covered(self, value: int):
+        self._covered = value
+        self._counter = None
+
+    @property
+    def has_children(self) -> bool:
+        """True if the node has children (without fetching them)."""
+        return self.child_count > 0
 
     def get_coverage(self):
         """Get precomputed coverage for this node."""
@@ -40,8 +102,15 @@ class HierarchyView(BaseView):
     """
     Hierarchy view for navigating the design structure.
 
+    The tree is virtualised: scope names, types and rolled-up coverage are
+    indexed once (or, without SQL, as nodes are first shown), node objects
+    are only created as subtrees are expanded, and the visible rows are kept
+    as a flat list with the selection tracked by index. Navigation and rendering cost depends on the window height,
+    not on the size of the design.
+
     Keyboard shortcuts:
     - Up/Down: Navigate nodes
+    - PageUp/PageDown, Home/End: Navigate by page / to either end
     - Enter: Toggle expand/collapse
     - Left/Right: Collapse/expand node
     - E: Expand all nodes
@@ -51,46 +120,74 @@ class HierarchyView(BaseView):
 
     def __init__(self, app):
         super().__init__(app)
-        self.root_nodes = []
+        self.root_nodes: List[HierarchyNode] = []
         self.current_index = 0
         self.scroll_offset = 0
-        self.selected_node = None
-        self._all_nodes: List[HierarchyNode] = []
-        self._nodes_by_id = {}
         self.search_filter = ""
         self.search_mode = False
-        self._tree_version = 0
-        self._flat_cache = None
-        self._flat_cache_key = None
-        self._filter_visible_ids = None
+        # Visible rows in display order; the selection is an index into it
+        self._rows: List[HierarchyNode] = []
+        self._all_cache: Optional[List[HierarchyNode]] = None
+        self._filter_visible = None
         self._filter_cache_key = None
+        # SQL index: scope_id -> (scope_type, scope_name, total, covered)
+        # and parent scope_id -> child scope_ids
+        self._sql_scopes = {}
+        self._sql_children = {}
+        # API index: id(scope) -> (scope, child count, total, covered)
+        self._api_index = {}
         self._build_hierarchy()
 
     def _build_hierarchy(self):
-        """Build the hierarchy tree from the database."""
+        """Index the hierarchy and create the top-level nodes."""
         self.root_nodes = []
-        self._all_nodes = []
-        self._nodes_by_id = {}
+        self._all_cache = None
+        self._sql_scopes = {}
+        self._sql_children = {}
+        self._api_index = {}
         try:
             if getattr(self.model.db, "conn", None) is not None:
                 self._build_hierarchy_sql()
             else:
                 self._build_hierarchy_api()
-            if self.root_nodes:
-                self.selected_node = self.root_nodes[0]
         except Exception:
             pass
-        self._invalidate_flat_cache()
-
-    def _invalidate_flat_cache(self):
-        self._tree_version += 1
-        self._flat_cache = None
-        self._flat_cache_key = None
-        self._filter_visible_ids = None
-        self._filter_cache_key = None
+        self.current_index = 0
+        self.scroll_offset = 0
+        self._rebuild_rows()
+
+    # ------------------------------------------------------------------
+    # Hierarchy index
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _rollup(roots, children_of, own_counts):
+        """
+        Post-order rollup of coverage counts. A node with children reports
+        the sum of its children; a leaf reports its own counts.
+
+        Returns a dict of key -> (total, covered).
+        """
+        totals = {}
+        for root in roots:
+            stack = [(root, False)]
+            while stack:
+                key, visited = stack.pop()
+                children = children_of(key)
+                if visited:
+                    if children:
+                        totals[key] = (sum(totals[c][0] for c in children),
+                                       sum(totals[c][1] for c in children))
+                    else:
+                        totals[key] = own_counts(key)
+                else:
+                    stack.append((key, True))
+                    for child in children:
+                        stack.append((child, False))
+        return totals
 
     def _build_hierarchy_sql(self):
-        """Build hierarchy and coverage from SQL in one shot."""
+        """Index hierarchy and coverage from SQL in one shot."""
         from ucis.cover_type_t import CoverTypeT
         from ucis.scope_type_t import ScopeTypeT
 
@@ -133,112 +230,252 @@ class HierarchyView(BaseView):
             ).fetchall()
         }
 
-        parent_map = {}
+        cp_t = int(ScopeTypeT.COVERPOINT)
+        toggle_t = int(ScopeTypeT.TOGGLE)
+        types = {}
+        children = self._sql_children
+        known = {row[0] for row in scope_rows}
+        orphans = []
         for scope_id, parent_id, scope_type, scope_name in scope_rows:
-            node = HierarchyNode(scope_id=scope_id, name=scope_name, scope_type=scope_type)
-            self._nodes_by_id[scope_id] = node
-            self._all_nodes.append(node)
-            parent_map[scope_id] = parent_id
-            if scope_type == int(ScopeTypeT.COVERPOINT):
-                node.total, node.covered = cp_stats.get(scope_id, (0, 0))
-            elif scope_type == int(ScopeTypeT.TOGGLE):
-                node.total, node.covered = toggle_stats.get(scope_id, (0, 0))
-
-        for scope_id, parent_id in parent_map.items():
-            node = self._nodes_by_id[scope_id]
-            if parent_id in self._nodes_by_id:
-                parent = self._nodes_by_id[parent_id]
-                node.parent = parent
-                parent.children.append(node)
-
-        if root_scope_id in self._nodes_by_id:
-            self.root_nodes = list(self._nodes_by_id[root_scope_id].children)
-            for node in self.root_nodes:
-                node.parent = None
+            types[scope_id] = (scope_type, scope_name)
+            if parent_id in known:
+                children.setdefault(parent_id, []).append(scope_id)
+            else:
+                orphans.append(scope_id)
+
+        if root_scope_id is not None:
+            top_ids = list(children.get(root_scope_id, ()))
         else:
-            self.root_nodes = [n for n in self._all_nodes if n.parent is None]
+            top_ids = orphans
+
+        def own_counts(scope_id):
+            scope_type = types[scope_id][0]
+            if scope_type == cp_t:
+                return cp_stats.get(scope_id, (0, 0))
+            if scope_type == toggle_t:
+                return toggle_stats.get(scope_id, (0, 0))
+            return (0, 0)
+
+        totals = self._rollup(top_ids, lambda k: children.get(k, ()), own_counts)
+        self._sql_scopes = {
+            scope_id: types[scope_id] + totals[scope_id] for scope_id in totals
+        }
+        self.root_nodes = [self._make_sql_node(scope_id, None) for scope_id in top_ids]
+
+    def _make_sql_node(self, scope_id, parent):
+        scope_type, scope_name, total, covered = self._sql_scopes[scope_id]
+        node = HierarchyNode(scope_id=scope_id, name=scope_name,
+                             scope_type=scope_type, parent=parent)
+        node.depth = 0 if parent is None else parent.depth + 1
+        node.total, node.covered = total, covered
+        node.child_count = len(self._sql_children.get(scope_id, ()))
+        node._loader = self._load_sql_children
+        return node
+
+    def _load_sql_children(self, node):
+        return [self._make_sql_node(child_id, node)
+                for child_id in self._sql_children.get(node.scope_id, ())]
 
-        stack = [(n, 0) for n in self.root_nodes]
-        while stack:
-            node, depth = stack.pop()
-            node.depth = depth
-            for child in node.children:
-                stack.append((child, depth + 1))
+    def _build_hierarchy_api(self):
+        """
+        Create the top-level nodes using API traversal (fallback).
 
-        self._rollup_coverage_totals()
+        Nothing below the top level is enumerated here: a node's children
+        are listed when it is first expanded, and its coverage is rolled up
+        when first read.
+        """
+        from ucis.scope_type_t import ScopeTypeT
 
-    def _build_hierarchy_api(self):
-        """Build hierarchy using API traversal (fallback)."""
+        try:
+            tops = list(self.model.db.scopes(ScopeTypeT.ALL))
+        except Exception:
+            tops = []
+        self.root_nodes = [self._make_api_node(scope, None) for scope in tops]
+
+    @staticmethod
+    def _api_child_scopes(scope):
+        from ucis.scope_type_t import ScopeTypeT
+        try:
+            return list(scope.scopes(ScopeTypeT.ALL))
+        except Exception:
+            return []
+
+    @staticmethod
+    def _api_has_children(scope) -> int:
+        from ucis.scope_type_t import ScopeTypeT
+        try:
+            return int(next(iter(scope.scopes(ScopeTypeT.ALL)), None) is not None)
+        except Exception:
+            return 0
+
+    def _index_api_subtree(self, scope):
+        """
+        Roll up the coverage of *scope*'s subtree into ``_api_index``.
+
+        Every scope below *scope* is recorded, so nodes created later by
+        expanding it do not walk their subtrees again.
+        """
         from ucis.scope_type_t import ScopeTypeT
         from ucis.cover_type_t import CoverTypeT
 
-        def build_node(scope, parent=None):
-            node = HierarchyNode(
-                scope_id=getattr(scope, "scope_id", -1),
-                name=scope.getScopeName(),
-                scope_type=scope.getScopeType(),
-                scope=scope,
-                parent=parent
-            )
-            node.depth = 0 if parent is None else parent.depth + 1
-            self._all_nodes.append(node)
-            self._nodes_by_id[node.scope_id] = node
+        # Keyed by id(scope); the handles are held by the index, so the
+        # keys stay unique for the lifetime of the view
+        scopes = {id(scope): scope}
+        children = {}
+
+        def children_of(key):
+            if key not in children:
+                kids = self._api_child_scopes(scopes[key])
+                for kid in kids:
+                    scopes[id(kid)] = kid
+                children[key] = [id(kid) for kid in kids]
+            return children[key]
+
+        def count_items(scope, cover_type):
+            total = 0
+            covered = 0
             try:
-                for child_scope in scope.scopes(ScopeTypeT.ALL):
-                    child_node = build_node(child_scope, node)
-                    node.children.append(child_node)
+                for bin_idx in scope.coverItems(cover_type):
+                    total += 1
+                    cover_data = bin_idx.getCoverData()
+                    if cover_data and cover_data.data > 0:
+                        covered += 1
             except Exception:
                 pass
-            if node.scope_type == ScopeTypeT.COVERPOINT and node.scope is not None:
-                total = 0
-                covered = 0
-                try:
-                    for bin_idx in node.scope.coverItems(CoverTypeT.CVGBIN):
-                        total += 1
-                        cover_data = bin_idx.getCoverData()
-                        if cover_data and cover_data.data > 0:
-                            covered += 1
-                except Exception:
-                    pass
-                node.total = total
-                node.covered = covered
-            elif node.scope_type == ScopeTypeT.TOGGLE and node.scope is not None:
-                total = 0
-                covered = 0
-                try:
-                    for bin_idx in node.scope.coverItems(CoverTypeT.TOGGLEBIN):
-                        total += 1
-                        cover_data = bin_idx.getCoverData()
-                        if cover_data and cover_data.data > 0:
-                            covered += 1
-                except Exception:
-                    pass
-                node.total = total
-                node.covered = covered
-            return node
+            return total, covered
+
+        def own_counts(key):
+            scope = scopes[key]
+            scope_type = scope.getScopeType()
+            if scope_type == ScopeTypeT.COVERPOINT:
+                return count_items(scope, CoverTypeT.CVGBIN)
+            if scope_type == ScopeTypeT.TOGGLE:
+                return count_items(scope, CoverTypeT.TOGGLEBIN)
+            return (0, 0)
+
+        totals = self._rollup([id(scope)], children_of, own_counts)
+        for key, (total, covered) in totals.items():
+            self._api_index[key] = (scopes[key], len(children[key]), total, covered)
+
+    def _count_api_node(self, node):
+        entry = self._api_index.get(id(node.scope))
+        if entry is None or entry[0] is not node.scope:
+            self._index_api_subtree(node.scope)
+            entry = self._api_index[id(node.scope)]
+        return entry[2:]
+
+    def _make_api_node(self, scope, parent):
+        node = HierarchyNode(
+            scope_id=getattr(scope, "scope_id", -1),
+            name=scope.getScopeName(),
+            scope_type=scope.getScopeType(),
+            scope=scope,
+            parent=parent
+        )
+        node.depth = 0 if parent is None else parent.depth + 1
+        entry = self._api_index.get(id(scope))
+        if entry is not None and entry[0] is scope:
+            node.child_count, node.total, node.covered = entry[1:]
+        else:
+            # Only whether there are children is known until it is expanded
+            node.child_count = self._api_has_children(scope)
+            node._counter = self._count_api_node
+        node._loader = self._load_api_children
+        return node
+
+    def _load_api_children(self, node):
+        return [self._make_api_node(child, node)
+                for child in self._api_child_scopes(node.scope)]
+
+    @property
+    def _all_nodes(self) -> List[HierarchyNode]:
+        """
+        Every node in the tree, in pre-order.
+
+        This materialises the whole tree, so it is only used by operations
+        that are inherently O(design size): expand-all and search.
+        """
+        if self._all_cache is None:
+            result = []
+            stack = list(reversed(self.root_nodes))
+            while stack:
+                node = stack.pop()
+                result.append(node)
+                stack.extend(reversed(node.children))
+            self._all_cache = result
+        return self._all_cache
+
+    # ------------------------------------------------------------------
+    # Visible rows
+    # ------------------------------------------------------------------
+
+    @property
+    def selected_node(self) -> Optional[HierarchyNode]:
+        """Node at the selection index, or None if nothing is visible."""
+        if 0 <= self.current_index < len(self._rows):
+            return self._rows[self.current_index]
+        return None
+
+    @selected_node.setter
+    def selected_node(self, node: Optional[HierarchyNode]):
+        for idx, row in enumerate(self._rows):
+            if row is node:
+                self.current_index = idx
+                return
 
-        try:
-            for scope in self.model.db.scopes(ScopeTypeT.ALL):
-                self.root_nodes.append(build_node(scope))
-        except Exception:
-            pass
+    def _is_visible(self, node) -> bool:
+        return self._filter_visible is None or id(node) in self._filter_visible
 
-        self._rollup_coverage_totals()
+    def _visible_descendants(self, node) -> List[HierarchyNode]:
+        """Rows shown beneath *node* when it is expanded."""
+        result = []
+        stack = [c for c in reversed(node.children) if self._is_visible(c)]
+        while stack:
+            child = stack.pop()
+            result.append(child)
+            if child.expanded and child.has_children:
+                stack.extend(c for c in reversed(child.children) if self._is_visible(c))
+        return result
 
-    def _rollup_coverage_totals(self):
-        """Roll up precomputed coverage from leaves to roots once."""
+    def _rebuild_rows(self):
+        """Recompute all visible rows, keeping the selected node if still shown."""
+        selected = self.selected_node
+        self._build_filter_visible_set()
+        rows = []
         for root in self.root_nodes:
-            stack = [(root, False)]
-            while stack:
-                node, visited = stack.pop()
-                if visited:
-                    if node.children:
-                        node.total = sum(c.total for c in node.children)
-                        node.covered = sum(c.covered for c in node.children)
-                else:
-                    stack.append((node, True))
-                    for child in node.children:
-                        stack.append((child, False))
+            if not self._is_visible(root):
+                continue
+            rows.append(root)
+            if root.expanded and root.has_children:
+                rows.extend(self._visible_descendants(root))
+        self._rows = rows
+        self.current_index = 0
+        if selected is not None:
+            self.selected_node = selected
+
+    def _expand(self, idx: int):
+        """Expand the row at *idx*, splicing its visible subtree in after it."""
+        node = self._rows[idx]
+        if node.expanded:
+            return
+        node.expanded = True
+        if node.has_children:
+            self._rows[idx + 1:idx + 1] = self._visible_descendants(node)
+
+    def _collapse(self, idx: int):
+        """Collapse the row at *idx*, removing the rows beneath it."""
+        node = self._rows[idx]
+        if not node.expanded:
+            return
+        node.expanded = False
+        end = idx + 1
+        while end < len(self._rows) and self._rows[end].depth > node.depth:
+            end += 1
+        del self._rows[idx + 1:end]
+        if self.current_index >= end:
+            self.current_index -= end - idx - 1
+        elif self.current_index > idx:
+            self.current_index = idx
 
     def render(self):
         """Render the hierarchy view."""
@@ -269,41 +506,39 @@ class HierarchyView(BaseView):
 
         return layout
 
-    def _render_tree(self):
-        """Render the coverage hierarchy tree with scrolling support."""
-        flat_list = self._flatten_tree()
-
-        if not flat_list:
-            return Text("No items to display", style="dim italic")
-
+    def _visible_rows(self) -> int:
         terminal_height = self.app.console.height if hasattr(self.app, "console") else 40
         overhead = 12
-        available_height = max(10, terminal_height - overhead)
-        visible_rows = available_height
+        return max(10, terminal_height - overhead)
 
-        if self.selected_node in flat_list:
-            selected_idx = flat_list.index(self.selected_node)
-            if selected_idx < self.scroll_offset:
-                self.scroll_offset = selected_idx
-            elif selected_idx >= self.scroll_offset + visible_rows:
-                self.scroll_offset = selected_idx - visible_rows + 1
+    def _render_tree(self):
+        """Render the rows of the tree that fall within the window."""
+        total_rows = len(self._rows)
+        if not total_rows:
+            return Text("No items to display", style="dim italic")
+
+        visible_rows = self._visible_rows()
+        selected_idx = self.current_index
+        if selected_idx < self.scroll_offset:
+            self.scroll_offset = selected_idx
+        elif selected_idx >= self.scroll_offset + visible_rows:
+            self.scroll_offset = selected_idx - visible_rows + 1
 
-        self.scroll_offset = max(0, min(self.scroll_offset, max(0, len(flat_list) - visible_rows)))
+        self.scroll_offset = max(0, min(self.scroll_offset, max(0, total_rows - visible_rows)))
 
         lines = []
         start_idx = self.scroll_offset
-        end_idx = min(start_idx + visible_rows, len(flat_list))
+        end_idx = min(start_idx + visible_rows, total_rows)
 
         for idx in range(start_idx, end_idx):
-            node = flat_list[idx]
-            lines.append(self._format_tree_line(node, is_selected=(node == self.selected_node)))
+            lines.append(self._format_tree_line(self._rows[idx], is_selected=(idx == selected_idx)))
 
         if self.scroll_offset > 0:
             lines.insert(0, Text("▲ More items above...", style="dim italic"))
-        if end_idx < len(flat_list):
+        if end_idx < total_rows:
             lines.append(Text("▼ More items below...", style="dim italic"))
-        if len(flat_list) > visible_rows:
-            lines.append(Text(f"\n[Showing {start_idx+1}-{end_idx} of {len(flat_list)} items]", style="dim italic"))
+        if total_rows > visible_rows:
+            lines.append(Text(f"\n[Showing {start_idx+1}-{end_idx} of {total_rows} items]", style="dim italic"))
 
         result = Text()
         for line in lines:
@@ -346,7 +581,7 @@ class HierarchyView(BaseView):
         coverage_style = f"{color} on blue" if is_selected else color
         line.append(f"({coverage_pct:.1f}%)", style=coverage_style)
 
-        if node.children:
+        if node.has_children:
             line.append(" [-]" if node.expanded else " [+]", style="dim on blue" if is_selected else "dim")
         return line
 
@@ -469,47 +704,47 @@ class HierarchyView(BaseView):
     def _build_filter_visible_set(self):
         """Compute nodes to keep visible for current search text."""
         if not self.search_filter:
-            self._filter_visible_ids = None
+            self._filter_visible = None
             self._filter_cache_key = ""
             return
 
         key = self.search_filter.lower()
-        if self._filter_cache_key == key and self._filter_visible_ids is not None:
+        if self._filter_cache_key == key and self._filter_visible is not None:
             return
 
-        matched = {}
-        for root in self.root_nodes:
-            stack = [(root, False)]
-            while stack:
-                node, visited = stack.pop()
-                if visited:
-                    self_match = key in node.name.lower()
-                    child_match = any(matched.get(ch.scope_id, False) for ch in node.children)
-                    matched[node.scope_id] = self_match or child_match
-                else:
-                    stack.append((node, True))
-                    for child in node.children:
-                        stack.append((child, False))
-        self._filter_visible_ids = {scope_id for scope_id, ok in matched.items() if ok}
+        # Pre-order list reversed: every child is decided before its parent
+        visible = set()
+        for node in reversed(self._all_nodes):
+            if key in node.name.lower() or any(id(ch) in visible for ch in node.children):
+                visible.add(id(node))
+        self._filter_visible = visible
         self._filter_cache_key = key
 
     def _expand_all(self):
         """Expand all nodes in the tree."""
-        stack = list(self.root_nodes)
-        while stack:
-            node = stack.pop()
+        for node in self._all_nodes:
             node.expanded = True
-            stack.extend(node.children)
-        self._invalidate_flat_cache()
+        self._rebuild_rows()
 
     def _collapse_all(self):
-        """Collapse all nodes in the tree."""
+        """Collapse all (materialised) nodes in the tree."""
+        selected = self.selected_node
         stack = list(self.root_nodes)
         while stack:
             node = stack.pop()
             node.expanded = False
-            stack.extend(node.children)
-        self._invalidate_flat_cache()
+            if node._children:
+                stack.extend(node._children)
+        self._rebuild_rows()
+        # Keep the selection on the top-level ancestor of the old selection
+        while selected is not None and selected.parent is not None:
+            selected = selected.parent
+        if selected is not None:
+            self.selected_node = selected
+
+    def _set_search(self, text: str):
+        self.search_filter = text
+        self._rebuild_rows()
 
     def handle_key(self, key: str) -> bool:
         """Handle hierarchy-specific keys."""
@@ -518,19 +753,16 @@ class HierarchyView(BaseView):
                 self.search_mode = False
                 return True
             if key == "backspace":
-                self.search_filter = self.search_filter[:-1]
-                self._invalidate_flat_cache()
+                self._set_search(self.search_filter[:-1])
                 return True
             if len(key) == 1 and key.isprintable():
-                self.search_filter += key
-                self._invalidate_flat_cache()
+                self._set_search(self.search_filter + key)
                 return True
             return True
 
         if key == "/":
             self.search_mode = True
-            self.search_filter = ""
-            self._invalidate_flat_cache()
+            self._set_search("")
             return True
         if key == "e" or key == "E":
             self._expand_all()
@@ -544,53 +776,39 @@ class HierarchyView(BaseView):
         if key == "up":
             self._move_selection(-1)
             return True
+        if key == "pagedown":
+            self._move_selection(self._visible_rows())
+            return True
+        if key == "pageup":
+            self._move_selection(-self._visible_rows())
+            return True
+        if key == "home":
+            self._move_selection(-len(self._rows))
+            return True
+        if key == "end":
+            self._move_selection(len(self._rows))
+            return True
         if key == "right" and self.selected_node:
-            self.selected_node.expanded = True
-            self._invalidate_flat_cache()
+            self._expand(self.current_index)
             return True
         if key == "left" and self.selected_node:
-            self.selected_node.expanded = False
-            self._invalidate_flat_cache()
+            self._collapse(self.current_index)
             return True
         if key == "enter" and self.selected_node:
-            self.selected_node.expanded = not self.selected_node.expanded
-            self._invalidate_flat_cache()
+            if self.selected_node.expanded:
+                self._collapse(self.current_index)
+            else:
+                self._expand(self.current_index)
             return True
 
         return False
 
     def _move_selection(self, delta):
         """Move selection up or down."""
-        flat_list = self._flatten_tree()
-        if not flat_list:
+        if not self._rows:
             return
-        try:
-            current_idx = flat_list.index(self.selected_node)
-            new_idx = max(0, min(len(flat_list) - 1, current_idx + delta))
-            self.selected_node = flat_list[new_idx]
-        except ValueError:
-            self.selected_node = flat_list[0]
+        self.current_index = max(0, min(len(self._rows) - 1, self.current_index + delta))
 
     def _flatten_tree(self):
-        """Flatten the tree for navigation (only visible nodes)."""
-        key = (self._tree_version, self.search_filter)
-        if self._flat_cache_key == key and self._flat_cache is not None:
-            return self._flat_cache
-
-        self._build_filter_visible_set()
-        result = []
-
-        def flatten_node(node):
-            if self._filter_visible_ids is not None and node.scope_id not in self._filter_visible_ids:
-                return
-            result.append(node)
-            if node.children and node.expanded:
-                for child in node.children:
-                    flatten_node(child)
-
-        for root in self.root_nodes:
-            flatten_node(root)
-
-        self._flat_cache = result
-        self._flat_cache_key = key
-        return result
+        """Visible nodes in display order."""
+        return self._rows
@@ -0,0 +1,45 @@
+"""
+Loading View - Placeholder shown while a view's data is being loaded.
+"""
+from rich.align import Align
+from rich.panel import Panel
+from rich.text import Text
+
+from ucis.tui.views.base_view import BaseView
+
+
+class LoadingView(BaseView):
+    """
+    Stands in for a view until the background loader has built it.
+
+    Shows the loader's current stage and overall progress, or the error
+    if loading failed.
+    """
+
+    def __init__(self, app, title: str):
+        super().__init__(app)
+        self.title = title
+
+    def render(self):
+        """Render loading progress."""
+        loader = getattr(self.app, 'loader', None)
+        text = Text(justify="center")
+
+        if loader is not None and loader.error is not None:
+            text.append("Failed to load coverage database\n\n", style="bold red")
+            text.append(str(loader.error), style="red")
+        else:
+            text.append(f"Loading {self.title}...\n\n", style="bold cyan")
+            if loader is not None:
+                fraction = loader.fraction
+                bar_width = 30
+                filled = int(fraction * bar_width)
+                text.append("█" * filled + "░" * (bar_width - filled), style="cyan")
+                text.append(f" {fraction * 100:.0f}%\n", style="bold")
+                text.append(loader.stage, style="dim")
+
+        return Panel(
+            Align.center(text, vertical="middle"),
+            title=f"[bold]{self.title}[/bold]",
+            border_style="cyan",
+        )
@@ -23,16 +23,23 @@ class TestHistoryView(BaseView):
         self.sort_ascending = True
         self.tests = []
         self.visible_rows = 20  # Will be adjusted dynamically
+        self._loaded = False
     
     def on_enter(self):
         """Called when view becomes active."""
         super().on_enter()
+        if not self._loaded:
+            self._load_tests()
+    
+    def preload(self):
+        """Load test data ahead of the first visit."""
         self._load_tests()
     
     def _load_tests(self):
         """Load test data from the model."""
         self.tests = self.model.get_all_tests()
         self._apply_sort()
+        self._loaded = True
     
     def _apply_sort(self):
         """Sort tests based on current sort criteria."""
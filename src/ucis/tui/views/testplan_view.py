@@ -50,6 +50,9 @@ class TestplanView(BaseView):
         if not self._loaded:
             self._load_closure()
 
+    def preload(self):
+        self._load_closure()
+
     def _load_closure(self):
         """Load testplan closure results from the model."""
         self.results = []
@@ -9,15 +9,19 @@ from .yaml_reader import YamlReader
 from .yaml_writer import YamlWriter
 
 class DbFormatIfYaml(FormatIfDb):
+
+    def __init__(self):
+        self.options = {}
     
     def init(self, options):
-        raise NotImplementedError("DbFormatIf.init not implemented by %s" % str(type(self)))
+        """Options: ``validate`` — see :class:`YamlReader` (default True)."""
+        self.options = options or {}
     
     def create(self, filename=None) -> 'UCIS':
         return YamlUCIS()
     
     def read(self, filename) -> 'UCIS':
-        reader = YamlReader()
+        reader = YamlReader(validate=self.options.get("validate", True))
 
         with open(filename, "r") as fp:
             db = reader.load(fp)
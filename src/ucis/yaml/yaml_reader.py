@@ -3,8 +3,6 @@ Created on Nov 9, 2021
 
 @author: mballance
 '''
-import yaml
-
 from io import StringIO
 from ucis.cover_type_t import CoverTypeT
 from ucis.flags_t import FlagsT
@@ -16,28 +14,64 @@ from ucis.ucis import UCIS
 
 import os
 import json
-import python_jsonschema_objects as pjs
 import yaml
-from yaml.loader import Loader
 import jsonschema
 
 
+class _Loader(getattr(yaml, "CSafeLoader", yaml.SafeLoader)):
+    """Safe loader on LibYAML's C parser when PyYAML was built with it.
+
+    Tag resolution of plain scalars runs a regex per candidate type for
+    every scalar; coverage documents repeat the same few keys and counts,
+    so resolved tags are cached per (value, implicit) pair.
+    """
+
+    _scalar_tags = {}
+
+    def resolve(self, kind, value, implicit):
+        if kind is yaml.ScalarNode:
+            key = (value, implicit)
+            tag = self._scalar_tags.get(key)
+            if tag is None:
+                tag = super().resolve(kind, value, implicit)
+                if len(self._scalar_tags) < 65536:
+                    self._scalar_tags[key] = tag
+            return tag
+        return super().resolve(kind, value, implicit)
+
+
 class YamlReader(object):
+    """Reads PyUCIS YAML coverage data into a MemUCIS.
+
+    The document is parsed once (with LibYAML when available) and the
+    resulting dicts are turned into UCIS scopes directly.
+
+    Args:
+        validate: Schema validation of loaded documents.  ``True`` (the
+                  default) validates every document, ``False`` none, and
+                  an integer *N* validates one in every *N* documents read
+                  through this reader, starting with the first — enough to
+                  catch a misbehaving producer when reading thousands of
+                  files written by the same testbench.
+    """
     
-    def __init__(self):
+    def __init__(self, validate=True):
         self.active_scope_s = []
         self.cg_default_du_name = "du"
         self.cg_default_inst_name = "cg_inst"
         self.cg_default_du = None
-        self.cvg_ns = None
+        self.validate = validate
+        self._n_loaded = 0
         pass
     
     _coverage_ns = None
     _coverage_schema = None
+    _coverage_validator = None
     
     @classmethod
     def getCoverageNS(cls):
         if cls._coverage_ns is None:
+            import python_jsonschema_objects as pjs
             schema = cls.getCoverageSchema()
             builder = pjs.ObjectBuilder(schema)
             cls._coverage_ns = builder.build_classes()
@@ -52,6 +86,16 @@ class YamlReader(object):
             with open(os.path.join(schema_dir, "coverage.json"), "r") as fp:
                 cls._coverage_schema = json.load(fp)
         return cls._coverage_schema
+
+    @classmethod
+    def getCoverageValidator(cls):
+        """Validator for the coverage schema, checked and built once."""
+        if cls._coverage_validator is None:
+            schema = cls.getCoverageSchema()
+            validator_cls = jsonschema.validators.validator_for(schema)
+            validator_cls.check_schema(schema)
+            cls._coverage_validator = validator_cls(schema)
+        return cls._coverage_validator
             
     
     def loads(self, s) -> UCIS:
@@ -61,15 +105,13 @@ class YamlReader(object):
 
     def load(self, fp) -> UCIS:
         
-        self.cvg_ns = YamlReader.getCoverageNS()
-        schema = YamlReader.getCoverageSchema()
+        cov_yml = yaml.load(fp, Loader=_Loader)
 
-        cov_yml = yaml.load(fp, Loader=yaml.FullLoader)
-        
-        jsonschema.validate(instance=cov_yml, schema=schema)
-            
-        coverage = self.cvg_ns.CoverageData()
-        coverage = coverage.from_json(json.dumps(cov_yml))
+        every = int(self.validate)
+        n_loaded = self._n_loaded
+        self._n_loaded += 1
+        if every and n_loaded % every == 0:
+            YamlReader.getCoverageValidator().validate(cov_yml)
         
         self.db = MemUCIS()
 
@@ -96,10 +138,10 @@ class YamlReader(object):
             self.cg_default_du,
             FlagsT.INST_ONCE)
 
-        coverage = coverage.coverage
+        coverage = (cov_yml or {}).get("coverage") or {}
         
-        if coverage.covergroups is not None:
-            for cg_t in coverage.covergroups:
+        if coverage.get("covergroups") is not None:
+            for cg_t in coverage["covergroups"]:
                 self.process_covergroup(cg_t)
                 
         return self.db
@@ -110,118 +152,81 @@ class YamlReader(object):
         cg_location = None
             
         weight = 1
-        if cg_t.weight is not None:
-            weight = int(cg_t.weight)
+        if cg_t.get("weight") is not None:
+            weight = int(cg_t["weight"])
 
-        # Create type coverage from instance data
+        # Create type coverage from instance data.  Type coverpoints and
+        # crosses are dicts shaped like the YAML ones; '_bins' maps a bin
+        # name to its (first) entry in 'bins'.
         cp_t_l = []
         cp_t_m = {}
         cr_t_l = []
-        # Map of string to tuple of cross,binmap
         cr_t_m = {}
-        if cg_t.instances is not None:
-            for cg_i in cg_t.instances:
-                if cg_i.coverpoints is not None:
-                    for cp in cg_i.coverpoints:
-                        if str(cp.name) not in cp_t_m.keys():
-                            cp_t = self.cvg_ns.Coverpoint()
-                            cp_t.name = str(cp.name)
-                            cp_t_m[cp_t.name] = cp_t
+        instances = cg_t.get("instances")
+        if instances is not None:
+            for cg_i in instances:
+                if cg_i.get("coverpoints") is not None:
+                    for cp in cg_i["coverpoints"]:
+                        cp_name = str(cp["name"])
+                        cp_t = cp_t_m.get(cp_name)
+                        if cp_t is None:
+                            cp_t = {"name": cp_name, "bins": [], "_bins": {}}
+                            cp_t_m[cp_name] = cp_t
                             cp_t_l.append(cp_t)
-                        else:
-                            cp_t = cp_t_m[str(cp.name)]
-                            
+                        t_bins = cp_t["bins"]
+                        t_bins_m = cp_t["_bins"]
+
                         # Now, do bins...
-                        if cp.bins is not None:
-                            if cp_t.bins is None:
-                                cp_t.bins = []
-                            for b in cp.bins:
-                                # Find the 'type' version
-                                t_b = None
-                                for t_b_t in cp_t.bins:
-                                    if t_b_t.name == b.name:
-                                        t_b = t_b_t
-                                        break
-                                if t_b is None:
-                                    t_b = self.cvg_ns.CoverageBin()
-                                    t_b.name = str(b.name)
-                                    t_b.count = 0
-                                    cp_t.bins.append(t_b)
-                                t_b.count += b.count
-                                
-                        if cp.ignorebins is not None:
-                            if cp_t.ignorebins is None:
-                                cp_t.ignorebins = []
-                            for b in cp.ignorebins:
-                                # Find the 'type' version
-                                t_b = None
-                                for t_b_t in cp_t.ignorebins:
-                                    if t_b_t.name == b.name:
-                                        t_b = t_b_t
-                                        break
-                                if t_b is None:
-                                    t_b = self.cvg_ns.CoverageBin()
-                                    t_b.name = str(b.name)
-                                    t_b.count = 0
-                                    cp_t.bins.append(t_b)
-                                t_b.count += b.count
-                                
-                        if cp.illegalbins is not None:
-                            if cp_t.illegalbins is None:
-                                cp_t.illegalbins = []
-                            for b in cp.illegalbins:
-                                # Find the 'type' version
-                                t_b = None
-                                for t_b_t in cp_t.illegalbins:
-                                    if t_b_t.name == b.name:
-                                        t_b = t_b_t
-                                        break
-                                if t_b is None:
-                                    t_b = self.cvg_ns.CoverageBin()
-                                    t_b.name = str(b.name)
-                                    t_b.count = 0
-                                    cp_t.bins.append(t_b)
-                                t_b.count += b.count
+                        for b in cp.get("bins") or ():
+                            b_name = str(b["name"])
+                            t_b = t_bins_m.get(b_name)
+                            if t_b is None:
+                                t_b = t_bins_m[b_name] = {"name": b_name,
+                                                          "count": 0}
+                                t_bins.append(t_b)
+                            t_b["count"] += b["count"]
+
+                        # Type-level ignore and illegal bins are accumulated
+                        # into the regular bins, one entry per occurrence
+                        for kind in ("ignorebins", "illegalbins"):
+                            for b in cp.get(kind) or ():
+                                b_name = str(b["name"])
+                                t_b = {"name": b_name, "count": b["count"]}
+                                t_bins_m.setdefault(b_name, t_b)
+                                t_bins.append(t_b)
                         
-                if cg_i.crosses is not None:
-                    for cr in cg_i.crosses:
-                        if cr.coverpoints is None:
+                if cg_i.get("crosses") is not None:
+                    for cr in cg_i["crosses"]:
+                        cr_name = str(cr["name"])
+                        if cr.get("coverpoints") is None:
                             raise Exception("Cross %s in covergroup instance %s doesn't specify coverpoints" % (
-                                str(cr.name), str(cg_i.name)))
-                        if str(cr.name) not in cr_t_m.keys():
-                            cr_t = self.cvg_ns.Cross()
-                            cr_t.name = str(cr.name)
-                            cr_t.coverpoints = []
-                            for cr_cp in cr.coverpoints:
-                                cr_t.coverpoints.append(cr_cp)
-                            cr_t_bins_m = {}
-                            cr_t_m[str(cr.name)] = (cr_t, cr_t_bins_m)
+                                cr_name, str(cg_i["name"])))
+                        cr_t = cr_t_m.get(cr_name)
+                        if cr_t is None:
+                            cr_t = {"name": cr_name,
+                                    "coverpoints": list(cr["coverpoints"]),
+                                    "bins": [], "_bins": {}}
+                            cr_t_m[cr_name] = cr_t
                             cr_t_l.append(cr_t)
                             
-                            if cr.bins is not None:
-                                cr_t.bins = []
-                        else:
-                            cr_t = cr_t_m[str(cr.name)][0]
-                            cr_t_bins_m = cr_t_m[str(cr.name)][1]
-                            
                         # Now, proceed to aggregate bins
-                        if cr.bins is not None:
-                            for b in cr.bins:
-                                if b.name in cr_t_bins_m.keys():
-                                    cr_t_bins_m[str(b.name)].count += b.count
-                                else:
-                                    b_t = self.cvg_ns.CoverageBin()
-                                    b_t.name = str(b.name)
-                                    b_t.count = b.count
-                                    cr_t.bins.append(b_t)
-                                    cr_t_bins_m[str(b.name)] = b_t
+                        cr_t_bins_m = cr_t["_bins"]
+                        for b in cr.get("bins") or ():
+                            b_name = str(b["name"])
+                            b_t = cr_t_bins_m.get(b_name)
+                            if b_t is not None:
+                                b_t["count"] += b["count"]
+                            else:
+                                b_t = {"name": b_name, "count": b["count"]}
+                                cr_t["bins"].append(b_t)
+                                cr_t_bins_m[b_name] = b_t
                 
         else:
-            print("Warning: Covergroup type %s has no instances" % str(cg_t.name))
+            print("Warning: Covergroup type %s has no instances" % str(cg_t["name"]))
 
         # Now, convert to UCIS
         cg_t_scope = self.cg_default_inst.createCovergroup(
-            str(cg_t.name),
+            str(cg_t["name"]),
             cg_location,
             weight,
             SourceT.OTHER)
@@ -230,43 +235,43 @@ class YamlReader(object):
         
         # Create type coverpoints and crosses
         for cp in cp_t_l:
-            cp_n_scope_m[str(cp.name)] = self.record_coverpoint(cg_t_scope, cp)
+            cp_n_scope_m[cp["name"]] = self.record_coverpoint(cg_t_scope, cp)
             
         for cr in cr_t_l:
             cp_l = []
             
-            for cp in cr.coverpoints:
-                if cp in cp_n_scope_m.keys():
+            for cp in cr["coverpoints"]:
+                if cp in cp_n_scope_m:
                     cp_l.append(cp_n_scope_m[cp])
                 else:
                     raise Exception("Coverpoint %s referenced in cross %s is not defined" % (
-                        cp, str(cr.name)))
+                        cp, cr["name"]))
             
             self.record_cross(cg_t_scope, cp_l, cr)
 
         # Now, write out instances
         cp_n_scope_m = {}
-        for i in cg_t.instances:
+        for i in instances or ():
             cg_i_scope = cg_t_scope.createCoverInstance(
-                str(i.name),
+                str(i["name"]),
                 cg_location,
                 weight,
                 SourceT.OTHER)
 
-            if i.coverpoints is not None:            
-                for cp in i.coverpoints:
-                    cp_n_scope_m[str(cp.name)] = self.record_coverpoint(cg_i_scope, cp)
+            if i.get("coverpoints") is not None:
+                for cp in i["coverpoints"]:
+                    cp_n_scope_m[str(cp["name"])] = self.record_coverpoint(cg_i_scope, cp)
                     
-            if i.crosses is not None:
-                for cr in i.crosses:
+            if i.get("crosses") is not None:
+                for cr in i["crosses"]:
                     cp_l = []
             
-                    for cp in cr.coverpoints:
-                        if cp in cp_n_scope_m.keys():
+                    for cp in cr["coverpoints"]:
+                        if cp in cp_n_scope_m:
                             cp_l.append(cp_n_scope_m[cp])
                         else:
                             raise Exception("Coverpoint %s referenced in cross %s is not defined" % (
-                                cp, str(cr.name)))
+                                cp, str(cr["name"])))
                             
                     self.record_cross(cg_i_scope, cp_l, cr)
 
@@ -279,44 +284,26 @@ class YamlReader(object):
 #            weight = int(cp_s["weight"])
             
         at_least = 1
-        if cp.atleast is not None:
-            at_least = cp.atleast
+        if cp.get("atleast") is not None:
+            at_least = cp["atleast"]
             
         cp_scope = cp_parent_s.createCoverpoint(
-            str(cp.name),
+            str(cp["name"]),
             cp_location,
             weight,
             SourceT.OTHER)
 
-        if cp.bins is not None:        
-            for b in cp.bins:
-                cp_scope.createBin(
-                    str(b.name),
-                    cp_location,
-                    at_least,
-                    b.count,
-                    str(b.name),
-                    CoverTypeT.CVGBIN)
-                
-        if cp.ignorebins is not None:
-            for b in cp.ignorebins:
+        for key, cover_type in (("bins", CoverTypeT.CVGBIN),
+                                ("ignorebins", CoverTypeT.IGNOREBIN),
+                                ("illegalbins", CoverTypeT.ILLEGALBIN)):
+            for b in cp.get(key) or ():
                 cp_scope.createBin(
-                    str(b.name),
+                    str(b["name"]),
                     cp_location,
                     at_least,
-                    b.count,
-                    str(b.name),
-                    CoverTypeT.IGNOREBIN)
-                
-        if cp.illegalbins is not None:
-            for b in cp.illegalbins:
-                cp_scope.createBin(
-                    str(b.name),
-                    cp_location,
-                    at_least,
-                    b.count,
-                    str(b.name),
-                    CoverTypeT.ILLEGALBIN)
+                    b["count"],
+                    str(b["name"]),
+                    cover_type)
                 
         return cp_scope
                 
@@ -328,23 +315,22 @@ class YamlReader(object):
 #            weight = int(cp_s["weight"])
             
         at_least = 1
-        if cr.atleast is not None:
-            at_least = cr.atleast
+        if cr.get("atleast") is not None:
+            at_least = cr["atleast"]
             
         cr_scope = cp_parent_s.createCross(
-            str(cr.name),
+            str(cr["name"]),
             cr_location,
             weight,
             SourceT.OTHER,
             cp_l)
 
-        if cr.bins is not None:        
-            for b in cr.bins:
-                cr_scope.createBin(
-                    str(b.name),
-                    cr_location,
-                    at_least,
-                    b.count,
-                    str(b.name))
+        for b in cr.get("bins") or ():
+            cr_scope.createBin(
+                str(b["name"]),
+                cr_location,
+                at_least,
+                b["count"],
+                str(b["name"]))
                     
         return cr_scope
@@ -88,6 +88,73 @@ class TestDatabaseManager:
         assert len(self.db_manager._databases) == 0
 
 
+class TestDatabaseCache:
+    """Test the shared, reference-counted database cache."""
+    
+    FIXTURE = os.path.join(os.path.dirname(__file__),
+                           "conversion", "fixtures", "xml", "fsm_example.xml")
+    
+    def _copy(self, tmp_path, name):
+        import shutil
+        path = str(tmp_path / name)
+        shutil.copy(self.FIXTURE, path)
+        return path
+    
+    def test_same_path_shares_database(self, tmp_path):
+        """Opening a loaded path reuses the parsed database."""
+        mgr = DatabaseManager()
+        path = self._copy(tmp_path, "a.xml")
+        h1 = mgr.open_database(path, "xml")
+        h2 = mgr.open_database(path, "xml")
+        
+        assert h1.db_id != h2.db_id
+        assert h1.db_obj is h2.db_obj
+        assert h1.lock is h2.lock
+        assert mgr.cache_info()["entries"] == 1
+    
+    def test_mtime_change_loads_new_copy(self, tmp_path):
+        """A rewritten file is parsed again rather than served stale."""
+        mgr = DatabaseManager()
+        path = self._copy(tmp_path, "a.xml")
+        h1 = mgr.open_database(path, "xml")
+        mtime = os.path.getmtime(path)
+        os.utime(path, (mtime + 10, mtime + 10))
+        h2 = mgr.open_database(path, "xml")
+        
+        assert h1.db_obj is not h2.db_obj
+        
+        mgr.reload_database(h1.db_id)
+        assert h1.db_obj is h2.db_obj
+        assert mgr.cache_info()["referenced"] == 1
+    
+    def test_lru_eviction_skips_referenced(self, tmp_path):
+        """Only unreferenced databases are evicted, oldest first."""
+        mgr = DatabaseManager(max_entries=1)
+        pa = self._copy(tmp_path, "a.xml")
+        pb = self._copy(tmp_path, "b.xml")
+        
+        ha = mgr.open_database(pa, "xml")
+        hb = mgr.open_database(pb, "xml")
+        # Both referenced: budget is exceeded rather than evicting
+        assert mgr.cache_info()["entries"] == 2
+        
+        mgr.close_database(ha.db_id)
+        assert mgr.cache_info()["entries"] == 1
+        
+        # b stays resident after close and is reused on reopen
+        mgr.close_database(hb.db_id)
+        assert mgr.cache_info()["entries"] == 1
+        assert mgr.open_database(pb, "xml").db_obj is hb.db_obj
+    
+    def test_byte_budget(self, tmp_path):
+        """Unreferenced databases are evicted to meet the byte budget."""
+        mgr = DatabaseManager(max_entries=None, max_bytes=1)
+        h = mgr.open_database(self._copy(tmp_path, "a.xml"), "xml")
+        assert mgr.cache_info()["entries"] == 1
+        mgr.close_database(h.db_id)
+        assert mgr.cache_info()["entries"] == 0
+
+
 class TestDatabaseHandle:
     """Test DatabaseHandle class."""
     
@@ -154,3 +154,197 @@ class TestToolImplementations:
             assert "error" in result
         
         asyncio.run(_test())
+    
+    def test_diff_databases(self, tmp_path):
+        """Diff an open database against another, and report unknown IDs."""
+        import os
+        import shutil
+        src = os.path.join(os.path.dirname(__file__),
+                           "conversion", "fixtures", "xml", "fsm_example.xml")
+        paths = [str(tmp_path / "a.xml"), str(tmp_path / "b.xml")]
+        for path in paths:
+            shutil.copy(src, path)
+        
+        async def _test():
+            ids = [(await self.tools.open_database(p, "xml"))["database"]["id"]
+                   for p in paths]
+            result = await self.tools.diff_databases(ids[0], ids[1:])
+            assert result["success"] is True
+            assert result["diff"]["databases"] == paths[1:]
+            cmp = result["diff"]["comparisons"][0]
+            assert cmp["newly_hit_count"] == cmp["newly_lost_count"] == 0
+            assert cmp["bins"] == result["diff"]["aligned_bins"] > 0
+            
+            missing = await self.tools.diff_databases(ids[0], ["nonexistent"])
+            assert missing["success"] is False
+            assert "nonexistent" in missing["error"]
+        
+        asyncio.run(_test())
+    
+    def test_compare_databases_uses_open_database(self, tmp_path):
+        """The comparison database is the open one, not re-read from disk."""
+        import os
+        import shutil
+        src = os.path.join(os.path.dirname(__file__),
+                           "conversion", "fixtures", "xml", "fsm_example.xml")
+        paths = [str(tmp_path / "a.xml"), str(tmp_path / "b.xml")]
+        for path in paths:
+            shutil.copy(src, path)
+        
+        async def _test():
+            ids = [(await self.tools.open_database(p, "xml"))["database"]["id"]
+                   for p in paths]
+            os.unlink(paths[1])
+            result = await self.tools.compare_databases(ids[0], ids[1])
+            assert result["success"] is True, result
+            assert result["comparison"]["summary"]["delta"] == 0
+        
+        asyncio.run(_test())
+    
+    def test_reload_clears_cache_on_event_loop(self, tmp_path):
+        """Stale databases reload on the pool; the cache is cleared on the loop."""
+        import os
+        import shutil
+        import threading
+        src = os.path.join(os.path.dirname(__file__),
+                           "conversion", "fixtures", "xml", "fsm_example.xml")
+        path = str(tmp_path / "db.xml")
+        shutil.copy(src, path)
+        threads = []
+        clear_cache = self.tools.clear_cache
+        
+        def recording_clear(db_id=None):
+            threads.append(threading.current_thread())
+            clear_cache(db_id)
+        
+        async def _test():
+            db_id = (await self.tools.open_database(path, "xml"))["database"]["id"]
+            await self.tools.get_coverage_summary(db_id)
+            handle = self.db_manager.get_database(db_id)
+            mtime = handle.metadata["file_mtime"]
+            os.utime(path, (mtime + 10, mtime + 10))
+            self.tools.clear_cache = recording_clear
+            await self.tools.get_coverage_summary(db_id)
+        
+        asyncio.run(_test())
+        assert threads == [threading.main_thread()]
+    
+    def test_tool_body_runs_off_event_loop(self):
+        """Tool bodies run on the worker pool, not the event loop thread."""
+        import threading
+        handle = DatabaseHandle("db_1", None, "/path/to/db.xml", "xml")
+        self.db_manager._databases["db_1"] = handle
+        threads = []
+        
+        def body():
+            threads.append(threading.current_thread())
+            return {"success": True}
+        
+        async def _test():
+            return await self.tools._run("t", (handle,), (), body)
+        
+        assert asyncio.run(_test()) == {"success": True}
+        assert threads and threads[0] is not threading.main_thread()
+    
+    def test_results_memoised_until_file_changes(self, tmp_path):
+        """Repeated queries are served from cache; a rewritten file reloads."""
+        import os
+        import shutil
+        src = os.path.join(os.path.dirname(__file__),
+                           "conversion", "fixtures", "xml", "fsm_example.xml")
+        path = str(tmp_path / "db.xml")
+        shutil.copy(src, path)
+        
+        async def _test():
+            opened = await self.tools.open_database(path, "xml")
+            assert opened["success"] is True
+            db_id = opened["database"]["id"]
+            handle = self.db_manager.get_database(db_id)
+            
+            first = await self.tools.get_coverage_summary(db_id)
+            assert first["success"] is True
+            assert await self.tools.get_coverage_summary(db_id) is first
+            
+            old_db = handle.db_obj
+            mtime = handle.metadata["file_mtime"]
+            os.utime(path, (mtime + 10, mtime + 10))
+            third = await self.tools.get_coverage_summary(db_id)
+            assert third is not first
+            assert third == first
+            assert handle.db_obj is not old_db
+            
+            await self.tools.close_database(db_id)
+            assert not self.tools._cache
+        
+        asyncio.run(_test())
+    
+    def test_paginated_bins_hierarchy_and_code_coverage(self, tmp_path):
+        """Paged results concatenate to the full result; cursors are bound to their query."""
+        from ucis.mem.mem_factory import MemFactory
+        from ucis.xml.xml_factory import XmlFactory
+        from ucis import UCIS_OTHER, UCIS_DU_MODULE, UCIS_INSTANCE, UCIS_INST_ONCE
+        
+        db = MemFactory.create()
+        du = db.createScope("top", None, 1, UCIS_OTHER, UCIS_DU_MODULE, 0)
+        inst = db.createInstance("top", None, 1, UCIS_OTHER, UCIS_INSTANCE,
+                                 du, UCIS_INST_ONCE)
+        for g in range(3):
+            cg = inst.createCovergroup("cg%d" % g, None, 1, UCIS_OTHER)
+            cp = cg.createCoverpoint("cp", None, 1, UCIS_OTHER)
+            for b in range(4):
+                cp.createBin("b%d" % b, None, 1, b, "b%d" % b)
+        path = str(tmp_path / "db.xml")
+        XmlFactory.write(db, path)
+        
+        async def pages(fn, key, items, **kwargs):
+            result, cursor = [], None
+            while True:
+                r = await fn(cursor=cursor, **kwargs)
+                assert r["success"] is True, r
+                result.extend(r[key][items])
+                cursor = r[key]["next_cursor"]
+                if cursor is None:
+                    return result
+        
+        async def _test():
+            db_id = (await self.tools.open_database(path, "xml"))["database"]["id"]
+            
+            full = await self.tools.get_bins(db_id, sort_by="count")
+            assert full["bins"]["total_bins"] == 12
+            assert full["bins"]["next_cursor"] is None
+            paged = await pages(self.tools.get_bins, "bins", "bins",
+                                db_id=db_id, sort_by="count", limit=5)
+            assert paged == full["bins"]["bins"]
+            
+            first = await self.tools.get_bins(db_id, limit=5)
+            other = await self.tools.get_bins(
+                db_id, sort_by="name", cursor=first["bins"]["next_cursor"])
+            assert other["success"] is False
+            
+            scopes = await pages(self.tools.get_hierarchy, "hierarchy", "scopes",
+                                 db_id=db_id, limit=2)
+            assert scopes == (await self.tools.get_hierarchy(db_id))["hierarchy"]["scopes"]
+            assert [s["path"] for s in scopes[:2]] == ["top", "top/cg0"]
+            assert scopes[1]["depth"] == 1
+            
+            cgs = await pages(self.tools.get_code_coverage, "code_coverage",
+                              "covergroups", db_id=db_id, limit=2)
+            assert [cg["name"] for cg in cgs] == ["cg0", "cg1", "cg2"]
+            # The headline number covers every page, and is on the first one
+            overall = (await self.tools.get_code_coverage(db_id))[
+                "code_coverage"]["overall_coverage"]
+            first = (await self.tools.get_code_coverage(db_id, limit=2))[
+                "code_coverage"]
+            assert first["next_cursor"] is not None
+            assert first["overall_coverage"] == pytest.approx(overall)
+            
+            # The JSON size bound shortens pages but keeps making progress
+            self.tools.max_page_bytes = 1
+            self.tools.clear_cache()
+            tiny = await self.tools.get_bins(db_id)
+            assert len(tiny["bins"]["bins"]) == 1
+            assert tiny["bins"]["next_cursor"] is not None
+            
+            await self.tools.close_database(db_id)
+        
+        asyncio.run(_test())
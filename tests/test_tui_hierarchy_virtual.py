@@ -0,0 +1,216 @@
+"""
+Unit tests for the virtualised HierarchyView: lazy child creation,
+incremental expand/collapse of the visible rows and index-based selection.
+"""
+import sqlite3
+import pytest
+from unittest.mock import Mock
+
+from ucis.sqlite.schema_manager import create_schema
+from ucis.cover_type_t import CoverTypeT
+from ucis.scope_type_t import ScopeTypeT
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _make_tree_db(n_inst=20, n_cp=5):
+    """
+    root
+    └── top                   (INSTANCE)
+        └── u<i>              (INSTANCE)   i < n_inst
+            └── cg            (COVERGROUP)
+                └── cp<j>     (COVERPOINT) j < n_cp, one bin hit iff j is even
+    """
+    conn = sqlite3.connect(":memory:")
+    create_schema(conn)
+    inst_t = int(ScopeTypeT.INSTANCE)
+    cg_t = int(ScopeTypeT.COVERGROUP)
+    cp_t = int(ScopeTypeT.COVERPOINT)
+    bin_t = int(CoverTypeT.CVGBIN)
+
+    scopes = [(1, None, 0, "root"), (2, 1, inst_t, "top")]
+    items = []
+    next_id = 3
+    for i in range(n_inst):
+        inst_id, cg_id = next_id, next_id + 1
+        next_id += 2
+        scopes.append((inst_id, 2, inst_t, f"u{i}"))
+        scopes.append((cg_id, inst_id, cg_t, "cg"))
+        for j in range(n_cp):
+            scopes.append((next_id, cg_id, cp_t, f"cp{j}"))
+            items.append((len(items) + 1, next_id, bin_t, "b", 0, 1 if j % 2 == 0 else 0))
+            next_id += 1
+    conn.executemany(
+        "INSERT INTO scopes (scope_id, parent_id, scope_type, scope_name) VALUES (?,?,?,?)",
+        scopes)
+    conn.executemany(
+        "INSERT INTO coveritems (cover_id, scope_id, cover_type, cover_name, cover_index, cover_data)"
+        " VALUES (?,?,?,?,?,?)", items)
+    conn.commit()
+    return conn
+
+
+def _make_view(conn, height=40):
+    from ucis.tui.views.hierarchy_view import HierarchyView
+
+    mock_db = Mock()
+    mock_db.conn = conn
+    mock_model = Mock()
+    mock_model.db = mock_db
+    mock_app = Mock()
+    mock_app.console.height = height
+    mock_app.coverage_model = mock_model
+    return HierarchyView(mock_app)
+
+
+def _make_api_view(n_inst=3, n_cp=2):
+    """The same tree as _make_tree_db, held in memory and read through the API."""
+    from ucis import UCIS_OTHER, UCIS_DU_MODULE, UCIS_ENABLED_STMT, UCIS_INST_ONCE, UCIS_SCOPE_UNDER_DU
+    from ucis.cover_data import CoverData
+    from ucis.mem.mem_factory import MemFactory
+    from ucis.source_info import SourceInfo
+    from ucis.source_t import SourceT
+    from ucis.tui.views.hierarchy_view import HierarchyView
+
+    db = MemFactory.create()
+    fh = db.createFileHandle("top.sv", "/rtl")
+    src = SourceInfo(fh, 1, 0)
+    du = db.createScope("top", src, 1, UCIS_OTHER, UCIS_DU_MODULE,
+                        UCIS_ENABLED_STMT | UCIS_INST_ONCE | UCIS_SCOPE_UNDER_DU)
+    top = db.createInstance("top", src, 1, UCIS_OTHER, ScopeTypeT.INSTANCE,
+                            du, UCIS_INST_ONCE)
+    for i in range(n_inst):
+        inst = top.createInstance(f"u{i}", src, 1, UCIS_OTHER,
+                                  ScopeTypeT.INSTANCE, du, UCIS_INST_ONCE)
+        cg = inst.createCovergroup("cg", src, 1, SourceT.SV)
+        for j in range(n_cp):
+            cp = cg.createCoverpoint(f"cp{j}", src, 1, SourceT.SV)
+            cd = CoverData(CoverTypeT.CVGBIN, 0)
+            cd.data = 1 if j % 2 == 0 else 0
+            cp.createNextCover("b", cd, src)
+
+    mock_model = Mock()
+    mock_model.db = db
+    mock_app = Mock()
+    mock_app.console.height = 40
+    mock_app.coverage_model = mock_model
+    return HierarchyView(mock_app)
+
+
+def _names(view):
+    return [n.name for n in view._rows]
+
+
+def _reference_rows(view):
+    """Visible rows recomputed from scratch (what _rebuild_rows produces)."""
+    result = []
+
+    def visit(node):
+        result.append(node)
+        if node.expanded:
+            for child in node.children:
+                visit(child)
+    for root in view.root_nodes:
+        visit(root)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestVirtualHierarchy:
+
+    def test_children_created_on_demand(self):
+        view = _make_view(_make_tree_db())
+        (top,) = view.root_nodes
+        assert top._children is None
+        assert top.has_children and top.child_count == 20
+        assert _names(view) == ["top"]
+
+        view.handle_key("right")
+        assert len(view._rows) == 21
+        # Grandchildren are still not materialised
+        assert all(n._children is None for n in view._rows[1:])
+
+    def test_totals_rolled_up_without_materialising(self):
+        view = _make_view(_make_tree_db(n_inst=4, n_cp=5))
+        (top,) = view.root_nodes
+        assert (top.total, top.covered) == (20, 12)
+        assert top._children is None
+
+    def test_expand_collapse_matches_full_rebuild(self):
+        view = _make_view(_make_tree_db(n_inst=5, n_cp=3))
+        keys = ["right", "down", "down", "right", "down", "right",
+                "up", "up", "left", "down", "enter", "down", "down",
+                "enter", "up", "enter"]
+        for key in keys:
+            selected = view.selected_node
+            view.handle_key(key)
+            assert view._rows == _reference_rows(view), key
+            if key in ("left", "right", "enter"):
+                assert view.selected_node is selected
+
+    def test_collapse_moves_selection_out_of_hidden_rows(self):
+        view = _make_view(_make_tree_db(n_inst=3, n_cp=2))
+        view.handle_key("right")
+        view.handle_key("down")
+        view.handle_key("right")
+        view.handle_key("down")
+        assert view.selected_node.name == "cg"
+        view.handle_key("C")
+        assert _names(view) == ["top"]
+        assert view.selected_node.name == "top"
+
+    def test_paging_and_render_window(self):
+        view = _make_view(_make_tree_db(n_inst=100, n_cp=1), height=30)
+        view.handle_key("right")
+        view.handle_key("end")
+        assert view.current_index == 100
+        assert view.selected_node.name == "u99"
+        view.render()
+        assert view.scroll_offset == 101 - view._visible_rows()
+        view.handle_key("pageup")
+        assert view.current_index == 100 - view._visible_rows()
+        view.handle_key("home")
+        assert view.current_index == 0
+
+    def test_search_shows_matching_paths(self):
+        view = _make_view(_make_tree_db(n_inst=3, n_cp=2))
+        view._expand_all()
+        assert len(view._rows) == 1 + 3 * (2 + 2)
+        view.handle_key("/")
+        for ch in "u1":
+            view.handle_key(ch)
+        # Matches and their ancestors stay visible
+        assert _names(view) == ["top", "u1"]
+        view.handle_key("enter")
+        view.handle_key("backspace")
+        assert view.search_mode is False
+
+    def test_api_children_listed_on_expand(self, monkeypatch):
+        from ucis.mem.mem_scope import MemScope
+
+        listed = []
+        scopes = MemScope.scopes
+
+        def counting_scopes(self, mask):
+            listed.append(self.getScopeName())
+            return scopes(self, mask)
+        monkeypatch.setattr(MemScope, "scopes", counting_scopes)
+
+        view = _make_api_view(n_inst=3, n_cp=2)
+        (top,) = [n for n in view.root_nodes
+                  if n.scope_type == ScopeTypeT.INSTANCE]
+        assert top.has_children and top._children is None
+        # Only the top level is listed, plus a peek at each top scope
+        assert "u0" not in listed and "cg" not in listed
+
+        assert (top.total, top.covered) == (6, 3)
+        view.selected_node = top
+        view.handle_key("right")
+        assert _names(view)[-3:] == ["u0", "u1", "u2"]
+        assert [(n.total, n.covered) for n in top.children] == [(2, 1)] * 3
+        assert all(n._children is None for n in top.children)
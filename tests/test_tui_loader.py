@@ -0,0 +1,105 @@
+"""
+Tests for background, progressive loading of the TUI.
+"""
+import threading
+
+from ucis.tui.app import TUIApp
+from ucis.tui.loader import BackgroundLoader
+from ucis.tui.views.loading_view import LoadingView
+
+from tests.tui_fixtures import _make_partial_coverage_db
+
+
+def _make_sqlite_db(tmp_path):
+    from ucis.sqlite.sqlite_ucis import SqliteUCIS
+    db_path = str(tmp_path / "test.cdb")
+    db = SqliteUCIS(db_path)
+    _make_partial_coverage_db(db)
+    db.close()
+    return db_path
+
+
+def _drain(app):
+    app.loader.join(30)
+    app.poll_loader()
+
+
+def test_loader_event_order():
+    loader = BackgroundLoader(lambda: "model", [
+        ("a", lambda: "view_a"),
+        ("b", lambda: "view_b"),
+    ])
+    loader.start()
+    assert loader.join(10)
+    assert loader.poll() == [
+        ("model", "model"),
+        ("view", ("a", "view_a")),
+        ("view", ("b", "view_b")),
+        ("done", None),
+    ]
+    assert loader.fraction == 1.0
+    assert not loader.running
+
+
+def test_loader_error_stops_loading():
+    def fail():
+        raise IOError("no such database")
+    loader = BackgroundLoader(fail, [("a", lambda: "view_a")])
+    loader.start()
+    loader.join(10)
+    events = loader.poll()
+    assert [kind for kind, _ in events] == ["error", "done"]
+    assert isinstance(loader.error, IOError)
+
+
+def test_navigation_stays_responsive_while_loading():
+    release = threading.Event()
+    loader = BackgroundLoader(lambda: release.wait(10) and "model", [])
+
+    app = TUIApp("unused.cdb")
+    app.start_loading()
+    app.loader = loader
+    loader.start()
+    try:
+        # Views are placeholders until loaded, but can still be navigated
+        assert isinstance(app.controller.get_current_view(), LoadingView)
+        assert app.controller.handle_key('2')
+        assert app.controller.current_view_name == "hierarchy"
+        assert app.controller.handle_key('c') is False
+        assert app.poll_loader() is True
+        app._render()
+    finally:
+        release.set()
+        loader.join(10)
+    app.controller.running = False
+
+
+def test_app_loads_views_in_background(tmp_path):
+    app = TUIApp(_make_sqlite_db(tmp_path))
+    app.start_loading()
+    assert app.controller.current_view_name == "dashboard"
+    app.controller.switch_view("gaps")
+
+    _drain(app)
+    assert app.loader.error is None
+    assert app.controller.coverage_model is app.coverage_model
+    for name, view in app.controller.views.items():
+        assert not isinstance(view, LoadingView), name
+    # The view that was showing was swapped in place
+    gaps = app.controller.get_current_view()
+    assert app.controller.current_view_name == "gaps"
+    assert gaps.focused
+    assert gaps.gaps
+    app._render()
+    app.controller.running = False
+
+
+def test_app_reports_load_error(tmp_path):
+    app = TUIApp(str(tmp_path / "db.cdb"), input_format="no-such-format")
+    app.start_loading()
+    _drain(app)
+    assert app.loader.error is not None
+    assert app.coverage_model is None
+    assert app.controller.status_type == "error"
+    assert isinstance(app.controller.get_current_view(), LoadingView)
+    app._render()
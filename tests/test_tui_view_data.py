@@ -286,6 +286,16 @@ class TestTestHistoryViewData:
         for name in expected["test_names"]:
             assert name in names
 
+    def test_preloaded_tests_kept_on_enter(self, multi_test):
+        from ucis.tui.views.test_history_view import TestHistoryView
+        model, _ = multi_test
+        view = TestHistoryView(StubApp(model))
+        view.preload()
+        tests = view.tests
+        model.get_all_tests = MagicMock(side_effect=AssertionError)
+        view.on_enter()
+        assert view.tests is tests
+
     def test_sort_by_name_ascending(self, multi_test):
         model, _ = multi_test
         view = self._make_view(model)
@@ -2,7 +2,7 @@
 Pytest configuration and fixtures for UCIS API backend tests.
 
 Provides parametrized fixtures for testing across multiple backends:
-- backend: Full-featured backends (Memory, XML, SQLite)
+- backend: Full-featured backends (Memory, compact Memory, XML, SQLite)
 - yaml_backend: Simplified YAML backend (limited feature set)
 """
 
@@ -19,6 +19,7 @@ from ucis.scope_type_t import ScopeTypeT
 # Backend configuration
 FULL_BACKENDS = [
     ("memory", "mem"),
+    ("memory_compact", "mem_compact"),
     ("xml", "xml"),
     ("sqlite", "sqlite"),
 ]
@@ -31,7 +32,8 @@ YAML_SIMPLE_BACKEND = [
 @pytest.fixture(params=FULL_BACKENDS, ids=[b[0] for b in FULL_BACKENDS])
 def backend(request, tmp_path):
     """
-    Parametrized fixture for full-featured backends (Memory, XML, SQLite).
+    Parametrized fixture for full-featured backends (Memory, compact Memory,
+    XML, SQLite).
     
     Returns:
         tuple: (backend_name, create_func, write_func, read_func, temp_file)
@@ -59,6 +61,16 @@ def backend(request, tmp_path):
             # Return same DB instance
             return db_or_path
     
+    elif backend_type == "mem_compact":
+        def create_db():
+            return MemFactory.create(compact=True)
+        
+        def write_db(db, path):
+            return db
+        
+        def read_db(db_or_path):
+            return db_or_path
+    
     elif backend_type == "xml":
         def create_db():
             return MemFactory.create()
@@ -155,6 +155,49 @@ class TestApiCoverpoints:
                         assert bin_types.get("illegal_bin") == CoverTypeT.ILLEGALBIN, \
                             f"Illegal bin type wrong for {backend_name}"
     
+    def test_create_bins_batch(self, backend):
+        """createBins() matches createBin() called per bin"""
+        backend_name, create_db, write_db, read_db, temp_file = backend
+        
+        db = create_db()
+        
+        testnode = db.createHistoryNode(None, "test", "test", UCIS_HISTORYNODE_TEST)
+        testnode.setTestData(TestData(teststatus=UCIS_TESTSTATUS_OK,
+                                      toolcategory="test", date="20240101000000"))
+        file_h = db.createFileHandle("test.sv", "/tmp")
+        du = db.createScope("work.m", SourceInfo(file_h, 1, 0),
+                           1, UCIS_VLOG, UCIS_DU_MODULE,
+                           UCIS_SCOPE_UNDER_DU | UCIS_INST_ONCE)
+        inst = db.createInstance("i", None, 1, UCIS_VLOG, UCIS_INSTANCE, 
+                                du, UCIS_INST_ONCE)
+        cg = inst.createCovergroup("cg", SourceInfo(file_h, 5, 0), 1, UCIS_VLOG)
+        bins = [("b%d" % i, i * 3) for i in range(10)]
+        
+        cp1 = cg.createCoverpoint("cp1", SourceInfo(file_h, 10, 0), 1, UCIS_VLOG)
+        for name, count in bins:
+            cp1.createBin(name, None, 2, count, None)
+        cp1.createBin("ign", None, 2, 4, None, UCIS_IGNOREBIN)
+        
+        cp2 = cg.createCoverpoint("cp2", SourceInfo(file_h, 20, 0), 1, UCIS_VLOG)
+        cp2.createBins(bins, None, 2)
+        cp2.createBins([("ign", 4)], None, 2, UCIS_IGNOREBIN)
+        
+        result = write_db(db, temp_file)
+        db2 = read_db(result if result else db)
+        
+        def items(cp_name):
+            for inst_read in db2.scopes(ScopeTypeT.INSTANCE):
+                for cg_read in inst_read.scopes(ScopeTypeT.COVERGROUP):
+                    for cp_read in cg_read.scopes(ScopeTypeT.COVERPOINT):
+                        if cp_read.getScopeName() == cp_name:
+                            return [(ci.getName(), ci.getCoverData().type,
+                                     ci.getCoverData().data,
+                                     ci.getCoverData().at_least)
+                                    for ci in cp_read.coverItems(CoverTypeT.ALL)]
+        
+        assert len(items("cp2")) == 11, backend_name
+        assert items("cp2") == items("cp1"), backend_name
+    
     def test_bin_counts(self, backend):
         """Test that bin hit counts are preserved"""
         backend_name, create_db, write_db, read_db, temp_file = backend
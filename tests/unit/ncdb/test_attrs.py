@@ -17,6 +17,7 @@ from ucis.ncdb.attrs import AttrsReader, AttrsWriter
 from ucis.ncdb.constants import MEMBER_ATTRS
 from ucis.ncdb.ncdb_reader import NcdbReader
 from ucis.ncdb.ncdb_writer import NcdbWriter
+from ucis.ncdb.string_table import StringTable
 from ucis.scope_type_t import ScopeTypeT
 from ucis.source_t import SourceT
 
@@ -45,31 +46,74 @@ def _write_read(db):
 
 # ── Unit tests: AttrsWriter / AttrsReader ─────────────────────────────────
 
+def _read_back(data, string_table=None):
+    """Apply *data* to a fresh copy of the _make_db_with_attrs tree."""
+    db2 = MemUCIS()
+    db2.createHistoryNode(None, "t", None, HistoryNodeKind.TEST)
+    block2 = db2.createScope("blk", None, 1, SourceT.SV, ScopeTypeT.BLOCK, 0)
+    cd = CoverData(CoverTypeT.STMTBIN, 0)
+    block2.createNextCover("s0", cd, None)
+    AttrsReader().deserialize(data, db2, string_table)
+    return db2, block2
+
+
 def test_attrs_writer_empty():
-    """No attrs → empty entries list."""
+    """No attrs → empty bytes."""
     db = MemUCIS()
     db.createScope("blk", None, 1, SourceT.SV, ScopeTypeT.BLOCK, 0)
     data = AttrsWriter().serialize(db)
-    payload = json.loads(data)
-    assert payload["version"] == 2
-    assert payload["scopes"] == []
+    assert data == b""
 
 
 def test_attrs_writer_single():
     """One scope with one attr → one entry."""
     db, block = _make_db_with_attrs({"author": "alice"})
     data = AttrsWriter().serialize(db)
-    payload = json.loads(data)
-    assert len(payload["scopes"]) == 1
-    assert payload["scopes"][0]["attrs"] == {"author": "alice"}
+    assert data[:1] != b"{"
+    _, block2 = _read_back(data)
+    assert block2.getAttributes() == {"author": "alice"}
 
 
 def test_attrs_writer_multiple_keys():
     """Multiple attrs on one scope → all keys present."""
     db, block = _make_db_with_attrs({"k1": "v1", "k2": "v2", "k3": "v3"})
     data = AttrsWriter().serialize(db)
-    payload = json.loads(data)
-    assert payload["scopes"][0]["attrs"] == {"k1": "v1", "k2": "v2", "k3": "v3"}
+    _, block2 = _read_back(data)
+    assert block2.getAttributes() == {"k1": "v1", "k2": "v2", "k3": "v3"}
+
+
+def test_attrs_all_sections_shared_string_table():
+    """Coveritem, history, global and non-string values round-trip, with
+    the strings kept in the shared table."""
+    db, block = _make_db_with_attrs({"owner": "alice"})
+    next(iter(block.coverItems(CoverTypeT.ALL))).setAttribute("why", "n/a")
+    next(iter(db.historyNodes(HistoryNodeKind.TEST))).setAttribute("seed", 7)
+    db.setAttribute("tool", "alice")
+    table = StringTable()
+    data = AttrsWriter(table).serialize(db)
+    assert b"alice" not in data
+    assert sorted(table) == ["7", "alice", "n/a", "owner", "seed", "tool", "why"]
+
+    db2, block2 = _read_back(data, table)
+    assert block2.getAttributes() == {"owner": "alice"}
+    ci = next(iter(block2.coverItems(CoverTypeT.ALL)))
+    assert ci.getAttribute("why") == "n/a"
+    node = next(iter(db2.historyNodes(HistoryNodeKind.TEST)))
+    assert node.getAttribute("seed") == 7
+    assert db2.getAttribute("tool") == "alice"
+
+
+def test_attrs_reader_legacy_json():
+    """Version-2 JSON members are still read."""
+    payload = {"version": 2,
+               "scopes": [{"idx": 0, "attrs": {"a": "1"}}],
+               "coveritems": [{"scope_idx": 0, "ci_idx": 0,
+                               "attrs": {"b": "2"}}],
+               "history": [], "global": {"c": "3"}}
+    db2, block2 = _read_back(json.dumps(payload).encode())
+    assert block2.getAttribute("a") == "1"
+    assert next(iter(block2.coverItems(CoverTypeT.ALL))).getAttribute("b") == "2"
+    assert db2.getAttribute("c") == "3"
 
 
 def test_attrs_reader_applies_attrs():
@@ -111,3 +111,73 @@ def test_bad_magic_raises():
     data = b"\x00\x00\x00\x00" + b"\x00" * 8
     with pytest.raises(ValueError, match="Bad magic"):
         BucketIndex.deserialize(data)
+
+
+def test_add_bucket_out_of_order_and_remove():
+    idx = _idx(
+        (2, 3000, 3999, 10, 0, 0, 1),
+        (0, 1000, 1999, 10, 0, 0, 1),
+        (1, 2000, 2999, 10, 0, 0, 1),
+    )
+    assert [e.bucket_seq for e in idx.entries()] == [0, 1, 2]
+    assert idx.remove_bucket(1).ts_start == 2000
+    assert idx.remove_bucket(1) is None
+    assert [e.bucket_seq for e in idx.buckets_in_range(0, 5000)] == [0, 2]
+    assert idx.last_bucket().bucket_seq == 2
+
+
+def test_range_queries_match_linear_scan():
+    import random
+    rnd = random.Random(7)
+    idx = BucketIndex()
+    rows = []
+    for seq in range(300):
+        start = rnd.randrange(0, 100000)
+        end = start + rnd.randrange(0, 5000)
+        rows.append((seq, start, end))
+        idx.add_bucket(seq, start, end, 1, 0, 0, 9)
+    for _ in range(200):
+        lo = rnd.randrange(-1000, 110000)
+        hi = lo + rnd.randrange(0, 20000)
+        expect = [s for s, a, b in rows if b >= lo and a <= hi]
+        assert [e.bucket_seq for e in idx.buckets_in_range(lo, hi)] == expect
+        assert [e.bucket_seq for e in idx.buckets_for_name(3, ts_from=lo)] == \
+            [s for s, a, b in rows if b >= lo]
+        assert [e.bucket_seq for e in idx.buckets_for_name(3, ts_to=hi)] == \
+            [s for s, a, b in rows if a <= hi]
+
+
+@pytest.mark.parametrize("names", [
+    [5, 6, 9, 40],                           # dense: bitmap
+    list(range(0, 200000, 997)),             # sparse: Bloom filter
+])
+def test_name_filter(names):
+    idx = BucketIndex()
+    idx.add_bucket(0, 1000, 1999, len(names), 0, min(names), max(names),
+                   name_ids=names + names[:2])
+    idx.add_bucket(1, 2000, 2999, 1, 0, 0, 10 ** 6)   # no filter
+
+    for data in (None, idx.serialize()):
+        cur = idx if data is None else BucketIndex.deserialize(data)
+        present = set(names)
+        for nid in names:
+            assert [e.bucket_seq for e in cur.buckets_for_name(nid)] == [0, 1]
+        absent = [n for n in range(min(names), max(names)) if n not in present]
+        false_pos = sum(1 for n in absent if cur._entries[0].may_contain(n))
+        assert false_pos <= 0.03 * len(absent)
+
+
+def test_name_filter_bitmap_is_exact():
+    idx = BucketIndex()
+    idx.add_bucket(0, 1000, 1999, 3, 0, 3, 7, name_ids=[3, 7])
+    idx2 = BucketIndex.deserialize(idx.serialize())
+    assert [n for n in range(12) if idx2.buckets_for_name(n)] == [3, 7]
+
+
+def test_version_1_without_filters():
+    idx = _idx((0, 1000, 1999, 100, 10, 0, 5))
+    data = idx.serialize()
+    assert data[4] == 1 and len(data) == 9 + 28
+    idx.add_bucket(1, 2000, 2999, 1, 0, 2, 2, name_ids=[2])
+    assert idx.serialize()[4] == 2
+    assert BucketIndex.deserialize(data).buckets_for_name(4)[0].bucket_seq == 0
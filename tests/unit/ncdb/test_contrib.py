@@ -1,7 +1,9 @@
 """Tests for contrib.py — per-test contribution round-trip."""
 
 import os
+import random
 import tempfile
+import zipfile
 
 import pytest
 
@@ -10,9 +12,12 @@ from ucis.scope_type_t import ScopeTypeT
 from ucis.cover_type_t import CoverTypeT
 from ucis.history_node_kind import HistoryNodeKind
 
-from ucis.ncdb.contrib import ContribWriter, ContribReader
+from ucis.ncdb.constants import MEMBER_CONTRIB, MEMBER_CONTRIB_BINS
+from ucis.ncdb.contrib import ContribWriter, ContribReader, ContribStore
+from ucis.ncdb.ncdb_merger import NcdbMerger
 from ucis.ncdb.ncdb_writer import NcdbWriter
 from ucis.ncdb.ncdb_reader import NcdbReader
+from ucis.ncdb.varint import encode_varints
 
 
 # ── helpers ───────────────────────────────────────────────────────────────────
@@ -139,9 +144,10 @@ def test_contrib_writer_produces_members():
     db = MemUCIS()
     db.record_test_association(0, 10, 3)
     db.record_test_association(0, 20, 1)
+    db.record_test_association(3, 20, 2)
     members = ContribWriter().serialize(db)
-    assert "contrib/0.bin" in members
-    assert len(members) == 1
+    assert set(members) == {MEMBER_CONTRIB, MEMBER_CONTRIB_BINS}
+    assert set(ContribWriter(with_index=False).serialize(db)) == {MEMBER_CONTRIB}
 
 
 def test_contrib_round_trip():
@@ -213,3 +219,127 @@ def test_ncdb_round_trip_api_after_read():
     info = api.get_tests_for_coveritem(0)
     assert info.total_hits == 8
     assert len(info.tests) == 2
+
+
+# ── ContribStore ──────────────────────────────────────────────────────────────
+
+def _random_rows(seed=1, tests=40, bins=500):
+    rnd = random.Random(seed)
+    return {h: {b: rnd.randrange(1, 300) for b in rnd.sample(range(bins),
+                                                             rnd.randrange(1, 60))}
+            for h in rnd.sample(range(tests * 2), tests)}
+
+
+def _brute_tests_for_bin(rows, b):
+    return sorted((h, c[b]) for h, c in rows.items() if b in c)
+
+
+def _brute_unique(rows, h):
+    others = set()
+    for idx, c in rows.items():
+        if idx != h:
+            others.update(c)
+    return sorted(set(rows[h]) - others)
+
+
+@pytest.mark.parametrize("with_index", [True, False])
+def test_store_queries_match_brute_force(with_index):
+    rows = _random_rows()
+    store = ContribStore.from_members(ContribStore(rows).serialize(with_index))
+    assert len(store) == len(rows) and set(store) == set(rows)
+    for b in range(0, 500, 7):
+        assert sorted(store.tests_for_bin(b)) == _brute_tests_for_bin(rows, b)
+    for h in rows:
+        assert store.bin_counts(h) == rows[h]
+        assert store.unique_bins(h) == _brute_unique(rows, h)
+    assert store.bin_counts(-1) == {}
+    assert dict(store.items()) == rows
+
+
+def test_store_untouched_rows_copied_verbatim():
+    members = ContribStore(_random_rows()).serialize()
+    store = ContribStore.from_members(members)
+    store.tests_for_bin(3)
+    store.unique_bins(next(iter(store)))
+    assert store.serialize() == members
+
+
+def test_store_modified_row_rebuilds_index():
+    rows = _random_rows()
+    store = ContribStore.from_members(ContribStore(rows).serialize())
+    h = next(iter(store))
+    store[h][499] = 7                  # through the mutable row
+    rows[h][499] = 7
+    assert sorted(store.tests_for_bin(499)) == _brute_tests_for_bin(rows, 499)
+    reread = ContribStore.from_members(store.serialize())
+    assert sorted(reread.tests_for_bin(499)) == _brute_tests_for_bin(rows, 499)
+    assert reread.unique_bins(h) == _brute_unique(rows, h)
+
+
+def test_store_add_store_offsets():
+    a = ContribStore.from_members(ContribStore({0: {1: 1}, 2: {5: 2}}).serialize())
+    b = ContribStore({0: {1: 4}})
+    out = ContribStore()
+    out.add_store(a)
+    out.add_store(b, hist_offset=3)
+    assert dict(out.items()) == {0: {1: 1}, 2: {5: 2}, 3: {1: 4}}
+    assert out.unique_bins(0) == []
+    with pytest.raises(ValueError):
+        out.add_store(b, hist_offset=3)
+
+
+def test_store_bad_version():
+    with pytest.raises(ValueError):
+        ContribStore.from_bytes(bytes([9, 0]))
+
+
+def test_legacy_members_read():
+    legacy = {
+        "contrib/0.bin": encode_varints([2, 5, 2, 10, 4]),
+        "contrib/1.bin": encode_varints([1, 7, 1]),
+    }
+    db = MemUCIS()
+    ContribReader().apply(db, legacy)
+    assert dict(db._per_test_data.items()) == {0: {5: 2, 15: 4}, 1: {7: 1}}
+    assert set(ContribWriter().serialize(db)) == {MEMBER_CONTRIB, MEMBER_CONTRIB_BINS}
+
+
+def test_reader_adds_to_existing_data():
+    members = ContribStore({0: {1: 2}}).serialize()
+    db = MemUCIS()
+    db.record_test_association(0, 1, 1)
+    ContribReader().apply(db, members)
+    assert db._per_test_data == {0: {1: 3}}
+
+
+def test_ncdb_single_member(tmp_path):
+    db = _make_db()
+    for h in range(2):
+        for b in range(3):
+            db.record_test_association(h, b, h + b + 1)
+    path = str(tmp_path / "c.cdb")
+    NcdbWriter().write(db, path)
+    with zipfile.ZipFile(path) as zf:
+        names = zf.namelist()
+    assert MEMBER_CONTRIB in names and MEMBER_CONTRIB_BINS in names
+    assert not any(n.startswith("contrib/") for n in names)
+
+
+def test_merger_shifts_history_indices(tmp_path):
+    paths = []
+    for i in range(2):
+        db = _make_db()
+        db.record_test_association(0, i, 1)
+        db.record_test_association(1, 2, 10 + i)
+        paths.append(str(tmp_path / ("s%d.cdb" % i)))
+        NcdbWriter().write(db, paths[-1])
+    out = str(tmp_path / "m.cdb")
+    NcdbMerger().merge(paths, out)
+
+    db2 = NcdbReader().read(out)
+    # Source 1's nodes follow source 0's two nodes
+    assert dict(db2._per_test_data.items()) == {
+        0: {0: 1}, 1: {2: 10}, 2: {1: 1}, 3: {2: 11}}
+    api = db2.get_test_coverage_api()
+    assert api.get_tests_for_coveritem(2).total_hits == 21
+    assert api.get_unique_coveritems(2) == [1]
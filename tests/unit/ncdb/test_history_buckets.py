@@ -142,3 +142,20 @@ def test_is_full():
     for i in range(HISTORY_BUCKET_MAX_RECORDS):
         w.add(0, 0, 1700000000 + i, HIST_STATUS_OK, 0)
     assert w.is_full()
+
+
+def test_earlier_ts_on_higher_name_id():
+    """A later name_id may have the bucket's earliest timestamp."""
+    r = _bucket((0, 0, 1700000500, HIST_STATUS_OK, 0),
+                (1, 0, 1700000000, HIST_STATUS_FAIL, 0))
+    assert [rec.ts for rec in r.records_for_name(1)] == [1700000000]
+    assert [rec.ts for rec in r.records_for_name(0)] == [1700000500]
+
+
+def test_can_add_seed_limit():
+    w = BucketWriter()
+    for seed_id in range(255):
+        assert w.can_add(seed_id)
+        w.add(0, seed_id, 1700000000, HIST_STATUS_OK, 0)
+    assert w.can_add(7)
+    assert not w.can_add(255)
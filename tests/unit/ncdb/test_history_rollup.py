@@ -0,0 +1,209 @@
+"""Unit tests for the trend rollups (history/rollup.bin)."""
+import os
+import random
+import zipfile
+
+import pytest
+
+from ucis.mem.mem_ucis import MemUCIS
+from ucis.ncdb.constants import (
+    HIST_FLAG_HAS_COVERAGE, HIST_STATUS_FAIL, HIST_STATUS_OK,
+    MEMBER_HISTORY_ROLLUP,
+)
+from ucis.ncdb.history_buckets import BucketRecord
+from ucis.ncdb.history_rollup import (
+    GRANULARITY_DAY, GRANULARITY_WEEK, HistoryRollup, period_of,
+    period_start,
+)
+from ucis.ncdb.ncdb_merger import NcdbMerger
+from ucis.ncdb.ncdb_ucis import NcdbUCIS
+from ucis.ncdb.ncdb_writer import NcdbWriter
+from ucis.ncdb.run_journal import RunJournal, compact_journals
+
+T0 = 1700000000
+
+
+def _records(n, seed=1, tests=5, days=30):
+    rnd = random.Random(seed)
+    # Distinct timestamps, so that the order of each test's runs is defined
+    return [BucketRecord(name_id=rnd.randrange(tests), seed_id=0,
+                         ts=T0 + offset,
+                         status=rnd.choice((HIST_STATUS_OK, HIST_STATUS_OK,
+                                            HIST_STATUS_FAIL)),
+                         flags=rnd.choice((0, HIST_FLAG_HAS_COVERAGE)))
+            for offset in rnd.sample(range(days * 86400), n)]
+
+
+def _expected(records, granularity, name_id=None):
+    """Brute-force trend: {period_start: (runs, pass, flake, coverage)}."""
+    by_cell = {}
+    for r in sorted(records, key=lambda r: r.ts):
+        if name_id is not None and r.name_id != name_id:
+            continue
+        p = period_of(granularity, r.ts)
+        by_cell.setdefault(p, {}).setdefault(r.name_id, []).append(r)
+    out = {}
+    for p, tests in sorted(by_cell.items()):
+        runs = [r for recs in tests.values() for r in recs]
+        pairs = sum(len(recs) - 1 for recs in tests.values())
+        flips = sum((a.status != HIST_STATUS_OK) != (b.status != HIST_STATUS_OK)
+                    for recs in tests.values() for a, b in zip(recs, recs[1:]))
+        out[period_start(granularity, p)] = (
+            len(runs),
+            sum(r.status == HIST_STATUS_OK for r in runs) / len(runs),
+            flips / pairs if pairs else 0.0,
+            sum(bool(r.flags & HIST_FLAG_HAS_COVERAGE) for r in runs) / len(runs))
+    return out
+
+
+def _as_dict(series):
+    return {ts: (n, p, f, c) for ts, n, p, f, c in zip(
+        series.ts, series.runs, series.pass_rate, series.flake_rate,
+        series.coverage_rate)}
+
+
+def _check(rollup, records, tests=5):
+    for g in (GRANULARITY_DAY, GRANULARITY_WEEK):
+        assert _as_dict(rollup.series(None, g)) == _expected(records, g)
+        for nid in range(tests):
+            assert _as_dict(rollup.series(nid, g)) == \
+                _expected(records, g, nid)
+
+
+def test_period_alignment():
+    # 2024-01-01 was a Monday
+    monday = 1704067200
+    assert period_start(GRANULARITY_WEEK, period_of(GRANULARITY_WEEK,
+                                                    monday + 5 * 86400)) == monday
+    assert period_of(GRANULARITY_WEEK, monday - 1) + 1 == \
+        period_of(GRANULARITY_WEEK, monday)
+    assert period_start(GRANULARITY_DAY, period_of(GRANULARITY_DAY,
+                                                   monday + 3600)) == monday
+
+
+def test_series_matches_brute_force():
+    recs = _records(2000)
+    rollup = HistoryRollup()
+    # Fed in several ts-ordered batches, as sealed buckets would be
+    recs.sort(key=lambda r: r.ts)
+    for i in range(0, len(recs), 300):
+        rollup.add_records(recs[i:i + 300])
+    _check(rollup, recs)
+    _check(HistoryRollup.deserialize(rollup.serialize()), recs)
+
+
+def test_series_range_and_pending():
+    recs = sorted(_records(500), key=lambda r: r.ts)
+    rollup = HistoryRollup()
+    rollup.add_records(recs[:400])
+    before = rollup.serialize()
+
+    series = rollup.series(2, GRANULARITY_DAY, pending=recs[400:])
+    assert _as_dict(series) == _expected(recs, GRANULARITY_DAY, 2)
+    assert rollup.serialize() == before          # pending not folded in
+
+    lo, hi = T0 + 5 * 86400, T0 + 9 * 86400
+    series = rollup.series(None, GRANULARITY_DAY, ts_from=lo, ts_to=hi)
+    assert len(series) == 5 and series.ts[0] <= lo < series.ts[0] + 86400
+
+    with pytest.raises(ValueError):
+        rollup.series(None, 3600)
+
+
+def test_rebuild_span():
+    recs = sorted(_records(1000), key=lambda r: r.ts)
+    rollup = HistoryRollup()
+    rollup.add_records(recs)
+    taken = recs[-150:]
+    lo, hi = min(r.ts for r in taken), max(r.ts for r in taken)
+    span_lo, span_hi = rollup.span(lo, hi)
+    kept = recs[:-150]
+    rollup.rebuild_span(lo, hi, [r for r in kept if span_lo <= r.ts <= span_hi],
+                        name_ids={r.name_id for r in taken})
+    _check(rollup, kept)
+
+
+def test_lazy_keys_copied_verbatim():
+    rollup = HistoryRollup()
+    rollup.add_records(_records(300))
+    data = rollup.serialize()
+    loaded = HistoryRollup.deserialize(data)
+    loaded.series(1, GRANULARITY_WEEK)            # decodes one key
+    assert loaded.serialize() == data
+
+
+# ── NcdbUCIS / merger / journals ──────────────────────────────────────────
+
+def _all_records(db):
+    db._ensure_v2_history()
+    return [r for name in db._test_registry._name_to_id
+            for r in db.query_test_history(name)]
+
+
+def _new_db(path, recs):
+    NcdbWriter().write(MemUCIS(), path)
+    db = NcdbUCIS(path)
+    for r in sorted(recs, key=lambda r: r.ts):
+        db.add_test_run("t%d" % r.name_id, seed=r.seed_id, status=r.status,
+                        ts=r.ts, has_coverage=bool(r.flags & HIST_FLAG_HAS_COVERAGE))
+    return db
+
+
+def _save(db, path):
+    NcdbWriter().write(db, path + ".tmp")
+    os.replace(path + ".tmp", path)
+
+
+def test_ncdb_trend_roundtrip(tmp_path):
+    path = str(tmp_path / "h.cdb")
+    db = _new_db(path, _records(12000))          # one sealed + one open bucket
+    assert db.history_trend("nope").runs == []
+    recs = _all_records(db)
+    trend = db.history_trend("t3", granularity="week")
+    assert _as_dict(trend) == _expected(
+        [r for r in recs if r.name_id == db._test_registry._name_to_id["t3"]],
+        GRANULARITY_WEEK)
+    _save(db, path)
+
+    with zipfile.ZipFile(path) as zf:
+        assert MEMBER_HISTORY_ROLLUP in zf.namelist()
+    db2 = NcdbUCIS(path)
+    assert db2.history_trend("t3", granularity="week") == trend
+    assert _as_dict(db2.history_trend()) == _expected(recs, GRANULARITY_DAY)
+    with pytest.raises(ValueError):
+        db2.history_trend(granularity="hour")
+
+
+def test_compaction_keeps_rollup_exact(tmp_path):
+    path = str(tmp_path / "h.cdb")
+    _save(_new_db(path, _records(200, seed=2)), path)
+    rnd = random.Random(5)
+    for batch in range(3):
+        j = RunJournal(path, writer_id="w%d" % batch)
+        for r in _records(100, seed=10 + batch):
+            j.record("t%d" % r.name_id, seed=rnd.randrange(50),
+                     status=r.status, ts=r.ts,
+                     has_coverage=bool(r.flags & HIST_FLAG_HAS_COVERAGE))
+        j.close()
+        compact_journals(path)
+
+    db = NcdbUCIS(path)
+    recs = _all_records(db)
+    assert len(recs) == 500
+    assert _as_dict(db.history_trend()) == _expected(recs, GRANULARITY_DAY)
+
+
+def test_merger_rebuilds_rollup(tmp_path):
+    paths = []
+    for i in range(2):
+        path = str(tmp_path / ("s%d.cdb" % i))
+        _save(_new_db(path, _records(300, seed=20 + i)), path)
+        paths.append(path)
+    out = str(tmp_path / "m.cdb")
+    NcdbMerger().merge(paths, out)
+
+    db = NcdbUCIS(out)
+    recs = _all_records(db)
+    assert len(recs) == 600
+    assert _as_dict(db.history_trend(granularity="week")) == \
+        _expected(recs, GRANULARITY_WEEK)
@@ -19,6 +19,7 @@ from ucis.ncdb.properties import PropertiesWriter, PropertiesReader
 from ucis.ncdb.dfs_util import dfs_scope_list
 from ucis.ncdb.ncdb_writer import NcdbWriter
 from ucis.ncdb.ncdb_reader import NcdbReader
+from ucis.ncdb.string_table import StringTable
 
 
 def _make_db_with_comment(comment="hello"):
@@ -43,19 +44,15 @@ def test_no_properties_returns_empty():
 
 
 def test_single_comment_serializes():
-    """A scope with COMMENT → non-empty JSON."""
+    """A scope with COMMENT → non-empty binary member."""
     db = _make_db_with_comment("my comment")
-    result = PropertiesWriter().serialize(db)
+    table = StringTable()
+    result = PropertiesWriter(table).serialize(db)
     assert result != b""
-    import json
-    payload = json.loads(result)
-    assert payload["version"] == 1
-    assert len(payload["entries"]) == 1
-    entry = payload["entries"][0]
-    assert entry["kind"] == "scope"
-    assert entry["key"] == int(StrProperty.COMMENT)
-    assert entry["type"] == "str"
-    assert entry["value"] == "my comment"
+    assert result[:1] != b"{"
+    assert list(table) == ["my comment"]
+    with pytest.raises(ValueError):
+        PropertiesReader().apply(db, result)   # strings.bin table missing
 
 
 def test_multiple_scopes_multiple_comments():
@@ -66,13 +63,28 @@ def test_multiple_scopes_multiple_comments():
     s1.setStringProperty(-1, StrProperty.COMMENT, "comment A")
     s2.setStringProperty(-1, StrProperty.COMMENT, "comment B")
     result = PropertiesWriter().serialize(db)
-    import json
-    payload = json.loads(result)
-    assert len(payload["entries"]) == 2
-    values = {e["idx"]: e["value"] for e in payload["entries"]}
+
+    db2 = MemUCIS()
+    db2.createScope("a", None, 1, SourceT.SV, ScopeTypeT.BLOCK, 0)
+    db2.createScope("b", None, 1, SourceT.SV, ScopeTypeT.BLOCK, 0)
+    PropertiesReader().apply(db2, result)
     # DFS order: a=0, b=1
-    assert values[0] == "comment A"
-    assert values[1] == "comment B"
+    scopes = dfs_scope_list(db2)
+    assert scopes[0].getStringProperty(-1, StrProperty.COMMENT) == "comment A"
+    assert scopes[1].getStringProperty(-1, StrProperty.COMMENT) == "comment B"
+
+
+def test_apply_legacy_json():
+    """Version-1 JSON members are still read."""
+    import json
+    payload = {"version": 1, "entries": [
+        {"kind": "scope", "idx": 0, "key": int(StrProperty.COMMENT),
+         "type": "str", "value": "old"}
+    ]}
+    db = MemUCIS()
+    db.createScope("top", None, 1, SourceT.SV, ScopeTypeT.BLOCK, 0)
+    PropertiesReader().apply(db, json.dumps(payload).encode())
+    assert dfs_scope_list(db)[0].getStringProperty(-1, StrProperty.COMMENT) == "old"
 
 
 # ── Round-trip via apply() ─────────────────────────────────────────────────
@@ -0,0 +1,143 @@
+"""Unit tests for run journals and their compaction (run_journal.py)."""
+import os
+
+import pytest
+
+from ucis.mem.mem_ucis import MemUCIS
+from ucis.ncdb.constants import HIST_STATUS_OK, HIST_STATUS_FAIL
+from ucis.ncdb.ncdb_ucis import NcdbUCIS
+from ucis.ncdb.ncdb_writer import NcdbWriter
+from ucis.ncdb.run_journal import (
+    RunJournal, compact_journals, journal_dir, read_journal,
+)
+from ucis.scope_type_t import ScopeTypeT
+from ucis.source_t import SourceT
+
+
+@pytest.fixture
+def cdb(tmp_path):
+    return str(tmp_path / "regress.cdb")
+
+
+def test_record_read_roundtrip(cdb):
+    j = RunJournal(cdb, writer_id="w0")
+    j.record("uart_smoke", seed=42, status=HIST_STATUS_FAIL, ts=1700000000,
+             cpu_time=1.25, has_coverage=True)
+    j.record("spi_basic", ts=1700000001)
+    records, end = read_journal(j.path)
+    assert [(r.name, r.seed, r.ts, r.status, r.cpu_time) for r in records] == [
+        ("uart_smoke", "42", 1700000000, HIST_STATUS_FAIL, 1.25),
+        ("spi_basic", "0", 1700000001, HIST_STATUS_OK, None)]
+    assert end == os.path.getsize(j.path)
+
+    # A torn (partially written) record is not returned until complete
+    with open(j.path, "ab") as fp:
+        fp.write(b"\x20\x00\x00\x00\x01")
+    assert read_journal(j.path, end) == ([], end)
+    j.close(done=False)
+
+
+def test_compact_orders_by_ts(cdb):
+    a = RunJournal(cdb, writer_id="a")
+    b = RunJournal(cdb, writer_id="b")
+    a.record("t", seed=1, status=HIST_STATUS_OK, ts=1700000030)
+    b.record("t", seed=2, status=HIST_STATUS_FAIL, ts=1700000010)
+    a.record("t", seed=3, status=HIST_STATUS_OK, ts=1700000020)
+    b.close()
+
+    assert compact_journals(cdb) == 3
+    db = NcdbUCIS(cdb)
+    assert [r.ts for r in db.query_test_history("t")] == \
+        [1700000010, 1700000020, 1700000030]
+    stats = db.get_test_stats("t")
+    assert (stats.total_runs, stats.fail_count) == (3, 1)
+    assert db._test_registry.next_run_id == 3
+
+    # The closed journal is gone, the open one is kept and resumed
+    assert sorted(os.listdir(journal_dir(cdb))) == ["a.jnl"]
+    a.record("t", seed=4, status=HIST_STATUS_OK, ts=1700000040)
+    assert compact_journals(cdb) == 1
+    assert compact_journals(cdb) == 0
+    db = NcdbUCIS(cdb)
+    assert db.get_test_stats("t").total_runs == 4
+    assert db._bucket_index.num_buckets == 1
+    a.close()
+
+
+def test_compact_keeps_coverage(cdb):
+    db = MemUCIS()
+    db.createScope("blk", None, 1, SourceT.SV, ScopeTypeT.BLOCK, 0)
+    NcdbWriter().write(db, cdb)
+
+    with RunJournal(cdb) as j:
+        for i in range(300):   # more distinct seeds than one bucket holds
+            j.record("t%d" % (i % 3), seed=i, ts=1700000000 + i)
+    assert compact_journals(cdb) == 300
+
+    db = NcdbUCIS(cdb)
+    assert [s.getScopeName() for s in db.scopes(ScopeTypeT.ALL)] == ["blk"]
+    assert sum(len(db.query_test_history("t%d" % i)) for i in range(3)) == 300
+
+
+def test_compaction_lock(cdb):
+    RunJournal(cdb, writer_id="w").close()
+    lock = os.path.join(journal_dir(cdb), ".compact.lock")
+    open(lock, "w").close()
+    with pytest.raises(RuntimeError):
+        compact_journals(cdb)
+    os.unlink(lock)
+    assert compact_journals(cdb) == 0
+
+
+def test_closed_writer_id_not_reused(cdb):
+    RunJournal(cdb, writer_id="w").close()
+    with pytest.raises(FileExistsError):
+        RunJournal(cdb, writer_id="w")
+
+
+def test_reopen_discards_torn_tail(cdb):
+    j = RunJournal(cdb, writer_id="w1")
+    j.record("a", ts=1700000000)
+    j.close(done=False)
+    # The worker crashed while writing its next record
+    with open(j.path, "ab") as fp:
+        fp.write(b"\x20\x00\x00\x00\x01")
+
+    j = RunJournal(cdb, writer_id="w1")
+    j.record("b", ts=1700000001)
+    j.record("c", ts=1700000002)
+    j.close()
+    assert compact_journals(cdb) == 3
+    assert compact_journals(cdb) == 0
+    assert os.listdir(journal_dir(cdb)) == []
+    db = NcdbUCIS(cdb)
+    assert [r.ts for n in "abc" for r in db.query_test_history(n)] == \
+        [1700000000, 1700000001, 1700000002]
+
+
+def test_reopen_after_torn_header(cdb):
+    os.makedirs(journal_dir(cdb))
+    with open(os.path.join(journal_dir(cdb), "w1.jnl"), "wb") as fp:
+        fp.write(b"RJ")
+    with RunJournal(cdb, writer_id="w1") as j:
+        j.record("a", ts=1700000000)
+    assert compact_journals(cdb) == 1
+
+
+def test_writer_id_reused_after_compaction(cdb):
+    with RunJournal(cdb, writer_id="worker-3") as j:
+        for i in range(5):
+            j.record("night1", seed=i, ts=1700000000 + i)
+    assert compact_journals(cdb) == 5
+    assert os.listdir(journal_dir(cdb)) == []
+
+    # The next night a worker with the same fixed id writes a new journal
+    with RunJournal(cdb, writer_id="worker-3") as j:
+        for i in range(3):
+            j.record("night2", seed=i, ts=1700100000 + i)
+    assert compact_journals(cdb) == 3
+    assert compact_journals(cdb) == 0
+    assert os.listdir(journal_dir(cdb)) == []
+    db = NcdbUCIS(cdb)
+    assert len(db.query_test_history("night1")) == 5
+    assert len(db.query_test_history("night2")) == 3
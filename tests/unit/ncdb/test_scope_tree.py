@@ -16,7 +16,7 @@ from ucis.cover_data import CoverData
 from ucis.history_node_kind import HistoryNodeKind
 
 from ucis.ncdb.string_table import StringTable
-from ucis.ncdb.scope_tree import ScopeTreeWriter, ScopeTreeReader
+from ucis.ncdb.scope_tree import ScopeTreeWriter, ScopeTreeReader, coveritem_paths
 from ucis.ncdb.counts import CountsWriter, CountsReader
 from ucis.ncdb.constants import TOGGLE_BIN_0_TO_1, TOGGLE_BIN_1_TO_0
 
@@ -227,3 +227,27 @@ def test_zero_coveritems_scope():
     rt = _roundtrip(db)
     scope = list(rt.scopes(ScopeTypeT.ALL))[0]
     assert list(scope.coverItems(CoverTypeT.ALL)) == []
+
+
+def test_coveritem_paths_in_counts_order():
+    """coveritem_paths() lists every coveritem in counts.bin order."""
+    db = MemUCIS()
+    top = db.createScope("top", None, 1, SourceT.SV, ScopeTypeT.BLOCK, 0)
+    _add_stmtbin(top, "s_top", 1)
+    blk = top.createScope("blk", None, 1, SourceT.SV, ScopeTypeT.BLOCK, 0)
+    _add_stmtbin(blk, "s0", 2)
+    _add_toggle_pair(top, "sig", c0=3, c1=4)
+    db.createScope("empty", None, 1, SourceT.SV, ScopeTypeT.BLOCK, 0)
+    other = db.createScope("other", None, 1, SourceT.SV, ScopeTypeT.BLOCK, 0)
+    _add_stmtbin(other, "s1", 5)
+
+    st = StringTable()
+    writer = ScopeTreeWriter(st, [])
+    tree_bytes = writer.write(db)
+
+    paths, at_least = coveritem_paths(tree_bytes, st)
+    assert paths == ["top/s_top", "top/blk/s0",
+                     f"top/sig/{TOGGLE_BIN_0_TO_1}",
+                     f"top/sig/{TOGGLE_BIN_1_TO_0}", "other/s1"]
+    assert writer.counts_list == [1, 2, 3, 4, 5]
+    assert at_least == [1] * 5
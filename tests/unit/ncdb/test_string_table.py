@@ -53,3 +53,64 @@ def test_none_becomes_empty():
     st = StringTable()
     idx = st.add(None)
     assert st.get(idx) == ""
+
+
+def _v1_bytes(strings):
+    """strings.bin in the legacy length-prefixed layout."""
+    from ucis.ncdb.varint import encode_varint
+    out = encode_varint(len(strings))
+    for s in strings:
+        b = s.encode("utf-8")
+        out += encode_varint(len(b)) + b
+    return out
+
+
+def test_front_coded_smaller_than_v1():
+    strings = ["top.u_core%d.sig_%d" % (i // 50, i) for i in range(1000)]
+    st = StringTable()
+    for s in strings:
+        st.add(s)
+    data = st.serialize()
+    assert len(data) < len(_v1_bytes(strings)) // 2
+    assert list(StringTable.from_bytes(data)) == strings
+
+
+@pytest.mark.parametrize("strings", [
+    [],
+    [""],
+    ["a", "ab", "abc", "ab", "b", ""],
+    ["sig\x00a", "sig\x00b", "x"],            # NUL inside strings
+    ["信号_a", "信号_b", "信号", "é", "ê", "e"],  # prefix ends inside a char
+])
+def test_front_coded_round_trip(strings):
+    st = StringTable()
+    for s in strings:
+        st.add(s)
+    st2 = StringTable.from_bytes(st.serialize())
+    assert list(st2) == list(st)
+
+
+def test_reads_v1_layout():
+    st = StringTable.from_bytes(_v1_bytes(["", "a", "b", "a"]))
+    assert list(st) == ["", "a", "b", "a"]
+    assert len(StringTable.from_bytes(_v1_bytes([]))) == 0
+
+
+def test_index_built_lazily():
+    st = StringTable.from_bytes(_v1_bytes(["x", "y", "x"]))
+    assert st._index is None
+    assert st.get(1) == "y"
+    assert st._index is None
+    assert st.add("x") == 0                    # first of duplicates
+    assert st.add("z") == 3
+    assert st.get(3) == "z"
+
+
+def test_malformed_front_coding():
+    st = StringTable()
+    st.add("abc")
+    st.add("abd")
+    data = bytearray(st.serialize())
+    data[3] = 5                                # shared_0 > 0
+    with pytest.raises(ValueError):
+        StringTable.from_bytes(bytes(data))
@@ -16,6 +16,7 @@ from ucis.mem.mem_ucis import MemUCIS
 from ucis.ncdb.constants import MEMBER_TOGGLE
 from ucis.ncdb.ncdb_reader import NcdbReader
 from ucis.ncdb.ncdb_writer import NcdbWriter
+from ucis.ncdb.string_table import StringTable
 from ucis.ncdb.toggle import ToggleReader, ToggleWriter
 from ucis.scope_type_t import ScopeTypeT
 from ucis.source_t import SourceT
@@ -58,6 +59,14 @@ def test_toggle_writer_empty_when_defaults():
     assert data == b""
 
 
+def _apply_to_fresh(data, string_table=None):
+    db2 = MemUCIS()
+    t2 = db2.createToggle("sig", "sig", 0, ToggleMetricT._2STOGGLE,
+                          ToggleTypeT.NET, ToggleDirT.INTERNAL)
+    ToggleReader().apply(db2, data, string_table)
+    return t2
+
+
 def test_toggle_writer_captures_canonical():
     """Non-default canonical name is included in entry."""
     db, _ = _make_toggle_db(
@@ -67,10 +76,10 @@ def test_toggle_writer_captures_canonical():
         ToggleDirT.INTERNAL,
     )
     data = ToggleWriter().serialize(db)
-    payload = json.loads(data)
-    assert payload["version"] == 1
-    assert len(payload["entries"]) == 1
-    assert payload["entries"][0]["canonical"] == "tb.dut.sig"
+    assert data[:1] != b"{"
+    t2 = _apply_to_fresh(data)
+    assert t2.getCanonicalName() == "tb.dut.sig"
+    assert t2.getToggleType() == ToggleTypeT.NET
 
 
 def test_toggle_writer_captures_type():
@@ -82,8 +91,7 @@ def test_toggle_writer_captures_type():
         ToggleDirT.INTERNAL,
     )
     data = ToggleWriter().serialize(db)
-    payload = json.loads(data)
-    assert payload["entries"][0]["type"] == int(ToggleTypeT.REG)
+    assert _apply_to_fresh(data).getToggleType() == ToggleTypeT.REG
 
 
 def test_toggle_writer_captures_dir():
@@ -95,8 +103,43 @@ def test_toggle_writer_captures_dir():
         ToggleDirT.IN,             # non-default (default is INTERNAL)
     )
     data = ToggleWriter().serialize(db)
-    payload = json.loads(data)
-    assert payload["entries"][0]["dir"] == int(ToggleDirT.IN)
+    assert _apply_to_fresh(data).getToggleDir() == ToggleDirT.IN
+
+
+def test_toggle_writer_shared_string_table():
+    """With a shared table the member holds indices only, and the leaf
+    names of front-coded paths are the scope names already in the table."""
+    db = MemUCIS()
+    names = ["sig%d" % i for i in range(50)]
+    for name in names:
+        db.createToggle(name, "tb.dut.u_core." + name, 0,
+                        ToggleMetricT._2STOGGLE, ToggleTypeT.NET,
+                        ToggleDirT.INTERNAL)
+    table = StringTable()
+    for name in names:
+        table.add(name)
+    data = ToggleWriter(table).serialize(db)
+    assert len(table) == 51                # plus "tb.dut.u_core.sig0"
+    assert b"u_core" not in data
+    with pytest.raises(ValueError):
+        ToggleReader().apply(db, data)
+
+    db2 = MemUCIS()
+    for name in names:
+        db2.createToggle(name, name, 0, ToggleMetricT._2STOGGLE,
+                         ToggleTypeT.NET, ToggleDirT.INTERNAL)
+    ToggleReader().apply(db2, data, table)
+    assert [t.getCanonicalName() for t in db2.scopes(ScopeTypeT.TOGGLE)] == \
+        ["tb.dut.u_core." + name for name in names]
+
+
+def test_toggle_reader_legacy_json():
+    """Version-1 JSON members are still read."""
+    payload = {"version": 1, "entries": [
+        {"idx": 0, "canonical": "tb.x", "dir": int(ToggleDirT.OUT)}]}
+    t2 = _apply_to_fresh(json.dumps(payload).encode())
+    assert t2.getCanonicalName() == "tb.x"
+    assert t2.getToggleDir() == ToggleDirT.OUT
 
 
 def test_toggle_reader_restores_canonical():
@@ -138,3 +138,78 @@ class TestWaiverSet:
         assert w.bin_pattern == "*"
         assert w.status == "active"
         assert w.expires_at == ""
+
+
+# ── Compiled matching ─────────────────────────────────────────────────────────
+
+def _random_waivers(rnd, n):
+    segs = ["top", "uart", "spi", "u_*", "*", "**", "dma*", "rx"]
+    bins = ["*", "reset_*", "b1", "*_hi"]
+    return [Waiver(id="W%d" % i,
+                   scope_pattern="/".join(rnd.choice(segs)
+                                          for _ in range(rnd.randrange(1, 5))),
+                   bin_pattern=rnd.choice(bins))
+            for i in range(n)]
+
+
+def _random_paths(rnd, n):
+    segs = ["top", "uart", "spi", "u_rx", "dma0", "rx", "x"]
+    return ["/".join(rnd.choice(segs) for _ in range(rnd.randrange(1, 6)))
+            for _ in range(n)]
+
+
+class TestCompiledWaiverSet:
+    def test_matches_brute_force(self):
+        import random
+        rnd = random.Random(4)
+        ws = WaiverSet(_random_waivers(rnd, 300))
+        for path in _random_paths(rnd, 500):
+            for bin_name in ("", "reset_a", "b1", "x_hi", "other"):
+                expect = [w.id for w in ws.waivers if w.matches(path, bin_name)]
+                assert ws.matching_ids(path, bin_name) == expect
+                assert ws.matches_scope(path, bin_name) == bool(expect)
+
+    def test_recompiles_after_changes(self):
+        ws = WaiverSet([Waiver(id="W1", scope_pattern="top/*")])
+        assert not ws.matches_scope("a/b")
+        ws.add(Waiver(id="W2", scope_pattern="a/**"))
+        assert ws.matching_ids("a/b") == ["W2"]
+        ws.waivers.append(Waiver(id="W3", scope_pattern="**/b"))
+        assert ws.matching_ids("a/b") == ["W2", "W3"]
+        ws.waivers = [Waiver(id="W4", scope_pattern="a/b")]
+        assert ws.matching_ids("a/b") == ["W4"]
+
+    def test_annotate(self):
+        from ucis.cover_data import CoverData
+        from ucis.cover_type_t import CoverTypeT
+        from ucis.mem.mem_ucis import MemUCIS
+        from ucis.scope_type_t import ScopeTypeT
+        from ucis.source_t import SourceT
+
+        db = MemUCIS()
+        top = db.createScope("top", None, 1, SourceT.SV, ScopeTypeT.BLOCK, 0)
+        bins = []                        # (scope path, bin name) in flat order
+        for name, sub in (("uart", ["reset_a", "b1"]), ("spi", ["b1", "c"])):
+            blk = top.createScope(name, None, 1, SourceT.SV, ScopeTypeT.BLOCK, 0)
+            for b in sub:
+                blk.createNextCover(b, CoverData(CoverTypeT.STMTBIN, 0), None)
+                bins.append(("top/" + name, b))
+        # A toggle pair is stored "0 -> 1" then "1 -> 0"
+        tog = top.createScope("sig", None, 1, SourceT.SV, ScopeTypeT.BRANCH, 0)
+        for b in ("1 -> 0", "0 -> 1"):
+            tog.createNextCover(b, CoverData(CoverTypeT.TOGGLEBIN, 0), None)
+        bins += [("top/sig", "0 -> 1"), ("top/sig", "1 -> 0")]
+
+        ws = WaiverSet([
+            Waiver(id="W1", scope_pattern="top/uart", bin_pattern="reset_*"),
+            Waiver(id="W2", scope_pattern="**/*", bin_pattern="b1"),
+            Waiver(id="W3", scope_pattern="top/s*", bin_pattern="0 -> 1"),
+            Waiver(id="W4", scope_pattern="nomatch/**"),
+        ])
+        expect = {}
+        for i, (path, b) in enumerate(bins):
+            ids = [w.id for w in ws.waivers if w.matches(path, b)]
+            if ids:
+                expect[i] = ids
+        assert ws.annotate(db) == expect
+        assert expect == {0: ["W1"], 1: ["W2"], 2: ["W2"], 4: ["W3"]}
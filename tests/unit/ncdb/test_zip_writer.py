@@ -0,0 +1,148 @@
+"""
+Tests for ucis.ncdb.zip_writer and the single-pass NcdbWriter.
+"""
+
+import os
+import random
+import zipfile
+
+import pytest
+
+from ucis.cover_data import CoverData
+from ucis.cover_type_t import CoverTypeT
+from ucis.history_node_kind import HistoryNodeKind
+from ucis.mem.mem_ucis import MemUCIS
+from ucis.ncdb.attrs import AttrsWriter
+from ucis.ncdb.constants import (
+    MEMBER_ATTRS, MEMBER_COVERITEM_FLAGS, MEMBER_DESIGN_UNITS, MEMBER_STRINGS,
+    MEMBER_TAGS, MEMBER_TOGGLE,
+)
+from ucis.ncdb.coveritem_flags import CoveritemFlagsWriter
+from ucis.ncdb.design_units import DesignUnitsWriter
+from ucis.ncdb.ncdb_reader import NcdbReader
+from ucis.ncdb.ncdb_writer import NcdbWriter
+from ucis.ncdb.string_table import StringTable
+from ucis.ncdb.tags import TagsWriter
+from ucis.ncdb.toggle import ToggleWriter
+from ucis.ncdb.zip_writer import write_zip
+from ucis.scope_type_t import ScopeTypeT
+from ucis.source_t import SourceT
+from ucis.toggle_dir_t import ToggleDirT
+from ucis.toggle_metric_t import ToggleMetricT
+from ucis.toggle_type_t import ToggleTypeT
+
+
+def _members():
+    rnd = random.Random(3)
+    big = bytes(rnd.randrange(16) for _ in range(200_000))
+    return [
+        ("manifest.json", b'{"format":"NCDB"}', True),
+        ("counts.bin", big, True),
+        ("scope_tree.bin", big[::-1], True),
+        ("history/bucket_00000000.bin", b"\x00already-compressed", False),
+        ("contrib/tést.bin", b"x" * 1000, True),
+    ]
+
+
+def _info(zi):
+    return (zi.filename, zi.compress_type, zi.CRC, zi.compress_size,
+            zi.file_size, zi.flag_bits, zi.create_system, zi.external_attr)
+
+
+# ── write_zip ─────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_write_zip_matches_zipfile(tmp_path, workers):
+    members = _members()
+    ours = str(tmp_path / "ours.zip")
+    ref = str(tmp_path / "ref.zip")
+    write_zip(ours, members, workers=workers)
+    with zipfile.ZipFile(ref, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, data, compress in members:
+            zf.writestr(name, data, compress_type=(
+                zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED))
+
+    with zipfile.ZipFile(ours) as a, zipfile.ZipFile(ref) as b:
+        assert a.testzip() is None
+        assert [_info(i) for i in a.infolist()] == \
+            [_info(i) for i in b.infolist()]
+        for name, data, _ in members:
+            assert a.read(name) == data
+
+
+def test_write_zip_levels(tmp_path):
+    members = _members()
+    sizes = {}
+    for level in (0, 1, 9):
+        path = str(tmp_path / ("l%d.zip" % level))
+        write_zip(path, members, compress_level=level)
+        with zipfile.ZipFile(path) as zf:
+            for name, data, _ in members:
+                assert zf.read(name) == data
+            if level == 0:
+                assert {i.compress_type for i in zf.infolist()} == \
+                    {zipfile.ZIP_STORED}
+        sizes[level] = os.path.getsize(path)
+    assert sizes[0] > sizes[1] >= sizes[9]
+
+    with pytest.raises(ValueError):
+        write_zip(str(tmp_path / "bad.zip"), members, compress_level=10)
+
+
+# ── NcdbWriter ────────────────────────────────────────────────────────────
+
+def _make_db():
+    db = MemUCIS()
+    db.createHistoryNode(None, "t", None, HistoryNodeKind.TEST)
+    du = db.createScope("work.top", None, 1, SourceT.SV, ScopeTypeT.DU_MODULE, 0)
+    du.addTag("rtl")
+    block = db.createScope("blk", None, 1, SourceT.SV, ScopeTypeT.BLOCK, 0)
+    block.setAttribute("owner", "alice")
+    for i in range(4):
+        cd = CoverData(CoverTypeT.STMTBIN, 0)
+        cd.data = i
+        ci = block.createNextCover("s%d" % i, cd, None)
+        if i == 2:
+            ci.setCoverFlags(0x4)
+            ci.setAttribute("why", "unreachable")
+    t = db.createToggle("sig", "top.sig", 0, ToggleMetricT._2STOGGLE,
+                        ToggleTypeT.REG, ToggleDirT.IN)
+    for name, n in (("0->1", 3), ("1->0", 2)):
+        cd = CoverData(CoverTypeT.TOGGLEBIN, 0)
+        cd.data = n
+        t.createNextCover(name, cd, None)
+    return db
+
+
+def test_single_pass_matches_serializers(tmp_path):
+    """Members fed from the scope-tree walk equal the standalone walks."""
+    db = _make_db()
+    path = str(tmp_path / "out.cdb")
+    NcdbWriter().write(db, path)
+
+    with zipfile.ZipFile(path) as zf:
+        # Members referencing strings.bin add nothing to the written table
+        strings = StringTable.from_bytes(zf.read(MEMBER_STRINGS))
+        for member, writer in ((MEMBER_ATTRS, AttrsWriter(strings)),
+                               (MEMBER_TAGS, TagsWriter()),
+                               (MEMBER_TOGGLE, ToggleWriter(strings)),
+                               (MEMBER_DESIGN_UNITS, DesignUnitsWriter()),
+                               (MEMBER_COVERITEM_FLAGS, CoveritemFlagsWriter())):
+            assert zf.read(member) == writer.serialize(db), member
+        assert strings.serialize() == zf.read(MEMBER_STRINGS)
+
+
+def test_compress_level(tmp_path):
+    db = _make_db()
+    fast = str(tmp_path / "fast.cdb")
+    NcdbWriter(compress_level=0, workers=1).write(db, fast)
+    with zipfile.ZipFile(fast) as zf:
+        assert {i.compress_type for i in zf.infolist()} == {zipfile.ZIP_STORED}
+
+    db2 = NcdbReader().read(fast)
+    blk = next(s for s in db2.scopes(ScopeTypeT.ALL)
+               if s.getScopeName() == "blk")
+    items = list(blk.coverItems(CoverTypeT.ALL))
+    assert [ci.getCoverData().data for ci in items] == [0, 1, 2, 3]
+    assert items[2].getCoverFlags() == 0x4
+    assert blk.getAttributes() == {"owner": "alice"}
@@ -0,0 +1,81 @@
+'''
+Tests for BinQuery and the paged hierarchy walk.
+'''
+import argparse
+
+import pytest
+
+from ucis.cmd.show.show_hierarchy import ShowHierarchy
+from ucis.report.bin_query import BinQuery
+from ucis.sqlite.sqlite_ucis import SqliteUCIS
+
+from .db_creator import DbCreator
+
+
+def _populate(db):
+    ctor = DbCreator(db)
+    ctor.dummy_test_data()
+    inst = ctor.dummy_instance()
+    ctor.create_covergroup(inst, "cg_a", dict(coverpoints=dict(
+        cp1=dict(bins=[("b0", 3), ("b1", 0), ("b2", 7)]),
+        cp2=dict(bins=[("x", 1), ("y", 5)]))))
+    ctor.create_covergroup(inst, "cg_b", dict(coverpoints=dict(
+        cp1=dict(bins=[("z", 2), ("a", 7)]))))
+    return db
+
+
+@pytest.fixture(params=["mem", "sqlite"])
+def db(request):
+    if request.param == "mem":
+        return _populate(DbCreator().db)
+    return _populate(SqliteUCIS())
+
+
+def _names(rows):
+    return [(r["covergroup"], r["coverpoint"], r["bin"]) for r in rows]
+
+
+def test_natural_order(db):
+    rows, total = BinQuery(db).page()
+    assert total == 7
+    assert _names(rows) == [
+        ("cg_a", "cp1", "b0"), ("cg_a", "cp1", "b1"), ("cg_a", "cp1", "b2"),
+        ("cg_a", "cp2", "x"), ("cg_a", "cp2", "y"),
+        ("cg_b", "cp1", "z"), ("cg_b", "cp1", "a")]
+    assert rows[1]["goal_met"] is False
+
+
+def test_filters(db):
+    rows, total = BinQuery(db, coverpoint="cp1", min_hits=1, max_hits=5).page()
+    assert total == 2
+    assert _names(rows) == [("cg_a", "cp1", "b0"), ("cg_b", "cp1", "z")]
+    assert BinQuery(db, covergroup="cg_b").page()[1] == 2
+
+
+@pytest.mark.parametrize("sort", [None, "count", "name"])
+def test_pages_concatenate_to_full_result(db, sort):
+    full, total = BinQuery(db, sort=sort).page()
+    pages = []
+    for offset in range(0, total, 3):
+        rows, t = BinQuery(db, sort=sort).page(offset, 3)
+        assert t == total
+        pages.extend(rows)
+    assert pages == full
+
+
+def test_sort_count_is_stable(db):
+    rows = BinQuery(db, sort="count").rows()
+    assert [r["count"] for r in rows] == [7, 7, 5, 3, 2, 1, 0]
+    assert _names(rows)[:2] == [("cg_a", "cp1", "b2"), ("cg_b", "cp1", "a")]
+
+
+def test_hierarchy_walk_resume():
+    db = _populate(DbCreator().db)
+    cmd = ShowHierarchy(argparse.Namespace(db="x", max_depth=None))
+    cmd.db = db
+    walked = list(cmd.walk())
+    paths = [row["path"] for row, _ in walked]
+    assert paths[0] == "dummy"
+    assert "dummy/cg_a/cp2" in paths
+    for i, (_, position) in enumerate(walked):
+        assert [row["path"] for row, _ in cmd.walk(position)] == paths[i:]
@@ -0,0 +1,115 @@
+"""
+Tests for the multi-database coverage diff engine.
+"""
+import argparse
+import json
+
+import pytest
+
+from ucis.cmd.show.show_batch import ShowBatch
+from ucis.cmd.show.show_diff import ShowDiff
+from ucis.cover_data import CoverData
+from ucis.cover_type_t import CoverTypeT
+from ucis.mem.mem_ucis import MemUCIS
+from ucis.ncdb.ncdb_reader import NcdbReader
+from ucis.ncdb.ncdb_writer import NcdbWriter
+from ucis.report.coverage_diff import CoverageDiff
+from ucis.scope_type_t import ScopeTypeT
+from ucis.source_t import SourceT
+
+
+def _make_db(counts, extra=()):
+    """BLOCK scope 'top' with one STMTBIN per count, plus *extra* items."""
+    db = MemUCIS()
+    block = db.createScope("top", None, 1, SourceT.SV, ScopeTypeT.BLOCK, 0)
+    for i, c in enumerate(counts):
+        cd = CoverData(CoverTypeT.STMTBIN, 0)
+        cd.data = c
+        block.createNextCover(f"stmt_{i}", cd, None)
+    for name, c in extra:
+        cd = CoverData(CoverTypeT.STMTBIN, 0)
+        cd.data = c
+        block.createNextCover(name, cd, None)
+    return db
+
+
+@pytest.fixture
+def nightly(tmp_path):
+    paths = []
+    for i, counts in enumerate(([1, 0, 3, 0, 0],
+                                [0, 2, 3, 0, 0],
+                                [0, 0, 3, 0, 4])):
+        path = str(tmp_path / f"n{i}.cdb")
+        NcdbWriter().write(_make_db(counts), path)
+        paths.append(path)
+    return paths
+
+
+class TestCoverageDiff:
+
+    def test_same_schema_ncdb(self, nightly):
+        diff = CoverageDiff.load(nightly)
+        assert diff.same_schema
+        assert diff.paths == [f"top/stmt_{i}" for i in range(5)]
+
+        data = diff.to_dict()
+        first, second = data["comparisons"]
+        assert first["newly_hit"] == ["top/stmt_1"]
+        assert first["newly_lost"] == ["top/stmt_0"]
+        assert second["newly_hit"] == ["top/stmt_4"]
+        assert second["newly_lost_count"] == 1
+        assert first["hits_delta"] == 1
+        assert data["summary"]["lost_in_all_count"] == 1
+        assert data["summary"]["missed_by_baseline"] == [
+            {"bin": "top/stmt_1", "hit_in": 1},
+            {"bin": "top/stmt_4", "hit_in": 1}]
+
+    def test_matches_open_databases(self, nightly):
+        fast = CoverageDiff.load(nightly).to_dict()
+        dbs = [NcdbReader().read(p) for p in nightly]
+        slow = CoverageDiff.load(dbs, names=nightly).to_dict()
+        assert not CoverageDiff.load(dbs).same_schema
+        fast.pop("same_schema")
+        slow.pop("same_schema")
+        assert fast == slow
+
+    def test_alignment_by_path(self, nightly):
+        other = _make_db([1, 0, 0], [("extra", 7)])
+        diff = CoverageDiff.load([nightly[0], other])
+        assert not diff.same_schema
+        assert len(diff.paths) == 6
+
+        cmp = diff.compare(1)
+        assert cmp["new_bins"] == ["top/extra"]
+        assert cmp["removed_bins"] == ["top/stmt_3", "top/stmt_4"]
+        assert cmp["newly_lost"] == ["top/stmt_2"]
+        assert cmp["hits_delta"] == 1 - 4
+        assert cmp["bins"] == 4 and cmp["total_hits"] == 8
+
+    def test_limit(self, nightly):
+        diff = CoverageDiff.load([nightly[0], nightly[2]])
+        cmp = diff.compare(1, limit=0)
+        assert cmp["newly_lost"] == [] and cmp["newly_lost_count"] == 1
+
+    def test_requires_two_databases(self, nightly):
+        with pytest.raises(ValueError):
+            CoverageDiff.load(nightly[:1])
+
+
+class TestShowDiff:
+
+    def test_cli_and_batch(self, nightly, tmp_path):
+        out = tmp_path / "diff.json"
+        args = argparse.Namespace(db=nightly[0], compare_dbs=nightly[1:],
+                                  input_format=None, output_format='json',
+                                  out=str(out), limit=100)
+        ShowDiff(args).execute()
+        data = json.loads(out.read_text())
+        assert data["databases"] == nightly[1:]
+
+        batch = ShowBatch(argparse.Namespace(
+            db=nightly[0], input_format=None, output_format='json',
+            out=None, queries=None, stdin=False))
+        result = batch.run_query({"cmd": "diff", "compare_dbs": nightly[1:]})
+        assert result["data"] == data
+        assert "compare_dbs" in batch.run_query({"cmd": "diff"})["error"]
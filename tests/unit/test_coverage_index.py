@@ -0,0 +1,75 @@
+"""
+Tests for the indexed coverage report used by the show analyses.
+"""
+import argparse
+import random
+
+import pytest
+
+from .db_creator import DbCreator
+from ucis.cmd.show.show_gaps import ShowGaps
+from ucis.cmd.show.show_hotspots import ShowHotspots
+from ucis.report.coverage_index import CoverageIndex, top_k
+from ucis.report.coverage_metrics import CoverageMetrics
+from ucis.report.coverage_report_builder import CoverageReportBuilder
+
+
+@pytest.fixture
+def db():
+    db_creator = DbCreator()
+    db_creator.dummy_test_data()
+    inst = db_creator.dummy_instance()
+    db_creator.create_covergroup(inst, "cg_a", dict(coverpoints=dict(
+        cp_a=dict(bins=[("b0", 10), ("b1", 5), ("b2", 0)]),
+        cp_b=dict(bins=[("b0", 0), ("b1", 0)]))))
+    db_creator.create_covergroup(inst, "cg_b", dict(coverpoints=dict(
+        cp_c=dict(bins=[("x", 2)]))))
+    return db_creator.db
+
+
+def _args(**kw):
+    return argparse.Namespace(db="cov.xml", input_format=None,
+                              output_format='json', out=None, **kw)
+
+
+class TestCoverageIndex:
+
+    def test_top_k_matches_sorted_slice(self):
+        rnd = random.Random(7)
+        items = [(rnd.randint(0, 5), i) for i in range(200)]
+        key = lambda x: x[0]
+        for k in (None, 0, 1, 10, 500, -3):
+            for largest in (False, True):
+                assert (top_k(items, k, key, largest)
+                        == sorted(items, key=key, reverse=largest)[:k])
+
+    def test_index_counts(self, db):
+        index = CoverageIndex(CoverageReportBuilder.build(db))
+        assert [cg.name for cg in index.covergroups] == ["cg_a", "cg_b"]
+        assert index.total_coverpoints == 3
+        assert index.total_bins == 6
+        assert index.uncovered_bins == 3
+        assert index.partial_coverpoints == 1
+
+        cp = index.coverpoint_m["cg_a/cp_a"]
+        assert (cp.total_bins, cp.uncovered_bins) == (3, 1)
+        assert [b.name for b in cp.uncovered()] == ["b2"]
+        assert index.bin_counts["cg_a.cp_b.b1"] == 0
+        assert index.bin_counts["cg_b.cp_c.x"] == 2
+
+    def test_index_shared_between_commands(self, db):
+        metrics = CoverageMetrics(db)
+        hotspots = ShowHotspots(_args(threshold=80.0, limit=10))
+        gaps = ShowGaps(_args(threshold=None))
+        hotspots.metrics = metrics
+        gaps.metrics = metrics
+
+        data = hotspots.get_data()
+        gaps_data = gaps.get_data()
+        assert hotspots.index is gaps.index
+
+        incomplete = data["hotspots"]["incomplete_coverpoints"]
+        assert [(c["coverpoint"], c["uncovered_bins"]) for c in incomplete] \
+            == [("cp_a", 1)]
+        assert gaps_data["summary"]["uncovered_bins"] == 3
+        assert len(gaps_data["uncovered_bins"]) == 3
@@ -5,6 +5,7 @@ Created on Mar 27, 2020
 '''
 from _io import StringIO
 import os
+import pytest
 from ucis import UCIS_HISTORYNODE_TEST, UCIS_TESTSTATUS_OK, UCIS_OTHER, \
     UCIS_DU_MODULE, UCIS_ENABLED_STMT, UCIS_ENABLED_BRANCH, UCIS_ENABLED_COND, \
     UCIS_ENABLED_EXPR, UCIS_ENABLED_FSM, UCIS_ENABLED_TOGGLE, UCIS_INST_ONCE, \
@@ -81,3 +82,24 @@ class TestCoverageReport:
         cov_report = CoverageReportBuilder.build(db)
         
         print("covergroups: " + str(len(cov_report.covergroups)))
+
+    def test_overall_coverage_matches_build(self):
+        from .db_creator import DbCreator
+        creator = DbCreator()
+        creator.dummy_test_data()
+        inst = creator.dummy_instance()
+        creator.create_covergroup(inst, "cg1", dict(
+            options=dict(weight=2), coverpoints=dict(
+                cp1=dict(bins=[("a", 1), ("b", 0), ("c", 4)]),
+                cp2=dict(options=dict(weight=3, at_least=2),
+                         bins=[("a", 1), ("b", 2)]))))
+        creator.create_covergroup(inst, "cg2", dict(coverpoints=dict(
+            cp=dict(bins=[("a", 0), ("b", 0)]))))
+        creator.create_covergroup(inst, "cg3", dict(
+            options=dict(weight=0), coverpoints=dict(
+                cp=dict(bins=[("a", 1)]))))
+
+        expected = CoverageReportBuilder.build(creator.db).coverage
+        assert expected > 0
+        assert CoverageReportBuilder.overall_coverage(creator.db) == \
+            pytest.approx(expected)
@@ -0,0 +1,84 @@
+"""
+Tests for the single-pass CoverageRollup engine.
+"""
+from ucis import UCIS_OTHER, UCIS_DU_MODULE, UCIS_ENABLED_STMT, UCIS_INST_ONCE, UCIS_SCOPE_UNDER_DU
+from ucis.cover_data import CoverData
+from ucis.cover_type_t import CoverTypeT
+from ucis.mem.mem_factory import MemFactory
+from ucis.report.coverage_metrics import CoverageMetrics
+from ucis.report.coverage_rollup import CoverageRollup
+from ucis.scope_type_t import ScopeTypeT
+from ucis.source_info import SourceInfo
+from ucis.source_t import SourceT
+
+from .db_creator import DbCreator
+
+
+def _code_db():
+    db = MemFactory.create()
+    fh = db.createFileHandle("top.sv", "/rtl")
+    du = db.createScope("work.top", SourceInfo(fh, 1, 0), 1, UCIS_OTHER,
+                        UCIS_DU_MODULE,
+                        UCIS_ENABLED_STMT | UCIS_INST_ONCE | UCIS_SCOPE_UNDER_DU)
+    top = db.createInstance("top", None, 1, UCIS_OTHER, ScopeTypeT.INSTANCE,
+                            du, UCIS_INST_ONCE)
+    sub = top.createInstance("sub", None, 1, UCIS_OTHER, ScopeTypeT.INSTANCE,
+                             du, UCIS_INST_ONCE)
+    blk = sub.createScope("blk", None, 1, SourceT.SV, ScopeTypeT.BLOCK, 0)
+    for i, (ct, count) in enumerate([(CoverTypeT.STMTBIN, 1),
+                                     (CoverTypeT.STMTBIN, 0),
+                                     (CoverTypeT.BRANCHBIN, 3)]):
+        cd = CoverData(ct, 0)
+        cd.data = count
+        blk.createNextCover("i%d" % i, cd, None)
+    return db, top, sub
+
+
+class TestCoverageRollup:
+
+    def test_totals_by_type(self):
+        db, _, _ = _code_db()
+        r = CoverageRollup(db)
+        assert r.totals.total(CoverTypeT.STMTBIN) == 2
+        assert r.totals.covered(CoverTypeT.STMTBIN) == 1
+        assert r.totals.bins(CoverTypeT.BRANCHBIN).covered == 1
+        assert r.types_present() == [CoverTypeT.STMTBIN, CoverTypeT.BRANCHBIN]
+
+    def test_per_scope_subtree(self):
+        db, top, sub = _code_db()
+        r = CoverageRollup(db)
+        assert r.scope(top).total() == 3
+        assert r.scope(sub).covered() == 2
+        assert abs(r.scope(top).coverage_pct() - 200.0 / 3) < 1e-9
+
+    def test_at_least_semantics(self):
+        db, _, sub = _code_db()
+        blk = next(sub.scopes(ScopeTypeT.BLOCK))
+        item = next(blk.coverItems(CoverTypeT.BRANCHBIN))
+        item.getCoverData().at_least = 5
+        r = CoverageRollup(db)
+        assert r.totals.covered(CoverTypeT.BRANCHBIN) == 0
+
+    def test_metrics_share_rollup(self):
+        db, _, _ = _code_db()
+        m = CoverageMetrics(db)
+        by_type = m.code_coverage_by_type()
+        assert by_type[CoverTypeT.STMTBIN].total == 2
+        assert m.bins_by_type(CoverTypeT.BRANCHBIN).covered == 1
+        assert m.coverage_types_present() == [CoverTypeT.STMTBIN, CoverTypeT.BRANCHBIN]
+        assert m.rollup is m.rollup
+
+    def test_functional_single_pass(self):
+        c = DbCreator()
+        c.dummy_test_data()
+        inst = c.dummy_instance()
+        c.create_covergroup(inst, "cg", dict(coverpoints=dict(
+            cp1=dict(bins=[("a", 1), ("b", 0)]),
+            cp2=dict(bins=[("c", 2)]))))
+        m = CoverageMetrics(c.db)
+        assert m.functional_bins().total == 3
+        assert m.functional_bins().covered == 2
+        assert [cp.name for cp in m.coverpoint_stats()] == ["cp1", "cp2"]
+        assert len(m.coverpoint_stats(include_bins=True)[0].bin_details) == 2
+        assert m.coverpoint_stats()[0].bin_details == []
+        assert m.covergroup_stats()[0].bins.total == 3
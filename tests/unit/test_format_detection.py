@@ -27,7 +27,8 @@ from ucis.format_detection import (
     CoverageFormat, 
     detect_format,
     get_reader,
-    read_coverage_file
+    read_coverage_file,
+    read_coverage_files
 )
 
 
@@ -149,3 +150,65 @@ class TestFormatDetection:
         
         with pytest.raises(ValueError):
             read_coverage_file(str(py_file))
+
+
+def _cocotb_yaml_runs(tmp_path, n):
+    """Write *n* cocotb YAML files; return paths and expected bin totals."""
+    import yaml
+    paths, totals = [], {}
+    for run in range(n):
+        data = {
+            "top.cg.cp": {"at_least": 1, "weight": 1,
+                          "bins:_hits": {"b%d" % b: run + b for b in range(4)}},
+            # Only present from the second run on
+            "top.cg%d.cp" % min(run, 1): {"at_least": 1, "weight": 1,
+                                          "bins:_hits": {"x": 1}},
+        }
+        for path, entry in data.items():
+            for b, hits in entry["bins:_hits"].items():
+                key = path + "/" + b
+                totals[key] = totals.get(key, 0) + hits
+        path = tmp_path / ("run%d.yml" % run)
+        path.write_text(yaml.safe_dump(data))
+        paths.append(str(path))
+    return paths, totals
+
+
+def _bin_counts(db):
+    from ucis.cover_type_t import CoverTypeT
+    from ucis.scope_type_t import ScopeTypeT
+    
+    ret = []
+    def walk(scope, path):
+        for child in scope.scopes(ScopeTypeT.ALL):
+            if child.getScopeType() == ScopeTypeT.DU_MODULE:
+                continue
+            name = child.getScopeName()
+            child_path = path + "." + name if path else name
+            for ci in child.coverItems(CoverTypeT.ALL):
+                ret.append((child_path + "/" + ci.getName(),
+                            ci.getCoverData().data))
+            walk(child, child_path)
+    walk(db, "")
+    return ret
+
+
+class TestReadCoverageFiles:
+    """Multi-file import."""
+    
+    def test_counts_summed(self, tmp_path):
+        paths, totals = _cocotb_yaml_runs(tmp_path, 5)
+        db = read_coverage_files(paths, workers=1)
+        counts = _bin_counts(db)
+        assert len(counts) == len(totals)
+        assert {k.split(".", 1)[1]: v for k, v in counts} == totals
+    
+    def test_workers_match_sequential(self, tmp_path):
+        paths, _ = _cocotb_yaml_runs(tmp_path, 7)
+        seq = read_coverage_files(paths, CoverageFormat.COCOTB_YAML, workers=1)
+        par = read_coverage_files(paths, CoverageFormat.COCOTB_YAML, workers=2)
+        assert _bin_counts(par) == _bin_counts(seq)
+    
+    def test_unsupported_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            read_coverage_files([str(tmp_path / "x")], CoverageFormat.UNKNOWN)
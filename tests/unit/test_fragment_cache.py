@@ -0,0 +1,110 @@
+"""
+Tests for incremental report regeneration via the fragment cache.
+"""
+import argparse
+import io
+import os
+import re
+
+import pytest
+
+from ucis.formatters.fragment_cache import FragmentCache
+from ucis.formatters.format_cobertura import CoberturaFormatter
+from ucis.formatters.format_html import HtmlFormatter
+from ucis.formatters.format_lcov import LcovFormatter
+
+from .db_creator import DbCreator
+
+
+def _db(b_count=0):
+    creator = DbCreator()
+    creator.dummy_test_data()
+    inst = creator.dummy_instance()
+    creator.create_covergroup(inst, "cg1", dict(coverpoints=dict(
+        cp=dict(bins=[("a", 1), ("b", 0)]))))
+    creator.create_covergroup(inst, "cg2", dict(coverpoints=dict(
+        cp=dict(bins=[("a", 2), ("b", b_count)]))))
+    return creator.db
+
+
+def _strip_ts(text):
+    return re.sub(r'timestamp="\d+"', '', text)
+
+
+class TestFragmentCache:
+
+    def test_render_hit_and_prune(self, tmp_path):
+        cache = FragmentCache(str(tmp_path), 'ns')
+        d1 = cache.digest('a', 1)
+        assert cache.render(d1, lambda: 'one') == 'one'
+        assert cache.render(d1, lambda: 'other') == 'one'
+        assert (cache.hits, cache.misses) == (1, 1)
+        cache.close()
+
+        # Another database's run keeps fragments it did not use
+        cache = FragmentCache(str(tmp_path), 'ns')
+        cache.render(cache.digest('b'), lambda: 'two')
+        cache.close()
+        assert sorted(os.listdir(str(tmp_path / 'ns'))) == \
+            sorted([d1, cache.digest('b')])
+
+        # Stale fragments go; another run's temporary file stays
+        tmp = tmp_path / 'ns' / (d1 + '.1.1.tmp')
+        tmp.write_text('partial')
+        old = os.stat(str(tmp)).st_mtime - 10
+        for name in (d1, tmp.name):
+            os.utime(str(tmp_path / 'ns' / name), (old, old))
+        cache = FragmentCache(str(tmp_path), 'ns', max_age=5)
+        cache.render(cache.digest('b'), lambda: 'other')
+        cache.close()
+        assert sorted(os.listdir(str(tmp_path / 'ns'))) == \
+            sorted([cache.digest('b'), tmp.name])
+
+    def test_lcov_reuses_unchanged_covergroups(self, tmp_path):
+        ref = io.StringIO()
+        LcovFormatter().format(_db(), ref)
+
+        first = io.StringIO()
+        LcovFormatter(cache_dir=str(tmp_path)).format(_db(), first)
+        assert first.getvalue() == ref.getvalue()
+
+        # Only cg2 changed: cg1 comes from the cache
+        fmt = LcovFormatter(cache_dir=str(tmp_path))
+        second = io.StringIO()
+        fmt.format(_db(b_count=5), second)
+        expected = io.StringIO()
+        LcovFormatter().format(_db(b_count=5), expected)
+        assert second.getvalue() == expected.getvalue()
+        # The old cg2 fragment is kept until it has been unused for max_age
+        assert len(os.listdir(str(tmp_path / 'lcov'))) == 3
+
+    def test_cobertura_matches_uncached(self, tmp_path):
+        ref = io.StringIO()
+        CoberturaFormatter().format(_db(), ref)
+        assert '<class name="cg1"' in ref.getvalue()
+        assert 'ucis-classes' not in ref.getvalue()
+
+        for _ in range(2):
+            out = io.StringIO()
+            CoberturaFormatter(cache_dir=str(tmp_path)).format(_db(), out)
+            assert _strip_ts(out.getvalue()) == _strip_ts(ref.getvalue())
+
+    def test_html_dir_shards_reused(self, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        outputs = []
+        for run in range(2):
+            out_dir = tmp_path / ('out%d' % run)
+            HtmlFormatter(include_source=False, shard_depth=1,
+                          cache_dir=cache_dir).format_dir(_db(), str(out_dir))
+            outputs.append(sorted(
+                (p.name, p.read_text()) for p in (out_dir / 'shards').iterdir()))
+        assert outputs[0] == outputs[1]
+        assert len(os.listdir(os.path.join(cache_dir, 'html-9'))) == len(outputs[0])
+
+    def test_cache_dir_only_for_html_dir(self, tmp_path):
+        from ucis.cmd.cmd_report import report
+        args = argparse.Namespace(
+            input_format=None, output_format='html', out=None,
+            cache_dir=str(tmp_path / 'cache'), db=str(tmp_path / 'none.xml'))
+        with pytest.raises(Exception, match="does not support --cache-dir"):
+            report(args)
@@ -155,3 +155,84 @@ class TestHtmlFormatter:
         assert formatter._detect_language('file.c') == 'c'
         assert formatter._detect_language('file.cpp') == 'cpp'
         assert formatter._detect_language('file.xyz') == 'unknown'
+
+    def test_scope_coverage_from_rollup(self):
+        """Per-scope coverage and summary come from the shared rollup."""
+        from .db_creator import DbCreator
+        creator = DbCreator()
+        creator.dummy_test_data()
+        inst = creator.dummy_instance()
+        creator.create_covergroup(inst, "cg", dict(coverpoints=dict(
+            cp=dict(bins=[("a", 1), ("b", 0)]))))
+        
+        formatter = HtmlFormatter(include_source=False, compress=False)
+        formatter.format(creator.db, StringIO())
+        data = formatter._build_coverage_data(creator.db)
+        
+        assert data['summary']['total_items'] == 2
+        assert data['summary']['covered_items'] == 1
+        inst_data = [s for s in data['scopes'] if s['name'] == 'dummy'][0]
+        assert inst_data['coverage'] == 50.0
+        cp_data = inst_data['children'][0]['children'][0]
+        assert cp_data['type'] == 'COVERPOINT'
+        assert len(cp_data['bins']) == 2
+        assert cp_data['coveritems'] == []
+    
+    def _deep_db(self):
+        from .db_creator import DbCreator
+        creator = DbCreator()
+        creator.dummy_test_data()
+        inst = creator.dummy_instance()
+        creator.create_covergroup(inst, "cg", dict(coverpoints=dict(
+            cp=dict(bins=[("a", 1), ("b", 0)]))))
+        return creator.db
+    
+    def _read_shard(self, path):
+        import base64
+        import gzip
+        import json
+        with open(path) as f:
+            text = f.read()
+        assert text.startswith('ucisShard(')
+        body = text[len('ucisShard('):-len(');\n')]
+        shard_id, compressed, payload = body.split(',', 2)
+        if compressed == 'true':
+            return json.loads(gzip.decompress(base64.b64decode(json.loads(payload))))
+        return json.loads(payload)
+    
+    def test_format_dir_shards(self, tmp_path):
+        """Multi-file mode writes index.html plus on-demand subtree shards."""
+        import json
+        formatter = HtmlFormatter(include_source=False, compress=False,
+                                  shard_depth=1, workers=2)
+        formatter.format_dir(self._deep_db(), str(tmp_path))
+        
+        index = (tmp_path / 'index.html').read_text()
+        assert 'ucisLoadShard' in index
+        start = index.index('data-compressed="false">') + len('data-compressed="false">')
+        data = json.loads(index[start:index.index('</script>', start)])
+        assert data['sharded'] is True
+        
+        inst = [s for s in data['scopes'] if s['name'] == 'dummy'][0]
+        assert inst['children'] == []
+        assert inst['child_count'] == 1
+        assert inst['coverage'] == 50.0
+        
+        shard = self._read_shard(tmp_path / 'shards' / (inst['shard'] + '.js'))
+        cg = shard['children'][0]
+        assert cg['name'] == 'cg'
+        # shard_depth=1: the coverpoint lives in a nested shard
+        cp = self._read_shard(tmp_path / 'shards' / (cg['shard'] + '.js'))['children'][0]
+        assert cp['name'] == 'cp'
+        assert len(cp['bins']) == 2
+    
+    def test_format_dir_compressed_sources(self, tmp_path):
+        """Compressed shards decode, and source files get their own shards."""
+        formatter = HtmlFormatter(include_source=True, compress=True)
+        formatter.format_dir(self._deep_db(), str(tmp_path))
+        
+        shard_files = sorted(p.name for p in (tmp_path / 'shards').iterdir())
+        assert any(n.startswith('f') for n in shard_files)
+        for name in shard_files:
+            data = self._read_shard(tmp_path / 'shards' / name)
+            assert 'children' in data or 'path' in data
@@ -0,0 +1,230 @@
+"""
+Test that format backends and report modules are imported on first use.
+
+Each check runs in a fresh interpreter so that modules imported by other
+tests do not mask an eager import.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from ucis.rgy.format_if_db import FormatDescDb
+from ucis.rgy.format_rgy import FormatRgy
+
+
+def _loaded_after(code, modules):
+    """Run *code* in a new interpreter; return which of *modules* it loaded."""
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(
+        sys.modules['ucis'].__file__)))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [src_dir] + [p for p in [env.get('PYTHONPATH')] if p])
+    script = code + (
+        "\nimport sys, json\n"
+        "print(json.dumps([m for m in %r if m in sys.modules]))\n" % (modules,))
+    out = subprocess.run([sys.executable, '-c', script], env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+BACKENDS = [
+    'ucis.xml.db_format_if_xml',
+    'ucis.sqlite.db_format_if_sqlite',
+    'ucis.ncdb.db_format_if_ncdb',
+    'ucis.report',
+    'jsonschema',
+]
+
+
+# Public names of the ucis package before its report and registry
+# imports were made lazy; every one must remain reachable.
+PUBLIC_NAMES = """
+    CoverData CoverFlagsT CoverTypeT CoverageReport
+    CoverageReportBuilder DbFormatIfLib DbFormatIfXml DbFormatIfYaml
+    Dict FlagsT FormatCapabilities FormatDbFlags FormatDescDb
+    FormatDescRpt FormatIfDb FormatRgy FormatRptJson FormatRptText
+    HandleProperty HistoryNode HistoryNodeKind IntEnum IntFlag
+    IntProperty Obj RealProperty Scope ScopeTypeT SourceInfo SourceT
+    StrProperty TestData TestStatusT ToggleDirT ToggleMetricT
+    ToggleTypeT UCIS UCIS_ACTIVEBIN UCIS_ASSERT UCIS_ASSERTBIN
+    UCIS_ATTEMPTBIN UCIS_BLOCK UCIS_BLOCKBIN UCIS_BRANCH UCIS_BRANCHBIN
+    UCIS_CLASS UCIS_COND UCIS_CONDBIN UCIS_COUNT UCIS_COVBLOCK
+    UCIS_COVER UCIS_COVERBIN UCIS_COVERGROUP UCIS_COVERINSTANCE
+    UCIS_COVERPOINT UCIS_CROSS UCIS_CVGBIN UCIS_CVGBINSCOPE
+    UCIS_DEFAULTBIN UCIS_DISABLEDBIN UCIS_DU_ARCH UCIS_DU_INTERFACE
+    UCIS_DU_MODULE UCIS_DU_PACKAGE UCIS_DU_PROGRAM UCIS_E
+    UCIS_ENABLED_BLOCK UCIS_ENABLED_BRANCH UCIS_ENABLED_COND
+    UCIS_ENABLED_EXPR UCIS_ENABLED_FSM UCIS_ENABLED_STMT
+    UCIS_ENABLED_TOGGLE UCIS_EXPR UCIS_EXPRBIN UCIS_FAILBIN
+    UCIS_FORKJOIN UCIS_FSM UCIS_FSMBIN UCIS_FSM_STATES UCIS_FSM_TRANS
+    UCIS_FUNCTION UCIS_GENERATE UCIS_GENERIC UCIS_GENERICBIN
+    UCIS_HAS_GOAL UCIS_HAS_WEIGHT UCIS_HISTORYNODE_ALL
+    UCIS_HISTORYNODE_MERGE UCIS_HISTORYNODE_NONE UCIS_HISTORYNODE_TEST
+    UCIS_IGNOREBIN UCIS_IGNOREBINSCOPE UCIS_ILLEGALBIN
+    UCIS_ILLEGALBINSCOPE UCIS_INSTANCE UCIS_INST_ONCE UCIS_INTERFACE
+    UCIS_INT_BRANCH_COUNT UCIS_INT_BRANCH_HAS_ELSE
+    UCIS_INT_BRANCH_ISCASE UCIS_INT_COVER_GOAL UCIS_INT_COVER_LIMIT
+    UCIS_INT_COVER_WEIGHT UCIS_INT_CVG_ATLEAST UCIS_INT_CVG_AUTOBINMAX
+    UCIS_INT_CVG_DETECTOVERLAP UCIS_INT_CVG_GETINSTCOV
+    UCIS_INT_CVG_MERGEINSTANCES UCIS_INT_CVG_NUMPRINTMISSING
+    UCIS_INT_CVG_PERINSTANCE UCIS_INT_CVG_STROBE UCIS_INT_FSM_STATEVAL
+    UCIS_INT_IS_MODIFIED UCIS_INT_MODIFIED_SINCE_SIM
+    UCIS_INT_NUM_CROSSED_CVPS UCIS_INT_NUM_TESTS UCIS_INT_SCOPE_GOAL
+    UCIS_INT_SCOPE_IS_UNDER_COVERINSTANCE UCIS_INT_SCOPE_IS_UNDER_DU
+    UCIS_INT_SCOPE_NUM_COVERITEMS UCIS_INT_SCOPE_NUM_EXPR_TERMS
+    UCIS_INT_SCOPE_SOURCE_TYPE UCIS_INT_SCOPE_WEIGHT UCIS_INT_STMT_INDEX
+    UCIS_INT_TEST_COMPULSORY UCIS_INT_TEST_STATUS
+    UCIS_INT_TOGGLE_COVERED UCIS_INT_TOGGLE_DIR UCIS_INT_TOGGLE_TYPE
+    UCIS_IS_32BIT UCIS_IS_64BIT UCIS_IS_IMMEDIATE_ASSERT
+    UCIS_IS_TOP_NODE UCIS_IS_VECTOR UCIS_NONE UCIS_OTHER UCIS_PACKAGE
+    UCIS_PASSBIN UCIS_PEAKACTIVEBIN UCIS_PROCESS UCIS_PROGRAM
+    UCIS_PSL_SV UCIS_PSL_SYSTEMC UCIS_PSL_VHDL UCIS_PSL_VLOG
+    UCIS_RESERVEDBIN UCIS_RESERVEDSCOPE UCIS_SCOPE_BLOCK_ISBRANCH
+    UCIS_SCOPE_CVG_AUTO UCIS_SCOPE_CVG_SCALAR UCIS_SCOPE_CVG_TRANSITION
+    UCIS_SCOPE_CVG_VECTOR UCIS_SCOPE_ERROR UCIS_SCOPE_EXCLUDED
+    UCIS_SCOPE_IFF_EXISTS UCIS_SCOPE_PRAGMA_CLEARED
+    UCIS_SCOPE_PRAGMA_EXCLUDED UCIS_SCOPE_SPECIALIZED
+    UCIS_SCOPE_UNDER_DU UCIS_SOURCE_ERROR UCIS_STMTBIN UCIS_STR_COMMENT
+    UCIS_STR_DESIGN_VERSION_ID UCIS_STR_DU_SIGNATURE UCIS_STR_EXPR_TERMS
+    UCIS_STR_FILE_NAME UCIS_STR_GENERIC UCIS_STR_HIST_CMDLINE
+    UCIS_STR_HIST_LOG_NAME UCIS_STR_HIST_PHYS_NAME UCIS_STR_HIST_RUNCWD
+    UCIS_STR_HIST_TOOLCATEGORY UCIS_STR_INSTANCE_DU_NAME
+    UCIS_STR_ITH_CROSSED_CVP_NAME UCIS_STR_SCOPE_HIER_NAME
+    UCIS_STR_SCOPE_NAME UCIS_STR_TEST_DATE UCIS_STR_TEST_HOSTNAME
+    UCIS_STR_TEST_HOSTOS UCIS_STR_TEST_NAME UCIS_STR_TEST_SEED
+    UCIS_STR_TEST_SIMARGS UCIS_STR_TEST_TIMEUNIT UCIS_STR_TEST_USERNAME
+    UCIS_STR_TOGGLE_CANON_NAME UCIS_STR_UNIQUE_ID
+    UCIS_STR_UNIQUE_ID_ALIAS UCIS_STR_VER_STANDARD
+    UCIS_STR_VER_STANDARD_VERSION UCIS_STR_VER_VENDOR_ID
+    UCIS_STR_VER_VENDOR_TOOL UCIS_STR_VER_VENDOR_VERSION UCIS_SV
+    UCIS_SYSTEMC UCIS_TASK UCIS_TESTSTATUS_ERROR UCIS_TESTSTATUS_FATAL
+    UCIS_TESTSTATUS_MERGE_ERROR UCIS_TESTSTATUS_MISSING
+    UCIS_TESTSTATUS_OK UCIS_TESTSTATUS_WARNING UCIS_TOGGLE
+    UCIS_TOGGLEBIN UCIS_TOGGLE_DIR_IN UCIS_TOGGLE_DIR_INOUT
+    UCIS_TOGGLE_DIR_INTERNAL UCIS_TOGGLE_DIR_OUT
+    UCIS_TOGGLE_METRIC_2STOGGLE UCIS_TOGGLE_METRIC_ENUM
+    UCIS_TOGGLE_METRIC_NOBINS UCIS_TOGGLE_METRIC_TRANSITION
+    UCIS_TOGGLE_METRIC_XTOGGLE UCIS_TOGGLE_METRIC_ZTOGGLE
+    UCIS_TOGGLE_TYPE_NET UCIS_TOGGLE_TYPE_REG UCIS_UOR_SAFE_SCOPE
+    UCIS_UOR_SAFE_SCOPE_ALLCOVERS UCIS_USERBIN UCIS_USERBITS
+    UCIS_VACUOUSBIN UCIS_VERA UCIS_VHDL UCIS_VLOG auto cov_scope
+    cover_data cover_flags_t cover_index cover_instance cover_item
+    cover_type cover_type_t coverage_report coverage_report_builder
+    covergroup coverpoint cross cvg_scope dataclass datetime du_scope
+    field file_handle flags_t format_if_db format_if_rpt format_rgy
+    func_cov_scope handle_property history_node history_node_kind
+    instance_coverage instance_scope int_property lib logging mem
+    name_value obj real_property report rgy scope scope_type_t
+    source_file source_info source_t statement_id str_property test_data
+    test_status_t toggle_dir_t toggle_metric_t toggle_type_t ucis
+    ucis_Close ucis_CreateFileHandle ucis_CreateHistoryNode
+    ucis_CreateInstance ucis_CreateNextCover ucis_CreateScope
+    ucis_CreateToggle ucis_GetHandleProperty ucis_GetIntProperty
+    ucis_GetRealProperty ucis_GetStringProperty ucis_RemoveScope
+    ucis_SetHandleProperty ucis_SetIntProperty ucis_SetRealProperty
+    ucis_SetStringProperty ucis_SetTestData ucis_Time ucis_Write
+    unimpl_error xml yaml
+""".split()
+
+
+class TestLazyFormatRgy:
+
+    def test_import_loads_no_backends(self):
+        assert _loaded_after("import ucis", BACKENDS) == []
+
+    def test_registry_loads_no_backends(self):
+        code = ("from ucis.rgy.format_rgy import FormatRgy\n"
+                "rgy = FormatRgy.inst()\n"
+                "assert rgy.hasDatabaseFormat('xml')\n"
+                "assert 'sqlite' in rgy.getDatabaseFormats()\n")
+        assert _loaded_after(code, BACKENDS) == []
+
+    def test_lookup_loads_only_requested_backend(self):
+        code = ("from ucis.rgy.format_rgy import FormatRgy\n"
+                "FormatRgy.inst().getDatabaseDesc('xml').fmt_if()\n")
+        assert _loaded_after(code, BACKENDS) == ['ucis.xml.db_format_if_xml']
+
+    def test_lazy_package_attributes(self):
+        import ucis
+        from ucis.report.coverage_report import CoverageReport
+        assert ucis.CoverageReport is CoverageReport
+        assert ucis.FormatRgy is FormatRgy
+        assert 'FormatRgy' in dir(ucis)
+        with pytest.raises(AttributeError):
+            ucis.NoSuchAttribute
+
+    def test_public_names_kept(self):
+        import ucis
+        missing = [n for n in PUBLIC_NAMES if not hasattr(ucis, n)]
+        assert missing == []
+        assert set(PUBLIC_NAMES) <= set(dir(ucis))
+
+    def test_public_names_still_lazy(self):
+        code = "import ucis\nucis.DbFormatIfXml\nucis.xml\n"
+        assert _loaded_after(code, BACKENDS) == ['ucis.xml.db_format_if_xml']
+
+    def test_provider_registered_by_name(self):
+        rgy = FormatRgy.inst()
+        rgy.addDatabaseFormatProvider(
+            'lazy-test', '%s:_LazyTestFormat' % __name__)
+        try:
+            assert rgy.hasDatabaseFormat('lazy-test')
+            assert 'lazy-test' in rgy.getDatabaseFormats()
+            assert _LazyTestFormat.registered == 0
+            assert rgy.getDatabaseDesc('lazy-test').fmt_if is _LazyTestFormat
+            assert rgy.getDatabaseDesc('lazy-test').fmt_if is _LazyTestFormat
+            assert _LazyTestFormat.registered == 1
+        finally:
+            rgy._format_db_m.pop('lazy-test', None)
+            rgy._format_db_lazy_m.pop('lazy-test', None)
+
+    def test_concurrent_lookup_loads_once(self):
+        from concurrent.futures import ThreadPoolExecutor
+        rgy = FormatRgy.inst()
+        rgy.addDatabaseFormatProvider(
+            'slow-test', '%s:_SlowTestFormat' % __name__)
+        try:
+            with ThreadPoolExecutor(8) as pool:
+                descs = list(pool.map(lambda _: rgy.getDatabaseDesc('slow-test'),
+                                      range(8)))
+            assert all(d.fmt_if is _SlowTestFormat for d in descs)
+            assert _SlowTestFormat.registered == 1
+        finally:
+            rgy._format_db_m.pop('slow-test', None)
+            rgy._format_db_lazy_m.pop('slow-test', None)
+
+    def test_failed_provider_stays_registered(self):
+        rgy = FormatRgy.inst()
+        rgy.addDatabaseFormatProvider('broken-test', 'ucis_no_such_module:X')
+        try:
+            for _ in range(2):
+                with pytest.raises(ImportError):
+                    rgy.getDatabaseDesc('broken-test')
+                assert rgy.hasDatabaseFormat('broken-test')
+        finally:
+            rgy._format_db_lazy_m.pop('broken-test', None)
+
+
+class _LazyTestFormat(object):
+    registered = 0
+
+    @classmethod
+    def register(cls, rgy):
+        cls.registered += 1
+        rgy.addDatabaseFormat(FormatDescDb(cls, 'lazy-test', 0, 'Lazy test'))
+
+
+class _SlowTestFormat(object):
+    registered = 0
+
+    @classmethod
+    def register(cls, rgy):
+        # Leave time for other threads to look the format up meanwhile
+        time.sleep(0.1)
+        cls.registered += 1
+        rgy.addDatabaseFormat(FormatDescDb(cls, 'slow-test', 0, 'Slow test'))
@@ -0,0 +1,117 @@
+"""
+Tests for the compact (array-backed) MemUCIS storage mode.
+"""
+from ucis import UCIS_OTHER, UCIS_DU_MODULE, UCIS_ENABLED_STMT, UCIS_INST_ONCE, UCIS_SCOPE_UNDER_DU
+from ucis.cover_data import CoverData
+from ucis.cover_type_t import CoverTypeT
+from ucis.mem.mem_cover_store import MemCoverStore, MemCoverIndexView
+from ucis.mem.mem_factory import MemFactory
+from ucis.mem.mem_scope import MemScope
+from ucis.mem.mem_cover_index import MemCoverIndex
+from ucis.report.coverage_report_builder import CoverageReportBuilder
+from ucis.scope_type_t import ScopeTypeT
+from ucis.source_info import SourceInfo
+from ucis.source_t import SourceT
+
+
+def _build(db, n_bins=8):
+    fh = db.createFileHandle("top.sv", "/rtl")
+    du = db.createScope("top", SourceInfo(fh, 1, 0), 1, UCIS_OTHER,
+                        UCIS_DU_MODULE,
+                        UCIS_ENABLED_STMT | UCIS_INST_ONCE | UCIS_SCOPE_UNDER_DU)
+    inst = db.createInstance("top", None, 1, UCIS_OTHER, ScopeTypeT.INSTANCE,
+                             du, UCIS_INST_ONCE)
+    cg = inst.createCovergroup("cg", SourceInfo(fh, 3, 0), 1, SourceT.SV)
+    cp = cg.createCoverpoint("cp", SourceInfo(fh, 4, 0), 1, SourceT.SV)
+    for i in range(n_bins):
+        cd = CoverData(CoverTypeT.CVGBIN, 0)
+        cd.data = i
+        cd.goal = 1
+        cd.weight = 1
+        cp.createNextCover("b%d" % i, cd, SourceInfo(fh, 4, 0))
+    return cp
+
+
+class TestMemCompact:
+
+    def test_store_used(self):
+        db = MemFactory.create(compact=True)
+        cp = _build(db)
+        assert isinstance(cp.m_cover_items, MemCoverStore)
+        assert len(cp.m_cover_items) == 8
+        assert list(cp.m_cover_items.counts) == list(range(8))
+
+    def test_default_mode_unchanged(self):
+        db = MemFactory.create()
+        cp = _build(db)
+        assert isinstance(cp.m_cover_items, list)
+        assert isinstance(cp.m_cover_items[0], MemCoverIndex)
+
+    def test_view_write_through(self):
+        db = MemFactory.create(compact=True)
+        cp = _build(db)
+        items = list(cp.coverItems(CoverTypeT.CVGBIN))
+        assert all(isinstance(i, MemCoverIndexView) for i in items)
+        assert items[3].getName() == "b3"
+        assert items[3].getSourceInfo().line == 4
+
+        items[3].incrementCover(10)
+        items[3].getCoverData().goal = 5
+        data = cp.m_cover_items[3].getCoverData()
+        assert data.data == 13
+        assert data.goal == 5
+        assert data.type == CoverTypeT.CVGBIN
+
+    def test_names_and_srcinfo_interned(self):
+        db = MemFactory.create(compact=True)
+        _build(db)
+        _build(db)
+        # Both coverpoints share the same 8 bin names and one srcinfo
+        assert len(db.m_cover_tables.names) == 8
+        assert len(db.m_cover_tables.srcinfos) == 1
+
+    def test_remove_cover(self):
+        db = MemFactory.create(compact=True)
+        cp = _build(db, 4)
+        cp.removeCover(1)
+        assert [i.getName() for i in cp.coverItems(CoverTypeT.CVGBIN)] == ["b0", "b2", "b3"]
+
+    def test_add_copies_cover_data(self):
+        db = MemFactory.create(compact=True)
+        cp = _build(db, 2)
+        cd = CoverData(CoverTypeT.CVGBIN, 0)
+        cd.data = 7
+        idx = cp.m_cover_items.add("b2", cd, None)
+        cd.data = 100
+        assert cp.m_cover_items[idx].getCoverData().data == 7
+
+    def test_pop_keeps_all_fields(self):
+        db = MemFactory.create(compact=True)
+        cp = _build(db, 4)
+        view = cp.m_cover_items[1]
+        view.getCoverData().at_least = 3
+        view.getCoverData().limit = 9
+        view.setAttribute("k", "v")
+        item = cp.m_cover_items.pop(1)
+        assert [i.getName() for i in cp.m_cover_items] == ["b0", "b2", "b3"]
+        assert item.getName() == "b1"
+        assert item.getSourceInfo().line == 4
+        assert item.getAttribute("k") == "v"
+        data = item.getCoverData()
+        assert (data.type, data.data, data.at_least, data.goal,
+                data.weight, data.limit) == (CoverTypeT.CVGBIN, 1, 3, 1, 1, 9)
+
+    def test_report_matches_default(self):
+        reports = []
+        for compact in (False, True):
+            db = MemFactory.create(compact=compact)
+            _build(db)
+            reports.append(CoverageReportBuilder.build(db).coverage)
+        assert reports[0] == reports[1]
+
+    def test_scopes_have_no_dict(self):
+        db = MemFactory.create(compact=True)
+        cp = _build(db)
+        assert isinstance(cp, MemScope)
+        assert not hasattr(cp, '__dict__')
+        assert not hasattr(MemCoverIndex("b", None, None), '__dict__')
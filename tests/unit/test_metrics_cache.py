@@ -0,0 +1,152 @@
+"""
+Tests for the persistent metrics cache sidecar.
+"""
+import argparse
+import json
+import os
+
+import pytest
+
+from .db_creator import DbCreator
+from ucis.cmd.show.show_gaps import ShowGaps
+from ucis.cmd.show.show_summary import ShowSummary
+from ucis.cover_type_t import CoverTypeT
+from ucis.report.coverage_metrics import CoverageMetrics
+from ucis.report.metrics_cache import CACHE_SUFFIX, MetricsCache
+from ucis.xml.xml_factory import XmlFactory
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    db_creator = DbCreator()
+    db_creator.dummy_test_data()
+    inst = db_creator.dummy_instance()
+    db_creator.create_covergroup(inst, "cg_a", dict(coverpoints=dict(
+        cp_a=dict(bins=[("b0", 10), ("b1", 5), ("b2", 0)]),
+        cp_b=dict(bins=[("b0", 0), ("b1", 1)]))))
+    db_creator.create_covergroup(inst, "cg_b", dict(coverpoints=dict(
+        cp_c=dict(bins=[("x", 2)]))))
+    path = str(tmp_path / "cov.xml")
+    XmlFactory.write(db_creator.db, path)
+    return path
+
+
+def _no_db():
+    raise AssertionError("database read despite cached results")
+
+
+def _results(metrics):
+    return [
+        metrics.summary(),
+        metrics.functional_bins(),
+        metrics.covergroup_stats(),
+        metrics.coverpoint_stats(),
+        metrics.coverpoint_stats(include_bins=True),
+        metrics.cross_stats(),
+        metrics.coverage_types_present(),
+        metrics.code_coverage_by_type(),
+        metrics.bins_by_type(CoverTypeT.STMTBIN),
+        metrics.file_coverage(),
+        metrics.tests(),
+    ]
+
+
+def _report_tuple(report):
+    def bins(lst):
+        return [(b.name, b.goal, b.count) for b in lst]
+
+    def cg(c):
+        return (c.name, c.instname, c.coverage, c.weight,
+                [(cp.name, cp.coverage, cp.weight, bins(cp.bins),
+                  bins(cp.ignore_bins), bins(cp.illegal_bins))
+                 for cp in c.coverpoints],
+                [(cr.name, cr.coverage, bins(cr.bins)) for cr in c.crosses],
+                [cg(sub) for sub in c.covergroups])
+    return (report.coverage, [cg(c) for c in report.covergroups],
+            sorted((k, v.name) for k, v in report.covergroup_m.items()))
+
+
+class TestMetricsCache:
+
+    def test_results_reloaded_without_database(self, db_path):
+        db = XmlFactory.read(db_path)
+        first = CoverageMetrics(db, cache=MetricsCache(db_path))
+        expected = _results(first)
+        report = first.report
+        first.save_cache()
+        assert os.path.exists(db_path + CACHE_SUFFIX)
+
+        cache = MetricsCache(db_path)
+        second = CoverageMetrics(None, cache=cache, loader=_no_db)
+        assert _results(second) == expected
+        assert _report_tuple(second.report) == _report_tuple(report)
+        assert cache.misses == 0
+
+    def test_database_change_invalidates(self, db_path):
+        db = XmlFactory.read(db_path)
+        metrics = CoverageMetrics(db, cache=MetricsCache(db_path))
+        metrics.summary()
+        metrics.save_cache()
+
+        st = os.stat(db_path)
+        os.utime(db_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000000))
+        cache = MetricsCache(db_path)
+        assert cache.get('summary') is None
+
+    def test_not_saved_when_database_changes_meanwhile(self, db_path):
+        cache = MetricsCache(db_path)
+        cache.put('summary', {'overall_coverage': 1.0})
+        with open(db_path, 'a') as fp:
+            fp.write("\n")
+        cache.save()
+        assert not os.path.exists(db_path + CACHE_SUFFIX)
+
+    def test_corrupt_sidecar_ignored(self, db_path):
+        with open(db_path + CACHE_SUFFIX, 'w') as fp:
+            fp.write("{not json\n")
+        cache = MetricsCache(db_path)
+        assert cache.get('summary') is None
+        cache.put('summary', {'overall_coverage': 1.0})
+        cache.save()
+        assert MetricsCache(db_path).get('summary') == {'overall_coverage': 1.0}
+
+    def test_non_file_database_disabled(self, tmp_path):
+        assert not MetricsCache(str(tmp_path)).enabled
+        assert not MetricsCache(str(tmp_path / "missing.cdb")).enabled
+
+
+def _run_show(cls, db_path, **kw):
+    out = db_path + ".out.json"
+    args = argparse.Namespace(db=db_path, input_format=None,
+                              output_format='json', out=out, **kw)
+    cls(args).execute()
+    with open(out) as fp:
+        return fp.read()
+
+
+class TestShowCache:
+
+    def test_show_answered_from_cache(self, db_path, monkeypatch):
+        summary = _run_show(ShowSummary, db_path, no_cache=False)
+        gaps = _run_show(ShowGaps, db_path, no_cache=False, threshold=80.0)
+
+        monkeypatch.setattr(ShowSummary, "read_db", lambda self: _no_db())
+        monkeypatch.setattr(ShowGaps, "read_db", lambda self: _no_db())
+        assert _run_show(ShowSummary, db_path, no_cache=False) == summary
+        assert _run_show(ShowGaps, db_path, no_cache=False,
+                         threshold=80.0) == gaps
+        # New options are computed from the cached report, still without
+        # reading the database
+        assert _run_show(ShowGaps, db_path, no_cache=False,
+                         threshold=50.0) != ""
+
+    def test_cached_result_names_requested_path(self, db_path, monkeypatch):
+        _run_show(ShowSummary, db_path, no_cache=False)
+        monkeypatch.chdir(os.path.dirname(db_path))
+        monkeypatch.setattr(ShowSummary, "read_db", lambda self: _no_db())
+        data = json.loads(_run_show(ShowSummary, "cov.xml", no_cache=False))
+        assert data["database"] == "cov.xml"
+
+    def test_no_cache_option(self, db_path):
+        _run_show(ShowSummary, db_path, no_cache=True)
+        assert not os.path.exists(db_path + CACHE_SUFFIX)
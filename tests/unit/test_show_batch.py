@@ -0,0 +1,124 @@
+"""
+Tests for UCIS show batch command
+"""
+import argparse
+import io
+import json
+
+import pytest
+
+from .db_creator import DbCreator
+from ucis.cmd.show.show_batch import ShowBatch
+from ucis.cmd.show.show_gaps import ShowGaps
+from ucis.cmd.show.show_summary import ShowSummary
+from ucis.report.coverage_report_builder import CoverageReportBuilder
+from ucis.xml.xml_factory import XmlFactory
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    db_creator = DbCreator()
+    db_creator.dummy_test_data()
+    inst = db_creator.dummy_instance()
+    db_creator.create_covergroup(inst, "cg_test", dict(coverpoints=dict(
+        cp_a=dict(bins=[("bin1", 10), ("bin2", 5), ("bin3", 0)]),
+        cp_b=dict(bins=[("bin1", 0), ("bin2", 0)]))))
+    path = str(tmp_path / "cov.xml")
+    XmlFactory.write(db_creator.db, path)
+    return path
+
+
+def _batch_args(db_path, **kw):
+    args = dict(db=db_path, input_format=None, output_format='json',
+                out=None, queries=None, stdin=False)
+    args.update(kw)
+    return argparse.Namespace(**args)
+
+
+def _single(cmd_class, db_path, **kw):
+    """Run a standalone show command the way the CLI would."""
+    args = argparse.Namespace(db=db_path, input_format='xml',
+                              output_format='json', out=None, **kw)
+    cmd = cmd_class(args)
+    cmd.load_db()
+    try:
+        return cmd.get_data()
+    finally:
+        cmd.db.close()
+
+
+class TestShowBatch:
+
+    def test_results_match_standalone_commands(self, db_path, tmp_path):
+        queries = tmp_path / "q.json"
+        queries.write_text(json.dumps([
+            {"cmd": "summary"},
+            {"cmd": "gaps", "threshold": 50},
+        ]))
+        out = tmp_path / "out.json"
+        ShowBatch(_batch_args(db_path, queries=str(queries),
+                              out=str(out))).execute()
+
+        data = json.loads(out.read_text())
+        assert data["database"] == db_path
+        summary, gaps = data["results"]
+        assert summary["data"] == _single(ShowSummary, db_path)
+        assert gaps["query"] == {"cmd": "gaps", "threshold": 50}
+        assert gaps["data"] == _single(ShowGaps, db_path, threshold=50)
+
+    def test_report_built_once(self, db_path, tmp_path, monkeypatch):
+        calls = []
+        build = CoverageReportBuilder.build
+
+        def counting_build(db):
+            calls.append(db)
+            return build(db)
+        monkeypatch.setattr(CoverageReportBuilder, "build",
+                            staticmethod(counting_build))
+
+        queries = tmp_path / "q.jsonl"
+        queries.write_text("\n".join(json.dumps(q) for q in [
+            {"cmd": "summary"}, {"cmd": "gaps"}, {"cmd": "hotspots"},
+            {"cmd": "covergroups"}, {"cmd": "metrics"}, {"cmd": "tests"},
+        ]))
+        cmd = ShowBatch(_batch_args(db_path, queries=str(queries)))
+        cmd.load_db()
+        data = cmd.get_data()
+        cmd.db.close()
+
+        assert [("error" in r) for r in data["results"]] == [False] * 6
+        assert len(calls) == 1
+
+    def test_bad_queries_reported_individually(self, db_path):
+        cmd = ShowBatch(_batch_args(db_path, stdin=True))
+        cmd.load_db()
+        fin = io.StringIO('{"cmd": "summary"}\n'
+                          'not json\n'
+                          '\n'
+                          '{"cmd": "no-such-cmd"}\n'
+                          '{"cmd": "gaps", "bogus": 1}\n'
+                          '{"cmd": "compare"}\n'
+                          '{"cmd": "tests"}\n')
+        fout = io.StringIO()
+        cmd.serve(fin, fout)
+        cmd.db.close()
+
+        lines = [json.loads(l) for l in fout.getvalue().splitlines()]
+        assert len(lines) == 6
+        assert "data" in lines[0] and "data" in lines[5]
+        assert "Invalid query" in lines[1]["error"]
+        assert "Unknown show command" in lines[2]["error"]
+        assert "bogus" in lines[3]["error"]
+        assert "compare_db" in lines[4]["error"]
+
+    def test_query_writes_own_output(self, db_path, tmp_path):
+        out = tmp_path / "summary.txt"
+        cmd = ShowBatch(_batch_args(db_path))
+        cmd.load_db()
+        result = cmd.run_query({"cmd": "summary", "output_format": "text",
+                                "out": str(out)})
+        cmd.db.close()
+        assert result == {"query": {"cmd": "summary", "output_format": "text",
+                                    "out": str(out)},
+                          "out": str(out)}
+        assert "overall_coverage:" in out.read_text()
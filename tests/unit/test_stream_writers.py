@@ -0,0 +1,104 @@
+"""
+Tests for the streaming CI-export formatters (LCOV, Cobertura, JaCoCo, Clover).
+"""
+import gzip
+import io
+import re
+import xml.etree.ElementTree as ET
+from xml.dom import minidom
+
+import pytest
+
+from ucis.formatters.format_clover import CloverFormatter
+from ucis.formatters.format_cobertura import CoberturaFormatter
+from ucis.formatters.format_jacoco import JacocoFormatter
+from ucis.formatters.format_lcov import LcovFormatter
+from ucis.formatters.stream_writer import XmlStreamWriter
+
+from .db_creator import DbCreator
+
+
+FORMATTERS = [LcovFormatter, CoberturaFormatter, JacocoFormatter, CloverFormatter]
+
+
+def _db(with_cg=True):
+    creator = DbCreator()
+    creator.dummy_test_data()
+    inst = creator.dummy_instance()
+    if with_cg:
+        creator.create_covergroup(inst, "cg_a&b", dict(coverpoints=dict(
+            cp1=dict(bins=[("a", 1), ("b", 0)]),
+            cp2=dict(bins=[("x", 3)]))))
+        creator.create_covergroup(inst, "cg2", dict(coverpoints=dict(
+            cp=dict(bins=[]))))
+    return creator.db
+
+
+def _strip_ts(text):
+    return re.sub(r'(timestamp|generated|start|dump)="\d+"', '', text)
+
+
+class TestXmlStreamWriter:
+
+    def test_matches_minidom_layout(self):
+        root = ET.Element('a', {'k': 'v"<&>'})
+        ET.SubElement(ET.SubElement(root, 'b'), 'c', {'n': '1'})
+        ET.SubElement(root, 't').text = 'x & y'
+        ET.SubElement(root, 'e')
+        expected = minidom.parseString(
+            ET.tostring(root, encoding='unicode')).toprettyxml(indent="  ")
+
+        out = io.StringIO()
+        w = XmlStreamWriter(out)
+        w.start('a', {'k': 'v"<&>'})
+        w.start('b')
+        w.empty('c', {'n': '1'})
+        w.end()
+        w.text('t', 'x & y')
+        w.empty('e')
+        w.close()
+        assert out.getvalue() == expected
+
+
+class TestStreamingFormatters:
+
+    @pytest.mark.parametrize("fmt", FORMATTERS)
+    def test_gzip_output_matches_text(self, fmt):
+        text = io.StringIO()
+        fmt().format(_db(), text)
+
+        raw = io.BytesIO()
+        with gzip.GzipFile(fileobj=raw, mode='wb') as gz:
+            fmt().format(_db(), gz)
+        data = gzip.decompress(raw.getvalue()).decode('utf-8')
+        assert _strip_ts(data) == _strip_ts(text.getvalue())
+
+    @pytest.mark.parametrize("fmt", [CoberturaFormatter, JacocoFormatter, CloverFormatter])
+    @pytest.mark.parametrize("with_cg", [True, False])
+    def test_well_formed_xml(self, fmt, with_cg):
+        out = io.StringIO()
+        fmt().format(_db(with_cg), out)
+        root = ET.fromstring(out.getvalue())
+        names = [e.get('name') for e in root.iter() if e.tag in ('class', 'file')]
+        if with_cg:
+            assert any(n and n.startswith('cg_a&b') for n in names)
+        else:
+            assert names == []
+
+    def test_cobertura_rates(self):
+        out = io.StringIO()
+        CoberturaFormatter().format(_db(), out)
+        root = ET.fromstring(out.getvalue())
+        # cg_a&b: (50 + 100) / 2 = 75%, cg2: 0%
+        assert root.get('line-rate') == '0.3750'
+        cls = root.find('packages/package/classes/class')
+        assert [l.get('hits') for l in cls.findall('lines/line')] == ['1', '0', '3']
+
+    def test_jacoco_counters(self):
+        out = io.StringIO()
+        JacocoFormatter().format(_db(), out)
+        root = ET.fromstring(out.getvalue())
+        counters = {c.get('type'): (c.get('missed'), c.get('covered'))
+                    for c in root.findall('counter')}
+        assert counters['LINE'] == ('1', '2')
+        assert counters['CLASS'] == ('0', '2')
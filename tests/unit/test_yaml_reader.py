@@ -161,4 +161,66 @@ class TestYamlReader:
         assert len(rpt.covergroups[0].coverpoints[0].bins) == 2
         assert len(rpt.covergroups[0].coverpoints[1].bins) == 2
         assert rpt.covergroups[0].coverage == 75.0
-        
\ No newline at end of file
+        
+    def test_type_bins_aggregated(self):
+        text = """
+        coverage:
+          covergroups:
+          - name: cvg
+            instances:
+            - name: i1
+              coverpoints:
+              - name: cp1
+                bins: [{name: a, count: 1}, {name: b, count: 0}]
+                ignorebins: [{name: x, count: 3}]
+            - name: i2
+              coverpoints:
+              - name: cp1
+                bins: [{name: a, count: 5}, {name: x, count: 1}]
+        """
+        from ucis.cover_type_t import CoverTypeT
+        from ucis.scope_type_t import ScopeTypeT
+
+        db = YamlReader().loads(text)
+        inst = next(db.scopes(ScopeTypeT.INSTANCE))
+        cg = next(inst.scopes(ScopeTypeT.COVERGROUP))
+        cp = next(cg.scopes(ScopeTypeT.COVERPOINT))
+        assert [(ci.getName(), ci.getCoverData().data)
+                for ci in cp.coverItems(CoverTypeT.ALL)] == \
+            [("a", 6), ("b", 0), ("x", 4)]
+        i1 = next(cg.scopes(ScopeTypeT.COVERINSTANCE))
+        cp_i1 = next(i1.scopes(ScopeTypeT.COVERPOINT))
+        assert [ci.getCoverData().type
+                for ci in cp_i1.coverItems(CoverTypeT.ALL)] == \
+            [CoverTypeT.CVGBIN, CoverTypeT.CVGBIN, CoverTypeT.IGNOREBIN]
+
+    def test_validate(self):
+        import jsonschema
+        import pytest
+
+        bad = """
+        coverage:
+          covergroups:
+          - name: cvg
+            instances:
+            - name: i1
+              coverpoints:
+              - name: cp1
+                bins: [{name: a, count: "many"}]
+        """
+        with pytest.raises(jsonschema.ValidationError):
+            YamlReader().loads(bad)
+        with pytest.raises(jsonschema.ValidationError):
+            YamlReader(validate=True).loads(bad)
+
+        good = bad.replace('"many"', "2")
+        assert YamlReader(validate=False).loads(good) is not None
+
+        # Sampled: the first of every 3 documents is checked
+        reader = YamlReader(validate=3)
+        with pytest.raises(jsonschema.ValidationError):
+            reader.loads(bad)
+        reader.loads(good)
+        reader.loads(good)
+        with pytest.raises(jsonschema.ValidationError):
+            reader.loads(bad)